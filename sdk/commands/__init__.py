@@ -1,6 +1,7 @@
 from .manipulator_commands import (
     SetStateCommand,
     RunProgramJsonCommand,
+    RunCompiledProgramCommand,
     RunProgramByNameCommand,
     RunPythonProgramCommand,
     StopMovementCommand,
@@ -13,6 +14,7 @@ from .servo_control_type_command import ServoControlTypeCommand, JOINT_JOG, TWIS
 __all__ = [
     "SetStateCommand",
     "RunProgramJsonCommand",
+    "RunCompiledProgramCommand",
     "RunProgramByNameCommand",
     "RunPythonProgramCommand",
     "StopMovementCommand",
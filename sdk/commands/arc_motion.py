@@ -1,68 +1,12 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Callable
 
 from sdk.commands.abstracts.sdk_command import SdkCommand
 
-# TODO(Victor Drobizov)
-# PM-1553
-# Put it in a separate file for general use:
-# Position
-# Orientation
-# Pose
+from sdk.commands.data import Position, Orientation, Point3D
 
-# TODO(Victor Drobizov)
-# PM-1553
-# Use pydentic instead of checking in __post__init___
-
-@dataclass
-class Position:
-    x: float
-    y: float
-    z: float
-
-    def __post_init__(self):
-        for attr in ('x', 'y', 'z'):
-            val = getattr(self, attr)
-            if not isinstance(val, (float, int)):
-                raise TypeError(f"Position.{attr} must be float, got {type(val).__name__}")
-
-    def to_dict(self):
-        return {'x': self.x, 'y': self.y, 'z': self.z}
-
-
-@dataclass
-class Orientation:
-    x: float = 0.0
-    y: float = 0.0
-    z: float = 0.0
-    w: float = 1.0
-
-    def __post_init__(self):
-        for attr in ('x', 'y', 'z', 'w'):
-            val = getattr(self, attr)
-            if not isinstance(val, (float, int)):
-                raise TypeError(f"Orientation.{attr} must be float, got {type(val).__name__}")
-
-    def to_dict(self):
-        return {'x': self.x, 'y': self.y, 'z': self.z, 'w': self.w}
-
-
-@dataclass
-class Pose:
-    position: Position
-    orientation: Orientation = field(default_factory=Orientation)
-
-    def __post_init__(self):
-        if not isinstance(self.position, Position):
-            raise TypeError(f"Pose.position must be Position, got {type(self.position).__name__}")
-        if not isinstance(self.orientation, Orientation):
-            raise TypeError(f"Pose.orientation must be Orientation, got {type(self.orientation).__name__}")
-
-    def to_dict(self):
-        return {
-            'position': self.position.to_dict(),
-            'orientation': self.orientation.to_dict()
-        }
+# Поза дуги – позиция и ориентация без коэффициентов скорости (общий тип из sdk.commands.data)
+Pose = Point3D
 
 
 @dataclass
@@ -99,8 +43,8 @@ class ArcMotion(SdkCommand):
             raise TypeError(f'throw_error must be bool, got {type(self.throw_error).__name__}')
 
         data = {
-            'target': self.target.to_dict(),
-            'center_arc': self.center_arc.to_dict(),
+            'target': Point3D.to_dict(self.target),
+            'center_arc': Point3D.to_dict(self.center_arc),
             'step': self.step,
             'count_point_arc': self.count_point_arc,
             'max_velocity_scaling_factor': self.max_velocity_scaling_factor,
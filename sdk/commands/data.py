@@ -1,35 +1,212 @@
-from typing import Union
-from pydantic import BaseModel
+"""
+Типы данных команд: позиции, ориентации, точки траекторий.
 
+Объекты неизменяемы и построены на ``__slots__``: создание и сериализация точки
+занимают микросекунды, что важно при генерации тысяч точек траектории.
+Проверку типов при создании можно отключить через ``set_validation(False)``,
+а в горячих циклах использовать ``Cls._make(*values)`` без какой-либо проверки.
+"""
+import numbers
+from typing import Any, Dict, Tuple, Union
+
+# Проверять ли типы полей при создании объектов
+VALIDATE = True
+
+# Тип числового поля: numbers.Real (в т.ч. скаляры numpy) или строка с числом, хранится как float
+_NUMBER = object()
+_MISSING = object()
+
+
+def set_validation(enabled: bool) -> None:
+    """
+    Включить или отключить проверку типов при создании объектов данных
+    :param enabled: True – проверять типы и приводить вложенные словари к объектам
+    """
+    global VALIDATE
+    VALIDATE = enabled
+
+
+class CustomModel:
+    """Базовый неизменяемый тип данных с позиционной и именованной инициализацией.
+
+    Наследники задают ``__slots__``, порядок полей ``_fields``, значения по
+    умолчанию ``_defaults`` и допустимые типы ``_types``. Тип поля – ``_NUMBER``
+    (значение приводится к float), кортеж классов, класс-наследник CustomModel
+    (словарь/кортеж приводится к нему) или список из одного элемента для
+    последовательности таких значений.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _defaults: Dict[str, Any] = {}
+    _types: Dict[str, Any] = {}
 
-class CustomModel(BaseModel):
     def __init__(self, *args, **kwargs):
-        fields = list(self.model_fields)
+        fields = self._fields
         if len(args) > len(fields):
             raise TypeError(f"Expected at most {len(fields)} positional arguments, got {len(args)}")
-        kwargs |= dict(zip(fields, args))
-        super().__init__(**kwargs)
+        setter = object.__setattr__
+        for index, name in enumerate(fields):
+            if index < len(args):
+                if name in kwargs:
+                    raise TypeError(f"{type(self).__name__}() got multiple values for argument '{name}'")
+                value = args[index]
+            else:
+                value = kwargs.pop(name, _MISSING)
+                if value is _MISSING:
+                    value = self._defaults.get(name, _MISSING)
+                    if value is _MISSING:
+                        raise TypeError(f"{type(self).__name__}() missing required argument: '{name}'")
+            spec = self._types.get(name)
+            if spec is not None:
+                value = _check_field(self, name, spec, value)
+            setter(self, name, value)
+        if kwargs:
+            raise TypeError(f"{type(self).__name__}() got unexpected arguments: {', '.join(kwargs)}")
+
+    @classmethod
+    def _make(cls, *values):
+        """Быстрое создание объекта из значений всех полей по порядку, без проверок."""
+        obj = object.__new__(cls)
+        setter = object.__setattr__
+        for name, value in zip(cls._fields, values):
+            setter(obj, name, value)
+        return obj
+
+    def _replace(self, **changes):
+        """Копия объекта с изменёнными полями."""
+        values = {name: getattr(self, name) for name in self._fields}
+        values.update(changes)
+        return type(self)(**values)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return self._make_from, (tuple(getattr(self, name) for name in self._fields),)
+
+    @classmethod
+    def _make_from(cls, values: tuple):
+        return cls._make(*values)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    def __hash__(self) -> int:
+        return hash((type(self),) + tuple(getattr(self, name) for name in self._fields))
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: _dump(getattr(self, name)) for name in self._fields}
+
+    def model_dump(self) -> dict[str, Any]:
+        """Совместимость с прежним API на pydantic."""
+        return self.to_dict()
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, CustomModel):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_dump(item) for item in value]
+    return value
+
+
+def _coerce(owner: CustomModel, name: str, model: type, value: Any) -> Any:
+    if isinstance(value, model):
+        return value
+    if isinstance(value, dict):
+        return model(**value)
+    if isinstance(value, (list, tuple)):
+        return model(*value)
+    raise TypeError(f"{type(owner).__name__}.{name} must be {model.__name__}, got {type(value).__name__}")
+
+
+def _check_field(owner: CustomModel, name: str, spec: Any, value: Any) -> Any:
+    if isinstance(spec, list):
+        # Последовательности хранятся кортежами, чтобы объект оставался неизменяемым
+        items = tuple(value)
+        if not VALIDATE:
+            return items
+        item_spec = spec[0]
+        if isinstance(item_spec, type) and issubclass(item_spec, CustomModel):
+            return tuple(_coerce(owner, name, item_spec, item) for item in items)
+        for item in items:
+            if not isinstance(item, item_spec):
+                raise TypeError(f"{type(owner).__name__}.{name} items must be "
+                                f"{_type_names(item_spec)}, got {type(item).__name__}")
+        return items
+    if not VALIDATE:
+        return value
+    if spec is _NUMBER:
+        return _to_float(owner, name, value)
+    if isinstance(spec, type) and issubclass(spec, CustomModel):
+        return _coerce(owner, name, spec, value)
+    if not isinstance(value, spec):
+        raise TypeError(f"{type(owner).__name__}.{name} must be {_type_names(spec)}, got {type(value).__name__}")
+    return value
 
-    def to_dict(self) -> dict[str, Union[int, float]]:
-        return self.model_dump()
+
+def _to_float(owner: CustomModel, name: str, value: Any) -> float:
+    if type(value) is float:
+        return value
+    if isinstance(value, (numbers.Real, str)):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise TypeError(f"{type(owner).__name__}.{name} must be a real number, got {value!r}")
+
+
+def _type_names(spec: Any) -> str:
+    if isinstance(spec, tuple):
+        return " or ".join(t.__name__ for t in spec)
+    return spec.__name__
 
 
 class Position(CustomModel):
+    __slots__ = ('x', 'y', 'z')
+    _fields = ('x', 'y', 'z')
+    _types = {'x': _NUMBER, 'y': _NUMBER, 'z': _NUMBER}
+
     x: Union[int, float]
     y: Union[int, float]
     z: Union[int, float]
 
+    def to_dict(self) -> dict[str, Union[int, float]]:
+        return {'x': self.x, 'y': self.y, 'z': self.z}
+
 
 class Orientation(CustomModel):
-    x: Union[int, float] = 0.0
-    y: Union[int, float] = 0.0
-    z: Union[int, float] = 0.0
-    w: Union[int, float] = 1.0
+    __slots__ = ('x', 'y', 'z', 'w')
+    _fields = ('x', 'y', 'z', 'w')
+    _defaults = {'x': 0.0, 'y': 0.0, 'z': 0.0, 'w': 1.0}
+    _types = {'x': _NUMBER, 'y': _NUMBER, 'z': _NUMBER, 'w': _NUMBER}
+
+    x: Union[int, float]
+    y: Union[int, float]
+    z: Union[int, float]
+    w: Union[int, float]
+
+    def to_dict(self) -> dict[str, Union[int, float]]:
+        return {'x': self.x, 'y': self.y, 'z': self.z, 'w': self.w}
 
 
 class Point3D(CustomModel):
+    __slots__ = ('position', 'orientation')
+    _fields = ('position', 'orientation')
+    _defaults = {'orientation': Orientation()}
+    _types = {'position': Position, 'orientation': Orientation}
+
     position: Position
-    orientation: Orientation = Orientation()
+    orientation: Orientation
 
     def to_dict(self) -> dict:
         return {
@@ -38,21 +215,41 @@ class Point3D(CustomModel):
         }
 
 
-class Pose(CustomModel):
-    position: Position
-    orientation: Orientation = Orientation()
-    velocity_factor: Union[int, float] = 0.1
-    acceleration_factor: Union[int, float] = 0.1
+class Pose(Point3D):
+    __slots__ = ('velocity_factor', 'acceleration_factor')
+    _fields = Point3D._fields + ('velocity_factor', 'acceleration_factor')
+    _defaults = {**Point3D._defaults, 'velocity_factor': 0.1, 'acceleration_factor': 0.1}
+    _types = {**Point3D._types, 'velocity_factor': _NUMBER, 'acceleration_factor': _NUMBER}
+
+    velocity_factor: Union[int, float]
+    acceleration_factor: Union[int, float]
+
+    def to_dict(self) -> dict:
+        return {
+            'position': self.position.to_dict(),
+            'orientation': self.orientation.to_dict(),
+            'velocity_factor': self.velocity_factor,
+            'acceleration_factor': self.acceleration_factor
+        }
 
 
 class Joint(CustomModel):
+    __slots__ = ('joint_name', 'position', 'velocity')
+    _fields = ('joint_name', 'position', 'velocity')
+    _defaults = {'velocity': 0.0}
+    _types = {'joint_name': (str,), 'position': _NUMBER, 'velocity': _NUMBER}
+
     joint_name: str
     position: Union[int, float]
-    velocity: Union[int, float] = 0.0
+    velocity: Union[int, float]
 
 
 class Point(CustomModel):
-    positions: list[Joint]
+    __slots__ = ('positions',)
+    _fields = ('positions',)
+    _types = {'positions': [Joint]}
+
+    positions: Tuple[Joint, ...]
 
     def to_dict(self) -> dict[str, dict[str, Union[int, float]]]:
         position_dict: dict[str, Union[int, float]] = {}
@@ -64,12 +261,20 @@ class Point(CustomModel):
 
 
 class JointPosition(CustomModel):
+    __slots__ = ('joint', 'position')
+    _fields = ('joint', 'position')
+    _types = {'joint': (str,), 'position': _NUMBER}
+
     joint: str
     position: float
 
 
 class JointPositions(CustomModel):
-    positions: list[JointPosition]
+    __slots__ = ('positions',)
+    _fields = ('positions',)
+    _types = {'positions': [JointPosition]}
+
+    positions: Tuple[JointPosition, ...]
 
     def to_dict(self) -> list[dict[str, float]]:
         return [{"joint": jp.joint, "position": jp.position} for jp in self.positions]
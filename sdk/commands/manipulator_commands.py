@@ -35,6 +35,27 @@ class RunProgramJsonCommand(SdkCommand):
         )
 
 
+class RunCompiledProgramCommand(SdkCommand):
+    """play_program_json с заранее сериализованным телом (см. ProgramRegistry)."""
+
+    def __init__(self, compiled: Any, send_command: Callable[[str, Any], None], timeout_seconds: float = 60.0, throw_error: bool = True, message_bus=None, enable_feedback: bool = False):
+        super().__init__(
+            send_command,
+            "play_program_json",
+            {"name": compiled.stored_name},
+            timeout_seconds,
+            throw_error,
+            message_bus,
+            enable_feedback
+        )
+        self.compiled = compiled
+
+    def make_command_action(self) -> None:
+        # Тело программы вставляется готовой строкой – программа не сериализуется заново
+        self.send_command("/command", '{"action":"execute","id":%d,"command":"play_program_json","data":%s}'
+                          % (self.command_id, self.compiled.payload))
+
+
 class RunProgramByNameCommand(SdkCommand):
     def __init__(self, program_name: str, send_command: Callable[[str, dict], None], timeout_seconds: float = 60.0, throw_error: bool = True, message_bus=None, enable_feedback: bool = False):
         super().__init__(
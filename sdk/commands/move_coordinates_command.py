@@ -2,19 +2,11 @@ from enum import Enum
 from typing import Callable
 
 from sdk.commands.abstracts.sdk_command import SdkCommand
+from sdk.commands.data import Position, Orientation
 
-class MoveCoordinatesParamsPosition:
-    def __init__(self, x: float, y: float, z: float):
-        self.x = x
-        self.y = y
-        self.z = z
-
-class MoveCoordinatesParamsOrientation:
-    def __init__(self, x: float, y: float, z: float, w: float):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.w = w
+# Параметры позиции и ориентации – общие типы из sdk.commands.data
+MoveCoordinatesParamsPosition = Position
+MoveCoordinatesParamsOrientation = Orientation
 
 
 class PlannerType(Enum):
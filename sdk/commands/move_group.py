@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Union
+from typing import Tuple, Union
 
-from sdk.commands.data import CustomModel, Pose, Point
+from sdk.commands.data import CustomModel, Pose, Point, Point3D
 
 
 class MoveType(Enum):
@@ -12,5 +12,9 @@ class MoveType(Enum):
 
 
 class MoveGroup(CustomModel):
+    __slots__ = ('move_type', 'points')
+    _fields = ('move_type', 'points')
+    _types = {'move_type': (MoveType,), 'points': [(Point, Point3D)]}
+
     move_type: MoveType
-    points: list[Union[Point, Pose]]
+    points: Tuple[Union[Point, Pose, Point3D], ...]
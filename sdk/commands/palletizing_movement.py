@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 from typing import Any, Callable
-from pydantic import Field
 
 from sdk.commands.abstracts.sdk_command import SdkCommand
 from sdk.commands.data import Pose, Orientation
@@ -10,7 +9,7 @@ from sdk.commands.data import Pose, Orientation
 class PaletizingMovement(SdkCommand):
     def __init__(self,
                  target_point: Pose,
-                 hold_orientation: Orientation = Field(default_factory=Orientation),
+                 hold_orientation: Orientation = Orientation(),
                  use_orientation: bool = False,
                  step: float = 0.05,
                  count_point: int = 50,
@@ -10,4 +10,15 @@ class CommandTimeout(SdkError):
     """Таймаут ожидания результата команды/Promise."""
 
 class ConnectionError(SdkError):
-    """Проблемы с подключением или публикацией сообщений.""" 
\ No newline at end of file
+    """Проблемы с подключением или публикацией сообщений.""" 
+
+class LimitError(SdkError):
+    """Цель движения выходит за пределы суставов или рабочей зоны (проверка на стороне SDK)."""
+
+    def __init__(self, message: str, violations: list = None):
+        super().__init__(message)
+        # Нарушения: (номер точки, имя сустава или оси, значение, (нижний, верхний предел))
+        self.violations = violations or []
+
+class KinematicsError(SdkError):
+    """Решение обратной кинематики не найдено (цель недостижима или вне пределов суставов)."""
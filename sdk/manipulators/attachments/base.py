@@ -1,15 +1,51 @@
+
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from .host import AttachmentHost
+from sdk.utils.telemetry import flatten_gpio_states
+from sdk.promise import Promise
 # Добавляем недостающий импорт Any
 from typing import Any
 
 class Attachment(ABC):
-    """Базовый класс насадки."""
+    """Базовый класс насадки.
+
+    Насадка, реализующая _make_command, получает неблокирующие варианты
+    activate/deactivate (_async, _async_await, _no_wait) и цепочки
+    activate_with/deactivate_with – действие насадки отправляется вместе с
+    командами движения, не дожидаясь ответа на каждую.
+
+    Если задан state_key (имя значения в телеметрии state_topic), насадка при
+    подключении подписывается на state_topic (общая подписка манипулятора) и
+    зеркалирует фактическое состояние: get_status и is_active отражают
+    телеметрию, wait_for_status ждёт перехода, а activate/deactivate не
+    отправляют команду, если насадка уже в нужном состоянии. Без state_key
+    команды отправляются всегда.
+    """
 
-    def __init__(self, name: str):
+    # Статусы насадки после включения/выключения
+    active_status = "active"
+    idle_status = "idle"
+    # Топик телеметрии с состоянием насадки (None – состояние известно только по ответам на команды)
+    state_topic: Optional[str] = None
+
+    def __init__(self, name: str, state_key: Optional[str] = None):
+        """
+        :param name: Имя насадки
+        :param state_key: Имя значения состояния в телеметрии state_topic (плоское имя, см.
+            flatten_gpio_states), например "outputs/DO3"; None – состояние не отслеживается
+        """
         self.name = name
         self._manipulator = None  # будет установлено при attach
+        self.state_key = state_key
+        self._mirrored: Optional[bool] = None
+        self._mirrored_at: Optional[float] = None
+        self._previous_payload: Any = None
+        self._state_waiters: List[Tuple[bool, Promise]] = []
+        self._state_lock = threading.Lock()
 
     # -------------------------------------------------
     # Жизненный цикл
@@ -29,11 +65,124 @@ class Attachment(ABC):
     # -------------------------------------------------
     # Хуки
     # -------------------------------------------------
+    @property
+    def mirrors_state(self) -> bool:
+        """Состояние насадки отслеживается по телеметрии (заданы state_topic и state_key)."""
+        return self.state_topic is not None and self.state_key is not None
+
     def on_attached(self) -> None:  # noqa: D401
-        pass
+        if self.mirrors_state and hasattr(self._manipulator, "add_payload_listener"):
+            self._manipulator.add_payload_listener(self.state_topic, self._on_state_message)
 
     def on_detached(self) -> None:  # noqa: D401
-        pass
+        if self.mirrors_state and hasattr(self._manipulator, "remove_payload_listener"):
+            self._manipulator.remove_payload_listener(self.state_topic, self._on_state_message)
+        self._mirrored = None
+        self._previous_payload = None
+
+    def _make_command(self, active: bool, timeout_seconds: float, throw_error: bool, **kwargs) -> Any:
+        """Создать (не отправляя) команду включения/выключения насадки."""
+        raise NotImplementedError(f"{self.__class__.__name__} не поддерживает неблокирующие команды")
+
+    def _state_from_value(self, value: Any) -> Optional[bool]:
+        """Перевести значение из телеметрии в состояние (True – включена); None – не распознано."""
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return value != 0
+        if isinstance(value, str):
+            lowered = value.lower()
+            if lowered in ("on", "true", "1", "active", "high"):
+                return True
+            if lowered in ("off", "false", "0", "idle", "low"):
+                return False
+        return None
+
+    # -------------------------------------------------
+    # Зеркало состояния по телеметрии
+    # -------------------------------------------------
+    def _on_state_message(self, topic: str, payload: Any) -> None:
+        # Телеметрия публикуется периодически: повтор того же сообщения не разбираем
+        if payload == self._previous_payload:
+            return
+        self._previous_payload = payload
+        try:
+            states = flatten_gpio_states(json.loads(payload))
+        except (TypeError, ValueError):
+            return
+        if self.state_key not in states:
+            return
+        active = self._state_from_value(states[self.state_key])
+        if active is not None:
+            self._update_status(active, mirrored=True)
+
+    def _update_status(self, active: bool, mirrored: bool = False) -> None:
+        status = self.active_status if active else self.idle_status
+        with self._state_lock:
+            self._status = status
+            # Подтверждённая команда обновляет уже установленное по телеметрии зеркало
+            if mirrored or self._mirrored is not None:
+                self._mirrored = active
+            if mirrored:
+                self._mirrored_at = time.monotonic()
+            ready = [promise for target, promise in self._state_waiters if target == active]
+        for promise in ready:
+            if promise.is_active:
+                promise.resolve(status)
+
+    @property
+    def is_active(self) -> Optional[bool]:
+        """Состояние насадки по телеметрии: True/False, None – телеметрии ещё не было."""
+        return self._mirrored
+
+    @property
+    def state_age(self) -> Optional[float]:
+        """Сколько секунд назад было получено состояние из телеметрии (None – не получено)."""
+        return None if self._mirrored_at is None else time.monotonic() - self._mirrored_at
+
+    def _add_state_waiter(self, active: bool, timeout_seconds: float, throw_error: bool) -> Promise:
+        promise = Promise(timeout_seconds=timeout_seconds, throw_error=throw_error)
+        with self._state_lock:
+            self._state_waiters.append((active, promise))
+            current = self._mirrored
+        if current is active:
+            promise.resolve(self.active_status if active else self.idle_status)
+        return promise
+
+    def _remove_state_waiter(self, promise: Promise) -> None:
+        with self._state_lock:
+            self._state_waiters = [w for w in self._state_waiters if w[1] is not promise]
+
+    def wait_for_status(self, active: bool = True, timeout_seconds: float = 60.0, throw_error: bool = True) -> Any:
+        """
+        Дождаться перехода насадки в состояние (по телеметрии или ответу на команду)
+        :param active: True – включена, False – выключена
+        :return: Статус насадки
+        """
+        promise = self._add_state_waiter(active, timeout_seconds, throw_error)
+        try:
+            return promise.result()
+        finally:
+            self._remove_state_waiter(promise)
+
+    async def wait_for_status_async_await(self, active: bool = True, timeout_seconds: float = 60.0,
+                                          throw_error: bool = True) -> Any:
+        promise = self._add_state_waiter(active, timeout_seconds, throw_error)
+        try:
+            return await promise.async_result()
+        except Exception as e:
+            if throw_error:
+                raise
+            return e
+        finally:
+            self._remove_state_waiter(promise)
+
+    def _is_redundant(self, active: bool, force: bool, kwargs: Dict[str, Any]) -> bool:
+        """Команда не нужна: телеметрия по state_key показывает, что насадка уже в этом состоянии."""
+        if force or not self.mirrors_state or self._mirrored is not active or any(v is not None for v in kwargs.values()):
+            return False
+        print(f"[{self.__class__.__name__}] {self.name} уже в состоянии {self._status}, команда не отправляется")
+        return True
 
     # -------------------------------------------------
     # Абстрактное API
@@ -50,6 +199,100 @@ class Attachment(ABC):
     def get_status(self) -> Dict[str, Any]:
         raise NotImplementedError
 
+    # -------------------------------------------------
+    # Неблокирующее API
+    # -------------------------------------------------
+    def _prepare(self, active: bool, timeout_seconds: float, throw_error: bool, **kwargs) -> Any:
+        """Создать команду, зарегистрировать её в active_commands и обновить статус по успешному ответу."""
+        command = self._make_command(active, timeout_seconds, throw_error, **kwargs)
+        active_commands = self.manipulator.active_commands
+
+        def on_success(result: Any) -> None:
+            # При throw_error=False ошибка приходит строкой вместо результата
+            if not isinstance(result, (str, Exception)):
+                self._update_status(active)
+
+        command.promise.add_success_callback(on_success)
+        command.promise.add_failure_callback(lambda _: active_commands.pop(command.command_id, None))
+        active_commands[command.command_id] = command
+        return command
+
+    def _execute(self, active: bool, timeout_seconds: float, throw_error: bool, force: bool = False, **kwargs) -> Any:
+        if self._is_redundant(active, force, kwargs):
+            return None
+        command = self._prepare(active, timeout_seconds, throw_error, **kwargs)
+        command.make_command_action()
+        try:
+            return command.result()
+        finally:
+            self.manipulator.active_commands.pop(command.command_id, None)
+
+    def activate_async(self, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> Any:
+        """
+        Подготовить команду включения насадки (без отправки).
+        Команду можно отправить через make_command_action() или передать в manipulator.run_pipelined.
+        """
+        return self._prepare(True, timeout_seconds, throw_error, **kwargs)
+
+    def deactivate_async(self, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> Any:
+        """Подготовить команду выключения насадки (без отправки)."""
+        return self._prepare(False, timeout_seconds, throw_error, **kwargs)
+
+    def activate_no_wait(self, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> Any:
+        """
+        Отправить команду включения насадки, не дожидаясь ответа.
+        :return: Команда; результат доступен через result()/async_result(), статус обновится по ответу
+        """
+        command = self._prepare(True, timeout_seconds, throw_error, **kwargs)
+        command.make_command_action()
+        return command
+
+    def deactivate_no_wait(self, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> Any:
+        """Отправить команду выключения насадки, не дожидаясь ответа."""
+        command = self._prepare(False, timeout_seconds, throw_error, **kwargs)
+        command.make_command_action()
+        return command
+
+    async def activate_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True,
+                                   force: bool = False, **kwargs) -> Any:
+        if self._is_redundant(True, force, kwargs):
+            return None
+        command = self.activate_no_wait(timeout_seconds, throw_error, **kwargs)
+        try:
+            return await command.async_result()
+        finally:
+            self.manipulator.active_commands.pop(command.command_id, None)
+
+    async def deactivate_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True,
+                                     force: bool = False, **kwargs) -> Any:
+        if self._is_redundant(False, force, kwargs):
+            return None
+        command = self.deactivate_no_wait(timeout_seconds, throw_error, **kwargs)
+        try:
+            return await command.async_result()
+        finally:
+            self.manipulator.active_commands.pop(command.command_id, None)
+
+    def activate_with(self, *commands: Any, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> List[Any]:
+        """
+        Включить насадку и сразу отправить следующие команды (например, движение), не дожидаясь ответа
+        на включение. Пример:
+            vacuum.activate_with(manipulator.move_to_coordinates_async(...))
+        :param commands: Подготовленные (не отправленные) команды
+        :return: Результаты в порядке [насадка, *commands]
+        """
+        command = self._prepare(True, timeout_seconds, throw_error, **kwargs)
+        return self.manipulator.run_pipelined([command, *commands], throw_error)
+
+    def deactivate_with(self, *commands: Any, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> List[Any]:
+        """
+        Выключить насадку и сразу отправить следующие команды. Пример (отпустить деталь и отвести руку):
+            vacuum.deactivate_with(manipulator.move_to_coordinates_async(...))
+        :return: Результаты в порядке [насадка, *commands]
+        """
+        command = self._prepare(False, timeout_seconds, throw_error, **kwargs)
+        return self.manipulator.run_pipelined([command, *commands], throw_error)
+
     # -------------------------------------------------
     @property
     def manipulator(self) -> AttachmentHost:
@@ -58,4 +301,4 @@ class Attachment(ABC):
         return self._manipulator
 
     def __repr__(self):
-        return f"<{self.__class__.__name__} name={self.name}>" 
\ No newline at end of file
+        return f"<{self.__class__.__name__} name={self.name}>"
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .base import Attachment
 from sdk.commands.gripper_control_command import GripperControlCommand
@@ -9,8 +9,13 @@ class GripperAttachment(Attachment):
     Отправляет команды напрямую через message_bus
     """
 
-    def __init__(self, manipulator, name: str = "gripper", rotation_open: int = 0, gripper_open: int = 40):
-        super().__init__(name)
+    state_topic = "/hardware_state"
+    # Допуск сравнения положения захвата с открытым положением
+    state_tolerance = 2.0
+
+    def __init__(self, manipulator, name: str = "gripper", rotation_open: int = 0, gripper_open: int = 40,
+                 state_key: Optional[str] = None):
+        super().__init__(name, state_key)
         self.rotation_open = rotation_open
         self.gripper_open = gripper_open
         self._status = "idle"
@@ -20,48 +25,35 @@ class GripperAttachment(Attachment):
         manipulator.register_attachment(self)
 
     # -------------------------------------------------
-    def activate(self, rotation: int = None, gripper: int = None, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> None:
-        """Закрыть гриппер (зажать предмет)."""
-        if rotation == None and gripper == None:
+    def _state_from_value(self, value: Any) -> Optional[bool]:
+        # Положение захвата: гриппер зажат, если он не в открытом положении
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return abs(value - self.gripper_open) > self.state_tolerance
+        return super()._state_from_value(value)
+
+    def _make_command(self, active: bool, timeout_seconds: float, throw_error: bool,
+                      rotation: int = None, gripper: int = None, **kwargs) -> GripperControlCommand:
+        if not active:
+            rotation, gripper = self.rotation_open, self.gripper_open
+        elif rotation == None and gripper == None:
             rotation = self.rotation_open
             gripper = 0
-        command = GripperControlCommand(
-            self.manipulator.message_bus.publish, 
+        return GripperControlCommand(
+            self.manipulator.message_bus.publish,
             rotation,
             gripper,
             timeout_seconds,
             throw_error,
             message_bus=self.manipulator.message_bus
         )
-        # Регистрируем команду в active_commands для отслеживания ответа
-        self.manipulator.active_commands[command.command_id] = command
-        command.make_command_action()
-        try:
-            command.result()
-        finally:
-            if command.command_id in self.manipulator.active_commands:
-                del self.manipulator.active_commands[command.command_id]
-        self._status = "active"
 
-    def deactivate(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+    def activate(self, rotation: int = None, gripper: int = None, timeout_seconds: float = 60.0, throw_error: bool = True, force: bool = False, **kwargs) -> None:
+        """Закрыть гриппер (зажать предмет). Команда с явными rotation/gripper отправляется всегда."""
+        self._execute(True, timeout_seconds, throw_error, force, rotation=rotation, gripper=gripper)
+
+    def deactivate(self, timeout_seconds: float = 60.0, throw_error: bool = True, force: bool = False) -> None:
         """Открыть гриппер."""
-        command = GripperControlCommand(
-            self.manipulator.message_bus.publish,
-            self.rotation_open,
-            self.gripper_open,
-            timeout_seconds,
-            throw_error,
-            message_bus=self.manipulator.message_bus
-        )
-        # Регистрируем команду в active_commands для отслеживания ответа
-        self.manipulator.active_commands[command.command_id] = command
-        command.make_command_action()
-        try:
-            command.result()
-        finally:
-            if command.command_id in self.manipulator.active_commands:
-                del self.manipulator.active_commands[command.command_id]
-        self._status = "idle"
+        self._execute(False, timeout_seconds, throw_error, force)
 
     def get_status(self) -> str:
         return self._status
\ No newline at end of file
@@ -1,10 +1,20 @@
-from typing import Protocol, Dict, Any
+from typing import Protocol, Dict, Any, Callable, List
 
 class AttachmentHost(Protocol):
+    message_bus: Any
+
+    active_commands: Dict[int, Any]
+
     def write_digital_output(self, channel: int, value: bool, **kwargs) -> None: ...
 
     def manage_gripper(self, rotation: int, gripper: int, **kwargs) -> None: ...
 
     def manage_vacuum(self, rotation: int, power_supply: bool, **kwargs) -> None: ...
 
-    def get_status(self) -> Dict[str, Any]: ... 
\ No newline at end of file
+    def add_payload_listener(self, topic: str, listener: Callable[[str, str], None]) -> None: ...
+
+    def remove_payload_listener(self, topic: str, listener: Callable[[str, str], None]) -> None: ...
+
+    def run_pipelined(self, commands: List[Any], throw_error: bool = True) -> List[Any]: ...
+
+    def get_status(self) -> Dict[str, Any]: ...
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .base import Attachment
 from sdk.commands.manipulator_commands import WriteDigitalOutputCommand
@@ -9,8 +9,12 @@ class LaserAttachment(Attachment):
     Отправляет команды напрямую через message_bus
     """
 
-    def __init__(self, manipulator, channel: int, name: str = "laser"):
-        super().__init__(name)
+    active_status = "on"
+    idle_status = "off"
+    state_topic = "/gpio_states"
+
+    def __init__(self, manipulator, channel: int, name: str = "laser", state_key: Optional[str] = None):
+        super().__init__(name, state_key)
         self.channel = channel
         self._status = "off"
         
@@ -18,45 +22,23 @@ class LaserAttachment(Attachment):
         manipulator.register_attachment(self)
 
     # -------------------------------------------------
-    def activate(self, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> None:
-        """Включить лазер."""
-        command = WriteDigitalOutputCommand(
+    def _make_command(self, active: bool, timeout_seconds: float, throw_error: bool, **kwargs) -> WriteDigitalOutputCommand:
+        return WriteDigitalOutputCommand(
             self.channel,
-            True,
+            active,
             self.manipulator.message_bus.publish,
             timeout_seconds,
             throw_error,
             message_bus=self.manipulator.message_bus
         )
-        # Регистрируем команду в active_commands для отслеживания ответа
-        self.manipulator.active_commands[command.command_id] = command
-        command.make_command_action()
-        try:
-            command.result()
-        finally:
-            if command.command_id in self.manipulator.active_commands:
-                del self.manipulator.active_commands[command.command_id]
-        self._status = "on"
-
-    def deactivate(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+
+    def activate(self, timeout_seconds: float = 60.0, throw_error: bool = True, force: bool = False, **kwargs) -> None:
+        """Включить лазер (force – отправить команду, даже если лазер уже включён)."""
+        self._execute(True, timeout_seconds, throw_error, force)
+
+    def deactivate(self, timeout_seconds: float = 60.0, throw_error: bool = True, force: bool = False) -> None:
         """Выключить лазер."""
-        command = WriteDigitalOutputCommand(
-            self.channel,
-            False,
-            self.manipulator.message_bus.publish,
-            timeout_seconds,
-            throw_error,
-            message_bus=self.manipulator.message_bus
-        )
-        # Регистрируем команду в active_commands для отслеживания ответа
-        self.manipulator.active_commands[command.command_id] = command
-        command.make_command_action()
-        try:
-            command.result()
-        finally:
-            if command.command_id in self.manipulator.active_commands:
-                del self.manipulator.active_commands[command.command_id]
-        self._status = "off"
+        self._execute(False, timeout_seconds, throw_error, force)
 
     def get_status(self) -> str:
         return self._status
\ No newline at end of file
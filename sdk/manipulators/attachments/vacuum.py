@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .base import Attachment
 from sdk.commands.vacuum_control_command import VacuumControlCommand
@@ -9,8 +9,10 @@ class VacuumAttachment(Attachment):
     Отправляет команды напрямую через message_bus
     """
 
-    def __init__(self, manipulator, name: str = "vacuum", rotation: int = 0):
-        super().__init__(name)
+    state_topic = "/hardware_state"
+
+    def __init__(self, manipulator, name: str = "vacuum", rotation: int = 0, state_key: Optional[str] = None):
+        super().__init__(name, state_key)
         self.rotation = rotation
         self._status = "idle"
         
@@ -19,46 +21,25 @@ class VacuumAttachment(Attachment):
         manipulator.register_attachment(self)
 
     # -------------------------------------------------
-    def activate(self, rotation: int = None, timeout_seconds: float = 60.0, throw_error: bool = True, **kwargs) -> None:
-        """Включить вакуум."""
+    def _make_command(self, active: bool, timeout_seconds: float, throw_error: bool,
+                      rotation: int = None, **kwargs) -> VacuumControlCommand:
         rotation = rotation if rotation is not None else self.rotation
-        command = VacuumControlCommand(
+        return VacuumControlCommand(
             self.manipulator.message_bus.publish,
             rotation,
-            True,  # power_supply=True
+            active,  # power_supply
             timeout_seconds,
             throw_error,
             message_bus=self.manipulator.message_bus
         )
-        # Регистрируем команду в active_commands для отслеживания ответа
-        self.manipulator.active_commands[command.command_id] = command
-        command.make_command_action()
-        try:
-            command.result()
-        finally:
-            if command.command_id in self.manipulator.active_commands:
-                del self.manipulator.active_commands[command.command_id]
-        self._status = "active"
 
-    def deactivate(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+    def activate(self, rotation: int = None, timeout_seconds: float = 60.0, throw_error: bool = True, force: bool = False, **kwargs) -> None:
+        """Включить вакуум (force – отправить команду, даже если вакуум уже включён)."""
+        self._execute(True, timeout_seconds, throw_error, force, rotation=rotation)
+
+    def deactivate(self, timeout_seconds: float = 60.0, throw_error: bool = True, force: bool = False) -> None:
         """Выключить вакуум."""
-        command = VacuumControlCommand(
-            self.manipulator.message_bus.publish,
-            self.rotation,
-            False,  # power_supply=False
-            timeout_seconds,
-            throw_error,
-            message_bus=self.manipulator.message_bus
-        )
-        # Регистрируем команду в active_commands для отслеживания ответа
-        self.manipulator.active_commands[command.command_id] = command
-        command.make_command_action()
-        try:
-            command.result()
-        finally:
-            if command.command_id in self.manipulator.active_commands:
-                del self.manipulator.active_commands[command.command_id]
-        self._status = "idle"
+        self._execute(False, timeout_seconds, throw_error, force)
 
     def get_status(self) -> str:
         return self._status
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Захват деталей с движущегося конвейера: данные датчиков, распознавание Pixy и
+движение манипулятора выполняются параллельно в отдельных потоках.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sdk.manipulators.extern_devices.pixy_cam.block_tracker import Block, BlockTracker, parse_blocks
+from sdk.manipulators.extern_devices.pixy_cam.calibration import PixyCalibration
+
+
+class PickTarget(NamedTuple):
+    """Деталь, найденная камерой, в координатах робота на момент обнаружения."""
+    track_id: int
+    block: Block
+    x: float
+    y: float
+    detected_at: float
+
+    def predict(self, belt_velocity: Tuple[float, float], at: float) -> Tuple[float, float]:
+        """Положение детали на момент времени at с учётом движения ленты."""
+        dt = at - self.detected_at
+        return self.x + belt_velocity[0] * dt, self.y + belt_velocity[1] * dt
+
+
+# Функция захвата: pick(manipulator, target, (x, y)) – (x, y) предсказанное положение детали
+PickFunction = Callable[[Any, PickTarget, Tuple[float, float]], None]
+
+
+def _put_latest(q: "queue.Queue", item: Any) -> bool:
+    """Положить элемент в ограниченную очередь, вытеснив самый старый. Возвращает True, если был вытеснен элемент."""
+    dropped = False
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped = True
+            except queue.Empty:
+                pass
+
+
+class ConveyorPickPipeline:
+    """Конвейер захвата деталей «на лету».
+
+    Три стадии работают параллельно и обмениваются данными через ограниченные
+    очереди с отметками времени (time.monotonic):
+
+    * датчики MGbot (необязательно) – поток датчиков включается при старте,
+      фронт условия sensor_trigger запускает съёмку;
+    * камера Pixy – блоки переводятся в координаты робота калибровкой, трекер
+      отбрасывает уже поставленные в очередь детали;
+    * движение – положение детали упреждается на lead_time с учётом скорости
+      ленты, заданной через set_conveyer_velocity.
+
+    Очереди вытесняют самые старые элементы: устаревшая цель бесполезна.
+    """
+
+    def __init__(self,
+                 manipulator: Any,
+                 calibration: PixyCalibration,
+                 pick: PickFunction,
+                 camera: Any = None,
+                 sensor_trigger: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 belt_direction: Tuple[float, float] = (1.0, 0.0),
+                 velocity_scale: float = 1.0,
+                 lead_time: float = 0.5,
+                 max_target_age: float = 5.0,
+                 signatures: Optional[Set[int]] = None,
+                 queue_size: int = 4,
+                 request_timeout: float = 5.0):
+        """
+        :param manipulator: Манипулятор
+        :param calibration: Калибровка камера -> робот
+        :param pick: Функция захвата детали
+        :param camera: Модуль Pixy (по умолчанию manipulator.pixy_cam_uart_control)
+        :param sensor_trigger: Условие по измерению датчиков MGbot (плоский словарь, см.
+            MGbotSensorStream), при котором выполняется съёмка; None – камера опрашивается непрерывно
+        :param belt_direction: Единичный вектор движения ленты в координатах робота
+        :param velocity_scale: Перевод скорости конвейера в единицы координат робота в секунду
+        :param lead_time: Время от выдачи цели до захвата (упреждение), с
+        :param max_target_age: Цели старше этого времени отбрасываются, с
+        :param signatures: Сигнатуры Pixy, которые нужно захватывать (None – все)
+        :param queue_size: Размер очередей между стадиями
+        :param request_timeout: Таймаут запросов к датчикам и камере, с
+        """
+        self.manipulator = manipulator
+        self.calibration = calibration
+        self.pick = pick
+        self.camera = camera if camera is not None else manipulator.pixy_cam_uart_control
+        self.sensor_trigger = sensor_trigger
+        self.belt_direction = belt_direction
+        self.velocity_scale = velocity_scale
+        self.lead_time = lead_time
+        self.max_target_age = max_target_age
+        self.signatures = signatures
+        self.request_timeout = request_timeout
+
+        self.tracker = BlockTracker()
+        self._triggers: "queue.Queue[float]" = queue.Queue(maxsize=queue_size)
+        self._targets: "queue.Queue[PickTarget]" = queue.Queue(maxsize=queue_size)
+        self._queued_tracks: Set[int] = set()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._sensor_handle: Any = None
+        self._triggered = False
+
+        self.picked_count = 0
+        self.stale_count = 0
+        self.overflow_count = 0
+        self.error_count = 0
+
+    # -------------------------------------------------
+    # Управление
+    # -------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """Запустить стадии конвейера в фоновых потоках."""
+        if self.running:
+            raise RuntimeError("Конвейер захвата уже запущен")
+        self._stop.clear()
+        if self.sensor_trigger is not None:
+            stream = self.manipulator.mgbot_conveyer.start_sensor_stream(timeout_seconds=self.request_timeout)
+            self._triggered = False
+            self._sensor_handle = stream.on_sample(self._on_sensor_sample)
+        stages = [("vision", self._vision_loop), ("motion", self._motion_loop)]
+        self._threads = [
+            threading.Thread(target=target, name=f"ConveyorPick-{name}", daemon=True)
+            for name, target in stages
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout_seconds: float = 5.0) -> None:
+        """Остановить конвейер; текущий захват доводится до конца."""
+        self._stop.set()
+        if self._sensor_handle is not None:
+            self.manipulator.mgbot_conveyer.sensor_stream.remove_callback(self._sensor_handle)
+            self._sensor_handle = None
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout_seconds)
+        self._threads = []
+
+    def __enter__(self) -> "ConveyorPickPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def belt_velocity(self) -> Tuple[float, float]:
+        """Скорость ленты в координатах робота (по последней подтверждённой скорости конвейера)."""
+        velocity = (getattr(self.manipulator, "conveyor_velocity", None) or 0.0) * self.velocity_scale
+        return self.belt_direction[0] * velocity, self.belt_direction[1] * velocity
+
+    # -------------------------------------------------
+    # Стадии
+    # -------------------------------------------------
+    def _on_sensor_sample(self, sample: Dict[str, Any]) -> None:
+        try:
+            active = bool(self.sensor_trigger(sample))
+        except Exception as e:
+            print(f"[ConveyorPick] Ошибка в условии датчиков: {e}")
+            self.error_count += 1
+            active = False
+        # Съёмка запускается по фронту условия: деталь вошла в зону датчика
+        if active and not self._triggered:
+            if _put_latest(self._triggers, time.monotonic()):
+                self.overflow_count += 1
+        self._triggered = active
+
+    def _vision_loop(self) -> None:
+        while not self._stop.is_set():
+            if self.sensor_trigger is not None:
+                try:
+                    self._triggers.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            try:
+                result = self.camera.get_blocks(timeout_seconds=self.request_timeout)
+            except Exception as e:
+                print(f"[ConveyorPick] Ошибка получения блоков: {e}")
+                self.error_count += 1
+                self._stop.wait(0.1)
+                continue
+            self._process_frame(parse_blocks(result), time.monotonic())
+
+    def _process_frame(self, blocks: List[Block], timestamp: float) -> None:
+        if self.signatures is not None:
+            blocks = [b for b in blocks if b.signature in self.signatures]
+        tracks = self.tracker.update(blocks, timestamp)
+        fresh = [t for t in tracks if t.track_id not in self._queued_tracks]
+        if not fresh:
+            return
+        coordinates = self.calibration.transform_many([(t.x, t.y) for t in fresh])
+        for track, (x, y) in zip(fresh, coordinates):
+            self._queued_tracks.add(track.track_id)
+            if _put_latest(self._targets, PickTarget(track.track_id, track.block, x, y, timestamp)):
+                self.overflow_count += 1
+        # Не держим ID объектов, которые трекер уже забыл
+        alive = {t.track_id for t in self.tracker.tracks}
+        self._queued_tracks &= alive
+
+    def _motion_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                target = self._targets.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            pick_at = time.monotonic() + self.lead_time
+            if pick_at - target.detected_at > self.max_target_age:
+                self.stale_count += 1
+                continue
+            predicted = target.predict(self.belt_velocity, pick_at)
+            try:
+                self.pick(self.manipulator, target, predicted)
+                self.picked_count += 1
+            except Exception as e:
+                print(f"[ConveyorPick] Ошибка захвата детали {target.track_id}: {e}")
+                self.error_count += 1
@@ -23,22 +23,22 @@ from sdk.utils.constants import (
 
 
 def _make_topic_decorator(topic: str):
-    """Строит декоратор, который фильтрует входящие сообщения по *topic* через self.on_message."""
+    """
+    Строит декоратор метода-обработчика топика *topic*.
 
-    def decorator(func: Callable[[Any], None]):
+    При первом вызове метода на экземпляре обработчик один раз регистрируется
+    в self.message_bus (повторные вызовы не добавляют обработчиков). Для шаблона
+    "#" метод получает (topic, payload), для конкретного топика – payload.
+    """
+
+    def decorator(func: Callable[..., None]):
         @wraps(func)
         def wrapper(self, *args, **kwargs):  # type: ignore[override]
-            # Назначаем единый on_message если ещё не назначен
-            previous = getattr(self, "on_message", None)
-
-            def _handler(msg_topic: str, payload: Any):
-                if msg_topic == topic:
-                    func(self, payload)
-                if callable(previous):
-                    previous(msg_topic, payload)
-
-            if previous is not _handler:
-                self.on_message = _handler  # type: ignore[attr-defined]
+            registered = self.__dict__.setdefault("_event_registrations", set())
+            bus = getattr(self, "message_bus", None)
+            if bus is not None and func not in registered:
+                registered.add(func)
+                bus.on_message(topic, lambda *message: func(self, *message))
 
             return func(self, *args, **kwargs)
 
@@ -48,7 +48,7 @@ def _make_topic_decorator(topic: str):
 
 
 # Создаём конкретные декораторы
-on_message = _make_topic_decorator("*")
+on_message = _make_topic_decorator("#")
 on_command = _make_topic_decorator(COMMAND_TOPIC)
 on_command_result = _make_topic_decorator(COMMAND_RESULT_TOPIC)
 on_management = _make_topic_decorator(MANAGEMENT_TOPIC)
@@ -18,6 +18,8 @@ class EventMixin:
         self._on_management: Optional[Callable] = None
         self._on_coordinates: Optional[Callable] = None
         self._on_joint_states: Optional[Callable] = None
+        # Обёртка on_message, зарегистрированная в шине на "#"
+        self._on_message_wrapper: Optional[Callable] = None
         
         # _topic_handlers убран за ненадобностью; обработка выполняется через on_message
     
@@ -29,6 +31,17 @@ class EventMixin:
             except Exception as e:
                 print(f"Ошибка в обработчике события: {e}")
     
+    def _replace_bus_handler(self, topic: str, previous: Optional[Callable], handler: Optional[Callable]) -> None:
+        """Заменить обработчик топика в шине: прежний снимается, а не остаётся в цепочке."""
+        bus = getattr(self, "message_bus", None)
+        if bus is None:
+            return
+        off_message = getattr(bus, "off_message", None)
+        if previous is not None and off_message is not None:
+            off_message(topic, previous)
+        if handler is not None:
+            bus.on_message(topic, handler)
+
     # Properties для удобного присваивания обработчиков
     @property
     def on_command(self) -> Optional[Callable]:
@@ -36,9 +49,8 @@ class EventMixin:
     
     @on_command.setter
     def on_command(self, handler: Callable) -> None:
-        self._on_command = handler
-        if hasattr(self, "message_bus"):
-            self.message_bus.on_message(COMMAND_TOPIC, handler)
+        previous, self._on_command = getattr(self, "_on_command", None), handler
+        self._replace_bus_handler(COMMAND_TOPIC, previous, handler)
     
     @property
     def on_command_result(self) -> Optional[Callable]:
@@ -46,9 +58,8 @@ class EventMixin:
     
     @on_command_result.setter
     def on_command_result(self, handler: Callable) -> None:
-        self._on_command_result = handler
-        if hasattr(self, "message_bus"):
-            self.message_bus.on_message(COMMAND_RESULT_TOPIC, handler)
+        previous, self._on_command_result = getattr(self, "_on_command_result", None), handler
+        self._replace_bus_handler(COMMAND_RESULT_TOPIC, previous, handler)
     
     @property
     def on_management(self) -> Optional[Callable]:
@@ -56,9 +67,8 @@ class EventMixin:
     
     @on_management.setter
     def on_management(self, handler: Callable) -> None:
-        self._on_management = handler
-        if hasattr(self, "message_bus"):
-            self.message_bus.on_message(MANAGEMENT_TOPIC, handler)
+        previous, self._on_management = getattr(self, "_on_management", None), handler
+        self._replace_bus_handler(MANAGEMENT_TOPIC, previous, handler)
     
     @property
     def on_coordinates(self) -> Optional[Callable]:
@@ -66,9 +76,8 @@ class EventMixin:
     
     @on_coordinates.setter
     def on_coordinates(self, handler: Callable) -> None:
-        self._on_coordinates = handler
-        if hasattr(self, "message_bus"):
-            self.message_bus.on_message(CARTESIAN_COORDINATES_TOPIC, handler)
+        previous, self._on_coordinates = getattr(self, "_on_coordinates", None), handler
+        self._replace_bus_handler(CARTESIAN_COORDINATES_TOPIC, previous, handler)
     
     @property
     def on_joint_states(self) -> Optional[Callable]:
@@ -76,9 +85,8 @@ class EventMixin:
     
     @on_joint_states.setter
     def on_joint_states(self, handler: Callable) -> None:
-        self._on_joint_states = handler
-        if hasattr(self, "message_bus"):
-            self.message_bus.on_message(JOINT_INFO_TOPIC, handler)
+        previous, self._on_joint_states = getattr(self, "_on_joint_states", None), handler
+        self._replace_bus_handler(JOINT_INFO_TOPIC, previous, handler)
 
     # Универсальный обработчик всех сообщений
     @property
@@ -88,12 +96,14 @@ class EventMixin:
     @on_message.setter
     def on_message(self, handler: Callable[[str, Any], None]) -> None:  # type: ignore
         self._on_message = handler
+        wrapper = None
         if hasattr(self, "message_bus") and callable(handler):
             # регистрируем обработчик, который передаёт topic + payload
-            def _wrapper(msg_topic: str, payload: Any):
+            def wrapper(msg_topic: str, payload: Any):
                 try:
                     handler(msg_topic, payload)
                 except Exception as e:
                     print(f"Ошибка в on_message: {e}")
 
-            self.message_bus.on_message("#", _wrapper)  # подписываемся на все 
\ No newline at end of file
+        previous, self._on_message_wrapper = getattr(self, "_on_message_wrapper", None), wrapper
+        self._replace_bus_handler("#", previous, wrapper)  # подписываемся на все
@@ -4,8 +4,10 @@ MGbot subpackage: экспорт модулей для управления ле
 
 
 from .mgbot_conveyer import MGbotConveyer
+from .sensor_stream import MGbotSensorStream
 
 
 __all__ = [
     "MGbotConveyer",
+    "MGbotSensorStream",
 ]
\ No newline at end of file
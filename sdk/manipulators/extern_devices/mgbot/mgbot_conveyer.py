@@ -2,6 +2,7 @@ from typing import Optional, Dict, Any
 from sdk.promise import Promise
 
 from sdk.commands.mgbot_conveyer_command import MGbotConveyerCommand
+from sdk.manipulators.extern_devices.mgbot.sensor_stream import MGbotSensorStream
 from sdk.utils.constants import COMMAND_TOPIC, COMMAND_RESULT_TOPIC, MGBOT_TOPIC
 
 class MGbotConveyer:
@@ -12,6 +13,7 @@ class MGbotConveyer:
         self.specific_command = None
         self.mgbot_promise: Optional[Promise] = None
         self.last_sensor_data: Optional[Dict[str, Any]] = None
+        self.sensor_stream = MGbotSensorStream()
 
     def _create_command(self, data: dict, timeout_seconds: float = 60.0, throw_error: bool = True) -> MGbotConveyerCommand:
         command = MGbotConveyerCommand(
@@ -107,4 +109,37 @@ class MGbotConveyer:
         try:
             return self.last_sensor_data
         finally:
-            self.sensor_data_promise = None
\ No newline at end of file
+            self.sensor_data_promise = None
+
+    def process_sensor_data(self, data: Dict[str, Any]) -> None:
+        """Обработка данных датчиков из /mgbot_info (вызывается манипулятором)."""
+        self.last_sensor_data = data
+        self.sensor_stream.process(data)
+        p = self.mgbot_promise
+        if p is not None:
+            p.resolve(True)
+
+    def start_sensor_stream(self, history_size: Optional[int] = None, timeout_seconds: float = 60.0,
+                            throw_error: bool = True) -> MGbotSensorStream:
+        """
+        Включить непрерывную передачу данных датчиков.
+        Измерения попадают в sensor_stream без отдельной команды на каждое из них.
+        :param history_size: Новый размер истории (None – оставить текущий)
+        :return: Поток данных датчиков
+        """
+        if history_size is not None:
+            self.sensor_stream.resize_history(history_size)
+        cmd, promise = self.get_sensors_data_async(True, timeout_seconds, throw_error)
+        self.mgbot_promise = None
+        cmd.make_command_action()
+        cmd.result()
+        self.specific_command = None
+        return self.sensor_stream
+
+    def stop_sensor_stream(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+        """Выключить передачу данных датчиков."""
+        cmd, promise = self.get_sensors_data_async(False, timeout_seconds, throw_error)
+        self.mgbot_promise = None
+        cmd.make_command_action()
+        cmd.result()
+        self.specific_command = None
@@ -0,0 +1,207 @@
+"""
+Непрерывный поток данных датчиков MGbot (/mgbot_info): история, пороговые
+обработчики и ожидание условий без отдельной команды на каждое измерение.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sdk.utils.telemetry import flatten_gpio_states
+from sdk.promise import Promise
+
+# Обработчик измерения: callback(sample) – sample это плоский словарь датчик -> значение
+SampleCallback = Callable[[Dict[str, Any]], None]
+# Обработчик порога: callback(sensor, value)
+ThresholdCallback = Callable[[str, Any], None]
+
+
+class _Window:
+    __slots__ = ("sensor", "low", "high", "on_enter", "on_exit", "inside")
+
+    def __init__(self, sensor: str, low: float, high: float,
+                 on_enter: Optional[ThresholdCallback], on_exit: Optional[ThresholdCallback]):
+        self.sensor = sensor
+        self.low = low
+        self.high = high
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.inside = False
+
+
+class MGbotSensorStream:
+    """История и события по данным датчиков MGbot.
+
+    Значения датчиков приводятся к плоскому словарю: вложенные значения
+    доступны по именам вида "ColorSensor/R".
+    """
+
+    def __init__(self, history_size: int = 256):
+        """
+        :param history_size: Число последних измерений, хранящихся в истории
+        """
+        self.history: Deque[Tuple[float, Dict[str, Any]]] = deque(maxlen=history_size)
+        self._callbacks: List[SampleCallback] = []
+        self._windows: List[_Window] = []
+        self._waiters: List[Tuple[Callable[[Dict[str, Any]], bool], Promise]] = []
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------
+    # Данные
+    # -------------------------------------------------
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Последнее измерение (плоский словарь) или None."""
+        with self._lock:
+            return self.history[-1][1] if self.history else None
+
+    def resize_history(self, history_size: int) -> None:
+        """Изменить размер истории, сохранив последние измерения."""
+        with self._lock:
+            self.history = deque(self.history, maxlen=history_size)
+
+    def values(self, sensor: str, since: Optional[float] = None) -> List[Tuple[float, Any]]:
+        """
+        История значений одного датчика
+        :param sensor: Имя датчика, например "DistanceSensor"
+        :param since: Только измерения после этого момента (time.monotonic)
+        :return: Список (время, значение)
+        """
+        with self._lock:
+            samples = list(self.history)
+        return [(t, s[sensor]) for t, s in samples if sensor in s and (since is None or t >= since)]
+
+    def process(self, data: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        """Обработать сообщение датчиков (поле data сообщения /mgbot_info)."""
+        now = time.monotonic() if timestamp is None else timestamp
+        sample = flatten_gpio_states(data)
+        with self._lock:
+            self.history.append((now, sample))
+            callbacks = list(self._callbacks)
+            windows = list(self._windows)
+            waiters = list(self._waiters)
+
+        for window in windows:
+            value = sample.get(window.sensor)
+            if not isinstance(value, (int, float)):
+                continue
+            inside = window.low <= value <= window.high
+            if inside == window.inside:
+                continue
+            window.inside = inside
+            callback = window.on_enter if inside else window.on_exit
+            if callback is not None:
+                try:
+                    callback(window.sensor, value)
+                except Exception as e:
+                    print(f"[MGbotSensorStream] Ошибка в обработчике порога {window.sensor}: {e}")
+
+        for callback in callbacks:
+            try:
+                callback(sample)
+            except Exception as e:
+                print(f"[MGbotSensorStream] Ошибка в обработчике измерения: {e}")
+
+        for predicate, promise in waiters:
+            self._check_waiter(predicate, promise, sample)
+
+    # -------------------------------------------------
+    # Обработчики
+    # -------------------------------------------------
+    def on_sample(self, callback: SampleCallback) -> SampleCallback:
+        """Вызывать callback(sample) на каждое измерение."""
+        if not callable(callback):
+            raise TypeError("Обработчик должен быть функцией или методом")
+        with self._lock:
+            self._callbacks.append(callback)
+        return callback
+
+    def on_window(self, sensor: str, low: float, high: float,
+                  on_enter: Optional[ThresholdCallback] = None,
+                  on_exit: Optional[ThresholdCallback] = None) -> Any:
+        """
+        Вызывать обработчики при входе значения датчика в диапазон [low, high] и выходе из него.
+
+        Пример (деталь появилась в зоне датчика расстояния):
+            stream.on_window("DistanceSensor", 0, 80, on_enter=lambda s, v: print("деталь", v))
+
+        :return: Дескриптор для remove_callback
+        """
+        window = _Window(sensor, low, high, on_enter, on_exit)
+        with self._lock:
+            self._windows.append(window)
+        return window
+
+    def on_threshold(self, sensor: str, threshold: float,
+                     on_rise: Optional[ThresholdCallback] = None,
+                     on_fall: Optional[ThresholdCallback] = None) -> Any:
+        """Вызывать обработчики при переходе значения датчика через порог вверх/вниз."""
+        return self.on_window(sensor, threshold, float("inf"), on_rise, on_fall)
+
+    def remove_callback(self, handle: Any) -> None:
+        """Удалить обработчик, добавленный on_sample/on_window/on_threshold."""
+        with self._lock:
+            if handle in self._callbacks:
+                self._callbacks.remove(handle)
+            if handle in self._windows:
+                self._windows.remove(handle)
+
+    # -------------------------------------------------
+    # Ожидание
+    # -------------------------------------------------
+    def _check_waiter(self, predicate: Callable[[Dict[str, Any]], bool], promise: Promise, sample: Dict[str, Any]) -> None:
+        try:
+            matched = predicate(sample)
+        except Exception as e:
+            with self._lock:
+                if promise.is_active:
+                    promise.reject(e)
+            return
+        if matched:
+            with self._lock:
+                if promise.is_active:
+                    promise.resolve(sample)
+
+    def _add_waiter(self, predicate: Callable[[Dict[str, Any]], bool], promise: Promise) -> None:
+        with self._lock:
+            self._waiters.append((predicate, promise))
+            latest = self.history[-1][1] if self.history else None
+        if latest is not None:
+            self._check_waiter(predicate, promise, latest)
+
+    def _remove_waiter(self, promise: Promise) -> None:
+        with self._lock:
+            self._waiters = [w for w in self._waiters if w[1] is not promise]
+
+    def wait_for(self, predicate: Callable[[Dict[str, Any]], bool], timeout_seconds: float = 60.0,
+                 throw_error: bool = True) -> Dict[str, Any]:
+        """
+        Дождаться измерения, удовлетворяющего условию (последнее измерение проверяется сразу)
+        :return: Измерение, на котором условие выполнилось
+        """
+        promise = Promise(timeout_seconds=timeout_seconds, throw_error=throw_error)
+        self._add_waiter(predicate, promise)
+        try:
+            return promise.result()
+        finally:
+            self._remove_waiter(promise)
+
+    async def wait_for_async_await(self, predicate: Callable[[Dict[str, Any]], bool], timeout_seconds: float = 60.0,
+                                   throw_error: bool = True) -> Dict[str, Any]:
+        """Асинхронная версия wait_for."""
+        promise = Promise(timeout_seconds=timeout_seconds, throw_error=throw_error)
+        self._add_waiter(predicate, promise)
+        try:
+            return await promise.async_result()
+        except Exception as e:
+            if throw_error:
+                raise
+            return e
+        finally:
+            self._remove_waiter(promise)
+
+    def wait_for_window(self, sensor: str, low: float, high: float, timeout_seconds: float = 60.0,
+                        throw_error: bool = True) -> Dict[str, Any]:
+        """Дождаться, пока значение датчика окажется в диапазоне [low, high]."""
+        return self.wait_for(lambda s: isinstance(s.get(sensor), (int, float)) and low <= s[sensor] <= high,
+                             timeout_seconds, throw_error)
@@ -3,12 +3,19 @@ PixyCam subpackage: экспорт базового класса и реализ
 """
 
 
+from .block_tracker import Block, BlockTracker, TrackedObject, parse_blocks
+from .calibration import PixyCalibration
 from .pixy_cam_module_base import PixyCamModuleBase
 from .pixy_cam_uart_module import PixyCamUartModule
 from .pixy_cam_usb_module import PixyCamUsbModule
 
 
 __all__ = [
+    "Block",
+    "BlockTracker",
+    "TrackedObject",
+    "parse_blocks",
+    "PixyCalibration",
     "PixyCamModuleBase",
     "PixyCamUartModule",
     "PixyCamUsbModule",
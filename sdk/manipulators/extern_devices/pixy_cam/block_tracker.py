@@ -0,0 +1,234 @@
+"""
+Разбор ответов getBlocks и сопровождение объектов между кадрами Pixy.
+"""
+import json
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Block(NamedTuple):
+    """Блок (объект), найденный камерой Pixy в одном кадре."""
+    signature: int
+    x: float
+    y: float
+    width: float = 0.0
+    height: float = 0.0
+    angle: float = 0.0
+    index: Optional[int] = None
+    age: Optional[int] = None
+
+
+# Возможные имена полей блока в ответе контроллера (Pixy2 API и сокращённые)
+_BLOCK_KEYS = {
+    "signature": ("m_signature", "signature", "sig"),
+    "x": ("m_x", "x"),
+    "y": ("m_y", "y"),
+    "width": ("m_width", "width", "w"),
+    "height": ("m_height", "height", "h"),
+    "angle": ("m_angle", "angle"),
+    "index": ("m_index", "index"),
+    "age": ("m_age", "age"),
+}
+
+
+def _field(item: Dict[str, Any], name: str, default: Any = None) -> Any:
+    for key in _BLOCK_KEYS[name]:
+        if key in item:
+            return item[key]
+    return default
+
+
+def _find_block_list(data: Any) -> List[Any]:
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return []
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("blocks", "result", "data"):
+            if key in data:
+                found = _find_block_list(data[key])
+                if found:
+                    return found
+    return []
+
+
+def parse_blocks(result: Any) -> List[Block]:
+    """
+    Извлечь блоки из ответа getBlocks.
+    Поддерживаются ответы вида {"result": [...]}, {"data": {"blocks": [...]}},
+    строки JSON и поля как в Pixy2 API (m_x, m_signature, ...), так и без префикса.
+    Записи без координат пропускаются.
+    """
+    blocks: List[Block] = []
+    for item in _find_block_list(result):
+        if not isinstance(item, dict):
+            continue
+        x = _field(item, "x")
+        y = _field(item, "y")
+        if x is None or y is None:
+            continue
+        try:
+            blocks.append(Block(
+                int(_field(item, "signature", 0)),
+                float(x),
+                float(y),
+                float(_field(item, "width", 0.0)),
+                float(_field(item, "height", 0.0)),
+                float(_field(item, "angle", 0.0)),
+                _field(item, "index"),
+                _field(item, "age"),
+            ))
+        except (TypeError, ValueError):
+            continue
+    return blocks
+
+
+class TrackedObject:
+    """Объект, сопровождаемый между кадрами: стабильный ID и оценка скорости."""
+    __slots__ = ("track_id", "block", "x", "y", "vx", "vy", "first_seen", "last_seen", "hits")
+
+    def __init__(self, track_id: int, block: Block, timestamp: float):
+        self.track_id = track_id
+        self.block = block
+        self.x = block.x
+        self.y = block.y
+        self.vx = 0.0
+        self.vy = 0.0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.hits = 1
+
+    @property
+    def signature(self) -> int:
+        return self.block.signature
+
+    def predict(self, timestamp: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Предсказать положение объекта (в пикселях) на момент времени
+        :param timestamp: Время в шкале time.monotonic(); по умолчанию – текущее
+        """
+        t = time.monotonic() if timestamp is None else timestamp
+        dt = t - self.last_seen
+        return self.x + self.vx * dt, self.y + self.vy * dt
+
+    def __repr__(self) -> str:
+        return (f"TrackedObject(id={self.track_id}, signature={self.signature}, x={self.x:.1f}, y={self.y:.1f}, "
+                f"vx={self.vx:.1f}, vy={self.vy:.1f}, hits={self.hits})")
+
+
+class BlockTracker:
+    """Сопоставляет блоки соседних кадров и присваивает им стабильные ID.
+
+    Сопоставление жадное по расстоянию от предсказанного положения объекта до
+    блока той же сигнатуры; индекс блока Pixy (m_index), если он есть,
+    используется в первую очередь. Скорость сглаживается экспоненциально.
+    """
+
+    def __init__(self, max_distance: float = 40.0, max_missed_seconds: float = 0.5, smoothing: float = 0.5):
+        """
+        :param max_distance: Максимальное смещение объекта между кадрами (в пикселях)
+        :param max_missed_seconds: Через сколько секунд без обнаружения объект забывается
+        :param smoothing: Вес нового измерения скорости (0..1)
+        """
+        self.max_distance = max_distance
+        self.max_missed_seconds = max_missed_seconds
+        self.smoothing = smoothing
+        self._tracks: Dict[int, TrackedObject] = {}
+        self._next_id = 1
+
+    @property
+    def tracks(self) -> List[TrackedObject]:
+        return list(self._tracks.values())
+
+    def get(self, track_id: int) -> Optional[TrackedObject]:
+        return self._tracks.get(track_id)
+
+    def reset(self) -> None:
+        self._tracks.clear()
+
+    def update(self, blocks: List[Block], timestamp: Optional[float] = None) -> List[TrackedObject]:
+        """
+        Обработать блоки нового кадра
+        :param blocks: Блоки кадра (см. parse_blocks)
+        :param timestamp: Время кадра в шкале time.monotonic()
+        :return: Объекты, обнаруженные в этом кадре
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        unmatched = list(range(len(blocks)))
+        free_tracks = set(self._tracks)
+        matches: List[Tuple[int, int]] = []
+
+        # 1. Совпадение по индексу Pixy
+        by_index = {(t.signature, t.block.index): tid for tid, t in self._tracks.items() if t.block.index is not None}
+        for i in list(unmatched):
+            block = blocks[i]
+            if block.index is None:
+                continue
+            tid = by_index.get((block.signature, block.index))
+            if tid is not None and tid in free_tracks:
+                matches.append((tid, i))
+                free_tracks.discard(tid)
+                unmatched.remove(i)
+
+        # 2. Жадное сопоставление по расстоянию до предсказанного положения
+        candidates = []
+        limit = self.max_distance * self.max_distance
+        for tid in free_tracks:
+            track = self._tracks[tid]
+            px, py = track.predict(now)
+            for i in unmatched:
+                block = blocks[i]
+                if block.signature != track.signature:
+                    continue
+                # Оценка скорости по неравномерно приходящим кадрам бывает шумной,
+                # поэтому учитываем и последнее измеренное положение
+                d2 = min((block.x - px) ** 2 + (block.y - py) ** 2,
+                         (block.x - track.x) ** 2 + (block.y - track.y) ** 2)
+                if d2 <= limit:
+                    candidates.append((d2, tid, i))
+        candidates.sort()
+        used_blocks = set()
+        for _, tid, i in candidates:
+            if tid not in free_tracks or i in used_blocks:
+                continue
+            matches.append((tid, i))
+            free_tracks.discard(tid)
+            used_blocks.add(i)
+        unmatched = [i for i in unmatched if i not in used_blocks]
+
+        seen: List[TrackedObject] = []
+        for tid, i in matches:
+            track = self._tracks[tid]
+            self._apply(track, blocks[i], now)
+            seen.append(track)
+
+        for i in unmatched:
+            track = TrackedObject(self._next_id, blocks[i], now)
+            self._tracks[track.track_id] = track
+            self._next_id += 1
+            seen.append(track)
+
+        for tid in free_tracks:
+            if now - self._tracks[tid].last_seen > self.max_missed_seconds:
+                del self._tracks[tid]
+        return seen
+
+    def _apply(self, track: TrackedObject, block: Block, timestamp: float) -> None:
+        dt = timestamp - track.last_seen
+        if dt > 0:
+            vx = (block.x - track.x) / dt
+            vy = (block.y - track.y) / dt
+            if track.hits == 1:
+                track.vx, track.vy = vx, vy
+            else:
+                a = self.smoothing
+                track.vx = a * vx + (1 - a) * track.vx
+                track.vy = a * vy + (1 - a) * track.vy
+        track.block = block
+        track.x = block.x
+        track.y = block.y
+        track.last_seen = timestamp
+        track.hits += 1
@@ -0,0 +1,239 @@
+"""
+Калибровка камера -> робот: перевод пиксельных координат Pixy в координаты
+базы манипулятора по аффинному преобразованию или гомографии плоскости стола.
+"""
+import json
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from sdk.utils.numeric import np, solve_linear
+
+AFFINE = "affine"
+HOMOGRAPHY = "homography"
+
+# Минимальное число пар точек для каждой модели
+_MIN_SAMPLES = {AFFINE: 3, HOMOGRAPHY: 4}
+
+
+def _least_squares(rows: List[List[float]], values: List[float]) -> List[float]:
+    """Решение переопределённой системы через нормальные уравнения."""
+    n = len(rows[0])
+    ata = [[sum(row[i] * row[j] for row in rows) for j in range(n)] for i in range(n)]
+    atb = [sum(row[i] * v for row, v in zip(rows, values)) for i in range(n)]
+    try:
+        return solve_linear(ata, atb)
+    except ValueError:
+        raise ValueError("Точки калибровки вырождены (лежат на одной прямой или совпадают)") from None
+
+
+def _normalization(points: Sequence[Tuple[float, float]]) -> List[List[float]]:
+    """Матрица нормализации Хартли: центр в нуле, среднее расстояние sqrt(2)."""
+    cx = sum(p[0] for p in points) / len(points)
+    cy = sum(p[1] for p in points) / len(points)
+    mean_dist = sum(((p[0] - cx) ** 2 + (p[1] - cy) ** 2) ** 0.5 for p in points) / len(points)
+    s = (2 ** 0.5) / mean_dist if mean_dist > 0 else 1.0
+    return [[s, 0.0, -s * cx], [0.0, s, -s * cy], [0.0, 0.0, 1.0]]
+
+
+def _matmul(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+def _invert_normalization(t: List[List[float]]) -> List[List[float]]:
+    s = t[0][0]
+    return [[1.0 / s, 0.0, -t[0][2] / s], [0.0, 1.0 / s, -t[1][2] / s], [0.0, 0.0, 1.0]]
+
+
+def robot_xy(coordinates: Any) -> Tuple[float, float]:
+    """
+    Извлечь (x, y) из сообщения /coordinates, Position/Point3D или пары чисел
+    """
+    if isinstance(coordinates, str):
+        coordinates = json.loads(coordinates)
+    if isinstance(coordinates, (tuple, list)):
+        return float(coordinates[0]), float(coordinates[1])
+    if isinstance(coordinates, dict):
+        position = coordinates.get("position", coordinates)
+        return float(position["x"]), float(position["y"])
+    position = getattr(coordinates, "position", coordinates)
+    return float(position.x), float(position.y)
+
+
+class PixyCalibration:
+    """Преобразование пиксельных координат Pixy в координаты базы робота.
+
+    Пример:
+        calibration = PixyCalibration()
+        for pixel, coords in samples:
+            calibration.add_sample(pixel, coords)
+        calibration.fit(HOMOGRAPHY)
+        calibration.save("pixy_calibration.json")
+        targets = calibration.transform_blocks(blocks)
+    """
+
+    def __init__(self, model: str = AFFINE, plane_z: Optional[float] = None):
+        """
+        :param model: Модель преобразования: "affine" или "homography"
+        :param plane_z: Высота плоскости стола в координатах робота (для захвата)
+        """
+        if model not in _MIN_SAMPLES:
+            raise ValueError(f"Неизвестная модель калибровки: {model}")
+        self.model = model
+        self.plane_z = plane_z
+        self.matrix: Optional[List[List[float]]] = None
+        self.samples: List[Tuple[Tuple[float, float], Tuple[float, float]]] = []
+        self._np_matrix = None
+
+    # -------------------------------------------------
+    # Сбор точек и расчёт
+    # -------------------------------------------------
+    def add_sample(self, pixel: Sequence[float], robot: Any) -> None:
+        """
+        Добавить пару точек
+        :param pixel: Координаты блока на изображении (u, v) или Block
+        :param robot: Координаты робота: сообщение /coordinates, Position/Point3D или (x, y)
+        """
+        u, v = (pixel.x, pixel.y) if hasattr(pixel, "x") else (pixel[0], pixel[1])
+        self.samples.append(((float(u), float(v)), robot_xy(robot)))
+
+    def clear_samples(self) -> None:
+        self.samples.clear()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.matrix is not None
+
+    def fit(self, model: Optional[str] = None) -> float:
+        """
+        Рассчитать преобразование по собранным точкам (метод наименьших квадратов)
+        :param model: Модель преобразования (по умолчанию – заданная в конструкторе)
+        :return: Среднеквадратичная ошибка на точках калибровки
+        """
+        if model is not None:
+            if model not in _MIN_SAMPLES:
+                raise ValueError(f"Неизвестная модель калибровки: {model}")
+            self.model = model
+        required = _MIN_SAMPLES[self.model]
+        if len(self.samples) < required:
+            raise ValueError(f"Для модели {self.model} нужно минимум {required} точек, получено {len(self.samples)}")
+
+        pixels = [s[0] for s in self.samples]
+        robots = [s[1] for s in self.samples]
+        if self.model == AFFINE:
+            rows = [[u, v, 1.0] for u, v in pixels]
+            ax = _least_squares(rows, [x for x, _ in robots])
+            ay = _least_squares(rows, [y for _, y in robots])
+            self._set_matrix([ax, ay, [0.0, 0.0, 1.0]])
+        else:
+            self._set_matrix(self._fit_homography(pixels, robots))
+        return self.residual_rms()
+
+    @staticmethod
+    def _fit_homography(pixels, robots) -> List[List[float]]:
+        t_pixel = _normalization(pixels)
+        t_robot = _normalization(robots)
+        rows, values = [], []
+        for (u, v), (x, y) in zip(pixels, robots):
+            un = t_pixel[0][0] * u + t_pixel[0][2]
+            vn = t_pixel[1][1] * v + t_pixel[1][2]
+            xn = t_robot[0][0] * x + t_robot[0][2]
+            yn = t_robot[1][1] * y + t_robot[1][2]
+            rows.append([un, vn, 1.0, 0.0, 0.0, 0.0, -un * xn, -vn * xn])
+            values.append(xn)
+            rows.append([0.0, 0.0, 0.0, un, vn, 1.0, -un * yn, -vn * yn])
+            values.append(yn)
+        h = _least_squares(rows, values)
+        normalized = [h[0:3], h[3:6], [h[6], h[7], 1.0]]
+        matrix = _matmul(_matmul(_invert_normalization(t_robot), normalized), t_pixel)
+        scale = matrix[2][2]
+        return [[value / scale for value in row] for row in matrix]
+
+    def _set_matrix(self, matrix: List[List[float]]) -> None:
+        self.matrix = [[float(value) for value in row] for row in matrix]
+        self._np_matrix = np.array(self.matrix) if np is not None else None
+
+    def residual_rms(self) -> float:
+        """Среднеквадратичная ошибка преобразования на точках калибровки."""
+        if not self.samples:
+            return 0.0
+        predicted = self.transform_many([s[0] for s in self.samples])
+        total = sum((px - x) ** 2 + (py - y) ** 2 for (px, py), (_, (x, y)) in zip(predicted, self.samples))
+        return (total / len(self.samples)) ** 0.5
+
+    # -------------------------------------------------
+    # Применение
+    # -------------------------------------------------
+    def transform(self, u: float, v: float) -> Tuple[float, float]:
+        """Перевести одну точку изображения в координаты робота."""
+        m = self._require_matrix()
+        w = m[2][0] * u + m[2][1] * v + m[2][2]
+        return (m[0][0] * u + m[0][1] * v + m[0][2]) / w, (m[1][0] * u + m[1][1] * v + m[1][2]) / w
+
+    def transform_many(self, points: Iterable[Sequence[float]]) -> List[Tuple[float, float]]:
+        """
+        Перевести пачку точек изображения за один вызов.
+        При наличии numpy расчёт выполняется векторно.
+        :param points: Последовательность (u, v)
+        :return: Список (x, y) в том же порядке
+        """
+        m = self._require_matrix()
+        points = list(points)
+        if not points:
+            return []
+        if self._np_matrix is not None:
+            uv = np.asarray(points, dtype=float)[:, :2]
+            homogeneous = uv @ self._np_matrix[:, :2].T + self._np_matrix[:, 2]
+            xy = homogeneous[:, :2] / homogeneous[:, 2:3]
+            return [tuple(p) for p in xy.tolist()]
+        m00, m01, m02 = m[0]
+        m10, m11, m12 = m[1]
+        m20, m21, m22 = m[2]
+        result = []
+        for p in points:
+            u, v = p[0], p[1]
+            w = m20 * u + m21 * v + m22
+            result.append(((m00 * u + m01 * v + m02) / w, (m10 * u + m11 * v + m12) / w))
+        return result
+
+    def transform_blocks(self, blocks: Iterable[Any]) -> List[Tuple[Any, float, float]]:
+        """
+        Перевести результат getBlocks (блоки или отслеживаемые объекты) в координаты робота
+        :return: Список (блок, x, y)
+        """
+        blocks = list(blocks)
+        coordinates = self.transform_many([(b.x, b.y) for b in blocks])
+        return [(block, x, y) for block, (x, y) in zip(blocks, coordinates)]
+
+    def _require_matrix(self) -> List[List[float]]:
+        if self.matrix is None:
+            raise RuntimeError("Калибровка не выполнена: вызовите fit() или load()")
+        return self.matrix
+
+    # -------------------------------------------------
+    # Сохранение
+    # -------------------------------------------------
+    def to_dict(self) -> dict:
+        return {
+            "model": self.model,
+            "matrix": self.matrix,
+            "plane_z": self.plane_z,
+            "samples": [[list(p), list(r)] for p, r in self.samples],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PixyCalibration":
+        calibration = cls(data.get("model", AFFINE), data.get("plane_z"))
+        calibration.samples = [(tuple(p), tuple(r)) for p, r in data.get("samples", [])]
+        if data.get("matrix") is not None:
+            calibration._set_matrix(data["matrix"])
+        return calibration
+
+    def save(self, path: str) -> None:
+        """Сохранить калибровку в JSON-файл."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "PixyCalibration":
+        """Загрузить калибровку из JSON-файла."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -1,7 +1,14 @@
-from typing import Callable, Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any, Hashable, List, Optional, Sequence, Tuple
 from sdk.commands.pixy_cam_command import PixyCamCommand
+from sdk.manipulators.extern_devices.pixy_cam.block_tracker import Block, BlockTracker, TrackedObject, parse_blocks
 from sdk.utils.constants import COMMAND_TOPIC, COMMAND_RESULT_TOPIC
 
+# Обработчик кадра потока блоков: callback(blocks, tracks)
+BlockStreamCallback = Callable[[List[Block], List[TrackedObject]], None]
+
 
 class PixyCamModuleBase:
     def __init__(self, message_bus, run_async: Callable, parent, command_name: str):
@@ -11,19 +18,149 @@ class PixyCamModuleBase:
         self._command_name = command_name
         self.specific_command: Optional[Any] = None
 
-    def _create_command(self, data: Dict[str, Any], timeout_seconds: float = 60.0, throw_error: bool = True) -> PixyCamCommand:
-        command = self.specific_command = PixyCamCommand(
+        self.block_tracker: Optional[BlockTracker] = None
+        self.latest_blocks: List[Block] = []
+        self.latest_blocks_time: Optional[float] = None
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_stop = threading.Event()
+
+        # Неизменные в течение сессии свойства камеры (версия, разрешение, размер кадра)
+        self._cache: Dict[Hashable, Any] = {}
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, key: Hashable, fetch: Callable[[], Any], use_cache: bool = True) -> Any:
+        """
+        Вернуть сохранённый результат запроса или выполнить запрос и сохранить его.
+        Сохраняются только успешные ответы (словарь ответа команды); при
+        throw_error=False ошибка возвращается, но не сохраняется.
+        """
+        if use_cache:
+            with self._cache_lock:
+                if key in self._cache:
+                    return self._cache[key]
+        result = fetch()
+        if isinstance(result, dict):
+            with self._cache_lock:
+                self._cache[key] = result
+        return result
+
+    def invalidate_cache(self) -> None:
+        """Забыть сохранённые свойства камеры (например, после переподключения камеры)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _build_command(self, data: Dict[str, Any], timeout_seconds: float = 60.0, throw_error: bool = True) -> PixyCamCommand:
+        return PixyCamCommand(
             self.message_bus.publish,
             data,
             self._command_name,
             timeout_seconds,
-            throw_error
+            throw_error,
+            self.message_bus
         )
+
+    def _create_command(self, data: Dict[str, Any], timeout_seconds: float = 60.0, throw_error: bool = True) -> PixyCamCommand:
+        command = self._build_command(data, timeout_seconds, throw_error)
         self.message_bus.subscribe(COMMAND_TOPIC)
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         self.specific_command = command
-        self._parent.specific_command = command
+        # Ответ сопоставляется по ID через active_commands, specific_command манипулятора не затрагивается
+        active_commands = getattr(self._parent, "active_commands", None)
+        if active_commands is not None:
+            active_commands[command.command_id] = command
+        else:
+            self._parent.specific_command = command
         return command
+
+    # -------------------------------------------------
+    # Поток блоков
+    # -------------------------------------------------
+    @property
+    def block_stream_active(self) -> bool:
+        return self._stream_thread is not None and self._stream_thread.is_alive()
+
+    def start_block_stream(self,
+                           callback: Optional[BlockStreamCallback] = None,
+                           sigmap: int = 0xFF,
+                           max_blocks: int = 100,
+                           depth: int = 2,
+                           tracker: Optional[BlockTracker] = None,
+                           timeout_seconds: float = 5.0) -> BlockTracker:
+        """
+        Запустить непрерывное получение блоков в фоновом потоке.
+        Запросы getBlocks отправляются конвейером: пока ожидается ответ на один кадр,
+        следующие depth - 1 запросов уже отправлены, поэтому частота кадров ограничена
+        камерой, а не временем ответа.
+        :param callback: Обработчик кадра callback(blocks, tracks)
+        :param sigmap: Маска сигнатур
+        :param max_blocks: Максимальное число блоков в кадре
+        :param depth: Число одновременно отправленных запросов
+        :param tracker: Трекер объектов (по умолчанию создаётся новый)
+        :param timeout_seconds: Таймаут ответа на один запрос
+        :return: Трекер, которому передаются кадры потока
+        """
+        if self.block_stream_active:
+            raise RuntimeError("Поток блоков уже запущен")
+        if depth < 1:
+            raise ValueError("depth должен быть не меньше 1")
+        self.block_tracker = tracker if tracker is not None else BlockTracker()
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(
+            target=self._block_stream_loop,
+            args=(callback, sigmap, max_blocks, depth, timeout_seconds),
+            name=f"PixyBlockStream-{self._command_name}",
+            daemon=True,
+        )
+        self._stream_thread.start()
+        return self.block_tracker
+
+    def stop_block_stream(self, timeout_seconds: float = 1.0) -> None:
+        """Остановить поток блоков, запущенный start_block_stream."""
+        self._stream_stop.set()
+        thread = self._stream_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout_seconds)
+        self._stream_thread = None
+
+    def _block_stream_loop(self, callback: Optional[BlockStreamCallback], sigmap: int, max_blocks: int,
+                           depth: int, timeout_seconds: float) -> None:
+        inflight: deque = deque()
+        data = {"cmd": "getBlocks", "sigmap": sigmap, "max_blocks": max_blocks}
+        try:
+            while not self._stream_stop.is_set():
+                while len(inflight) < depth:
+                    command = self._create_command(dict(data), timeout_seconds, True)
+                    command.make_command_action()
+                    inflight.append(command)
+
+                command = inflight.popleft()
+                try:
+                    result = command.result()
+                except Exception as e:
+                    print(f"[PixyCam] Ошибка получения кадра: {e}")
+                    self._drop_command(command)
+                    # Не забиваем шину запросами, если камера не отвечает
+                    self._stream_stop.wait(0.1)
+                    continue
+
+                timestamp = time.monotonic()
+                blocks = parse_blocks(result)
+                self.latest_blocks = blocks
+                self.latest_blocks_time = timestamp
+                tracks = self.block_tracker.update(blocks, timestamp)
+                if callback is not None:
+                    try:
+                        callback(blocks, tracks)
+                    except Exception as e:
+                        print(f"[PixyCam] Ошибка в обработчике кадра: {e}")
+        finally:
+            for command in inflight:
+                self._drop_command(command)
+
+    def _drop_command(self, command: PixyCamCommand) -> None:
+        active_commands = getattr(self._parent, "active_commands", None)
+        if active_commands is not None:
+            active_commands.pop(command.command_id, None)
     
     def get_blocks_async(self, sigmap: int = 0xFF, max_blocks: int = 100, timeout_seconds: float = 60.0, throw_error: bool = True):
         return self._create_command({"cmd": "getBlocks", "sigmap": sigmap, "max_blocks": max_blocks}, timeout_seconds, throw_error)
@@ -51,6 +188,36 @@ class PixyCamModuleBase:
         result = command.result()
         self.specific_command = None
         return result
+
+    def get_rgb_batch(self, points: Sequence[Tuple[int, int]], saturate: bool = False, timeout_seconds: float = 60.0,
+                      throw_error: bool = True, max_in_flight: int = 32) -> List[Any]:
+        """
+        Получить цвет в нескольких точках изображения.
+        Запросы отправляются конвейером (до max_in_flight одновременно), поэтому
+        выборка из 25 точек занимает примерно одно время ответа, а не 25.
+        :param points: Список точек (x, y)
+        :param max_in_flight: Максимальное число одновременно ожидаемых ответов
+        :param throw_error: Выбросить первую ошибку после получения всех ответов
+        :return: Ответы в порядке точек; при throw_error=False на месте неудачных запросов –
+            сообщение об ошибке (строка, как у get_rgb) или исключение таймаута
+        """
+        results: List[Any] = []
+        points = list(points)
+        for start in range(0, len(points), max(1, max_in_flight)):
+            commands = [
+                self._build_command({"cmd": "getRGB", "x": x, "y": y, "saturate": int(saturate)}, timeout_seconds, throw_error)
+                for x, y in points[start:start + max(1, max_in_flight)]
+            ]
+            results.extend(self._parent._run_commands_pipelined(commands))
+        if throw_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    async def get_rgb_batch_async_await(self, points: Sequence[Tuple[int, int]], saturate: bool = False,
+                                        timeout_seconds: float = 60.0, throw_error: bool = True, max_in_flight: int = 32) -> List[Any]:
+        return await self._run_async(self.get_rgb_batch, points, saturate, timeout_seconds, throw_error, max_in_flight)
     
     def set_lamp_async(self, upper: bool, lower: bool, timeout_seconds: float = 60.0, throw_error: bool = True):
         return self._create_command({"cmd": "setLamp", "upper": int(upper), "lower": int(lower)}, timeout_seconds, throw_error)
@@ -3,39 +3,41 @@ from sdk.manipulators.extern_devices.pixy_cam.pixy_cam_module_base import PixyCa
 
 class PixyCamUartModule(PixyCamModuleBase):
     def __init__(self, message_bus, run_async, parent):
-        self.message_bus = message_bus
-        self._run_async = run_async
-        self._parent = parent
-        self.specific_command = None
-        self._command_name = 'pixy_cam_uart_control'
+        super().__init__(message_bus, run_async, parent, 'pixy_cam_uart_control')
 
 
     def get_version_async(self, timeout_seconds: float = 60.0, throw_error: bool = True):
         return self._create_command({"cmd": "getVersion"}, timeout_seconds, throw_error)
 
-    async def get_version_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True):
-        await self._run_async(self.get_version, timeout_seconds, throw_error)
-
-    def get_version(self, timeout_seconds: float = 60.0, throw_error: bool = True):
-        command = self.get_version_async(timeout_seconds, throw_error)
-        command.make_command_action()
-        result = command.result()
-        self.specific_command = None
-        return result
+    async def get_version_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True):
+        return await self._run_async(self.get_version, timeout_seconds, throw_error, use_cache)
+
+    def get_version(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True):
+        """Версия камеры; результат сохраняется до invalidate_cache()."""
+        def fetch():
+            command = self.get_version_async(timeout_seconds, throw_error)
+            command.make_command_action()
+            result = command.result()
+            self.specific_command = None
+            return result
+        return self._cached("version", fetch, use_cache)
     
 
     def get_resolution_async(self, type: int = 0, timeout_seconds: float = 60.0, throw_error: bool = True):
         return self._create_command({"cmd": "getResolution", "type": type}, timeout_seconds, throw_error)
 
-    async def get_resolution_async_await(self, type: int = 0, timeout_seconds: float = 60.0, throw_error: bool = True):
-        await self._run_async(self.get_resolution_uart, type, timeout_seconds, throw_error)
-
-    def get_resolution_uart(self, type: int = 0, timeout_seconds: float = 60.0, throw_error: bool = True):
-        command = self.get_resolution_async(type, timeout_seconds, throw_error)
-        command.make_command_action()
-        result = command.result()
-        self.specific_command = None
-        return result
+    async def get_resolution_async_await(self, type: int = 0, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True):
+        return await self._run_async(self.get_resolution_uart, type, timeout_seconds, throw_error, use_cache)
+
+    def get_resolution_uart(self, type: int = 0, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True):
+        """Разрешение камеры; результат сохраняется до invalidate_cache()."""
+        def fetch():
+            command = self.get_resolution_async(type, timeout_seconds, throw_error)
+            command.make_command_action()
+            result = command.result()
+            self.specific_command = None
+            return result
+        return self._cached(("resolution", type), fetch, use_cache)
     
 
     def get_fps_async(self, timeout_seconds: float = 60.0, throw_error: bool = True):
@@ -3,11 +3,7 @@ from sdk.manipulators.extern_devices.pixy_cam.pixy_cam_module_base import PixyCa
 
 class PixyCamUsbModule(PixyCamModuleBase):
     def __init__(self, message_bus, run_async, parent):
-        self.message_bus = message_bus
-        self._run_async = run_async
-        self._parent = parent
-        self.specific_command = None
-        self._command_name = 'pixy_cam_usb_control'
+        super().__init__(message_bus, run_async, parent, 'pixy_cam_usb_control')
     
 
     def line_all_features_async(self, max_items: int = 100, timeout_seconds: float = 60.0, throw_error: bool = True):
@@ -41,15 +37,18 @@ class PixyCamUsbModule(PixyCamModuleBase):
     def get_frame_size_async(self, timeout_seconds: float = 60.0, throw_error: bool = True):
         return self._create_command({"cmd": "getFrameSize"}, timeout_seconds, throw_error)
 
-    async def get_frame_size_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True):
-        await self._run_async(self.get_frame_size_usb, timeout_seconds, throw_error)
-
-    def get_frame_size_usb(self, timeout_seconds: float = 60.0, throw_error: bool = True):
-        command = self.get_frame_size_async(timeout_seconds, throw_error)
-        command.make_command_action()
-        result = command.result()
-        self.specific_command = None
-        return result
+    async def get_frame_size_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True):
+        return await self._run_async(self.get_frame_size_usb, timeout_seconds, throw_error, use_cache)
+
+    def get_frame_size_usb(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True):
+        """Размер кадра; результат сохраняется до invalidate_cache()."""
+        def fetch():
+            command = self.get_frame_size_async(timeout_seconds, throw_error)
+            command.make_command_action()
+            result = command.result()
+            self.specific_command = None
+            return result
+        return self._cached("frame_size", fetch, use_cache)
 
 
     def set_servos_async(self, s0: int, s1: int, timeout_seconds: float = 60.0, throw_error: bool = True):
@@ -0,0 +1,208 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sdk.utils.telemetry import flatten_gpio_states
+
+# Обработчик изменения пина: callback(pin, old_value, new_value)
+PinCallback = Callable[[str, Any, Any], None]
+
+# Маркер отсутствия значения пина (None – допустимое значение)
+_MISSING = object()
+
+
+class GpioWatcher:
+    """Отслеживает изменения состояний GPIO по сообщениям /gpio_states.
+
+    Хранит предыдущее состояние и вызывает обработчики только при переходах:
+    фронт (rising), спад (falling) и любое изменение (change). Одинаковые
+    сообщения отбрасываются без декодирования JSON, поэтому работа обработчика
+    зависит от числа изменений, а не от частоты сообщений.
+
+    При подавлении дребезга новое значение засчитывается таймером через
+    debounce_seconds, если за это время не пришло другое значение, – так что
+    изменение не теряется, даже если контроллер публикует /gpio_states только
+    при изменениях. Обработчики вызываются из потока MQTT или из потока таймера.
+    """
+
+    def __init__(self, debounce_seconds: float = 0.0):
+        """
+        :param debounce_seconds: Время, в течение которого новое значение пина должно
+            оставаться неизменным, прежде чем изменение будет засчитано
+        """
+        self.debounce_seconds = debounce_seconds
+        self._state: Dict[str, Any] = {}
+        self._candidates: Dict[str, Tuple[Any, float]] = {}
+        self._previous_payload: Optional[str] = None
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        self._rising: Dict[Optional[str], List[PinCallback]] = {}
+        self._falling: Dict[Optional[str], List[PinCallback]] = {}
+        self._changed: Dict[Optional[str], List[PinCallback]] = {}
+
+    # -------------------------------------------------
+    # Регистрация обработчиков
+    # -------------------------------------------------
+    def on_rising(self, callback: PinCallback, pin: Optional[str] = None) -> PinCallback:
+        """Вызвать callback при переходе пина из 0 в 1 (pin=None – для всех пинов)."""
+        return self._add(self._rising, callback, pin)
+
+    def on_falling(self, callback: PinCallback, pin: Optional[str] = None) -> PinCallback:
+        """Вызвать callback при переходе пина из 1 в 0 (pin=None – для всех пинов)."""
+        return self._add(self._falling, callback, pin)
+
+    def on_change(self, callback: PinCallback, pin: Optional[str] = None) -> PinCallback:
+        """Вызвать callback при любом изменении значения пина (pin=None – для всех пинов)."""
+        return self._add(self._changed, callback, pin)
+
+    def remove_callback(self, callback: PinCallback) -> None:
+        """Удалить обработчик из всех списков."""
+        for registry in (self._rising, self._falling, self._changed):
+            for pin in list(registry):
+                callbacks = registry[pin]
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    del registry[pin]
+
+    @staticmethod
+    def _add(registry: Dict[Optional[str], List[PinCallback]], callback: PinCallback, pin: Optional[str]) -> PinCallback:
+        if not callable(callback):
+            raise TypeError("Обработчик должен быть функцией или методом")
+        registry.setdefault(pin, []).append(callback)
+        return callback
+
+    # -------------------------------------------------
+    # Состояние
+    # -------------------------------------------------
+    @property
+    def state(self) -> Dict[str, Any]:
+        """Текущее (подтверждённое) состояние всех пинов."""
+        return dict(self._state)
+
+    def get(self, pin: str, default: Any = None) -> Any:
+        return self._state.get(pin, default)
+
+    # -------------------------------------------------
+    # Обработка сообщений
+    # -------------------------------------------------
+    def process_message(self, topic: str, payload: str) -> None:
+        """Обработчик сырых сообщений топика /gpio_states."""
+        if payload == self._previous_payload and not self._candidates:
+            return
+        self._previous_payload = payload
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            print(f"[GpioWatcher] Ошибка декодирования JSON из топика {topic}: {payload}")
+            return
+        self.update(flatten_gpio_states(data))
+
+    def update(self, states: Dict[str, Any], timestamp: Optional[float] = None) -> List[Tuple[str, Any, Any]]:
+        """
+        Применить новое состояние пинов
+        :param states: Словарь пин -> значение
+        :param timestamp: Время получения (time.monotonic); по умолчанию – текущее. С явным временем
+            таймер не запускается – ожидающие изменения засчитывает следующий вызов update или confirm_pending
+        :return: Список засчитанных изменений (пин, старое значение, новое значение)
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+
+        with self._lock:
+            if not self._initialized:
+                self._state = dict(states)
+                self._initialized = True
+                return []
+
+            changes: List[Tuple[str, Any, Any]] = []
+            for pin, value in states.items():
+                old = self._state.get(pin, _MISSING)
+                if value == old:
+                    self._candidates.pop(pin, None)
+                    continue
+                if self.debounce_seconds > 0 and old is not _MISSING:
+                    candidate = self._candidates.get(pin)
+                    if candidate is None or candidate[0] != value:
+                        self._candidates[pin] = (value, now)
+                    continue
+                self._state[pin] = value
+                if old is not _MISSING:
+                    changes.append((pin, old, value))
+            changes.extend(self._take_confirmed(now))
+            if timestamp is None:
+                self._schedule(now)
+
+        self._dispatch_changes(changes)
+        return changes
+
+    def confirm_pending(self, timestamp: Optional[float] = None) -> List[Tuple[str, Any, Any]]:
+        """
+        Засчитать изменения, значения которых не менялись debounce_seconds
+        :param timestamp: Текущее время (time.monotonic); по умолчанию – текущее
+        :return: Список засчитанных изменений
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            changes = self._take_confirmed(now)
+        self._dispatch_changes(changes)
+        return changes
+
+    def close(self) -> None:
+        """Остановить таймер подтверждения (ожидающие изменения отбрасываются)."""
+        with self._lock:
+            self._closed = True
+            self._candidates.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _take_confirmed(self, now: float) -> List[Tuple[str, Any, Any]]:
+        """Перенести устоявшиеся значения в состояние (вызывается под блокировкой)."""
+        changes = []
+        for pin, (value, since) in list(self._candidates.items()):
+            if now - since >= self.debounce_seconds:
+                del self._candidates[pin]
+                changes.append((pin, self._state.get(pin), value))
+                self._state[pin] = value
+        return changes
+
+    def _schedule(self, now: float) -> None:
+        """Запустить таймер до ближайшего подтверждения (вызывается под блокировкой)."""
+        if self._closed or self._timer is not None or not self._candidates:
+            return
+        wait = min(since for _, since in self._candidates.values()) + self.debounce_seconds - now
+        self._timer = threading.Timer(max(wait, 0.0), self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._closed:
+                return
+            now = time.monotonic()
+            changes = self._take_confirmed(now)
+            self._schedule(now)
+        self._dispatch_changes(changes)
+
+    def _dispatch_changes(self, changes: List[Tuple[str, Any, Any]]) -> None:
+        for pin, old, new in changes:
+            self._dispatch(self._changed, pin, old, new)
+            if not old and new:
+                self._dispatch(self._rising, pin, old, new)
+            elif old and not new:
+                self._dispatch(self._falling, pin, old, new)
+
+    @staticmethod
+    def _dispatch(registry: Dict[Optional[str], List[PinCallback]], pin: str, old: Any, new: Any) -> None:
+        for key in (pin, None):
+            for callback in registry.get(key, ()):
+                try:
+                    callback(pin, old, new)
+                except Exception as e:
+                    print(f"[GpioWatcher] Ошибка в обработчике пина {pin}: {e}")
+
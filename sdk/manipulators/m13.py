@@ -1,5 +1,5 @@
 from sdk.manipulators.manipulator import Manipulator
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, Optional, Any
 from sdk.utils.constants import JOINT_INFO_TOPIC
 import json
 
@@ -9,12 +9,17 @@ from sdk.commands.data import Pose, Orientation
 from sdk.commands.gpio_mask import SetGpioMask, GetGpioMask
 from sdk.commands.manipulator_commands import GPIOConfigurePin
 from sdk.utils.constants import COMMAND_TOPIC, COMMAND_RESULT_TOPIC, COMMAND_FEEDBACK_TOPIC
+from sdk.utils.delivery_policy import DeliveryGate, DeliveryPolicy
+from sdk.motion.kinematics import M13_JOINTS
 
 
 class M13 (Manipulator):
+    kinematic_joints = M13_JOINTS
+
     def __init__(self, host: str, client_id: str, login: str, password: str):
         super(M13, self).__init__(host, client_id, login, password)
         self.joint_state_callback = None
+        self._joint_state_gate: Optional[DeliveryGate] = None
 
     def move_to_angles(self, sp1: float, sp2: float, sp3: float, sp4: float, sp5: float, sp6: float,
                        sp1_v: float = 0.0, sp2_v: float = 0.0, sp3_v: float = 0.0,
@@ -258,11 +263,16 @@ class M13 (Manipulator):
         self.specific_command = GetGpioMask(self.message_bus.send_message, name, timeout_seconds, throw_error)
         return (await self.info.get_result_command_async(self.specific_command))['data']
 
-    def subscribe_to_joint_state(self, callback: callable) -> None:
+    def subscribe_to_joint_state(self, callback: callable, policy: Optional[DeliveryPolicy] = None) -> None:
         """
         Подписаться на обновления состояния узлов манипулятора
         :param callback: Функция обратного вызова, принимающая параметр с данными состояния узлов
+        :param policy: Политика доставки (например, DeliveryPolicy(max_rate=10)); None – каждое сообщение
         """
+        self._close_joint_state_gate()
+        if policy is not None:
+            self._joint_state_gate = self._make_delivery_gate(JOINT_INFO_TOPIC, policy,
+                                                              self._call_joint_state_callback, callback)
         self.joint_state_callback = callback
         self.message_bus.subscribe(JOINT_INFO_TOPIC)
     
@@ -271,7 +281,13 @@ class M13 (Manipulator):
         Отписаться от обновлений состояния узлов манипулятора
         """
         self.joint_state_callback = None
+        self._close_joint_state_gate()
         self.message_bus.unsubscribe(JOINT_INFO_TOPIC)
+
+    def _close_joint_state_gate(self) -> None:
+        gate, self._joint_state_gate = self._joint_state_gate, None
+        if gate is not None:
+            gate.close()
     
     def process_message(self, topic: str, payload: str) -> None:
         """
@@ -283,12 +299,20 @@ class M13 (Manipulator):
         
         # Если есть подписка на состояние узлов и пришло соответствующее сообщение
         if self.joint_state_callback is not None and topic == JOINT_INFO_TOPIC:
-            try:
-                if isinstance(payload, str):
-                    joint_data = json.loads(payload)
-                else:
-                    joint_data = payload
-                # Вызов функции обратного вызова с данными
-                self.joint_state_callback(joint_data)
-            except Exception as e:
-                print(f"Ошибка обработки данных состояния узлов: {str(e)}")
+            gate = self._joint_state_gate
+            if gate is not None:
+                gate.offer(payload)
+            else:
+                self._dispatch_handler(topic, self._call_joint_state_callback, self.joint_state_callback, payload)
+
+    @staticmethod
+    def _call_joint_state_callback(callback: Callable, payload: Any) -> Any:
+        try:
+            if isinstance(payload, str):
+                joint_data = json.loads(payload)
+            else:
+                joint_data = payload
+            # Вызов функции обратного вызова с данными
+            return callback(joint_data)
+        except Exception as e:
+            print(f"Ошибка обработки данных состояния узлов: {str(e)}")
@@ -1,7 +1,12 @@
 from abc import abstractmethod
 import asyncio
+import inspect
 import json
-from typing import Optional, List, Dict, Any, Union, Set, Callable
+import math
+import os
+import threading
+import time
+from typing import Optional, List, Dict, Any, Union, Set, Callable, Sequence, Tuple
 
 from sdk.commands.data import Joint, Point, Pose, Point3D, JointPositions
 from sdk.commands.abstracts.sdk_command import SdkCommand
@@ -23,9 +28,10 @@ from sdk.manipulators.manipulator_info import ManipulatorInfo
 from sdk.commands.arc_motion import ArcMotion, Pose
 from sdk.manipulators.manipulator_connection import ManipulatorConnection
 from sdk.promise import Promise
-from sdk.utils.constants import COMMAND_TOPIC, MANAGEMENT_TOPIC, CARTESIAN_COORDINATES_TOPIC, JOINT_INFO_TOPIC, COMMAND_RESULT_TOPIC, COMMAND_FEEDBACK_TOPIC, PIXY_CAM_COORDINATES_TOPIC, MGBOT_TOPIC
+from sdk.utils.constants import COMMAND_TOPIC, MANAGEMENT_TOPIC, CARTESIAN_COORDINATES_TOPIC, JOINT_INFO_TOPIC, COMMAND_RESULT_TOPIC, COMMAND_FEEDBACK_TOPIC, PIXY_CAM_COORDINATES_TOPIC, MGBOT_TOPIC, ROBOT_DESCRIPTION_TOPIC
 from sdk.commands import (
     RunProgramJsonCommand,
+    RunCompiledProgramCommand,
     RunProgramByNameCommand,
     RunPythonProgramCommand,
     StopMovementCommand,
@@ -36,9 +42,39 @@ from sdk.commands import (
 from sdk.commands.servo_control_type_command import ServoControlTypeCommand, JOINT_JOG, TWIST, POSE
 from sdk.utils.enums import ManipulatorState, ServoControlType
 from sdk.commands.abstracts.sdk_command import NoWaitCommand
+from sdk.utils.command_coalescer import CommandCoalescer
+from sdk.manipulators.gpio_watcher import GpioWatcher
+from sdk.utils.telemetry import flatten_gpio_states
+from sdk.utils.topic_trie import TopicTrie
+from sdk.utils.handler_dispatcher import DROP_OLDEST, HandlerDispatcher
+from sdk.utils.delivery_policy import DeliveryGate, DeliveryPolicy
+from sdk.utils.program_registry import CompiledProgram, ProgramRegistry
+from sdk.utils.metadata_cache import MetadataCache, JOINT_LIMITS, TCP_LIST, TCP_CURRENT, HOME_POSITION, MANIPULATOR_INFO
+from sdk.errors import CommandTimeout, KinematicsError
+from sdk.motion.limits import JointLimits, WorkspaceLimits, MotionValidator
+from sdk.motion.kinematics import KinematicChain
+from sdk.motion.inverse_kinematics import InverseKinematics
+from sdk.motion.paths import Path, PathSamples
+from sdk.motion.timing import JointTrajectory, joint_rows
+from sdk.motion.palletizing import APPROACH, PLACE, PalletPlan, PalletPlanner, PalletRecipe
+from sdk.manipulators.topic_subscription import TopicSubscription
+
+# Ключи каналов слоя объединения записей
+WRITE_DIGITAL_OUTPUT = "write_digital_output"
+WRITE_ANALOG_OUTPUT = "write_analog_output"
+WRITE_GPIO = "set_gpio"
+CONVEYOR_VELOCITY = "set_conveyor_velocity"
+
+# Стриминг через суставы: предыдущая отправленная конфигурация старше этого срока, с,
+# не служит начальным приближением – углы берутся из /joint_states
+IK_STREAM_STALE_SECONDS = 0.5
+# Наибольший шаг сустава за одну точку, рад, если dt или предел скорости сустава неизвестны
+IK_STREAM_MAX_STEP = 0.2
 
 class Manipulator:
     message_bus: ManipulatorConnection
+    # Подвижные суставы модели в URDF контроллера (None – кинематика задаётся только вручную)
+    kinematic_joints: Optional[Tuple[str, ...]] = None
     
     def __init__(self, host: str, client_id: str, login: str, password: str):
         self.host = host
@@ -76,9 +112,40 @@ class Manipulator:
 
         self._user_message_handler = None
         self._topic_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        # Политики доставки обработчиков топиков (частота, прореживание, только последнее)
+        self._handler_gates: Dict[str, DeliveryGate] = {}
+        # Диспетчер пользовательских обработчиков (None – обработчики вызываются в потоке MQTT)
+        self.handler_dispatcher: Optional[HandlerDispatcher] = None
+        # Внутренние слушатели сырых сообщений по шаблонам топиков
+        self._payload_listeners = TopicTrie()
+        # Ожидания условий по телеметрии: topic -> список (predicate, promise)
+        self._telemetry_waiters: Dict[str, List[tuple]] = {}
+        self._telemetry_last: Dict[str, Any] = {}
+        self._telemetry_lock = threading.Lock()
 
         self._attachments: List[Any] = []
 
+        # Последняя подтверждённая контроллером скорость конвейера (None – неизвестна)
+        self.conveyor_velocity: Optional[float] = None
+
+        self.write_coalescer = CommandCoalescer(self._send_coalesced_writes)
+
+        # Кэш редко меняющихся данных контроллера (None – не используется, см. enable_metadata_cache)
+        self.metadata_cache: Optional[MetadataCache] = None
+        # Проверка целей движения до отправки (None – не выполняется, см. enable_motion_validation)
+        self.motion_validator: Optional[MotionValidator] = None
+        # Модель кинематики (None – строится по URDF контроллера при первом обращении, см. load_kinematics)
+        self.kinematics: Optional[KinematicChain] = None
+        # Решатель обратной кинематики (создаётся при первом обращении, см. inverse_kinematics)
+        self._ik_solver: Optional[InverseKinematics] = None
+        # Последние углы, отправленные stream_coordinates_via_joints, и время отправки (time.monotonic)
+        self._ik_stream_last: Optional[List[float]] = None
+        self._ik_stream_time = 0.0
+        # Кэш планов паллет по рецептам (см. plan_pallet / run_pallet)
+        self.pallet_planner = PalletPlanner()
+        # Скомпилированные JSON-программы (см. run_program_cached)
+        self.program_registry = ProgramRegistry()
+
     def register_attachment(self, attachment: Any) -> None:
         """
         Зарегистрировать насадку в манипуляторе
@@ -236,11 +303,8 @@ class Manipulator:
                 import json
                 data = json.loads(payload)       
                 if 'DistanceSensor' in data['data'] or 'ColorSensor' in data['data']:   
-                    p = self.mgbot_conveyer.mgbot_promise
-                    self.mgbot_conveyer.last_sensor_data = data['data']
-                    print(f"[MANIPULATOR] Обрабатываем mgbot_promise...")
-                    if p is not None:
-                        p.resolve(True)
+                    print(f"[MANIPULATOR] Обрабатываем данные датчиков mgbot...")
+                    self.mgbot_conveyer.process_sensor_data(data['data'])
             except Exception as e:
                 print(f"[MANIPULATOR] Ошибка: {e}")
 
@@ -263,29 +327,290 @@ class Manipulator:
             if p is not None:
                 p.resolve(True)
             
+        # Внутренние слушатели (наблюдатели GPIO и т.п.) получают сырой payload
+        for listener in self._payload_listeners.match(topic):
+            try:
+                listener(topic, payload)
+            except Exception as e:
+                print(f"[MANIPULATOR] Ошибка во внутреннем слушателе топика {topic}: {e}")
+
         # Вызываем пользовательский обработчик, если установлен
         if self._user_message_handler is not None:
             print(f"[MANIPULATOR] Вызываем пользовательский обработчик...")
-            try:
-                self._user_message_handler(topic, payload)
-            except Exception as e:
-                print(f"Ошибка в пользовательском обработчике сообщений: {e}")
+            self._dispatch_handler(topic, self._call_message_handler, self._user_message_handler, topic, payload)
         
         # Вызываем обработчик для конкретного топика, если он есть
-        if topic in self._topic_handlers:
-            print(f"[MANIPULATOR] Вызываем обработчик для топика {topic}...")
-            try:
-                import json as json_module
-                data = json_module.loads(payload)
-                self._topic_handlers[topic](data)
-            except json_module.JSONDecodeError:
-                print(f"Ошибка декодирования JSON из топика {topic}: {payload}")
-            except Exception as e:
-                print(f"Ошибка в обработчике для топика {topic}: {e}")
+        handler = self._topic_handlers.get(topic)
+        if handler is not None:
+            gate = self._handler_gates.get(topic)
+            if gate is not None:
+                # Политика доставки решает до разбора JSON, нужен ли вызов
+                gate.offer(payload)
+            else:
+                print(f"[MANIPULATOR] Вызываем обработчик для топика {topic}...")
+                self._dispatch_handler(topic, self._call_topic_handler, handler, topic, payload)
                 
         if not is_streaming_topic:
             print(f"[MANIPULATOR] process_message завершен")
 
+    # --- Выполнение пользовательских обработчиков ---
+
+    def _dispatch_handler(self, topic: str, func: Callable, *args: Any) -> bool:
+        """
+        Вызвать обработчик на месте или поставить в очередь диспетчера (если он включён).
+        :return: False, если диспетчер отбросил вызов
+        """
+        dispatcher = self.handler_dispatcher
+        if dispatcher is not None:
+            return dispatcher.submit(topic, func, *args)
+        func(*args)
+        return True
+
+    def _make_delivery_gate(self, topic: str, policy: DeliveryPolicy, func: Callable, *args: Any) -> DeliveryGate:
+        """Политика доставки для вызова func(*args, payload) через _dispatch_handler."""
+        return DeliveryGate(policy,
+                            lambda payload: func(*args, payload),
+                            lambda call, payload: self._dispatch_handler(topic, call, payload))
+
+    def _close_delivery_gate(self, topic: str) -> None:
+        gate = self._handler_gates.pop(topic, None)
+        if gate is not None:
+            gate.close()
+
+    @staticmethod
+    def _call_message_handler(handler: Callable[[str, str], None], topic: str, payload: str) -> Any:
+        try:
+            return handler(topic, payload)
+        except Exception as e:
+            print(f"Ошибка в пользовательском обработчике сообщений: {e}")
+
+    @staticmethod
+    def _call_topic_handler(handler: Callable[[Dict[str, Any]], None], topic: str, payload: str) -> Any:
+        # Результат возвращается диспетчеру: обработчик-корутина будет выполнен в его цикле
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError:
+            print(f"Ошибка декодирования JSON из топика {topic}: {payload}")
+            return None
+        try:
+            return handler(data)
+        except Exception as e:
+            print(f"Ошибка в обработчике для топика {topic}: {e}")
+
+    # --- Кинематика ---
+
+    def load_kinematics(self,
+                        urdf: Optional[str] = None,
+                        tool: Sequence[float] = (0.0, 0.0, 0.0),
+                        timeout_seconds: float = 10.0) -> KinematicChain:
+        """
+        Построить модель кинематики (self.kinematics) по URDF контроллера.
+        M13 и MEdu вызывают её сами при первом расчёте кинематики.
+        :param urdf: Текст URDF (по умолчанию – сообщение топика /robot_description)
+        :param tool: Смещение точки инструмента относительно фланца, м
+        :param timeout_seconds: Таймаут ожидания /robot_description
+        :raises ValueError: URDF не разобран или его суставы не совпадают с суставами модели
+        """
+        if urdf is None:
+            message = self.wait_until(lambda msg: True, ROBOT_DESCRIPTION_TOPIC, timeout_seconds)
+            # std_msgs/String: {"data": "<robot ...>"}
+            urdf = message.get("data") if isinstance(message, dict) else message
+            if not isinstance(urdf, str):
+                raise ValueError(f"Неожиданное сообщение {ROBOT_DESCRIPTION_TOPIC}: {message!r}")
+        chain = KinematicChain.from_urdf(urdf, self.kinematic_joints, tool=tool,
+                                         name=type(self).__name__)
+        self.kinematics = chain
+        print(f"[MANIPULATOR] Кинематика построена по URDF: {chain}")
+        return chain
+
+    async def load_kinematics_async_await(self,
+                                          urdf: Optional[str] = None,
+                                          tool: Sequence[float] = (0.0, 0.0, 0.0),
+                                          timeout_seconds: float = 10.0) -> KinematicChain:
+        return await self._run_async(self.load_kinematics, urdf, tool, timeout_seconds)
+
+    def _kinematic_chain(self) -> KinematicChain:
+        if self.kinematics is None:
+            if self.kinematic_joints is None:
+                raise KinematicsError(f"Кинематическая модель для {type(self).__name__} не задана")
+            try:
+                self.load_kinematics()
+            except (CommandTimeout, ValueError) as e:
+                raise KinematicsError(f"Не удалось построить кинематику {type(self).__name__} "
+                                      f"по URDF контроллера: {e}") from None
+        return self.kinematics
+
+    def forward_kinematics(self, joints: Union[List[float], Dict[str, float]]) -> Point3D:
+        """
+        Поза инструмента для заданных углов, рассчитанная локально (без запроса /coordinates)
+        :param joints: Углы, рад: список в порядке суставов или словарь {сустав: угол}
+        """
+        return self._kinematic_chain().forward(joints)
+
+    def _inverse_kinematics_solver(self) -> InverseKinematics:
+        chain = self._kinematic_chain()
+        joint_limits = self.motion_validator.joint_limits if self.motion_validator is not None else None
+        solver = self._ik_solver
+        if solver is None or solver.chain is not chain or solver.joint_limits is not joint_limits:
+            solver = self._ik_solver = InverseKinematics(chain, joint_limits)
+        return solver
+
+    def inverse_kinematics(self, target: Any, seed: Optional[List[float]] = None) -> List[float]:
+        """
+        Углы суставов для позы инструмента, рассчитанные локально.
+        Пределы суставов берутся из enable_motion_validation, если проверка включена.
+        :param target: Поза (Point3D/Pose), положение (x, y, z) или (x, y, z, qx, qy, qz, qw)
+        :param seed: Начальное приближение (по умолчанию – решение для ближайшей известной позы)
+        :raises KinematicsError: Решение не найдено
+        """
+        return self._inverse_kinematics_solver().solve(target, seed)
+
+    def inverse_kinematics_many(self, targets: List[Any], seed: Optional[List[float]] = None,
+                                throw_error: bool = True) -> List[Optional[List[float]]]:
+        """
+        Углы суставов для последовательности поз (каждая решается от решения предыдущей)
+        :param throw_error: Выбросить KinematicsError на недостижимой позе; иначе вместо решения None
+        """
+        return self._inverse_kinematics_solver().solve_many(targets, seed, throw_error=throw_error)
+
+    # --- Проверка целей движения ---
+
+    def enable_motion_validation(self,
+                                 joint_limits: Optional[JointLimits] = None,
+                                 workspace: Optional[WorkspaceLimits] = None,
+                                 fetch: bool = True,
+                                 timeout_seconds: float = 10.0) -> MotionValidator:
+        """
+        Проверять цели move_to_angles, move_to_coordinates и move_group до отправки:
+        цель вне пределов отклоняется исключением LimitError без обращения к контроллеру.
+
+        :param joint_limits: Пределы суставов (None – запросить get_joint_limits, если fetch)
+        :param workspace: Рабочая зона (None – прочитать /coordinate_limits, если fetch)
+        :param fetch: Запросить недостающие пределы у контроллера (один раз)
+        :param timeout_seconds: Таймаут запросов пределов
+        """
+        if joint_limits is None and fetch:
+            try:
+                joint_limits = JointLimits.from_controller(self.get_joint_limits(timeout_seconds))
+            except Exception as e:
+                print(f"[MANIPULATOR] Пределы суставов недоступны, проверка суставов отключена: {e}")
+        if workspace is None and fetch:
+            try:
+                message = self.info.snapshot(["/coordinate_limits"], timeout_seconds, throw_error=True)
+                workspace = WorkspaceLimits.from_message(message["/coordinate_limits"])
+            except Exception as e:
+                print(f"[MANIPULATOR] Пределы рабочей зоны недоступны, проверка координат отключена: {e}")
+        self.motion_validator = MotionValidator(joint_limits, workspace)
+        return self.motion_validator
+
+    def disable_motion_validation(self) -> None:
+        self.motion_validator = None
+
+    def _validate_angles(self, angles: List[MoveAnglesCommandParamsAngleInfo]) -> None:
+        if self.motion_validator is not None:
+            self.motion_validator.check_joints({angle.name: angle.position for angle in angles})
+
+    def _validate_position(self, position: MoveCoordinatesParamsPosition) -> None:
+        if self.motion_validator is not None:
+            self.motion_validator.check_point(position.x, position.y, position.z)
+
+    # --- Кэш данных контроллера ---
+
+    def enable_metadata_cache(self,
+                              ttl_seconds: Optional[float] = 300.0,
+                              ttls: Optional[Dict[str, Optional[float]]] = None,
+                              path: Optional[str] = None,
+                              identity: Optional[str] = None,
+                              serial_key: str = "serial_number",
+                              timeout_seconds: float = 5.0) -> MetadataCache:
+        """
+        Кэшировать пределы суставов, список и текущий TCP, домашнюю позицию и /manipulator_info.
+        Команды set_joint_limits, tcp_add, tcp_delete и tcp_apply сбрасывают соответствующие записи.
+
+        Пример:
+            robot.enable_metadata_cache(path="~/.cache/promobot/metadata.json")
+            robot.get_joint_limits()  # запрос к контроллеру (или значение из файла)
+            robot.get_joint_limits()  # из кэша
+
+        :param ttl_seconds: Время жизни записей, с (None – без ограничения)
+        :param ttls: Время жизни отдельных записей: joint_limits, tcp_list, tcp_current, home_position, manipulator_info
+        :param path: Файл для сохранения кэша между запусками (None – только в памяти)
+        :param identity: Идентификатор контроллера в файле кэша. По умолчанию при заданном path
+            читается /manipulator_info и берётся серийный номер контроллера (поле serial_key)
+        :param serial_key: Поле /manipulator_info с серийным номером
+        :param timeout_seconds: Таймаут чтения /manipulator_info
+        """
+        info = None
+        if path is not None:
+            path = os.path.expanduser(path)
+            if identity is None:
+                # Адрес брокера не идентифицирует контроллер: по тому же адресу может оказаться другой робот
+                info = self.info.snapshot(["/manipulator_info"], timeout_seconds, True)["/manipulator_info"]
+                serial = info.get(serial_key) if isinstance(info, dict) else None
+                if serial in (None, ""):
+                    raise ValueError(f"В /manipulator_info нет поля {serial_key!r}: передайте identity явно")
+                identity = f"{type(self).__name__}:{serial}"
+        cache = MetadataCache(ttl_seconds, ttls, path, identity or "default")
+        if info is not None:
+            cache.set(MANIPULATOR_INFO, info)
+        self.metadata_cache = cache
+        return cache
+
+    def disable_metadata_cache(self) -> None:
+        self.metadata_cache = None
+
+    def _cached_metadata(self, key: str, fetch: Callable[[], Any], use_cache: bool = True) -> Any:
+        cache = self.metadata_cache
+        if cache is None:
+            return fetch()
+        return cache.get_or_fetch(key, fetch, refresh=not use_cache)
+
+    def _invalidate_metadata_on_success(self, command: SdkCommand, *keys: str) -> None:
+        """Сбросить записи кэша сразу и ещё раз после подтверждения команды (запрос между ними мог вернуть старое значение)."""
+        cache = self.metadata_cache
+        if cache is None:
+            return
+        cache.invalidate(*keys)
+        command.promise.add_success_callback(lambda _: cache.invalidate(*keys))
+
+    def enable_handler_dispatcher(self,
+                                  workers: int = 2,
+                                  maxsize: int = 64,
+                                  policy: str = DROP_OLDEST,
+                                  block_timeout: Optional[float] = 1.0,
+                                  loop: Optional[asyncio.AbstractEventLoop] = None) -> HandlerDispatcher:
+        """
+        Выполнять пользовательские обработчики (on_message, on_topic, set_*_handler, колбэки
+        состояния суставов, обработчики шины) вне сетевого потока MQTT. Медленный обработчик
+        больше не задерживает ответы на команды: сопоставление ответов с командами
+        по-прежнему выполняется сразу при получении сообщения.
+
+        Пример:
+            dispatcher = robot.enable_handler_dispatcher(workers=2, maxsize=8)
+            dispatcher.configure_topic("/hardware_error", policy="block")
+
+        :param workers: Число рабочих потоков (не используется при заданном loop)
+        :param maxsize: Размер очереди вызовов каждого топика
+        :param policy: Политика переполнения: drop_oldest, drop_newest или block
+        :param block_timeout: Время ожидания места в очереди при политике block
+        :param loop: Цикл asyncio, в котором выполнять обработчики (вместо пула потоков)
+        :return: Запущенный диспетчер
+        """
+        self.disable_handler_dispatcher()
+        dispatcher = HandlerDispatcher(workers, maxsize, policy, block_timeout, loop).start()
+        self.handler_dispatcher = dispatcher
+        self.message_bus.dispatcher = dispatcher
+        return dispatcher
+
+    def disable_handler_dispatcher(self, drain: bool = True) -> None:
+        """Вернуть вызов обработчиков в поток MQTT и остановить диспетчер."""
+        dispatcher = self.handler_dispatcher
+        if dispatcher is None:
+            return
+        self.handler_dispatcher = None
+        self.message_bus.dispatcher = None
+        dispatcher.stop(drain)
+
     async def _run_async(self, sync_func, *args, **kwargs):
         """
         Выполняет синхронную функцию в пуле потоков асинхронно
@@ -296,6 +621,127 @@ class Manipulator:
         """
         return await asyncio.to_thread(sync_func, *args, **kwargs)
 
+    def _run_commands_pipelined(self, commands: List[SdkCommand]) -> List[Any]:
+        """
+        Отправляет команды друг за другом, не дожидаясь ответов, и затем собирает результаты.
+        Ответы сопоставляются по ID через active_commands, поэтому команды не конфликтуют
+        со specific_command.
+        :param commands: Список команд
+        :return: Результаты в порядке команд; для неудачных команд – объект исключения
+        """
+        self.message_bus.subscribe(COMMAND_TOPIC)
+        self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
+        for command in commands:
+            if command.message_bus is None:
+                command.message_bus = self.message_bus
+            self.active_commands[command.command_id] = command
+        results: List[Any] = []
+        try:
+            for command in commands:
+                command.make_command_action()
+            for command in commands:
+                try:
+                    results.append(command.result())
+                except Exception as e:
+                    results.append(e)
+        finally:
+            for command in commands:
+                self.active_commands.pop(command.command_id, None)
+        return results
+
+    def run_pipelined(self, commands: List[SdkCommand], throw_error: bool = True) -> List[Any]:
+        """
+        Отправить подготовленные команды (*_async) одну за другой без ожидания ответов и дождаться всех.
+        Пример (отпустить деталь, одновременно отводя руку):
+            manipulator.run_pipelined([vacuum.deactivate_async(), manipulator.move_to_coordinates_async(...)])
+        Порядок выполнения команд на контроллере сохраняется, экономится время ожидания ответа.
+        :param commands: Команды, ещё не отправленные на контроллер
+        :param throw_error: Выбросить первую ошибку после получения всех ответов
+        :return: Результаты в порядке команд; при throw_error=False для неудачных команд – объект исключения
+        """
+        results = self._run_commands_pipelined(commands)
+        for command in commands:
+            for slot in ("move_coordinates_command", "move_angles_command", "specific_command", "manage_command"):
+                if getattr(self, slot, None) is command:
+                    setattr(self, slot, None)
+        if throw_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    # -------------------------------------------------
+    # Объединение повторяющихся записей (write-behind)
+    # -------------------------------------------------
+
+    def _make_write_command(self, kind: str, channel: Any, value: Any, timeout_seconds: float = 60.0) -> SdkCommand:
+        if kind == WRITE_DIGITAL_OUTPUT:
+            return WriteDigitalOutputCommand(channel, value, self.message_bus.publish, timeout_seconds, True, self.message_bus)
+        if kind == WRITE_ANALOG_OUTPUT:
+            return WriteAnalogOutputCommand(channel, value, self.message_bus.publish, timeout_seconds, True, self.message_bus)
+        if kind == WRITE_GPIO:
+            return WriteGPIO(channel, value, self.message_bus.publish, timeout_seconds, True)
+        if kind == CONVEYOR_VELOCITY:
+            return SetConveyorVelocityCommand(self.message_bus.publish, value, timeout_seconds, True, self.message_bus)
+        raise ValueError(f"Неизвестный тип записи: {kind}")
+
+    def _send_coalesced_writes(self, items: List[Any]) -> Dict[Any, Optional[Exception]]:
+        """Отправляет пачку записей из слоя объединения одним конвейером команд."""
+        commands = [self._make_write_command(kind, channel, value) for (kind, channel), value in items]
+        results = self._run_commands_pipelined(commands)
+        for ((kind, _), value), result in zip(items, results):
+            if kind == CONVEYOR_VELOCITY and isinstance(result, dict):
+                self.conveyor_velocity = value
+        return {
+            key: result if isinstance(result, Exception) else None
+            for (key, _), result in zip(items, results)
+        }
+
+    def configure_write_coalescing(self, window_seconds: float = 0.05, tolerance: float = 0.0) -> None:
+        """
+        Настроить слой объединения записей
+        :param window_seconds: Окно, в пределах которого серия записей в канал сливается в последнее значение
+        :param tolerance: Допуск сравнения числовых значений (аналоговые выходы, скорость конвейера)
+        """
+        self.write_coalescer.window_seconds = window_seconds
+        self.write_coalescer.tolerance = tolerance
+
+    def write_digital_output_coalesced(self, channel: int, value: bool) -> bool:
+        """
+        Записать цифровой выход через слой объединения (без блокировки).
+        Повтор последнего подтверждённого значения не отправляется.
+        :return: False, если запись отброшена как не меняющая состояние
+        """
+        return self.write_coalescer.write((WRITE_DIGITAL_OUTPUT, channel), value)
+
+    def write_analog_output_coalesced(self, channel: int, value: float) -> bool:
+        """
+        Записать аналоговый выход через слой объединения (без блокировки).
+        :return: False, если запись отброшена как не меняющая состояние
+        """
+        return self.write_coalescer.write((WRITE_ANALOG_OUTPUT, channel), value)
+
+    def write_gpio_coalesced(self, name: str, value: int) -> bool:
+        """
+        Записать GPIO через слой объединения (без блокировки).
+        :return: False, если запись отброшена как не меняющая состояние
+        """
+        return self.write_coalescer.write((WRITE_GPIO, name), value)
+
+    def set_conveyer_velocity_coalesced(self, velocity: float) -> bool:
+        """
+        Установить скорость конвейера через слой объединения (без блокировки).
+        :return: False, если запись отброшена как не меняющая состояние
+        """
+        return self.write_coalescer.write((CONVEYOR_VELOCITY, None), velocity)
+
+    def flush_coalesced_writes(self, timeout_seconds: Optional[float] = None) -> bool:
+        """
+        Отправить все накопленные записи и дождаться их подтверждения
+        :return: True, если все записи отправлены до истечения таймаута
+        """
+        return self.write_coalescer.flush(timeout_seconds)
+
     # Асинхронные методы для существующих команд
     def get_control_async(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> GetManageCommand:
         self.manage_command = GetManageCommand(
@@ -331,6 +777,7 @@ class Manipulator:
                                   planner_type: PlannerType = PlannerType.LIN,
                                   timeout_seconds: float = 60.0,
                                   throw_error: bool = True) -> MoveCoordinatesCommand:
+        self._validate_position(position)
         parameters = MoveCoordinatesParams(position, orientation, velocity_scaling_factor, acceleration_scaling_factor, planner_type)
         self.move_coordinates_command = MoveCoordinatesCommand(self.message_bus.publish, parameters, timeout_seconds, throw_error, self.message_bus)
         self.message_bus.subscribe(COMMAND_TOPIC)
@@ -380,6 +827,79 @@ class Manipulator:
         finally:
             self.move_coordinates_command = None
 
+    # --- Паллетирование ---
+
+    def plan_pallet(self, recipe: PalletRecipe) -> PalletPlan:
+        """
+        План паллеты по рецепту; рассчитывается один раз и хранится в pallet_planner
+        вместе с местом остановки, так что смена рецепта и продолжение не требуют пересчёта
+        """
+        return self.pallet_planner.plan(recipe)
+
+    def run_pallet(self,
+                   plan: Union[PalletPlan, PalletRecipe],
+                   velocity_scaling_factor: float = 0.1,
+                   acceleration_scaling_factor: float = 0.1,
+                   start: Optional[int] = None,
+                   window: int = 8,
+                   before_slot: Optional[Callable[[int], Any]] = None,
+                   on_place: Optional[Callable[[int], Any]] = None,
+                   stop_event: Optional[threading.Event] = None,
+                   timeout_seconds: float = 60.0) -> int:
+        """
+        Выполнить план паллеты: позы отправляются пачками по window команд без ожидания
+        ответов между ними (run_pipelined). Переезд к ячейке – PTP, укладка и отвод – LIN.
+        После остановки, ошибки или исключения выполнение продолжается с plan.next_index.
+
+        :param plan: План или рецепт (план берётся из кэша; выполненный до конца план рецепта
+            начинается заново, прерванный – продолжается)
+        :param start: Начать с индекса позы (None – с plan.next_index; plan.index_of_slot(n) – с ячейки n)
+        :param window: Наибольшее число команд в пачке (ограничивает задержку остановки)
+        :param before_slot: Вызывается перед подходом к ячейке (например, взять изделие)
+        :param on_place: Вызывается по достижении позы укладки (например, отпустить изделие)
+        :param stop_event: Событие остановки (проверяется между пачками)
+        :return: Индекс следующей невыполненной позы
+        """
+        if isinstance(plan, PalletRecipe):
+            plan = self.plan_pallet(plan)
+        if start is not None:
+            plan.reset(start)
+        if self.motion_validator is not None:
+            self.motion_validator.check_points(plan.positions()[plan.next_index:])
+        while not plan.done:
+            if stop_event is not None and stop_event.is_set():
+                break
+            index = plan.next_index
+            if before_slot is not None and plan.kinds[index] == APPROACH:
+                before_slot(plan.slots[index])
+            chunk: List[int] = []
+            while index < len(plan) and len(chunk) < window:
+                kind = plan.kinds[index]
+                if chunk and kind == APPROACH and before_slot is not None:
+                    break
+                chunk.append(index)
+                index += 1
+                if kind == PLACE and on_place is not None:
+                    break
+            commands = []
+            for i in chunk:
+                x, y, z, qx, qy, qz, qw = plan.row(i)
+                commands.append(self.move_to_coordinates_async(
+                    MoveCoordinatesParamsPosition(x=x, y=y, z=z),
+                    MoveCoordinatesParamsOrientation(x=qx, y=qy, z=qz, w=qw),
+                    velocity_scaling_factor,
+                    acceleration_scaling_factor,
+                    PlannerType.PTP if plan.kinds[i] == APPROACH else PlannerType.LIN,
+                    timeout_seconds))
+            results = self.run_pipelined(commands, throw_error=False)
+            for i, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    raise result
+                plan.next_index = i + 1
+            if on_place is not None and plan.kinds[chunk[-1]] == PLACE:
+                on_place(plan.slots[chunk[-1]])
+        return plan.next_index
+
     def _run_move_to_angles_command_async(self,
                                           angles: List[MoveAnglesCommandParamsAngleInfo],
                                           timeout_seconds: float = 60.0,
@@ -387,6 +907,7 @@ class Manipulator:
                                           enable_feedback: bool = False,
                                           velocity_factor: float = 0.1,
                                           acceleration_factor: float = 0.1) -> MoveAnglesCommand:
+        self._validate_angles(angles)
         self.move_angles_command = MoveAnglesCommand(self.message_bus.publish,
                                                     angles,
                                                     timeout_seconds,
@@ -547,6 +1068,70 @@ class Manipulator:
         finally:
             self.specific_command = None
 
+    def _cached_program(self, program: Union[str, CompiledProgram], program_json: Optional[dict],
+                        version: Any) -> CompiledProgram:
+        if isinstance(program, CompiledProgram):
+            return program
+        if program_json is not None:
+            return self.program_registry.register(program, program_json, version)
+        compiled = self.program_registry.get(program)
+        if compiled is None:
+            raise ValueError(f"Программа {program} не зарегистрирована в program_registry")
+        return compiled
+
+    def run_program_cached_async(self, program: Union[str, CompiledProgram], program_json: Optional[dict] = None, timeout_seconds: float = 60.0, throw_error: bool = True, enable_feedback: bool = False, version: Any = None) -> SdkCommand:
+        """
+        Подготовить запуск программы из program_registry: программа компилируется один раз
+        при регистрации и первый раз отправляется готовым телом под именем с хэшем
+        содержимого (<имя>-<хэш>), следующие запуски передают только имя (play_program_name).
+        Признак загрузки по результату обновляет run_program_cached; при самостоятельном
+        запуске команды – program_registry.mark_uploaded.
+        :param program: Дескриптор из program_registry.register или имя программы
+        :param program_json: Программа (при первом запуске имени или вместе с новой version)
+        :param version: Версия программы: новая версия компилирует program_json заново
+        """
+        registry = self.program_registry
+        compiled = self._cached_program(program, program_json, version)
+        if registry.by_name and compiled.uploaded:
+            return self.run_program_by_name_async(compiled.stored_name, timeout_seconds, throw_error, enable_feedback)
+        self.specific_command = RunCompiledProgramCommand(
+            compiled,
+            self.message_bus.publish,
+            timeout_seconds,
+            throw_error,
+            self.message_bus,
+            enable_feedback
+        )
+        self.message_bus.subscribe(COMMAND_FEEDBACK_TOPIC)
+        self.message_bus.subscribe(COMMAND_TOPIC)
+        self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
+        if enable_feedback:
+            self.specific_command.promise.add_feedback_callback(self._on_run_feedback)
+        return self.specific_command
+
+    async def run_program_cached_async_await(self, program: Union[str, CompiledProgram], program_json: Optional[dict] = None, timeout_seconds: float = 60.0, throw_error: bool = True, version: Any = None) -> None:
+        await self._run_async(self.run_program_cached, program, program_json, timeout_seconds, throw_error, version)
+
+    def run_program_cached(self, program: Union[str, CompiledProgram], program_json: Optional[dict] = None, timeout_seconds: float = 60.0, throw_error: bool = True, version: Any = None) -> None:
+        """
+        Запустить программу из program_registry (см. run_program_cached_async)
+        :param program: Дескриптор из program_registry.register или имя программы
+        :param program_json: Программа (при первом запуске имени или вместе с новой version)
+        :param version: Версия программы: новая версия компилирует program_json заново
+        """
+        compiled = self._cached_program(program, program_json, version)
+        command = self.run_program_cached_async(compiled, None, timeout_seconds, throw_error)
+        command.make_command_action()
+        result = None
+        try:
+            result = command.result()
+        finally:
+            self.specific_command = None
+            if self.program_registry.by_name:
+                # Успех – словарь ответа; отказ (строка при throw_error=False), таймаут или исключение –
+                # программа на контроллере считается неизвестной и в следующий раз загружается заново
+                self.program_registry.mark_uploaded(compiled, isinstance(result, dict))
+
     def run_python_program_async(self,
                                  python_code: str,
                                  python_version: str = "3.12",
@@ -644,6 +1229,7 @@ class Manipulator:
             timeout_seconds,
             throw_error
         )
+        self._invalidate_metadata_on_success(self.specific_command, TCP_LIST, TCP_CURRENT)
         self.message_bus.subscribe(COMMAND_TOPIC)
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
@@ -658,6 +1244,7 @@ class Manipulator:
         self.specific_command = None
 
     def write_analog_output_async(self, channel: int, value: float, timeout_seconds: float = 60.0, throw_error: bool = True) -> WriteAnalogOutputCommand:
+        self.write_coalescer.invalidate((WRITE_ANALOG_OUTPUT, channel), discard_pending=True)
         self.specific_command = WriteAnalogOutputCommand(
             channel,
             value,
@@ -680,6 +1267,7 @@ class Manipulator:
         self.specific_command = None
 
     def write_gpio_async(self, name: str, value: int, timeout_seconds: float = 60.0, throw_error: bool = True) -> WriteGPIO:
+        self.write_coalescer.invalidate((WRITE_GPIO, name), discard_pending=True)
         self.specific_command = WriteGPIO(name, value, self.message_bus.publish, timeout_seconds, throw_error)
         self.message_bus.subscribe(COMMAND_TOPIC)
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
@@ -702,6 +1290,7 @@ class Manipulator:
             apply_other,
             timeout_seconds,
             throw_error)
+        self._invalidate_metadata_on_success(self.specific_command, TCP_LIST, TCP_CURRENT)
         self.message_bus.subscribe(COMMAND_TOPIC)
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
@@ -717,6 +1306,7 @@ class Manipulator:
 
     def tcp_apply_async(self, name: str, timeout_seconds: float = 60.0, throw_error: bool = True) -> TCPApply:
         self.specific_command = TCPApply(name, self.message_bus.publish, timeout_seconds, throw_error)
+        self._invalidate_metadata_on_success(self.specific_command, TCP_CURRENT)
         self.message_bus.subscribe(COMMAND_TOPIC)
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
@@ -736,10 +1326,16 @@ class Manipulator:
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
 
-    def tcp_get_current(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> Dict[str, Any]:
-        command = self.tcp_get_current_async(timeout_seconds, throw_error)
-        command.make_command_action()
-        return command.result()
+    def tcp_get_current(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Текущий TCP
+        :param use_cache: Взять значение из кэша, если он включён (False – запросить заново)
+        """
+        def fetch() -> Dict[str, Any]:
+            command = self.tcp_get_current_async(timeout_seconds, throw_error)
+            command.make_command_action()
+            return command.result()
+        return self._cached_metadata(TCP_CURRENT, fetch, use_cache)
 
     def tcp_get_list_async(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> TCPGetList:
         self.specific_command = TCPGetList(self.message_bus.publish, timeout_seconds, throw_error)
@@ -747,10 +1343,16 @@ class Manipulator:
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
 
-    def tcp_get_list(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> Dict[str, Any]:
-        command = self.tcp_get_list_async(timeout_seconds, throw_error)
-        command.make_command_action()
-        return command.result()
+    def tcp_get_list(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Список TCP
+        :param use_cache: Взять значение из кэша, если он включён (False – запросить заново)
+        """
+        def fetch() -> Dict[str, Any]:
+            command = self.tcp_get_list_async(timeout_seconds, throw_error)
+            command.make_command_action()
+            return command.result()
+        return self._cached_metadata(TCP_LIST, fetch, use_cache)
 
     def write_i2c_async(self, name: str, value: int, timeout_seconds: float = 60.0, throw_error: bool = True) -> WriteI2C:
         self.specific_command = WriteI2C(name, value, self.message_bus.publish, timeout_seconds, throw_error)
@@ -768,6 +1370,7 @@ class Manipulator:
         self.specific_command = None
 
     def write_digital_output_async(self, channel: int, value: bool, timeout_seconds: float = 60.0, throw_error: bool = True) -> WriteDigitalOutputCommand:
+        self.write_coalescer.invalidate((WRITE_DIGITAL_OUTPUT, channel), discard_pending=True)
         self.specific_command = WriteDigitalOutputCommand(
             channel,
             value,
@@ -791,6 +1394,7 @@ class Manipulator:
 
     def set_joint_limits_async(self, limits: list[JointLimit], timeout_seconds: float = 60.0, throw_error: bool = True) -> SetJointLimits:
         self.specific_command = SetJointLimits(limits, self.message_bus.publish, timeout_seconds, throw_error)
+        self._invalidate_metadata_on_success(self.specific_command, JOINT_LIMITS)
         self.message_bus.subscribe(COMMAND_TOPIC)
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
@@ -810,14 +1414,23 @@ class Manipulator:
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
 
-    async def get_joint_limits_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
-        await self._run_async(self.get_joint_limits, timeout_seconds, throw_error)
+    async def get_joint_limits_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True,
+                                           use_cache: bool = True) -> Dict[str, Any]:
+        return await self._run_async(self.get_joint_limits, timeout_seconds, throw_error, use_cache)
 
-    def get_joint_limits(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
-        command = self.get_joint_limits_async(timeout_seconds, throw_error)
-        command.make_command_action()
-        command.result()
-        self.specific_command = None
+    def get_joint_limits(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Пределы суставов
+        :param use_cache: Взять значение из кэша, если он включён (False – запросить заново)
+        :return: Ответ контроллера
+        """
+        def fetch() -> Dict[str, Any]:
+            command = self.get_joint_limits_async(timeout_seconds, throw_error)
+            command.make_command_action()
+            result = command.result()
+            self.specific_command = None
+            return result
+        return self._cached_metadata(JOINT_LIMITS, fetch, use_cache)
 
 
     def arc_motion_async(self,
@@ -909,6 +1522,209 @@ class Manipulator:
 
         self.message_bus.publish("/stream", message)
 
+    def stream_coordinates_via_joints(self,
+                                      position: MoveCoordinatesParamsPosition,
+                                      orientation: Optional[MoveCoordinatesParamsOrientation] = None,
+                                      dt: Optional[float] = None,
+                                      timeout_seconds: float = 1.0) -> List[float]:
+        """
+        Стриминг декартовой цели через позиции суставов: обратная кинематика решается
+        локально от предыдущей отправленной конфигурации (если она старше IK_STREAM_STALE_SECONDS –
+        от текущих углов из /joint_states), контроллер получает /stream joint.
+        Решение ищется только от этого приближения (без случайных перезапусков) и отклоняется,
+        если какой-либо сустав смещается больше чем на предел скорости · dt (IK_STREAM_MAX_STEP,
+        если dt или предел неизвестны) – смена ветви решения не уходит на контроллер.
+        :param position: Позиция инструмента (x, y, z)
+        :param orientation: Ориентация (x, y, z, w); None – только положение
+        :param dt: Период стриминга, с; задан – скорости считаются по разности с предыдущей точкой, иначе нули
+        :param timeout_seconds: Таймаут ожидания /joint_states
+        :return: Отправленные углы, рад
+        :raises KinematicsError: Решение не найдено или нарушает непрерывность (ничего не отправлено)
+        """
+        target = (position.x, position.y, position.z)
+        if orientation is not None:
+            target += (orientation.x, orientation.y, orientation.z, orientation.w)
+        solver = self._inverse_kinematics_solver()
+        names = self.kinematics.joint_names
+        previous = self._ik_stream_last
+        if previous is None or time.monotonic() - self._ik_stream_time > IK_STREAM_STALE_SECONDS:
+            previous = self._current_joint_vector(names, timeout_seconds)
+        angles = solver.solve(target, previous, restarts=0)
+        self._check_stream_step(names, previous, angles, dt)
+        if dt:
+            velocities = {name: (a - b) / dt for name, a, b in zip(names, angles, previous)}
+        else:
+            velocities = {name: 0.0 for name in names}
+        self.stream_joint_positions(dict(zip(names, angles)), velocities)
+        self._ik_stream_last = angles
+        self._ik_stream_time = time.monotonic()
+        return angles
+
+    def _current_joint_vector(self, names: Sequence[str], timeout_seconds: float) -> List[float]:
+        """Текущие углы суставов names из /joint_states (sensor_msgs/JointState: name[], position[])."""
+        try:
+            state = json.loads(self.get_joint_state(timeout_seconds))
+            positions = dict(zip(state["name"], state["position"]))
+            return [float(positions[name]) for name in names]
+        except Exception as e:
+            raise KinematicsError(f"Не удалось получить текущие углы суставов из /joint_states: {e}") from None
+
+    def _check_stream_step(self, names: Sequence[str], previous: Sequence[float], angles: Sequence[float],
+                           dt: Optional[float]) -> None:
+        joint_limits = self.motion_validator.joint_limits if self.motion_validator is not None else None
+        for i, name in enumerate(names):
+            step = IK_STREAM_MAX_STEP
+            if dt and joint_limits is not None and joint_limits.velocity is not None and name in joint_limits.names:
+                velocity = joint_limits.velocity[joint_limits.names.index(name)]
+                if math.isfinite(velocity):
+                    step = velocity * dt
+            if abs(angles[i] - previous[i]) > step:
+                raise KinematicsError(f"Разрыв траектории: сустав {name} смещается на {angles[i] - previous[i]:.4g} рад "
+                                      f"за одну точку (допустимо {step:.4g})")
+
+    def _stream_path_sample(self, position: tuple, orientation: Optional[tuple], via_joints: bool, dt: float) -> None:
+        target = MoveCoordinatesParamsPosition(x=position[0], y=position[1], z=position[2])
+        rotation = None
+        if orientation is not None:
+            rotation = MoveCoordinatesParamsOrientation(x=orientation[0], y=orientation[1], z=orientation[2], w=orientation[3])
+        if via_joints:
+            self.stream_coordinates_via_joints(target, rotation, dt)
+        else:
+            self.stream_coordinates(target, rotation)
+
+    def _path_samples(self, path: Union[Path, PathSamples], max_velocity: float, max_acceleration: float,
+                      rate_hz: float, via_joints: bool, max_angular_velocity: Optional[float]) -> PathSamples:
+        if isinstance(path, Path):
+            samples = path.sample(max_velocity, max_acceleration, rate_hz, max_angular_velocity)
+        else:
+            samples = path
+        if samples.orientations is None and not via_joints:
+            raise ValueError("Для стриминга позы нужна ориентация: задайте её в точках пути или используйте via_joints=True")
+        return samples
+
+    def stream_path(self,
+                    path: Union[Path, PathSamples],
+                    max_velocity: float = 0.1,
+                    max_acceleration: float = 0.5,
+                    rate_hz: float = 100.0,
+                    via_joints: bool = False,
+                    stop_event: Optional[threading.Event] = None,
+                    max_angular_velocity: Optional[float] = None) -> int:
+        """
+        Проиграть траекторию через потоковое управление: точки отправляются по расписанию
+        выборки (без накопления задержек), контроллер не получает команд на каждый сегмент.
+        Серво-режим должен быть включён заранее (set_servo_pose_mode / set_servo_joint_jog_mode).
+
+        :param path: Путь (будет размечен по времени) или готовая выборка PathSamples
+        :param max_velocity: Предел скорости вдоль пути, м/с (для Path)
+        :param max_acceleration: Предел ускорения, м/с² (для Path)
+        :param rate_hz: Частота стриминга, Гц (для Path)
+        :param via_joints: Отправлять позиции суставов (обратная кинематика на стороне SDK) вместо поз
+        :param stop_event: Событие досрочной остановки
+        :param max_angular_velocity: Предел скорости поворота инструмента, рад/с (для Path; None – не ограничена)
+        :return: Число отправленных точек
+        """
+        samples = self._path_samples(path, max_velocity, max_acceleration, rate_hz, via_joints, max_angular_velocity)
+        self._ik_stream_last = None
+        dt = float(samples.times[1] - samples.times[0]) if len(samples) > 1 else 1.0 / rate_hz
+        start = time.monotonic()
+        sent = 0
+        for t, position, orientation in samples:
+            delay = start + t - time.monotonic()
+            if stop_event is not None:
+                if stop_event.wait(max(delay, 0.0)):
+                    break
+            elif delay > 0:
+                time.sleep(delay)
+            self._stream_path_sample(position, orientation, via_joints, dt)
+            sent += 1
+        return sent
+
+    async def stream_path_async(self,
+                                path: Union[Path, PathSamples],
+                                max_velocity: float = 0.1,
+                                max_acceleration: float = 0.5,
+                                rate_hz: float = 100.0,
+                                via_joints: bool = False,
+                                max_angular_velocity: Optional[float] = None) -> int:
+        """
+        Асинхронный вариант stream_path (отмена – через отмену задачи)
+        :return: Число отправленных точек
+        """
+        samples = self._path_samples(path, max_velocity, max_acceleration, rate_hz, via_joints, max_angular_velocity)
+        self._ik_stream_last = None
+        loop = asyncio.get_running_loop()
+        dt = float(samples.times[1] - samples.times[0]) if len(samples) > 1 else 1.0 / rate_hz
+        start = loop.time()
+        sent = 0
+        for t, position, orientation in samples:
+            delay = start + t - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._stream_path_sample(position, orientation, via_joints, dt)
+            sent += 1
+        return sent
+
+    def plan_joint_trajectory(self,
+                              positions: List[Union[JointPositions, Dict[str, float]]],
+                              velocity_scaling: float = 1.0,
+                              acceleration_scaling: float = 1.0,
+                              joint_limits: Optional[JointLimits] = None,
+                              corner_period: float = 0.01,
+                              timeout_seconds: float = 10.0) -> JointTrajectory:
+        """
+        Разметить путь через точки суставов по времени с наибольшей допустимой скоростью
+        на каждом участке (вместо единого масштаба max_velocity/max_acceleration у move_group).
+
+        :param positions: Точки пути (как в move_group) или словари {сустав: угол}
+        :param velocity_scaling: Доля пределов скорости суставов
+        :param acceleration_scaling: Доля пределов ускорения суставов
+        :param joint_limits: Пределы суставов; по умолчанию – из enable_motion_validation или get_joint_limits
+        :param corner_period: Период стриминга, с (ограничивает скачок скорости в изломах пути)
+        :param timeout_seconds: Таймаут запроса пределов
+        """
+        if joint_limits is None and self.motion_validator is not None:
+            joint_limits = self.motion_validator.joint_limits
+        if joint_limits is None:
+            joint_limits = JointLimits.from_controller(self.get_joint_limits(timeout_seconds))
+        names, rows = joint_rows(positions)
+        if self.motion_validator is not None:
+            self.motion_validator.check_joint_path(names, rows)
+        return JointTrajectory.plan(names, rows, joint_limits,
+                                    velocity_scaling=velocity_scaling,
+                                    acceleration_scaling=acceleration_scaling,
+                                    corner_period=corner_period)
+
+    def stream_joint_trajectory(self,
+                                trajectory: JointTrajectory,
+                                rate_hz: Optional[float] = None,
+                                stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Проиграть размеченную траекторию через stream_joint_positions (позиции и скорости)
+        по расписанию выборки. Серво-режим суставов должен быть включён заранее.
+        :param trajectory: Траектория из plan_joint_trajectory
+        :param rate_hz: Частота стриминга, Гц (None – 1 / corner_period, под который размечена траектория)
+        :param stop_event: Событие досрочной остановки
+        :return: Число отправленных точек
+        """
+        if rate_hz is None:
+            rate_hz = 1.0 / trajectory.corner_period
+        times, positions, velocities = trajectory.sample(rate_hz)
+        names = trajectory.names
+        start = time.monotonic()
+        sent = 0
+        for i in range(len(times)):
+            delay = start + float(times[i]) - time.monotonic()
+            if stop_event is not None:
+                if stop_event.wait(max(delay, 0.0)):
+                    break
+            elif delay > 0:
+                time.sleep(delay)
+            self.stream_joint_positions({name: float(v) for name, v in zip(names, positions[i])},
+                                        {name: float(v) for name, v in zip(names, velocities[i])})
+            sent += 1
+        return sent
+
     def stream_coordinates(self, position: MoveCoordinatesParamsPosition, orientation: MoveCoordinatesParamsOrientation) -> None:
         """
         :param position: Позиция манипулятора (x, y, z)
@@ -921,8 +1737,8 @@ class Manipulator:
                     "stamp": "now",
                     "frame_id": "base_link"
                 },
-                "position": position.__dict__,
-                "orientation": orientation.__dict__
+                "position": position.to_dict(),
+                "orientation": orientation.to_dict()
             }
         }
         self.message_bus.publish("/stream", message)
@@ -965,8 +1781,8 @@ class Manipulator:
                     "stamp": "now",
                     "frame_id": "base_link"
                 },
-                "position": position.__dict__,
-                "orientation": orientation.__dict__
+                "position": position.to_dict(),
+                "orientation": orientation.to_dict()
             }
         }
         self.message_bus.publish("/stream", message)
@@ -1186,7 +2002,7 @@ class Manipulator:
         :param channel: Номер канала.
         :param value: Значение (0.0 - 1.0).
         """
-        
+        self.write_coalescer.invalidate((WRITE_ANALOG_OUTPUT, channel), discard_pending=True)
         command = NoWaitCommand(self.message_bus.publish, "write_analog_output", {"channel": channel, "value": value}, message_bus=self.message_bus)
         command.make_command_action()
 
@@ -1197,7 +2013,7 @@ class Manipulator:
         :param channel: Номер канала.
         :param value: Значение (True/False).
         """
-        
+        self.write_coalescer.invalidate((WRITE_DIGITAL_OUTPUT, channel), discard_pending=True)
         command = NoWaitCommand(self.message_bus.publish, "write_digital_output", {"channel": channel, "value": value}, message_bus=self.message_bus)
         command.make_command_action()
 
@@ -1214,7 +2030,7 @@ class Manipulator:
         :param velocity_scaling_factor: Множитель скорости (0.0 - 1.0).
         :param acceleration_scaling_factor: Множитель ускорения (0.0 - 1.0).
         """
-        
+        self._validate_position(position)
         data = {
             "position": {
                 "x": position.x,
@@ -1240,7 +2056,7 @@ class Manipulator:
 
         :param angles: Список информации об углах.
         """
-        
+        self._validate_angles(angles)
         positions = {}
         velocities = {}
         
@@ -1317,6 +2133,23 @@ class Manipulator:
     # Публичный API для событий
     # -------------------------------------------------
 
+    def subscribe(self, topic: str, maxsize: int = 100, conflate: bool = False) -> TopicSubscription:
+        """
+        Асинхронная подписка на топик: сообщения читаются через async for.
+        Вызывается внутри работающего цикла asyncio.
+
+        Пример:
+            async with robot.subscribe("/joint_states", conflate=True) as joints:
+                async for msg in joints:
+                    print(msg.data)
+
+        :param topic: Топик или шаблон с "+"/"#"
+        :param maxsize: Размер очереди; при переполнении вытесняются самые старые сообщения
+        :param conflate: Хранить только последнее сообщение (для частой телеметрии)
+        :return: Подписка (TopicSubscription); закрывается через close() или выход из async with
+        """
+        return TopicSubscription(self, topic, maxsize, conflate)
+
     def topic_listener(self, topic: str):
         """Декоратор: вызовет функцию один раз при получении сообщения из *topic* и вернёт его результат.
 
@@ -1328,45 +2161,175 @@ class Manipulator:
 
         def decorator(func):
             async def wrapper(*args, **kwargs):
-                from sdk.promise import Promise  # локальный импорт чтобы избежать циклов
+                async with self.subscribe(topic, maxsize=1) as subscription:
+                    message = await subscription.get()
+                # вызываем оригинальный обработчик
+                return await func(message.payload, *args, **kwargs)
 
-                promise = Promise()
+            return wrapper
 
-                # Подписываемся на сообщения выбранного топика через собственный обработчик
-                previous_handler = self.on_message  # может быть None
-                # Подписываемся на топик на уровне MQTT
-                try:
-                    self.message_bus.subscribe(topic)
-                except Exception:
-                    pass
+        return decorator
 
-                def _combined_handler(t: str, msg: str):
-                    # Если нужный топик – резолвим promise
-                    if t == topic:
-                        promise.resolve(msg)
-                    # Передаём дальше
-                    if previous_handler is not None:
-                        previous_handler(t, msg)
+    # --- Внутренние слушатели сырых сообщений ---
 
-                # Назначаем временный обработчик
-                self.on_message = _combined_handler
+    def add_payload_listener(self, topic: str, listener: Callable[[str, str], None]) -> None:
+        """
+        Добавить слушатель сырых сообщений топика. Подписка на топик общая:
+        она выполняется при добавлении первого слушателя.
+        :param topic: Топик или шаблон с "+"/"#"
+        :param listener: Функция listener(topic, payload)
+        """
+        if not callable(listener):
+            raise TypeError("Обработчик должен быть функцией или методом")
+        if self._payload_listeners.add(topic, listener):
+            self.message_bus.subscribe(topic)
 
-                try:
-                    payload = await promise.async_result()
-                finally:
-                    # Возвращаем предыдущий обработчик
-                    self.on_message = previous_handler
-                    try:
-                        self.message_bus.unsubscribe(topic)
-                    except Exception:
-                        pass
-                 
-                # вызываем оригинальный обработчик
-                return await func(payload, *args, **kwargs)
+    def remove_payload_listener(self, topic: str, listener: Callable[[str, str], None]) -> None:
+        """
+        Удалить слушатель сырых сообщений. После удаления последнего слушателя
+        выполняется отписка от топика (если на него нет пользовательского обработчика).
+        """
+        if not self._payload_listeners.remove(topic, listener):
+            return
+        if not self._payload_listeners.has(topic) and topic not in self._topic_handlers:
+            try:
+                self.message_bus.unsubscribe(topic)
+            except Exception as e:
+                print(f"[MANIPULATOR] Ошибка при отписке от топика {topic}: {e}")
 
-            return wrapper
+    def watch_gpio(self, debounce_seconds: float = 0.0) -> GpioWatcher:
+        """
+        Начать отслеживание изменений GPIO по топику /gpio_states.
 
-        return decorator
+        Пример:
+            watcher = robot.watch_gpio(debounce_seconds=0.02)
+            watcher.on_rising(lambda pin, old, new: print(pin), pin="DI1")
+
+        :param debounce_seconds: Время подавления дребезга в секундах
+        :return: Наблюдатель GPIO с обработчиками фронта/спада/изменения
+        """
+        watcher = GpioWatcher(debounce_seconds)
+        self.add_payload_listener("/gpio_states", watcher.process_message)
+        return watcher
+
+    def unwatch_gpio(self, watcher: GpioWatcher) -> None:
+        """Прекратить отслеживание GPIO, начатое через watch_gpio."""
+        self.remove_payload_listener("/gpio_states", watcher.process_message)
+        watcher.close()
+
+    # --- Ожидание условий по телеметрии ---
+
+    def _resolve_waiter(self, predicate: Callable[[Any], bool], promise: Promise, data: Any) -> None:
+        try:
+            matched = predicate(data)
+        except Exception as e:
+            with self._telemetry_lock:
+                if promise.is_active:
+                    promise.reject(e)
+            return
+        if matched:
+            with self._telemetry_lock:
+                if promise.is_active:
+                    promise.resolve(data)
+
+    def _on_waited_telemetry(self, topic: str, payload: str) -> None:
+        """Общий слушатель топика для всех ожиданий: сообщение декодируется один раз."""
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            print(f"Ошибка декодирования JSON из топика {topic}: {payload}")
+            return
+        with self._telemetry_lock:
+            self._telemetry_last[topic] = data
+            waiters = list(self._telemetry_waiters.get(topic, ()))
+        for predicate, promise in waiters:
+            if promise.is_active:
+                self._resolve_waiter(predicate, promise, data)
+
+    def _add_telemetry_waiter(self, topic: str, predicate: Callable[[Any], bool], promise: Promise) -> None:
+        with self._telemetry_lock:
+            waiters = self._telemetry_waiters.setdefault(topic, [])
+            first = not waiters
+            waiters.append((predicate, promise))
+            has_last = topic in self._telemetry_last
+            last = self._telemetry_last.get(topic)
+        if first:
+            self.add_payload_listener(topic, self._on_waited_telemetry)
+        elif has_last:
+            # Подписка уже активна – проверяем последнее полученное значение сразу
+            self._resolve_waiter(predicate, promise, last)
+
+    def _remove_telemetry_waiter(self, topic: str, promise: Promise) -> None:
+        with self._telemetry_lock:
+            waiters = [w for w in self._telemetry_waiters.get(topic, ()) if w[1] is not promise]
+            if waiters:
+                self._telemetry_waiters[topic] = waiters
+                return
+            self._telemetry_waiters.pop(topic, None)
+            self._telemetry_last.pop(topic, None)
+        self.remove_payload_listener(topic, self._on_waited_telemetry)
+
+    def wait_until(self, predicate: Callable[[Any], bool], topic: str = CARTESIAN_COORDINATES_TOPIC,
+                   timeout_seconds: float = 60.0, throw_error: bool = True) -> Any:
+        """
+        Дождаться, пока декодированное сообщение топика удовлетворит условию.
+        Условие проверяется при получении каждого сообщения, без опроса;
+        все ожидания одного топика используют общую подписку.
+
+        Пример:
+            robot.wait_until(lambda msg: abs(msg["position"]["z"] - 0.2) < 0.001)
+
+        :param predicate: Функция predicate(message) -> bool
+        :param topic: Топик телеметрии (по умолчанию /coordinates)
+        :param timeout_seconds: Максимальное время ожидания
+        :param throw_error: Выбрасывать ли CommandTimeout при истечении таймаута
+        :return: Сообщение, на котором условие выполнилось
+        """
+        promise = Promise(timeout_seconds=timeout_seconds, throw_error=throw_error)
+        self._add_telemetry_waiter(topic, predicate, promise)
+        try:
+            return promise.result()
+        except Exception as e:
+            if throw_error:
+                raise
+            return e
+        finally:
+            self._remove_telemetry_waiter(topic, promise)
+
+    async def wait_until_async_await(self, predicate: Callable[[Any], bool], topic: str = CARTESIAN_COORDINATES_TOPIC,
+                                     timeout_seconds: float = 60.0, throw_error: bool = True) -> Any:
+        """
+        Асинхронная версия wait_until
+        :return: Сообщение, на котором условие выполнилось
+        """
+        promise = Promise(timeout_seconds=timeout_seconds, throw_error=throw_error)
+        self._add_telemetry_waiter(topic, predicate, promise)
+        try:
+            return await promise.async_result()
+        except Exception as e:
+            if throw_error:
+                raise
+            return e
+        finally:
+            self._remove_telemetry_waiter(topic, promise)
+
+    def wait_for_gpio(self, name: str, value: Any, timeout_seconds: float = 60.0, throw_error: bool = True) -> Any:
+        """
+        Дождаться значения пина в /gpio_states
+        :param name: Имя пина (для вложенных сообщений – "group/pin")
+        :param value: Ожидаемое значение
+        :return: Сообщение /gpio_states, в котором пин принял значение
+        """
+        return self.wait_until(lambda msg: flatten_gpio_states(msg).get(name) == value, "/gpio_states",
+                               timeout_seconds, throw_error)
+
+    async def wait_for_gpio_async_await(self, name: str, value: Any, timeout_seconds: float = 60.0,
+                                        throw_error: bool = True) -> Any:
+        """
+        Асинхронная версия wait_for_gpio
+        """
+        return await self.wait_until_async_await(lambda msg: flatten_gpio_states(msg).get(name) == value,
+                                                 "/gpio_states", timeout_seconds, throw_error)
 
     # Свойство on_message: позволяет назначить единый обработчик всех входящих сообщений
 
@@ -1382,73 +2345,110 @@ class Manipulator:
 
     # --- Обработчики событий ---
 
-    def _set_topic_handler(self, topic: str, handler: Callable[[Dict[str, Any]], None]):
+    def _set_topic_handler(self, topic: str, handler: Callable[[Dict[str, Any]], None],
+                           policy: Optional[DeliveryPolicy] = None):
         """
         Вспомогательный метод для подписки на топик и установки обработчика.
+        :param policy: Политика доставки (частота, прореживание, только последнее); None – каждое сообщение
         """
         if not callable(handler):
             raise TypeError("Обработчик должен быть функцией или методом")
+        if inspect.iscoroutinefunction(handler):
+            handler = self._bind_coroutine_handler(handler)
+        self._close_delivery_gate(topic)
+        if policy is not None:
+            self._handler_gates[topic] = self._make_delivery_gate(topic, policy, self._call_topic_handler, handler, topic)
         self.message_bus.subscribe(topic)
         self._topic_handlers[topic] = handler
 
-    def set_coordinates_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/coordinates", handler)
+    def _bind_coroutine_handler(self, handler: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+        """Обработчик-корутина выполняется в цикле asyncio, в котором он был назначен."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            raise RuntimeError("Асинхронный обработчик нужно назначать внутри работающего цикла asyncio") from None
+
+        def on_done(future) -> None:
+            if not future.cancelled() and future.exception() is not None:
+                print(f"Ошибка в асинхронном обработчике {getattr(handler, '__name__', handler)}: {future.exception()}")
+
+        def run(data: Dict[str, Any]) -> None:
+            asyncio.run_coroutine_threadsafe(handler(data), loop).add_done_callback(on_done)
 
-    def set_joint_states_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/joint_states", handler)
+        return run
 
-    def set_gpio_states_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/gpio_states", handler)
+    def set_coordinates_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/coordinates", handler, policy)
 
-    def set_gamepad_info_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/gamepad_info", handler)
+    def set_joint_states_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                 policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/joint_states", handler, policy)
 
-    def set_hardware_state_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/hardware_state", handler)
+    def set_gpio_states_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/gpio_states", handler, policy)
 
-    def set_coordinate_limits_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/coordinate_limits", handler)
+    def set_gamepad_info_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                 policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/gamepad_info", handler, policy)
 
-    def set_hardware_error_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/hardware_error", handler)
+    def set_hardware_state_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                   policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/hardware_state", handler, policy)
 
-    def set_manipulator_info_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        self._set_topic_handler("/manipulator_info", handler)
+    def set_coordinate_limits_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                      policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/coordinate_limits", handler, policy)
+
+    def set_hardware_error_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                   policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/hardware_error", handler, policy)
+
+    def set_manipulator_info_handler(self, handler: Callable[[Dict[str, Any]], None],
+                                     policy: Optional[DeliveryPolicy] = None) -> None:
+        self._set_topic_handler("/manipulator_info", handler, policy)
 
     # --- Декораторы для обработчиков событий ---
 
-    def on_topic(self, topic: str):
+    def on_topic(self, topic: str, policy: Optional[DeliveryPolicy] = None):
         """
         Фабрика декораторов для подписки на события из определенного топика.
+        Обработчик может быть корутиной (async def): тогда декоратор применяется
+        внутри работающего цикла asyncio, и обработчик выполняется в этом цикле.
+
+        Пример (панель, которой достаточно 10 Гц):
+            @robot.on_topic("/joint_states", DeliveryPolicy(max_rate=10, latest_only=True))
+            def update(data): ...
         """
         def decorator(handler: Callable[[Dict[str, Any]], None]):
-            self._set_topic_handler(topic, handler)
+            self._set_topic_handler(topic, handler, policy)
             return handler
         return decorator
 
-    def on_coordinates(self):
-        return self.on_topic("/coordinates")
+    def on_coordinates(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/coordinates", policy)
 
-    def on_joint_states(self):
-        return self.on_topic("/joint_states")
+    def on_joint_states(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/joint_states", policy)
 
-    def on_gpio_states(self):
-        return self.on_topic("/gpio_states")
+    def on_gpio_states(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/gpio_states", policy)
 
-    def on_gamepad_info(self):
-        return self.on_topic("/gamepad_info")
+    def on_gamepad_info(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/gamepad_info", policy)
 
-    def on_hardware_state(self):
-        return self.on_topic("/hardware_state")
+    def on_hardware_state(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/hardware_state", policy)
 
-    def on_coordinate_limits(self):
-        return self.on_topic("/coordinate_limits")
+    def on_coordinate_limits(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/coordinate_limits", policy)
 
-    def on_hardware_error(self):
-        return self.on_topic("/hardware_error")
+    def on_hardware_error(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/hardware_error", policy)
 
-    def on_manipulator_info(self):
-        return self.on_topic("/manipulator_info")
+    def on_manipulator_info(self, policy: Optional[DeliveryPolicy] = None):
+        return self.on_topic("/manipulator_info", policy)
 
     def clear_all_commands(self) -> None:
         """Принудительно очищает все незавершенные команды"""
@@ -1487,6 +2487,14 @@ class Manipulator:
 
         Метод безопасен к повторному вызову: если соединение уже разорвано, он ничего не делает.
         """
+        try:
+            self.write_coalescer.close()
+        except Exception as e:
+            print(f"[MANIPULATOR] Ошибка при отправке отложенных записей: {e}")
+        try:
+            self.disable_handler_dispatcher()
+        except Exception as e:
+            print(f"[MANIPULATOR] Ошибка при остановке диспетчера обработчиков: {e}")
         try:
             if self.message_bus is not None and getattr(self.message_bus, "is_connected", False):
                 self.message_bus.disconnect()
@@ -1509,10 +2517,12 @@ class Manipulator:
             topic: Топик, от которого нужно отписаться (например, "/joint_states")
         """
         try:
-            # Отписываемся на уровне MQTT
-            self.message_bus.unsubscribe(topic)
+            # Отписываемся на уровне MQTT, если топик не нужен внутренним слушателям (насадки, наблюдатели GPIO)
+            if not self._payload_listeners.has(topic):
+                self.message_bus.unsubscribe(topic)
             
             # Удаляем обработчик из словаря
+            self._close_delivery_gate(topic)
             if topic in self._topic_handlers:
                 del self._topic_handlers[topic]
                 print(f"[MANIPULATOR] Отписались от топика {topic}")
@@ -1551,10 +2561,13 @@ class Manipulator:
     def set_conveyer_velocity(self, velocity: float, timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
         command = self.set_conveyer_velocity_async(velocity, timeout_seconds, throw_error)
         command.make_command_action()
-        command.result()
+        result = command.result()
+        if isinstance(result, dict):
+            self.conveyor_velocity = velocity
         self.specific_command = None
 
     def set_conveyer_velocity_async(self, velocity: float, timeout_seconds: float = 60.0, throw_error: bool = True) -> SetConveyorVelocityCommand:
+        self.write_coalescer.invalidate((CONVEYOR_VELOCITY, None), discard_pending=True)
         self.specific_command = SetConveyorVelocityCommand(
             self.message_bus.publish,
             velocity,
@@ -1647,6 +2660,69 @@ class Manipulator:
         self.specific_command = None
         return result.get('data', {}).get('value', None)
 
+    def _collect_channel_values(self, names: List[str], commands: List[SdkCommand], throw_error: bool) -> Dict[str, Any]:
+        """Выполняет команды чтения каналов конвейером и собирает значения в словарь."""
+        values: Dict[str, Any] = {}
+        for name, result in zip(names, self._run_commands_pipelined(commands)):
+            if isinstance(result, Exception):
+                if throw_error:
+                    raise result
+                values[name] = None
+            elif isinstance(result, dict):
+                values[name] = result.get('data', {}).get('value', None)
+            else:
+                values[name] = None
+        return values
+
+    def _check_channel_writes(self, results: List[Any], throw_error: bool) -> None:
+        if throw_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+    def get_gpio_values(self, names: List[str], timeout_seconds: float = 60.0, throw_error: bool = True) -> Dict[str, Optional[float]]:
+        """
+        Прочитать несколько GPIO за один проход: команды отправляются без ожидания
+        ответов друг друга, поэтому чтение N каналов занимает около одного кругового обмена.
+        :param names: Имена GPIO
+        :param timeout_seconds: Timeout операции (по умолчанию 60 секунд)
+        :param throw_error: Флаг выбрасывания исключения при ошибке (иначе значение канала – None)
+        :return: Словарь имя -> значение
+        """
+        commands = [GetGpio(self.message_bus.publish, name, timeout_seconds, True, self.message_bus) for name in names]
+        return self._collect_channel_values(list(names), commands, throw_error)
+
+    async def get_gpio_values_async_await(self, names: List[str], timeout_seconds: float = 60.0, throw_error: bool = True) -> Dict[str, Optional[float]]:
+        return await self._run_async(self.get_gpio_values, names, timeout_seconds, throw_error)
+
+    def write_gpio_values(self, values: Dict[str, int], timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+        """
+        Записать несколько GPIO за один проход
+        :param values: Словарь имя -> значение
+        :param timeout_seconds: Timeout операции (по умолчанию 60 секунд)
+        :param throw_error: Флаг выбрасывания исключения при ошибке
+        """
+        for name in values:
+            self.write_coalescer.invalidate((WRITE_GPIO, name), discard_pending=True)
+        commands = [WriteGPIO(name, value, self.message_bus.publish, timeout_seconds, True) for name, value in values.items()]
+        self._check_channel_writes(self._run_commands_pipelined(commands), throw_error)
+
+    async def write_gpio_values_async_await(self, values: Dict[str, int], timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+        await self._run_async(self.write_gpio_values, values, timeout_seconds, throw_error)
+
+    def write_i2c_values(self, values: Dict[str, int], timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+        """
+        Записать несколько I2C-каналов за один проход
+        :param values: Словарь имя -> значение
+        :param timeout_seconds: Timeout операции (по умолчанию 60 секунд)
+        :param throw_error: Флаг выбрасывания исключения при ошибке
+        """
+        commands = [WriteI2C(name, value, self.message_bus.publish, timeout_seconds, True) for name, value in values.items()]
+        self._check_channel_writes(self._run_commands_pipelined(commands), throw_error)
+
+    async def write_i2c_values_async_await(self, values: Dict[str, int], timeout_seconds: float = 60.0, throw_error: bool = True) -> None:
+        await self._run_async(self.write_i2c_values, values, timeout_seconds, throw_error)
+
     def move_group_async(self,
                          points: Optional[List[Point3D]] = None,
                          positions: Optional[List[JointPositions]] = None,
@@ -1660,6 +2736,8 @@ class Manipulator:
                          count_points: int = 50,
                          timeout_seconds: float = 60.0,
                          throw_error: bool = True) -> MoveGroup:
+        if self.motion_validator is not None:
+            self.motion_validator.check_group(points, positions)
         self.specific_command = MoveGroup(
             self.message_bus.publish,
             points,
@@ -1720,12 +2798,22 @@ class Manipulator:
         self.message_bus.subscribe(COMMAND_RESULT_TOPIC)
         return self.specific_command
 
-    async def get_home_position_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> dict:
-        return await self._run_async(self.get_home_position, timeout_seconds, throw_error)
+    async def get_home_position_async_await(self, timeout_seconds: float = 60.0, throw_error: bool = True,
+                                            use_cache: bool = True) -> dict:
+        return await self._run_async(self.get_home_position, timeout_seconds, throw_error, use_cache)
 
-    def get_home_position(self, timeout_seconds: float = 60.0, throw_error: bool = True) -> dict:
-        command = self.get_home_position_async(timeout_seconds, throw_error)
-        command.make_command_action()
-        result: dict[str, Any] = self.specific_command.result()
-        self.specific_command = None
+    def get_home_position(self, timeout_seconds: float = 60.0, throw_error: bool = True, use_cache: bool = True) -> dict:
+        """
+        Домашняя позиция
+        :param use_cache: Взять значение из кэша, если он включён (False – запросить заново)
+        """
+        def fetch() -> Any:
+            command = self.get_home_position_async(timeout_seconds, throw_error)
+            command.make_command_action()
+            try:
+                return command.result()
+            finally:
+                self.specific_command = None
+        # Ошибка (строка или исключение) не кэшируется – следующий вызов запросит позицию снова
+        result = self._cached_metadata(HOME_POSITION, fetch, use_cache)
         return result.get('data', {}) if isinstance(result, dict) else {}
\ No newline at end of file
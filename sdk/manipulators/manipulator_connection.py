@@ -27,7 +27,7 @@ class ManipulatorConnection(MessageBus):
 
         self.mqtt_client = mqtt.Client(client_id=self.client_id, protocol=mqtt.MQTTv311)
         self.mqtt_client.on_connect = self.on_connect
-        self.mqtt_client.on_message = self.on_message
+        self.mqtt_client.on_message = self.on_mqtt_message
 
     def connect(self, **kwargs) -> None:
         self.connect_future = Promise()
@@ -140,7 +140,8 @@ class ManipulatorConnection(MessageBus):
         else:
             self.connect_future.reject(ConnectionError(f"Ошибка подключения к MQTT брокеру (rc={rc})"))
 
-    def on_message(self, client: mqtt.Client, userdata, msg: mqtt.MQTTMessage) -> None:
+    # Колбэк paho назван иначе, чем MessageBus.on_message(topic, handler), чтобы не перекрывать регистрацию обработчиков
+    def on_mqtt_message(self, client: mqtt.Client, userdata, msg: mqtt.MQTTMessage) -> None:
         decoded_payload = msg.payload.decode("utf-8")
         if msg.topic == "/command_result":
             print(f"[MQTT] Ответ: {decoded_payload}")
@@ -148,4 +149,8 @@ class ManipulatorConnection(MessageBus):
         if self.message_processor is not None:
             self.message_processor(msg.topic, decoded_payload)
         else:
-            print(f"[MQTT] message_processor не установлен!")
\ No newline at end of file
+            print(f"[MQTT] message_processor не установлен!")
+
+        # Обработчики, зарегистрированные через on_message(topic, handler) (в т.ч. по шаблонам)
+        if self.has_handlers:
+            self._process_message(msg.topic, decoded_payload)
\ No newline at end of file
@@ -1,9 +1,43 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
+import asyncio
 import json
+import threading
 from sdk.promise import Promise
 from sdk.utils.message_bus import MessageBus
 from sdk.manipulators.manipulator_connection import ManipulatorConnection
 from sdk.commands.abstracts.sdk_command import SdkCommand
+from sdk.utils.metadata_cache import MANIPULATOR_INFO
+
+# Топики, которые snapshot() читает по умолчанию
+SNAPSHOT_TOPICS = (
+    "/manipulator_info",
+    "/hardware_state",
+    "/coordinate_limits",
+    "/gamepad_info",
+    "/gpio_states",
+    "/i2c_states",
+)
+
+# Топик -> (атрибут последнего сообщения, атрибут ожидающего Promise)
+_TOPIC_SLOTS = {
+    "/manipulator_info": ("_last_info", "_info_promise"),
+    "/hardware_state": ("_last_hardware_state", "_hardware_state_promise"),
+    "/joint_states": ("_last_joint_states", "_joint_states_promise"),
+    "/coordinates": ("_last_coordinates", "_coordinates_promise"),
+    "/coordinate_limits": ("_last_coordinate_limits", "_coordinate_limits_promise"),
+    "/gamepad_info": ("_last_gamepad_info", "_gamepad_info_promise"),
+    "/gpio_states": ("_last_gpio_states", "_gpio_states_promise"),
+    "/i2c_states": ("_last_i2c_states", "_i2c_states_promise"),
+    '/command_result': ('_last_command_result_states', '_command_result_states_promise')
+}
+
+# Promise манипулятора, ожидающие сообщения топика (get_cartesian_coordinates и т.п.)
+_MANIPULATOR_PROMISES = {
+    "/coordinates": "cartesian_coordinates_promise",
+    "/joint_states": "joint_state_promise",
+    "/pixy_coordinates": "pixy_coordinates_promise",
+}
+
 
 class ManipulatorInfo:
     def __init__(self, message_bus: MessageBus):
@@ -29,18 +63,15 @@ class ManipulatorInfo:
         self._last_command_result_states: Optional[str] = None
         self._last_i2c_states: Optional[str] = None
 
+        # Ожидания snapshot(): у каждого вызова свой Promise на каждый топик
+        self._snapshot_waiters: Dict[str, List[Promise]] = {}
+        self._snapshot_lock = threading.Lock()
+
     def process_message(self, topic: str, payload: str) -> None:
-        topic_mapping = {
-            "/manipulator_info": ("_last_info", "_info_promise"),
-            "/hardware_state": ("_last_hardware_state", "_hardware_state_promise"),
-            "/joint_states": ("_last_joint_states", "_joint_states_promise"),
-            "/coordinates": ("_last_coordinates", "_coordinates_promise"),
-            "/coordinate_limits": ("_last_coordinate_limits", "_coordinate_limits_promise"),
-            "/gamepad_info": ("_last_gamepad_info", "_gamepad_info_promise"),
-            "/gpio_states": ("_last_gpio_states", "_gpio_states_promise"),
-            "/i2c_states": ("_last_i2c_states", "_i2c_states_promise"),
-            '/command_result': ('_last_command_result_states', '_command_result_states_promise')
-        }
+        topic_mapping = _TOPIC_SLOTS
+
+        if self._snapshot_waiters:
+            self._resolve_snapshot_waiters(topic, payload)
 
         if topic in topic_mapping:
             last_attr, promise_attr = topic_mapping[topic]
@@ -110,16 +141,31 @@ class ManipulatorInfo:
         finally:
             self._command_result_states_promise = None
     
-    def get_manipulator_info(self, timeout_seconds: float = 60.0) -> Dict[str, Any]:
-        """Получить информацию о манипуляторе"""
+    def _metadata_cache(self):
+        return getattr(self._manipulator_ref, "metadata_cache", None)
+
+    def get_manipulator_info(self, timeout_seconds: float = 60.0, use_cache: bool = True) -> Dict[str, Any]:
+        """Получить информацию о манипуляторе (из кэша манипулятора, если он включён и use_cache=True)"""
+        cache = self._metadata_cache()
+        if cache is not None:
+            return cache.get_or_fetch(MANIPULATOR_INFO,
+                                      lambda: self.snapshot(["/manipulator_info"], timeout_seconds, True)["/manipulator_info"],
+                                      refresh=not use_cache)
         self._info_promise = Promise(timeout_seconds=timeout_seconds)
         try:
             return self._safe_get_data("/manipulator_info", self._info_promise, self._last_info, timeout_seconds)
         finally:
             self._info_promise = None
 
-    async def get_manipulator_info_async(self, timeout_seconds: float = 60.0) -> Dict[str, Any]:
+    async def get_manipulator_info_async(self, timeout_seconds: float = 60.0, use_cache: bool = True) -> Dict[str, Any]:
         """Получить информацию о манипуляторе (асинхронная версия)"""
+        cache = self._metadata_cache()
+        if cache is not None:
+            info = cache.get(MANIPULATOR_INFO) if use_cache else None
+            if info is None:
+                info = (await self.snapshot_async(["/manipulator_info"], timeout_seconds, True))["/manipulator_info"]
+                cache.set(MANIPULATOR_INFO, info)
+            return info
         self._info_promise = Promise(timeout_seconds=timeout_seconds)
         try:
             return await self._safe_get_data_async("/manipulator_info", self._info_promise, self._last_info, timeout_seconds)
@@ -254,4 +300,128 @@ class ManipulatorInfo:
         try:
             return await self._safe_get_data_async("/i2c_states", self._i2c_states_promise, self._last_i2c_states, timeout_seconds)
         finally:
-            self._i2c_states_promise = None 
\ No newline at end of file
+            self._i2c_states_promise = None 
+
+    # -------------------------------------------------
+    # Снимок всех информационных топиков
+    # -------------------------------------------------
+    def _resolve_snapshot_waiters(self, topic: str, payload: str) -> None:
+        with self._snapshot_lock:
+            waiters = self._snapshot_waiters.pop(topic, None)
+        for promise in waiters or ():
+            try:
+                promise.resolve(payload)
+            except Exception as e:
+                print(f"[ManipulatorInfo] Ошибка при promise.resolve: {e}")
+
+    def _begin_snapshot(self, topics: Iterable[str], timeout_seconds: float) -> Dict[str, Promise]:
+        promises: Dict[str, Promise] = {}
+        for topic in topics:
+            if topic in promises:
+                continue
+            promise = Promise(timeout_seconds=timeout_seconds)
+            with self._snapshot_lock:
+                self._snapshot_waiters.setdefault(topic, []).append(promise)
+            promises[topic] = promise
+        # Подписываемся на все топики сразу: первые сообщения ждутся параллельно
+        for topic in promises:
+            self.message_bus.subscribe(topic)
+        return promises
+
+    def _end_snapshot(self, promises: Dict[str, Promise]) -> None:
+        for topic, promise in promises.items():
+            with self._snapshot_lock:
+                waiters = self._snapshot_waiters.get(topic)
+                if waiters is not None and promise in waiters:
+                    waiters.remove(promise)
+                    if not waiters:
+                        del self._snapshot_waiters[topic]
+                still_waited = topic in self._snapshot_waiters
+            if still_waited or self._topic_in_use(topic):
+                continue
+            try:
+                self.message_bus.unsubscribe(topic)
+            except Exception:
+                pass
+
+    def _topic_in_use(self, topic: str) -> bool:
+        """Нужен ли топик кому-то ещё (идущие get_*, обработчики пользователя, внутренние слушатели)."""
+        slots = _TOPIC_SLOTS.get(topic)
+        if slots is not None and self._is_waiting(getattr(self, slots[1], None)):
+            return True
+        manipulator = self._manipulator_ref
+        if manipulator is None:
+            return False
+        if topic in _MANIPULATOR_PROMISES and self._is_waiting(getattr(manipulator, _MANIPULATOR_PROMISES[topic], None)):
+            return True
+        if topic in getattr(manipulator, "_topic_handlers", {}):
+            return True
+        listeners = getattr(manipulator, "_payload_listeners", None)
+        return listeners is not None and listeners.has(topic)
+
+    @staticmethod
+    def _is_waiting(promise: Any) -> bool:
+        return isinstance(promise, Promise) and promise.is_active
+
+    @staticmethod
+    def _snapshot_result(outcomes: Dict[str, Any], throw_error: bool) -> Dict[str, Dict[str, Any]]:
+        result: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, BaseException] = {}
+        for topic, outcome in outcomes.items():
+            if isinstance(outcome, BaseException):
+                failed[topic] = outcome
+                continue
+            try:
+                result[topic] = json.loads(outcome) if outcome else {}
+            except json.JSONDecodeError as e:
+                failed[topic] = e
+        if failed and throw_error:
+            details = ", ".join(f"{topic}: {error}" for topic, error in failed.items())
+            raise Exception(f"Нет данных из топиков: {details}")
+        for topic, error in failed.items():
+            result[topic] = {"error": f"topic_{topic.replace('/', '').replace('_', '')}_unavailable", "message": str(error)}
+        return result
+
+    def snapshot(self,
+                 topics: Optional[Iterable[str]] = None,
+                 timeout_seconds: float = 5.0,
+                 throw_error: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Получить первое сообщение каждого информационного топика за одно ожидание:
+        подписка на все топики выполняется сразу, ответы ждутся параллельно.
+
+        Пример:
+            state = robot.info.snapshot()
+            print(state["/hardware_state"], state["/gpio_states"])
+
+        :param topics: Топики (по умолчанию SNAPSHOT_TOPICS)
+        :param timeout_seconds: Общий таймаут ожидания, с
+        :param throw_error: Выбросить исключение, если из какого-то топика нет данных;
+            иначе вместо данных топика возвращается {"error": ..., "message": ...}
+        :return: {топик: данные}
+        """
+        promises = self._begin_snapshot(SNAPSHOT_TOPICS if topics is None else topics, timeout_seconds)
+        try:
+            outcomes: Dict[str, Any] = {}
+            for topic, promise in promises.items():
+                # Таймаут Promise отсчитывается от создания, поэтому ожидания не складываются
+                try:
+                    outcomes[topic] = promise.result()
+                except Exception as e:
+                    outcomes[topic] = e
+            return self._snapshot_result(outcomes, throw_error)
+        finally:
+            self._end_snapshot(promises)
+
+    async def snapshot_async(self,
+                             topics: Optional[Iterable[str]] = None,
+                             timeout_seconds: float = 5.0,
+                             throw_error: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Получить первое сообщение каждого информационного топика (асинхронная версия snapshot)"""
+        promises = self._begin_snapshot(SNAPSHOT_TOPICS if topics is None else topics, timeout_seconds)
+        try:
+            results = await asyncio.gather(*(promise.async_result() for promise in promises.values()),
+                                           return_exceptions=True)
+            return self._snapshot_result(dict(zip(promises.keys(), results)), throw_error)
+        finally:
+            self._end_snapshot(promises)
@@ -1,7 +1,7 @@
 from time import sleep
 import asyncio
 import json
-from typing import Dict, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any
 
 from sdk.commands.gripper_control_command import GripperControlCommand
 from sdk.commands.nozzle_power_command import NozzlePowerCommand
@@ -13,14 +13,18 @@ from sdk.manipulators.manipulator_connection import ManipulatorConnection
 from sdk.commands.abstracts.sdk_command import NoWaitCommand
 from sdk.commands.manipulator_commands import GetI2C
 from sdk.manipulators.extern_devices.mgbot.mgbot_conveyer import MGbotConveyer
+from sdk.utils.delivery_policy import DeliveryGate, DeliveryPolicy
+from sdk.motion.kinematics import MEDU_JOINTS
 
 class MEdu (Manipulator):
     message_bus: ManipulatorConnection
     joint_state_callback: Optional[Callable]
+    kinematic_joints = MEDU_JOINTS
 
     def __init__(self, host: str, client_id: str, login: str, password: str):
         super(MEdu, self).__init__(host, client_id, login, password)
         self.joint_state_callback = None
+        self._joint_state_gate: Optional[DeliveryGate] = None
         self.mgbot_conveyer = MGbotConveyer(self.message_bus, self._run_async, self)
 
     def _cleanup_finished_commands(self):
@@ -55,6 +59,7 @@ class MEdu (Manipulator):
             MoveAnglesCommandParamsAngleInfo("privod_plecha", privod_plecha, v_plecha),
             MoveAnglesCommandParamsAngleInfo("privod_strely", privod_strely, v_strely)
         ]
+        self._validate_angles(angles)
         
         self.move_angles_command = MoveAnglesCommand(
             self.message_bus.publish, 
@@ -98,6 +103,7 @@ class MEdu (Manipulator):
             MoveAnglesCommandParamsAngleInfo("privod_plecha", privod_plecha, v_plecha),
             MoveAnglesCommandParamsAngleInfo("privod_strely", privod_strely, v_strely)
         ]
+        self._validate_angles(angles)
         
         command = MoveAnglesCommand(
             self.message_bus.publish, 
@@ -172,6 +178,8 @@ class MEdu (Manipulator):
             "velocity_factor": velocity_factor,
             "acceleration_factor": acceleration_factor
         }
+        if self.motion_validator is not None:
+            self.motion_validator.check_joints(data["positions"])
         
         command = NoWaitCommand(self.message_bus.publish, "move_joints", data, message_bus=self.message_bus)
         self.active_commands[command.command_id] = command
@@ -387,11 +395,16 @@ class MEdu (Manipulator):
         
         await self.stream_joint_positions_async(positions, velocities)
 
-    def subscribe_to_joint_state(self, callback: callable) -> None:
+    def subscribe_to_joint_state(self, callback: callable, policy: Optional[DeliveryPolicy] = None) -> None:
         """
         Подписаться на обновления состояния узлов манипулятора
         :param callback: Функция обратного вызова, принимающая параметр с данными состояния узлов
+        :param policy: Политика доставки (например, DeliveryPolicy(max_rate=10)); None – каждое сообщение
         """
+        self._close_joint_state_gate()
+        if policy is not None:
+            self._joint_state_gate = self._make_delivery_gate(JOINT_INFO_TOPIC, policy,
+                                                              self._call_joint_state_callback, callback)
         self.joint_state_callback = callback
         self.message_bus.subscribe(JOINT_INFO_TOPIC)
     
@@ -400,7 +413,13 @@ class MEdu (Manipulator):
         Отписаться от обновлений состояния узлов манипулятора
         """
         self.joint_state_callback = None
+        self._close_joint_state_gate()
         self.message_bus.unsubscribe(JOINT_INFO_TOPIC)
+
+    def _close_joint_state_gate(self) -> None:
+        gate, self._joint_state_gate = self._joint_state_gate, None
+        if gate is not None:
+            gate.close()
     
     def process_message(self, topic: str, payload: str) -> None:
         self._cleanup_finished_commands()
@@ -421,13 +440,21 @@ class MEdu (Manipulator):
                 import traceback
                 traceback.print_exc()
         if topic == JOINT_INFO_TOPIC and self.joint_state_callback is not None:
-            try:
-                data = json.loads(payload)
-                self.joint_state_callback(data)
-            except Exception as e:
-                print(f"[MEdu] ОШИБКА при обработке joint state: {e}")
+            gate = self._joint_state_gate
+            if gate is not None:
+                gate.offer(payload)
+            else:
+                self._dispatch_handler(topic, self._call_joint_state_callback, self.joint_state_callback, payload)
         super().process_message(topic, payload)
 
+    @staticmethod
+    def _call_joint_state_callback(callback: Callable, payload: str) -> Any:
+        try:
+            data = json.loads(payload)
+            return callback(data)
+        except Exception as e:
+            print(f"[MEdu] ОШИБКА при обработке joint state: {e}")
+
     def get_i2c_value(self, name: str, timeout_seconds: float = 60.0, throw_error: bool = True) -> Optional[float]:
         self.specific_command = GetI2C(self.message_bus.publish, name, timeout_seconds, throw_error)
         self.message_bus.subscribe(COMMAND_TOPIC)
@@ -436,3 +463,17 @@ class MEdu (Manipulator):
         result: dict[str, Any] = self.specific_command.result()
         self.specific_command = None
         return result.get('data', {}).get('value', None)
+
+    def get_i2c_values(self, names: List[str], timeout_seconds: float = 60.0, throw_error: bool = True) -> Dict[str, Optional[float]]:
+        """
+        Прочитать несколько I2C-каналов за один проход
+        :param names: Имена каналов
+        :param timeout_seconds: Timeout операции (по умолчанию 60 секунд)
+        :param throw_error: Флаг выбрасывания исключения при ошибке (иначе значение канала – None)
+        :return: Словарь имя -> значение
+        """
+        commands = [GetI2C(self.message_bus.publish, name, timeout_seconds, True, self.message_bus) for name in names]
+        return self._collect_channel_values(list(names), commands, throw_error)
+
+    async def get_i2c_values_async_await(self, names: List[str], timeout_seconds: float = 60.0, throw_error: bool = True) -> Dict[str, Optional[float]]:
+        return await self._run_async(self.get_i2c_values, names, timeout_seconds, throw_error)
@@ -0,0 +1,185 @@
+"""
+Асинхронная подписка на топик: сообщения из потока MQTT передаются в
+ограниченную asyncio.Queue и читаются через `async for`.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+_MISSING = object()
+
+
+class TopicMessage:
+    """Сообщение топика. JSON разбирается при первом обращении к data."""
+    __slots__ = ("topic", "payload", "timestamp", "_data")
+
+    def __init__(self, topic: str, payload: str, timestamp: float):
+        self.topic = topic
+        self.payload = payload
+        self.timestamp = timestamp
+        self._data = _MISSING
+
+    @property
+    def data(self) -> Any:
+        """Содержимое сообщения, разобранное из JSON."""
+        if self._data is _MISSING:
+            self._data = json.loads(self.payload)
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"TopicMessage(topic={self.topic!r}, payload={self.payload!r})"
+
+
+class TopicSubscription:
+    """Асинхронный итератор по сообщениям топика (шаблоны "+"/"#" допускаются).
+
+    Сообщения копятся в потоке MQTT и одной задачей цикла переносятся в
+    asyncio.Queue размера maxsize; при переполнении вытесняются самые старые
+    (счётчик dropped). С conflate=True хранится только последнее сообщение –
+    режим для частой телеметрии, когда важно текущее состояние, а не история.
+
+    Пример:
+        async with robot.subscribe("/joint_states", conflate=True) as joints:
+            async for msg in joints:
+                print(msg.data)
+    """
+
+    def __init__(self, manipulator: Any, topic: str, maxsize: int = 100, conflate: bool = False):
+        """
+        :param manipulator: Манипулятор (источник сообщений)
+        :param topic: Топик или шаблон
+        :param maxsize: Размер очереди
+        :param conflate: Хранить только последнее сообщение
+        """
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            raise RuntimeError("subscribe() нужно вызывать внутри работающего цикла asyncio") from None
+        if maxsize < 1:
+            raise ValueError("Размер очереди должен быть не меньше 1")
+        self.topic = topic
+        self.conflate = conflate
+        self.maxsize = 1 if conflate else maxsize
+        self.dropped = 0
+        self._manipulator = manipulator
+        self._queue: "asyncio.Queue[Optional[TopicMessage]]" = asyncio.Queue(self.maxsize)
+        self._incoming: Deque[Tuple[str, str, float]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup_pending = False
+        self._closed = False
+        manipulator.add_payload_listener(topic, self._on_payload)
+
+    # -------------------------------------------------
+    # Поток MQTT
+    # -------------------------------------------------
+    def _on_payload(self, topic: str, payload: str) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            if self.conflate and self._incoming:
+                self._incoming.clear()
+                self.dropped += 1
+            self._incoming.append((topic, payload, time.monotonic()))
+            # Один вызов в цикл asyncio на пачку сообщений, а не на каждое
+            if self._wakeup_pending:
+                return
+            self._wakeup_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # Цикл закрыт – подписка больше не нужна
+            self._detach()
+
+    # -------------------------------------------------
+    # Цикл asyncio
+    # -------------------------------------------------
+    def _drain(self) -> None:
+        with self._lock:
+            items = list(self._incoming)
+            self._incoming.clear()
+            self._wakeup_pending = False
+        for topic, payload, timestamp in items:
+            self._put(TopicMessage(topic, payload, timestamp))
+
+    def _put(self, item: TopicMessage) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+
+    def _wake_waiters(self) -> None:
+        # Ожидающий get() бывает только при пустой очереди; иначе get() завершится,
+        # когда дочитает оставшиеся сообщения
+        if self._queue.empty():
+            self._queue.put_nowait(None)
+
+    async def get(self, timeout: Optional[float] = None) -> TopicMessage:
+        """
+        Дождаться следующего сообщения
+        :param timeout: Таймаут, с (None – без ограничения)
+        :raises asyncio.TimeoutError: Сообщение не пришло за timeout
+        :raises StopAsyncIteration: Подписка закрыта
+        """
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+        if timeout is None:
+            message = await self._queue.get()
+        else:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    def get_nowait(self) -> Optional[TopicMessage]:
+        """Взять сообщение из очереди без ожидания (None – очередь пуста)."""
+        try:
+            message = self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        return message
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def __aiter__(self) -> "TopicSubscription":
+        return self
+
+    async def __anext__(self) -> TopicMessage:
+        return await self.get()
+
+    # -------------------------------------------------
+    # Завершение
+    # -------------------------------------------------
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _detach(self) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._closed = True
+            self._incoming.clear()
+        self._manipulator.remove_payload_listener(self.topic, self._on_payload)
+        return True
+
+    def close(self) -> None:
+        """Отписаться; ожидающие get()/async for завершатся (потокобезопасно)."""
+        if not self._detach():
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake_waiters)
+        except RuntimeError:
+            pass
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "TopicSubscription":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
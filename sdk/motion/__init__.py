@@ -0,0 +1,16 @@
+"""
+Расчёты движения на стороне SDK: проверка пределов, кинематика, траектории.
+"""
+from .limits import JointLimits, WorkspaceLimits, MotionValidator
+from .kinematics import DHLink, URDFJoint, KinematicChain, M13_JOINTS, MEDU_JOINTS
+from .inverse_kinematics import InverseKinematics
+from .paths import TrapezoidProfile, LineSegment, ArcSegment, Path, PathSamples
+from .timing import JointTrajectory, TimedSegment, joint_rows
+from .palletizing import PalletRecipe, PalletPlan, PalletPlanner, build_plan
+
+__all__ = ["JointLimits", "WorkspaceLimits", "MotionValidator",
+           "DHLink", "URDFJoint", "KinematicChain", "M13_JOINTS", "MEDU_JOINTS",
+           "InverseKinematics",
+           "TrapezoidProfile", "LineSegment", "ArcSegment", "Path", "PathSamples",
+           "JointTrajectory", "TimedSegment", "joint_rows",
+           "PalletRecipe", "PalletPlan", "PalletPlanner", "build_plan"]
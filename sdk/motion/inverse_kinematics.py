@@ -0,0 +1,333 @@
+"""
+Обратная кинематика на стороне SDK: аналитическое решение для трёхосевой
+схемы в записи DH (основание, плечо, стрела) и метод демпфированных наименьших
+квадратов (DLS) для остальных цепей, в том числе построенных по URDF. Решения кэшируются по
+близким позам и служат начальным приближением для следующих целей.
+"""
+import math
+import random
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sdk.errors import KinematicsError
+from sdk.motion.kinematics import DHLink, KinematicChain, rotation_to_quaternion
+from sdk.motion.limits import JointLimits
+from sdk.utils.numeric import solve_linear
+
+Vector3 = Tuple[float, float, float]
+Quaternion = Tuple[float, float, float, float]
+
+TWO_PI = 2 * math.pi
+
+
+def _parse_target(target: Any) -> Tuple[Vector3, Optional[Quaternion]]:
+    """Point3D/Pose, Position, (x, y, z) или (x, y, z, qx, qy, qz, qw) -> (положение, кватернион или None)."""
+    position = getattr(target, "position", None)
+    if position is not None:
+        orientation = getattr(target, "orientation", None)
+        quaternion = None
+        if orientation is not None:
+            quaternion = (orientation.x, orientation.y, orientation.z, orientation.w)
+        return (position.x, position.y, position.z), quaternion
+    if hasattr(target, "x") and hasattr(target, "z"):
+        return (target.x, target.y, target.z), None
+    values = [float(v) for v in target]
+    if len(values) == 3:
+        return (values[0], values[1], values[2]), None
+    if len(values) == 7:
+        return (values[0], values[1], values[2]), (values[3], values[4], values[5], values[6])
+    raise ValueError("Цель задаётся позой, положением (x, y, z) или (x, y, z, qx, qy, qz, qw)")
+
+
+def _orientation_error(current: Quaternion, target: Quaternion) -> Vector3:
+    """Вектор поворота (ось * угол), переводящий current в target, в мировой системе."""
+    x1, y1, z1, w1 = target
+    x2, y2, z2, w2 = -current[0], -current[1], -current[2], current[3]
+    # q_err = target * conj(current)
+    w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+    x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+    y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+    z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+    if w < 0:
+        x, y, z, w = -x, -y, -z, -w
+    norm = math.sqrt(x * x + y * y + z * z)
+    if norm < 1e-12:
+        return 0.0, 0.0, 0.0
+    scale = 2 * math.atan2(norm, w) / norm
+    return x * scale, y * scale, z * scale
+
+
+class InverseKinematics:
+    """Решатель обратной кинематики для цепи KinematicChain.
+
+    Для цепи вида «поворот основания + два звена в вертикальной плоскости»
+    (MEdu) используется точное аналитическое решение по положению. Для
+    остальных цепей (M13) – итерационный метод DLS по положению и ориентации
+    с адаптивным демпфированием и перезапусками из случайных конфигураций.
+
+    Начальное приближение выбирается так: явный seed, затем решение для
+    близкой позы из кэша, затем предыдущее решение. При движении по
+    траектории соседние цели сходятся за одну-две итерации.
+
+    Пример:
+        ik = InverseKinematics(robot.kinematics)
+        angles = ik.solve(Point3D(Position(0.4, 0.1, 0.3), Orientation(1, 0, 0, 0)))
+        path = ik.solve_many(points)  # каждая точка стартует с решения предыдущей
+    """
+
+    def __init__(self,
+                 chain: KinematicChain,
+                 joint_limits: Optional[JointLimits] = None,
+                 tolerance: float = 1e-5,
+                 orientation_tolerance: float = 1e-4,
+                 damping: float = 0.01,
+                 max_iterations: int = 100,
+                 restarts: int = 4,
+                 cache_size: int = 4096,
+                 cache_resolution: float = 0.005):
+        """
+        :param chain: Кинематическая цепь
+        :param joint_limits: Пределы суставов (решения вне пределов отбрасываются)
+        :param tolerance: Допустимая ошибка положения, м
+        :param orientation_tolerance: Допустимая ошибка ориентации, рад
+        :param damping: Начальный коэффициент демпфирования DLS
+        :param max_iterations: Предел итераций на одну попытку
+        :param restarts: Число перезапусков из случайных конфигураций, если попытка не сошлась
+        :param cache_size: Число поз в кэше начальных приближений (0 – без кэша)
+        :param cache_resolution: Шаг сетки кэша по положению, м
+        """
+        self.chain = chain
+        self.joint_limits = joint_limits
+        self.tolerance = tolerance
+        self.orientation_tolerance = orientation_tolerance
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.restarts = restarts
+        self.cache_size = cache_size
+        self.cache_resolution = cache_resolution
+        self._cache: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._last: Optional[List[float]] = None
+        self._random = random.Random(0)
+        self._bounds = self._joint_bounds()
+        self.analytic = self._is_planar_3dof(chain)
+        self.iterations = 0
+
+    # -------------------------------------------------
+    # Общий интерфейс
+    # -------------------------------------------------
+    def solve(self, target: Any, seed: Optional[Sequence[float]] = None, orientation: Optional[bool] = None,
+              restarts: Optional[int] = None) -> List[float]:
+        """
+        Углы суставов для цели
+        :param target: Поза (Point3D/Pose), положение (x, y, z) или (x, y, z, qx, qy, qz, qw)
+        :param seed: Начальное приближение (по умолчанию кэш или предыдущее решение)
+        :param orientation: Учитывать ориентацию (по умолчанию – если она задана и у цепи 6 и более суставов)
+        :param restarts: Число случайных перезапусков (None – self.restarts; 0 – только от seed, решение
+            остаётся в той же ветви, что и начальное приближение)
+        :raises KinematicsError: Решение не найдено
+        """
+        position, quaternion = _parse_target(target)
+        if orientation is None:
+            orientation = quaternion is not None and self.chain.dof >= 6
+        if not orientation:
+            quaternion = None
+        key = self._cache_key(position, quaternion)
+        if seed is None:
+            seed = self._cache.get(key) or self._last
+        if self.analytic:
+            solution = self._solve_analytic(position, seed)
+        else:
+            solution = self._solve_numeric(position, quaternion, seed, self.restarts if restarts is None else restarts)
+        self._remember(key, solution)
+        return solution
+
+    def solve_many(self,
+                   targets: Sequence[Any],
+                   seed: Optional[Sequence[float]] = None,
+                   orientation: Optional[bool] = None,
+                   throw_error: bool = True) -> List[Optional[List[float]]]:
+        """
+        Решить последовательность целей; каждая стартует с решения предыдущей
+        :param throw_error: Выбросить KinematicsError на недостижимой цели; иначе вместо решения None
+        """
+        solutions: List[Optional[List[float]]] = []
+        for index, target in enumerate(targets):
+            try:
+                seed = self.solve(target, seed, orientation)
+            except KinematicsError as e:
+                if throw_error:
+                    raise KinematicsError(f"Точка {index}: {e}") from None
+                solutions.append(None)
+                continue
+            solutions.append(seed)
+        return solutions
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._last = None
+
+    # -------------------------------------------------
+    # Кэш начальных приближений
+    # -------------------------------------------------
+    def _cache_key(self, position: Vector3, quaternion: Optional[Quaternion]) -> tuple:
+        step = self.cache_resolution
+        key = tuple(round(v / step) for v in position)
+        if quaternion is not None:
+            # Кватернионы q и -q задают один поворот
+            sign = -1.0 if quaternion[3] < 0 else 1.0
+            key += tuple(round(sign * v / 0.05) for v in quaternion)
+        return key
+
+    def _remember(self, key: tuple, solution: List[float]) -> None:
+        self._last = solution
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = solution
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # -------------------------------------------------
+    # Пределы суставов
+    # -------------------------------------------------
+    def _joint_bounds(self) -> List[Tuple[float, float]]:
+        bounds = []
+        for name in self.chain.joint_names:
+            low, high = -math.pi, math.pi
+            if self.joint_limits is not None and name in self.joint_limits.names:
+                i = self.joint_limits.names.index(name)
+                low, high = self.joint_limits.lower[i], self.joint_limits.upper[i]
+            bounds.append((low, high))
+        return bounds
+
+    def _fit_limits(self, q: List[float]) -> Optional[List[float]]:
+        """Сдвинуть углы на 2π внутрь пределов; None – решение вне пределов."""
+        if self.joint_limits is None:
+            return q
+        fitted = []
+        for value, (low, high) in zip(q, self._bounds):
+            if not low - 1e-9 <= value <= high + 1e-9:
+                shifted = value - TWO_PI * math.floor((value - low) / TWO_PI) if math.isfinite(low) else value
+                if not low - 1e-9 <= shifted <= high + 1e-9:
+                    return None
+                value = shifted
+            fitted.append(value)
+        return fitted
+
+    # -------------------------------------------------
+    # Аналитическое решение (MEdu)
+    # -------------------------------------------------
+    @staticmethod
+    def _is_planar_3dof(chain: KinematicChain) -> bool:
+        if chain.dof != 3 or not all(isinstance(link, DHLink) for link in chain.links):
+            return False
+        first, second, third = chain.links
+        return (abs(first.a) < 1e-12 and abs(first.alpha - math.pi / 2) < 1e-12
+                and abs(second.alpha) < 1e-12 and abs(second.d) < 1e-12
+                and abs(third.alpha) < 1e-12 and abs(third.d) < 1e-12)
+
+    def _solve_analytic(self, position: Vector3, seed: Optional[Sequence[float]]) -> List[float]:
+        chain = self.chain
+        base = chain.base
+        # Цель в системе основания
+        dx, dy, dz = position[0] - base[0][3], position[1] - base[1][3], position[2] - base[2][3]
+        x = base[0][0] * dx + base[1][0] * dy + base[2][0] * dz
+        y = base[0][1] * dx + base[1][1] * dy + base[2][1] * dz
+        z = base[0][2] * dx + base[1][2] * dy + base[2][2] * dz
+        first, second, third = chain.links
+        tool_x, tool_y, tool_z = chain.tool
+        # Смещение инструмента вдоль оси z3 выводит его из плоскости руки
+        radial_sq = x * x + y * y - tool_z * tool_z
+        if radial_sq < 0:
+            raise KinematicsError(f"Цель {position} недостижима: слишком близко к оси основания")
+        radial = math.sqrt(radial_sq)
+        theta1 = math.atan2(y, x) - math.atan2(-tool_z, radial) - first.offset
+        height = z - first.d
+        # Стрела вместе с инструментом – одно звено длиной forearm под углом phi к оси стрелы
+        upper = second.a
+        forearm = math.hypot(third.a + tool_x, tool_y)
+        phi = math.atan2(tool_y, third.a + tool_x)
+        cos_elbow = (radial * radial + height * height - upper * upper - forearm * forearm) / (2 * upper * forearm)
+        if abs(cos_elbow) > 1 + 1e-12:
+            raise KinematicsError(f"Цель {position} недостижима: вне радиуса действия")
+        cos_elbow = max(-1.0, min(1.0, cos_elbow))
+        candidates = []
+        for elbow in (-math.acos(cos_elbow), math.acos(cos_elbow)):
+            shoulder = math.atan2(height, radial) - math.atan2(forearm * math.sin(elbow), upper + forearm * math.cos(elbow))
+            q = [theta1, shoulder - second.offset, elbow - phi - third.offset]
+            q = [math.atan2(math.sin(v), math.cos(v)) for v in q]
+            q = self._fit_limits(q)
+            if q is not None:
+                candidates.append(q)
+        if not candidates:
+            raise KinematicsError(f"Цель {position} вне пределов суставов")
+        if seed is None:
+            return candidates[0]
+        return min(candidates, key=lambda q: sum((a - b) ** 2 for a, b in zip(q, seed)))
+
+    # -------------------------------------------------
+    # Численное решение (DLS)
+    # -------------------------------------------------
+    def _errors(self, q: List[float], position: Vector3, quaternion: Optional[Quaternion]) -> Tuple[List[float], List[List[float]]]:
+        frames = self.chain.frames(q)
+        tip = self.chain.tip(frames)
+        error = [position[0] - tip[0][3], position[1] - tip[1][3], position[2] - tip[2][3]]
+        if quaternion is not None:
+            error.extend(_orientation_error(rotation_to_quaternion(tip), quaternion))
+        return error, frames
+
+    def _converged(self, error: List[float]) -> bool:
+        position_error = math.sqrt(error[0] ** 2 + error[1] ** 2 + error[2] ** 2)
+        if position_error > self.tolerance:
+            return False
+        if len(error) > 3:
+            return math.sqrt(error[3] ** 2 + error[4] ** 2 + error[5] ** 2) <= self.orientation_tolerance
+        return True
+
+    def _clamp(self, q: List[float]) -> List[float]:
+        if self.joint_limits is None:
+            return q
+        return [min(max(value, low), high) for value, (low, high) in zip(q, self._bounds)]
+
+    def _attempt(self, q: List[float], position: Vector3, quaternion: Optional[Quaternion]) -> Optional[List[float]]:
+        rows = 6 if quaternion is not None else 3
+        damping = self.damping
+        error, frames = self._errors(q, position, quaternion)
+        cost = sum(e * e for e in error)
+        for _ in range(self.max_iterations):
+            self.iterations += 1
+            if self._converged(error):
+                return self._fit_limits(q)
+            jacobian = self.chain.jacobian_from_frames(frames, rows)
+            # (J·Jᵀ + λ²·I)·y = e,  Δq = Jᵀ·y
+            jjt = [[sum(a * b for a, b in zip(jacobian[i], jacobian[j])) + (damping * damping if i == j else 0.0)
+                    for j in range(rows)] for i in range(rows)]
+            y = solve_linear(jjt, error)
+            step = [sum(jacobian[r][c] * y[r] for r in range(rows)) for c in range(len(q))]
+            largest = max(abs(s) for s in step)
+            if largest > 0.5:
+                step = [s * 0.5 / largest for s in step]
+            candidate = self._clamp([a + b for a, b in zip(q, step)])
+            candidate_error, candidate_frames = self._errors(candidate, position, quaternion)
+            candidate_cost = sum(e * e for e in candidate_error)
+            if candidate_cost < cost:
+                q, error, frames, cost = candidate, candidate_error, candidate_frames, candidate_cost
+                damping = max(damping * 0.5, 1e-6)
+            else:
+                damping *= 4
+                if damping > 10:
+                    break
+        return self._fit_limits(q) if self._converged(error) else None
+
+    def _random_configuration(self) -> List[float]:
+        return [self._random.uniform(max(low, -math.pi), min(high, math.pi)) for low, high in self._bounds]
+
+    def _solve_numeric(self, position: Vector3, quaternion: Optional[Quaternion], seed: Optional[Sequence[float]],
+                       restarts: int) -> List[float]:
+        start = list(seed) if seed is not None else [(max(low, -math.pi) + min(high, math.pi)) / 2 for low, high in self._bounds]
+        for attempt in range(restarts + 1):
+            solution = self._attempt(self._clamp(start), position, quaternion)
+            if solution is not None:
+                return solution
+            start = self._random_configuration()
+        raise KinematicsError(f"Решение обратной кинематики для {position} не найдено")
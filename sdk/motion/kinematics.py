@@ -0,0 +1,442 @@
+"""
+Прямая кинематика манипуляторов по параметрам Денавита–Хартенберга или по
+описанию URDF: положение и ориентация инструмента для заданных углов суставов
+без обращения к контроллеру. Пачки конфигураций считаются векторно (numpy).
+"""
+import math
+import xml.etree.ElementTree as ElementTree
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from sdk.commands.data import Orientation, Point3D, Position
+from sdk.utils.numeric import np
+
+Matrix = List[List[float]]
+JointValues = Union[Sequence[float], Mapping[str, float]]
+
+M13_JOINTS = ("shoulder_pan_joint", "shoulder_lift_joint", "elbow_joint",
+              "wrist_1_joint", "wrist_2_joint", "wrist_3_joint")
+MEDU_JOINTS = ("povorot_osnovaniya", "privod_plecha", "privod_strely")
+
+
+class DHLink(NamedTuple):
+    """Звено в стандартной записи DH: A = Rz(theta + offset) · Tz(d) · Tx(a) · Rx(alpha)."""
+    a: float
+    alpha: float
+    d: float
+    offset: float = 0.0
+
+
+class URDFJoint(NamedTuple):
+    """
+    Вращательный сустав URDF: A = origin · R(axis, theta) · after.
+    origin – матрица 4x4 сустава относительно предыдущего звена (с предшествующими
+    фиксированными сочленениями), after – фиксированные сочленения за последним суставом.
+    """
+    origin: Matrix
+    axis: Tuple[float, float, float] = (0.0, 0.0, 1.0)
+    after: Optional[Matrix] = None
+
+
+def _identity() -> Matrix:
+    return [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def _translation(x: float, y: float, z: float) -> Matrix:
+    m = _identity()
+    m[0][3], m[1][3], m[2][3] = x, y, z
+    return m
+
+
+def _dh(link: DHLink, theta: float) -> Matrix:
+    ct, st = math.cos(theta + link.offset), math.sin(theta + link.offset)
+    ca, sa = math.cos(link.alpha), math.sin(link.alpha)
+    return [[ct, -st * ca, st * sa, link.a * ct],
+            [st, ct * ca, -ct * sa, link.a * st],
+            [0.0, sa, ca, link.d],
+            [0.0, 0.0, 0.0, 1.0]]
+
+
+def _rpy(x: float, y: float, z: float, roll: float, pitch: float, yaw: float) -> Matrix:
+    """<origin xyz rpy> URDF: поворот Rz(yaw) · Ry(pitch) · Rx(roll) и смещение."""
+    cr, sr = math.cos(roll), math.sin(roll)
+    cp, sp = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    return [[cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr, x],
+            [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr, y],
+            [-sp, cp * sr, cp * cr, z],
+            [0.0, 0.0, 0.0, 1.0]]
+
+
+def _axis_frame(axis: Sequence[float]) -> Matrix:
+    """Поворот, переводящий ось z в ось сустава: поворот вокруг оси = M · Rz · Mᵀ."""
+    ax, ay, az = axis
+    norm = math.sqrt(ax * ax + ay * ay + az * az)
+    if norm < 1e-12:
+        raise ValueError("Нулевая ось сустава")
+    ax, ay, az = ax / norm, ay / norm, az / norm
+    # Первая ось базиса – перпендикуляр к оси сустава
+    hx, hy, hz = (1.0, 0.0, 0.0) if abs(ax) < 0.9 else (0.0, 1.0, 0.0)
+    ux, uy, uz = hy * az - hz * ay, hz * ax - hx * az, hx * ay - hy * ax
+    norm = math.sqrt(ux * ux + uy * uy + uz * uz)
+    ux, uy, uz = ux / norm, uy / norm, uz / norm
+    vx, vy, vz = ay * uz - az * uy, az * ux - ax * uz, ax * uy - ay * ux
+    return [[ux, vx, ax, 0.0], [uy, vy, ay, 0.0], [uz, vz, az, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def _transpose(m: Matrix) -> Matrix:
+    """Обратная матрица чистого поворота."""
+    return [[m[0][0], m[1][0], m[2][0], 0.0], [m[0][1], m[1][1], m[2][1], 0.0],
+            [m[0][2], m[1][2], m[2][2], 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def _rz(theta: float) -> Matrix:
+    c, s = math.cos(theta), math.sin(theta)
+    return [[c, -s, 0.0, 0.0], [s, c, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def _floats(text: Optional[str], default: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    if not text:
+        return default
+    values = [float(v) for v in text.split()]
+    if len(values) != 3:
+        raise ValueError(f"Ожидалось три числа, получено: {text!r}")
+    return values[0], values[1], values[2]
+
+
+def _mul(a: Matrix, b: Matrix) -> Matrix:
+    """Произведение однородных матриц 4x4 (нижняя строка всегда 0 0 0 1)."""
+    rows = []
+    for i in range(3):
+        ai0, ai1, ai2, ai3 = a[i]
+        rows.append([ai0 * b[0][j] + ai1 * b[1][j] + ai2 * b[2][j] for j in range(3)]
+                    + [ai0 * b[0][3] + ai1 * b[1][3] + ai2 * b[2][3] + ai3])
+    rows.append([0.0, 0.0, 0.0, 1.0])
+    return rows
+
+
+def rotation_to_quaternion(r: Sequence[Sequence[float]]) -> Tuple[float, float, float, float]:
+    """Матрица поворота 3x3 -> кватернион (x, y, z, w), w >= 0."""
+    m00, m01, m02 = r[0][0], r[0][1], r[0][2]
+    m10, m11, m12 = r[1][0], r[1][1], r[1][2]
+    m20, m21, m22 = r[2][0], r[2][1], r[2][2]
+    trace = m00 + m11 + m22
+    if trace > 0:
+        s = math.sqrt(trace + 1.0) * 2
+        w, x, y, z = 0.25 * s, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s
+    elif m00 > m11 and m00 > m22:
+        s = math.sqrt(1.0 + m00 - m11 - m22) * 2
+        w, x, y, z = (m21 - m12) / s, 0.25 * s, (m01 + m10) / s, (m02 + m20) / s
+    elif m11 > m22:
+        s = math.sqrt(1.0 + m11 - m00 - m22) * 2
+        w, x, y, z = (m02 - m20) / s, (m01 + m10) / s, 0.25 * s, (m12 + m21) / s
+    else:
+        s = math.sqrt(1.0 + m22 - m00 - m11) * 2
+        w, x, y, z = (m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, 0.25 * s
+    if w < 0:
+        x, y, z, w = -x, -y, -z, -w
+    return x, y, z, w
+
+
+def _quaternions_np(r: "np.ndarray") -> "np.ndarray":
+    """Пачка матриц поворота (N, 3, 3) -> кватернионы (N, 4) в порядке x, y, z, w (как rotation_to_quaternion)."""
+    m00, m01, m02 = r[:, 0, 0], r[:, 0, 1], r[:, 0, 2]
+    m10, m11, m12 = r[:, 1, 0], r[:, 1, 1], r[:, 1, 2]
+    m20, m21, m22 = r[:, 2, 0], r[:, 2, 1], r[:, 2, 2]
+    trace = m00 + m11 + m22
+    by_trace = trace > 0
+    by_x = ~by_trace & (m00 > m11) & (m00 > m22)
+    by_y = ~by_trace & ~by_x & (m11 > m22)
+    by_z = ~(by_trace | by_x | by_y)
+    q = np.empty((r.shape[0], 4))
+    i = by_trace
+    s = np.sqrt(trace[i] + 1.0) * 2
+    q[i] = np.stack(((m21[i] - m12[i]) / s, (m02[i] - m20[i]) / s, (m10[i] - m01[i]) / s, 0.25 * s), axis=1)
+    i = by_x
+    s = np.sqrt(1.0 + m00[i] - m11[i] - m22[i]) * 2
+    q[i] = np.stack((0.25 * s, (m01[i] + m10[i]) / s, (m02[i] + m20[i]) / s, (m21[i] - m12[i]) / s), axis=1)
+    i = by_y
+    s = np.sqrt(1.0 + m11[i] - m00[i] - m22[i]) * 2
+    q[i] = np.stack(((m01[i] + m10[i]) / s, 0.25 * s, (m12[i] + m21[i]) / s, (m02[i] - m20[i]) / s), axis=1)
+    i = by_z
+    s = np.sqrt(1.0 + m22[i] - m00[i] - m11[i]) * 2
+    q[i] = np.stack(((m02[i] + m20[i]) / s, (m12[i] + m21[i]) / s, 0.25 * s, (m10[i] - m01[i]) / s), axis=1)
+    q[q[:, 3] < 0] *= -1
+    return q
+
+
+class KinematicChain:
+    """Последовательная цепь вращательных суставов в записи DH или URDF.
+
+    Углы задаются в радианах списком в порядке joint_names или словарём
+    {имя сустава: угол}; длины – в метрах.
+
+    Цепь строится по URDF (from_urdf; M13 и MEdu так загружают описание
+    контроллера, см. Manipulator.load_kinematics) или задаётся параметрами DH.
+
+    Пример:
+        chain = KinematicChain.from_urdf(urdf_text, MEDU_JOINTS)
+        pose = chain.forward({"povorot_osnovaniya": 0.3, "privod_plecha": 0.5, "privod_strely": -0.2})
+        positions, quaternions = chain.forward_many(configurations)  # пачка (N, dof)
+    """
+
+    def __init__(self,
+                 joint_names: Sequence[str],
+                 links: Sequence[Union[DHLink, URDFJoint]],
+                 tool: Sequence[float] = (0.0, 0.0, 0.0),
+                 base: Optional[Matrix] = None,
+                 name: str = ""):
+        """
+        :param joint_names: Имена суставов по порядку от основания
+        :param links: Звенья DH или суставы URDF (по одному на сустав)
+        :param tool: Смещение точки инструмента (TCP) в системе фланца, м
+        :param base: Однородная матрица 4x4 основания в мировой системе (None – единичная)
+        :param name: Название модели
+        """
+        if len(joint_names) != len(links):
+            raise ValueError("Число суставов и звеньев должно совпадать")
+        self.joint_names: Tuple[str, ...] = tuple(joint_names)
+        self.links: Tuple[Union[DHLink, URDFJoint], ...] = tuple(
+            link if isinstance(link, URDFJoint) else DHLink(*link) for link in links)
+        self.tool: Tuple[float, float, float] = (float(tool[0]), float(tool[1]), float(tool[2]))
+        self.base: Matrix = [list(map(float, row)) for row in base] if base is not None else _identity()
+        self.name = name
+        self._tool_matrix = _translation(*self.tool)
+        self._np_base = np.asarray(self.base) if np is not None else None
+        # Для суставов URDF: A = pre · Rz(theta) · post, ось сустава – z системы frame · pre
+        self._urdf: List[Optional[Tuple[Matrix, Matrix]]] = []
+        for link in self.links:
+            if isinstance(link, URDFJoint):
+                turn = _axis_frame(link.axis)
+                post = _transpose(turn)
+                if link.after is not None:
+                    post = _mul(post, link.after)
+                self._urdf.append((_mul(link.origin, turn), post))
+            else:
+                self._urdf.append(None)
+
+    @classmethod
+    def from_urdf(cls,
+                  urdf: str,
+                  joint_names: Optional[Sequence[str]] = None,
+                  base_link: Optional[str] = None,
+                  tip_link: Optional[str] = None,
+                  tool: Sequence[float] = (0.0, 0.0, 0.0),
+                  base: Optional[Matrix] = None,
+                  name: str = "") -> "KinematicChain":
+        """
+        Цепь по описанию URDF (<robot> с <link>/<joint>).
+        Фиксированные сочленения внутри цепи объединяются с соседними суставами.
+
+        :param urdf: Текст URDF
+        :param joint_names: Ожидаемые подвижные суставы по порядку; по умолчанию – все суставы
+            от base_link до tip_link
+        :param base_link: Начальное звено (по умолчанию – корень дерева)
+        :param tip_link: Конечное звено (по умолчанию – фланец за последним из joint_names через
+            фиксированные сочленения или единственный лист дерева)
+        :param tool: Смещение точки инструмента относительно tip_link, м
+        :param base: Однородная матрица основания в мировой системе (None – единичная)
+        :param name: Название модели (по умолчанию – имя робота в URDF)
+        :raises ValueError: Описание не разобрано или цепь не совпадает с joint_names
+        """
+        try:
+            robot = ElementTree.fromstring(urdf)
+        except ElementTree.ParseError as e:
+            raise ValueError(f"Некорректный URDF: {e}") from None
+        if robot.tag != "robot":
+            raise ValueError("Корневой элемент URDF должен быть <robot>")
+        joints = {}
+        by_parent: dict = {}
+        for element in robot.iter("joint"):
+            parent, child = element.find("parent"), element.find("child")
+            if parent is None or child is None:
+                raise ValueError(f"У сочленения {element.get('name')} нет parent/child")
+            origin = element.find("origin")
+            xyz = _floats(origin.get("xyz") if origin is not None else None, (0.0, 0.0, 0.0))
+            rpy = _floats(origin.get("rpy") if origin is not None else None, (0.0, 0.0, 0.0))
+            axis = element.find("axis")
+            joint = {"name": element.get("name"), "type": element.get("type"),
+                     "parent": parent.get("link"), "child": child.get("link"),
+                     "origin": _rpy(*xyz, *rpy),
+                     "axis": _floats(axis.get("xyz") if axis is not None else None, (1.0, 0.0, 0.0)),
+                     "mimic": element.find("mimic") is not None}
+            joints[joint["child"]] = joint
+            by_parent.setdefault(joint["parent"], []).append(joint)
+
+        if tip_link is None:
+            if joint_names:
+                named = [joint for joint in joints.values() if joint["name"] == joint_names[-1]]
+                if not named:
+                    raise ValueError(f"В URDF нет сустава {joint_names[-1]}")
+                tip_link = named[0]["child"]
+                # До фланца через фиксированные сочленения
+                while len(by_parent.get(tip_link, ())) == 1 and by_parent[tip_link][0]["type"] == "fixed":
+                    tip_link = by_parent[tip_link][0]["child"]
+            else:
+                leaves = [link for link in joints if link not in by_parent]
+                if len(leaves) != 1:
+                    raise ValueError(f"Дерево URDF ветвится ({', '.join(leaves)}): укажите tip_link")
+                tip_link = leaves[0]
+
+        path = []
+        link = tip_link
+        while link != base_link and link in joints:
+            path.append(joints[link])
+            link = joints[link]["parent"]
+        if base_link is not None and link != base_link:
+            raise ValueError(f"Звено {tip_link} не связано с {base_link}")
+        path.reverse()
+
+        names: List[str] = []
+        links: List[URDFJoint] = []
+        pending = _identity()
+        for joint in path:
+            if joint["type"] == "fixed":
+                pending = _mul(pending, joint["origin"])
+                continue
+            if joint["type"] not in ("revolute", "continuous"):
+                raise ValueError(f"Сустав {joint['name']} типа {joint['type']} не поддерживается")
+            if joint["mimic"]:
+                raise ValueError(f"Сустав {joint['name']} с mimic не поддерживается")
+            names.append(joint["name"])
+            links.append(URDFJoint(_mul(pending, joint["origin"]), joint["axis"]))
+            pending = _identity()
+        if not links:
+            raise ValueError(f"Между {link} и {tip_link} нет вращательных суставов")
+        if pending != _identity():
+            links[-1] = links[-1]._replace(after=pending)
+        if joint_names is not None and tuple(names) != tuple(joint_names):
+            raise ValueError(f"Суставы цепи URDF {names} не совпадают с ожидаемыми {list(joint_names)}")
+        return cls(names, links, tool, base, name or robot.get("name", ""))
+
+    @property
+    def dof(self) -> int:
+        return len(self.links)
+
+    def with_tool(self, tool: Sequence[float]) -> "KinematicChain":
+        """Та же цепь с другим смещением инструмента (например, после tcp_apply)."""
+        return KinematicChain(self.joint_names, self.links, tool, self.base, self.name)
+
+    def joint_vector(self, joints: JointValues) -> List[float]:
+        """Углы в порядке joint_names (словарь должен содержать все суставы)."""
+        if isinstance(joints, Mapping):
+            try:
+                return [float(joints[name]) for name in self.joint_names]
+            except KeyError as e:
+                raise ValueError(f"Не задан угол сустава {e.args[0]}") from None
+        values = [float(v) for v in joints]
+        if len(values) != self.dof:
+            raise ValueError(f"Ожидалось {self.dof} углов, получено {len(values)}")
+        return values
+
+    # -------------------------------------------------
+    # Одна конфигурация
+    # -------------------------------------------------
+    def frames(self, joints: JointValues) -> List[Matrix]:
+        """Системы координат основания и всех звеньев (dof + 1 матриц, без инструмента)."""
+        q = self.joint_vector(joints)
+        frames = [self.base]
+        current = self.base
+        for link, urdf, theta in zip(self.links, self._urdf, q):
+            if urdf is None:
+                current = _mul(current, _dh(link, theta))
+            else:
+                current = _mul(_mul(_mul(current, urdf[0]), _rz(theta)), urdf[1])
+            frames.append(current)
+        return frames
+
+    def tip(self, frames: Sequence[Matrix]) -> Matrix:
+        """Однородная матрица точки инструмента по результату frames()."""
+        return _mul(frames[-1], self._tool_matrix)
+
+    def transform(self, joints: JointValues) -> Matrix:
+        """Однородная матрица 4x4 точки инструмента."""
+        return self.tip(self.frames(joints))
+
+    def position(self, joints: JointValues) -> Tuple[float, float, float]:
+        """Положение точки инструмента (x, y, z)."""
+        m = self.transform(joints)
+        return m[0][3], m[1][3], m[2][3]
+
+    def forward(self, joints: JointValues) -> Point3D:
+        """Поза инструмента (положение и кватернион ориентации)."""
+        m = self.transform(joints)
+        x, y, z, w = rotation_to_quaternion(m)
+        return Point3D._make(Position._make(m[0][3], m[1][3], m[2][3]), Orientation._make(x, y, z, w))
+
+    def jacobian_from_frames(self, frames: Sequence[Matrix], rows: int = 6) -> Matrix:
+        """
+        Якобиан по уже посчитанным frames() (без повторного расчёта цепи)
+        :param rows: 6 – строки vx, vy, vz, wx, wy, wz; 3 – только линейная скорость
+        """
+        tip = self.tip(frames)
+        px, py, pz = tip[0][3], tip[1][3], tip[2][3]
+        columns = []
+        for frame, urdf in zip(frames, self._urdf):
+            if urdf is not None:
+                frame = _mul(frame, urdf[0])
+            zx, zy, zz = frame[0][2], frame[1][2], frame[2][2]
+            dx, dy, dz = px - frame[0][3], py - frame[1][3], pz - frame[2][3]
+            columns.append((zy * dz - zz * dy, zz * dx - zx * dz, zx * dy - zy * dx, zx, zy, zz))
+        return [[column[row] for column in columns] for row in range(rows)]
+
+    def jacobian(self, joints: JointValues) -> Matrix:
+        """
+        Геометрический якобиан 6 x dof точки инструмента: строки vx, vy, vz, wx, wy, wz.
+        """
+        return self.jacobian_from_frames(self.frames(joints))
+
+    # -------------------------------------------------
+    # Пачка конфигураций
+    # -------------------------------------------------
+    def transforms_many(self, batch: Sequence[Sequence[float]]) -> Any:
+        """
+        Матрицы инструмента для пачки конфигураций (строки – углы в порядке joint_names).
+        :return: numpy-массив (N, 4, 4) при наличии numpy, иначе список матриц
+        """
+        if np is None:
+            return [self.transform(q) for q in batch]
+        q = np.asarray(batch, dtype=float).reshape(-1, self.dof)
+        n = q.shape[0]
+        result = np.broadcast_to(self._np_base, (n, 4, 4)).copy()
+        link_matrix = np.zeros((n, 4, 4))
+        link_matrix[:, 3, 3] = 1.0
+        for i, (link, urdf) in enumerate(zip(self.links, self._urdf)):
+            if urdf is not None:
+                rz = np.zeros((n, 4, 4))
+                rz[:, 0, 0] = rz[:, 1, 1] = np.cos(q[:, i])
+                rz[:, 1, 0] = np.sin(q[:, i])
+                rz[:, 0, 1] = -rz[:, 1, 0]
+                rz[:, 2, 2] = rz[:, 3, 3] = 1.0
+                result = result @ np.asarray(urdf[0]) @ rz @ np.asarray(urdf[1])
+                continue
+            theta = q[:, i] + link.offset
+            ct, st = np.cos(theta), np.sin(theta)
+            ca, sa = math.cos(link.alpha), math.sin(link.alpha)
+            link_matrix[:, 0, 0], link_matrix[:, 0, 1], link_matrix[:, 0, 2], link_matrix[:, 0, 3] = ct, -st * ca, st * sa, link.a * ct
+            link_matrix[:, 1, 0], link_matrix[:, 1, 1], link_matrix[:, 1, 2], link_matrix[:, 1, 3] = st, ct * ca, -ct * sa, link.a * st
+            link_matrix[:, 2, 0], link_matrix[:, 2, 1], link_matrix[:, 2, 2], link_matrix[:, 2, 3] = 0.0, sa, ca, link.d
+            result = result @ link_matrix
+        result[:, :3, 3] += result[:, :3, :3] @ np.asarray(self.tool)
+        return result
+
+    def forward_many(self, batch: Sequence[Sequence[float]]) -> Tuple[Any, Any]:
+        """
+        Позы инструмента для пачки конфигураций
+        :return: (положения (N, 3), кватернионы (N, 4) x, y, z, w) – numpy-массивы при наличии numpy,
+            иначе списки кортежей
+        """
+        transforms = self.transforms_many(batch)
+        if np is None:
+            positions = [(m[0][3], m[1][3], m[2][3]) for m in transforms]
+            return positions, [rotation_to_quaternion(m) for m in transforms]
+        return transforms[:, :3, 3].copy(), _quaternions_np(transforms[:, :3, :3])
+
+    def positions_many(self, batch: Sequence[Sequence[float]]) -> Any:
+        """Только положения инструмента для пачки конфигураций: (N, 3)."""
+        transforms = self.transforms_many(batch)
+        if np is None:
+            return [(m[0][3], m[1][3], m[2][3]) for m in transforms]
+        return transforms[:, :3, 3].copy()
+
+    def __repr__(self) -> str:
+        return f"KinematicChain({self.name or self.joint_names!r}, dof={self.dof})"
@@ -0,0 +1,269 @@
+"""
+Проверка целей движения на стороне SDK: пределы суставов (из get_joint_limits)
+и рабочая зона (из топика /coordinate_limits). Ошибочная программа отклоняется
+до отправки, не занимая контроллер.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sdk.errors import LimitError
+from sdk.utils.numeric import np
+
+INF = float("inf")
+AXES = ("x", "y", "z")
+
+# Поля ответа get_joint_limits: {сустав: {"min_position", "max_position", "velocity", "acceleration"}}
+# (velocity и acceleration – те же поля, что принимает set_joint_limits)
+_JOINT_LOWER = "min_position"
+_JOINT_UPPER = "max_position"
+_JOINT_VELOCITY = "velocity"
+_JOINT_ACCELERATION = "acceleration"
+# Поля сообщения /coordinate_limits: {"x": {"min", "max"}, "y": {...}, "z": {...}}
+_AXIS_LOWER = "min"
+_AXIS_UPPER = "max"
+
+# Сколько нарушений перечислять в тексте исключения
+_REPORT_LIMIT = 5
+
+Violation = Tuple[int, str, float, Tuple[float, float]]
+
+
+def _number(spec: Mapping[str, Any], key: str, default: float) -> float:
+    value = spec.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Поле {key!r} должно быть числом, получено {value!r}")
+    return float(value)
+
+
+def _check_parsed(what: str, names: Sequence[str], lower: Sequence[float], upper: Sequence[float]) -> None:
+    """Без единого конечного предела проверка бессмысленна; частично заданные пределы – предупреждение."""
+    if all(low == -INF and high == INF for low, high in zip(lower, upper)):
+        raise ValueError(f"{what}: не найдено ни одного конечного предела")
+    missing = [name for name, low, high in zip(names, lower, upper) if low == -INF or high == INF]
+    if missing:
+        print(f"[LIMITS] {what}: пределы не заданы для {', '.join(missing)} – они не проверяются")
+
+
+def _unwrap(reply: Any) -> Any:
+    """Ответ команды {"id", "result", "data"} -> data."""
+    if isinstance(reply, Mapping) and "data" in reply and ("id" in reply or "result" in reply):
+        return reply["data"]
+    return reply
+
+
+def _raise_violations(what: str, violations: List[Violation]) -> None:
+    shown = "; ".join(f"точка {index}: {name}={value:.4g} вне [{low:.4g}, {high:.4g}]"
+                      for index, name, value, (low, high) in violations[:_REPORT_LIMIT])
+    more = f" (и ещё {len(violations) - _REPORT_LIMIT})" if len(violations) > _REPORT_LIMIT else ""
+    raise LimitError(f"{what}: {shown}{more}", violations)
+
+
+class _Box:
+    """Прямоугольные пределы по именованным осям с векторной проверкой наборов точек."""
+
+    def __init__(self, names: Sequence[str], lower: Sequence[float], upper: Sequence[float], tolerance: float):
+        if not (len(names) == len(lower) == len(upper)):
+            raise ValueError("Число имён и пределов должно совпадать")
+        self.names: Tuple[str, ...] = tuple(names)
+        self.lower: Tuple[float, ...] = tuple(float(v) for v in lower)
+        self.upper: Tuple[float, ...] = tuple(float(v) for v in upper)
+        self.tolerance = tolerance
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._np_bounds: Dict[Tuple[str, ...], Any] = {}
+
+    def _bounds(self, names: Sequence[str]) -> Tuple[List[float], List[float]]:
+        lower, upper = [], []
+        for name in names:
+            i = self._index.get(name)
+            lower.append(self.lower[i] - self.tolerance if i is not None else -INF)
+            upper.append(self.upper[i] + self.tolerance if i is not None else INF)
+        return lower, upper
+
+    def violations(self, names: Sequence[str], rows: Sequence[Sequence[float]]) -> List[Violation]:
+        """Все значения rows (строки – точки, столбцы – names) вне пределов; NaN считается нарушением."""
+        names = tuple(names)
+        if not rows:
+            return []
+        if np is not None:
+            bounds = self._np_bounds.get(names)
+            if bounds is None:
+                lower, upper = self._bounds(names)
+                bounds = self._np_bounds[names] = (np.asarray(lower), np.asarray(upper))
+            values = np.asarray(rows, dtype=float).reshape(-1, len(names))
+            bad = ~((values >= bounds[0]) & (values <= bounds[1]))
+            if not bad.any():
+                return []
+            return [(int(r), names[c], float(values[r, c]), self._reported(names[c]))
+                    for r, c in zip(*np.nonzero(bad))]
+        lower, upper = self._bounds(names)
+        found: List[Violation] = []
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                # not (a <= v <= b) ловит и NaN
+                if not (lower[c] <= value <= upper[c]):
+                    found.append((r, names[c], float(value), self._reported(names[c])))
+        return found
+
+    def _reported(self, name: str) -> Tuple[float, float]:
+        i = self._index.get(name)
+        return (self.lower[i], self.upper[i]) if i is not None else (-INF, INF)
+
+
+class JointLimits(_Box):
+    """Пределы положений суставов (рад) и, если известны, скоростей и ускорений.
+
+    Пример:
+        limits = JointLimits.from_controller(robot.get_joint_limits())
+        limits.check({"shoulder_pan_joint": 0.5, "elbow_joint": 3.5})  # LimitError
+    """
+
+    def __init__(self,
+                 names: Sequence[str],
+                 lower: Sequence[float],
+                 upper: Sequence[float],
+                 velocity: Optional[Sequence[float]] = None,
+                 acceleration: Optional[Sequence[float]] = None,
+                 tolerance: float = 1e-6):
+        """
+        :param names: Имена суставов
+        :param lower: Нижние пределы, рад
+        :param upper: Верхние пределы, рад
+        :param velocity: Максимальные скорости, рад/с (None – неизвестны)
+        :param acceleration: Максимальные ускорения, рад/с² (None – неизвестны)
+        :param tolerance: Допуск проверки, рад
+        """
+        super().__init__(names, lower, upper, tolerance)
+        self.velocity: Optional[Tuple[float, ...]] = tuple(velocity) if velocity is not None else None
+        self.acceleration: Optional[Tuple[float, ...]] = tuple(acceleration) if acceleration is not None else None
+
+    @classmethod
+    def from_controller(cls, reply: Any, tolerance: float = 1e-6) -> "JointLimits":
+        """
+        Разобрать ответ get_joint_limits: {сустав: {"min_position", "max_position", "velocity", "acceleration"}}.
+        Отсутствующий предел считается бесконечным (с предупреждением).
+        :raises ValueError: Неизвестный формат или ни одного конечного предела положения
+        """
+        data = _unwrap(reply)
+        if not isinstance(data, Mapping) or not data or not all(isinstance(spec, Mapping) for spec in data.values()):
+            raise ValueError(f"Неизвестный формат пределов суставов, ожидается {{сустав: {{...}}}}: {reply!r}")
+        names, lower, upper, velocity, acceleration = [], [], [], [], []
+        for name, spec in data.items():
+            names.append(str(name))
+            lower.append(_number(spec, _JOINT_LOWER, -INF))
+            upper.append(_number(spec, _JOINT_UPPER, INF))
+            velocity.append(_number(spec, _JOINT_VELOCITY, INF))
+            acceleration.append(_number(spec, _JOINT_ACCELERATION, INF))
+        _check_parsed("Пределы суставов", names, lower, upper)
+        return cls(names, lower, upper, velocity, acceleration, tolerance)
+
+    def check(self, positions: Mapping[str, float]) -> None:
+        """
+        Проверить одну цель {сустав: угол}
+        :raises LimitError: Угол вне пределов
+        """
+        names = tuple(positions)
+        found = self.violations(names, [[positions[name] for name in names]])
+        if found:
+            _raise_violations("Цель вне пределов суставов", found)
+
+    def check_path(self, names: Sequence[str], rows: Sequence[Sequence[float]]) -> None:
+        """
+        Проверить траекторию: строки rows – точки, столбцы – суставы names
+        :raises LimitError: Хотя бы одна точка вне пределов (в исключении перечислены все нарушения)
+        """
+        found = self.violations(names, rows)
+        if found:
+            _raise_violations("Траектория вне пределов суставов", found)
+
+
+class WorkspaceLimits(_Box):
+    """Рабочая зона инструмента: пределы по x, y, z (как в топике /coordinate_limits)."""
+
+    def __init__(self, lower: Sequence[float], upper: Sequence[float], tolerance: float = 1e-6):
+        """
+        :param lower: Нижние пределы (x, y, z)
+        :param upper: Верхние пределы (x, y, z)
+        :param tolerance: Допуск проверки
+        """
+        super().__init__(AXES, lower, upper, tolerance)
+
+    @classmethod
+    def from_message(cls, message: Any, tolerance: float = 1e-6) -> "WorkspaceLimits":
+        """
+        Разобрать сообщение /coordinate_limits: {"x": {"min", "max"}, "y": {...}, "z": {...}}.
+        Отсутствующий предел считается бесконечным (с предупреждением).
+        :raises ValueError: Неизвестный формат или ни одного конечного предела
+        """
+        data = _unwrap(message)
+        if not isinstance(data, Mapping) or not all(isinstance(data.get(axis, {}), Mapping) for axis in AXES):
+            raise ValueError(f"Неизвестный формат пределов рабочей зоны, ожидается {{\"x\": {{\"min\", \"max\"}}, ...}}: "
+                             f"{message!r}")
+        lower = [_number(data.get(axis, {}), _AXIS_LOWER, -INF) for axis in AXES]
+        upper = [_number(data.get(axis, {}), _AXIS_UPPER, INF) for axis in AXES]
+        _check_parsed("Пределы рабочей зоны", AXES, lower, upper)
+        return cls(lower, upper, tolerance)
+
+    def check_point(self, x: float, y: float, z: float) -> None:
+        """
+        Проверить одну точку
+        :raises LimitError: Точка вне рабочей зоны
+        """
+        found = self.violations(AXES, [(x, y, z)])
+        if found:
+            _raise_violations("Цель вне рабочей зоны", found)
+
+    def check_points(self, points: Iterable[Sequence[float]]) -> None:
+        """
+        Проверить набор точек (x, y, z)
+        :raises LimitError: Хотя бы одна точка вне рабочей зоны
+        """
+        found = self.violations(AXES, [tuple(p[:3]) for p in points])
+        if found:
+            _raise_violations("Траектория вне рабочей зоны", found)
+
+
+class MotionValidator:
+    """Проверка целей перед отправкой: пределы суставов и рабочая зона (любой из них может отсутствовать)."""
+
+    def __init__(self, joint_limits: Optional[JointLimits] = None, workspace: Optional[WorkspaceLimits] = None):
+        self.joint_limits = joint_limits
+        self.workspace = workspace
+
+    def check_joints(self, positions: Mapping[str, float]) -> None:
+        if self.joint_limits is not None:
+            self.joint_limits.check(positions)
+
+    def check_joint_path(self, names: Sequence[str], rows: Sequence[Sequence[float]]) -> None:
+        if self.joint_limits is not None:
+            self.joint_limits.check_path(names, rows)
+
+    def check_point(self, x: float, y: float, z: float) -> None:
+        if self.workspace is not None:
+            self.workspace.check_point(x, y, z)
+
+    def check_points(self, points: Iterable[Sequence[float]]) -> None:
+        if self.workspace is not None:
+            self.workspace.check_points(points)
+
+    def check_group(self, points: Optional[Sequence[Any]] = None, positions: Optional[Sequence[Any]] = None) -> None:
+        """
+        Проверить аргументы move_group: points – Point3D, positions – JointPositions.
+        Суставы могут различаться от точки к точке, поэтому точки группируются по набору суставов.
+        """
+        if points:
+            self.check_points([(p.position.x, p.position.y, p.position.z) for p in points])
+        if positions and self.joint_limits is not None:
+            groups: Dict[Tuple[str, ...], Tuple[List[int], List[List[float]]]] = {}
+            for index, jp in enumerate(positions):
+                names = tuple(item.joint for item in jp.positions)
+                indices, rows = groups.setdefault(names, ([], []))
+                indices.append(index)
+                rows.append([item.position for item in jp.positions])
+            found: List[Violation] = []
+            for names, (indices, rows) in groups.items():
+                found.extend((indices[r], name, value, bounds)
+                             for r, name, value, bounds in self.joint_limits.violations(names, rows))
+            if found:
+                found.sort(key=lambda v: v[0])
+                _raise_violations("Траектория вне пределов суставов", found)
@@ -0,0 +1,228 @@
+"""
+Планирование паллетирования: по геометрии паллеты, схеме раскладки слоёв
+и высотам подхода/отвода заранее рассчитывается вся последовательность поз
+в компактном массиве. Планы кэшируются по рецепту, выполнение можно
+продолжить с любого индекса после остановки.
+"""
+import math
+from array import array
+from collections import OrderedDict
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sdk.commands.data import Orientation, Point3D, Position
+from sdk.utils.numeric import np
+
+# Виды поз в плане
+APPROACH = 0
+PLACE = 1
+RETRACT = 2
+
+PATTERN_ROWS = "rows"
+PATTERN_SNAKE = "snake"
+PATTERN_COLUMNS = "columns"
+_PATTERNS = (PATTERN_ROWS, PATTERN_SNAKE, PATTERN_COLUMNS)
+
+_STRIDE = 7  # x, y, z, qx, qy, qz, qw
+
+
+class _PalletRecipeFields(NamedTuple):
+    origin: Tuple[float, float, float]
+    rows: int
+    columns: int
+    layers: int = 1
+    pitch: Tuple[float, float] = (0.1, 0.1)
+    layer_height: float = 0.05
+    yaw: float = 0.0
+    orientation: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)
+    pattern: str = PATTERN_ROWS
+    interlock: bool = False
+    approach: float = 0.05
+    retract: float = 0.05
+
+
+def _floats(owner: str, values: Sequence[float], count: int) -> Tuple[float, ...]:
+    result = tuple(float(v) for v in values)
+    if len(result) != count:
+        raise ValueError(f"{owner}: ожидается {count} чисел, получено {len(result)}")
+    return result
+
+
+class PalletRecipe(_PalletRecipeFields):
+    """Рецепт паллеты (неизменяемый, служит ключом кэша планов).
+
+    origin – центр первой ячейки нижнего слоя в системе основания, м;
+    pitch – шаг ячеек вдоль осей x и y паллеты, м; yaw – поворот паллеты
+    вокруг вертикали, рад; orientation – ориентация инструмента при
+    укладке (x, y, z, w). Схема обхода слоя: "rows" – по рядам, "snake" –
+    змейкой, "columns" – по столбцам. interlock поворачивает изделие на 90°
+    в нечётных слоях (перевязка для квадратных изделий).
+
+    origin, pitch и orientation можно задать списками или массивами –
+    они приводятся к кортежам float, чтобы рецепт оставался хэшируемым.
+    """
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        fields = _PalletRecipeFields(*args, **kwargs)
+        return super().__new__(cls, *fields._replace(origin=_floats("origin", fields.origin, 3),
+                                                     pitch=_floats("pitch", fields.pitch, 2),
+                                                     orientation=_floats("orientation", fields.orientation, 4)))
+
+    @classmethod
+    def _make(cls, iterable) -> "PalletRecipe":
+        # _replace создаёт копию через _make: значения проходят то же приведение
+        return cls(*iterable)
+
+
+def _quaternion_multiply(a: Tuple[float, ...], b: Tuple[float, ...]) -> Tuple[float, float, float, float]:
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+            aw * bw - ax * bx - ay * by - az * bz)
+
+
+def _layer_cells(recipe: PalletRecipe) -> List[Tuple[int, int]]:
+    if recipe.pattern == PATTERN_COLUMNS:
+        return [(r, c) for c in range(recipe.columns) for r in range(recipe.rows)]
+    cells = []
+    for r in range(recipe.rows):
+        columns = range(recipe.columns)
+        if recipe.pattern == PATTERN_SNAKE and r % 2:
+            columns = reversed(columns)
+        cells.extend((r, c) for c in columns)
+    return cells
+
+
+class PalletPlan:
+    """Рассчитанная последовательность поз паллеты.
+
+    Позы хранятся одним массивом (numpy (N, 7) или array('d') длиной 7·N):
+    для каждой ячейки – подход, укладка, отвод. kinds – вид позы
+    (APPROACH/PLACE/RETRACT), slots – номер ячейки. next_index – индекс
+    следующей невыполненной позы; выполнение продолжается с него.
+    """
+
+    def __init__(self, recipe: PalletRecipe, poses: "array", kinds: "array", slots: "array"):
+        self.recipe = recipe
+        self.poses = np.frombuffer(poses, dtype=float).reshape(-1, _STRIDE) if np is not None else poses
+        self.kinds = kinds
+        self.slots = slots
+        self.next_index = 0
+
+    @property
+    def slot_count(self) -> int:
+        return self.recipe.rows * self.recipe.columns * self.recipe.layers
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def row(self, index: int) -> Tuple[float, ...]:
+        """(x, y, z, qx, qy, qz, qw) позы index."""
+        if isinstance(self.poses, array):
+            return tuple(self.poses[index * _STRIDE:(index + 1) * _STRIDE])
+        return tuple(float(v) for v in self.poses[index])
+
+    def pose(self, index: int) -> Point3D:
+        x, y, z, qx, qy, qz, qw = self.row(index)
+        return Point3D(position=Position(x=x, y=y, z=z), orientation=Orientation(x=qx, y=qy, z=qz, w=qw))
+
+    def positions(self) -> List[Tuple[float, float, float]]:
+        return [self.row(i)[:3] for i in range(len(self))]
+
+    def index_of_slot(self, slot: int) -> int:
+        """Индекс позы подхода к ячейке slot (для продолжения с заданной ячейки)."""
+        if not 0 <= slot < self.slot_count:
+            raise IndexError(f"Ячейка {slot} вне паллеты из {self.slot_count} ячеек")
+        return slot * 3
+
+    def reset(self, index: int = 0) -> None:
+        if not 0 <= index <= len(self):
+            raise IndexError(f"Индекс {index} вне плана из {len(self)} поз")
+        self.next_index = index
+
+    @property
+    def done(self) -> bool:
+        return self.next_index >= len(self)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, Tuple[float, ...]]]:
+        """(индекс, вид, ячейка, поза) начиная с next_index."""
+        for index in range(self.next_index, len(self)):
+            yield index, self.kinds[index], self.slots[index], self.row(index)
+
+    def __repr__(self) -> str:
+        return f"PalletPlan(slots={self.slot_count}, poses={len(self)}, next_index={self.next_index})"
+
+
+def build_plan(recipe: PalletRecipe) -> PalletPlan:
+    """Рассчитать план паллеты по рецепту (без кэша)."""
+    if recipe.rows < 1 or recipe.columns < 1 or recipe.layers < 1:
+        raise ValueError("rows, columns и layers должны быть положительными")
+    if recipe.pattern not in _PATTERNS:
+        raise ValueError(f"Неизвестная схема раскладки {recipe.pattern!r}, ожидается одна из {_PATTERNS}")
+    ox, oy, oz = (float(v) for v in recipe.origin)
+    cos_yaw, sin_yaw = math.cos(recipe.yaw), math.sin(recipe.yaw)
+    cells = _layer_cells(recipe)
+    layer_orientations = []
+    for turn in (0.0, math.pi / 2):
+        half = (recipe.yaw + turn) / 2
+        layer_orientations.append(_quaternion_multiply((0.0, 0.0, math.sin(half), math.cos(half)),
+                                                       tuple(float(v) for v in recipe.orientation)))
+    poses, kinds, slots = array("d"), array("b"), array("i")
+    slot = 0
+    for layer in range(recipe.layers):
+        quaternion = layer_orientations[1 if recipe.interlock and layer % 2 else 0]
+        z = oz + layer * recipe.layer_height
+        for r, c in cells:
+            dx, dy = c * recipe.pitch[0], r * recipe.pitch[1]
+            x, y = ox + cos_yaw * dx - sin_yaw * dy, oy + sin_yaw * dx + cos_yaw * dy
+            for kind, lift in ((APPROACH, recipe.approach), (PLACE, 0.0), (RETRACT, recipe.retract)):
+                poses.extend((x, y, z + lift))
+                poses.extend(quaternion)
+                kinds.append(kind)
+                slots.append(slot)
+            slot += 1
+    return PalletPlan(recipe, poses, kinds, slots)
+
+
+class PalletPlanner:
+    """Кэш планов паллет по рецепту (LRU): повторный выбор рецепта не требует
+    пересчёта, а план хранит место остановки (next_index). Полностью
+    выполненный план при повторном запросе начинается заново (следующая
+    паллета); прерванный продолжается с места остановки.
+
+    Пример:
+        planner = PalletPlanner()
+        plan = planner.plan(PalletRecipe(origin=(0.4, -0.2, 0.05), rows=3, columns=4, layers=2))
+        robot.run_pallet(plan, on_place=lambda slot: gripper.deactivate())
+    """
+
+    def __init__(self, max_plans: int = 32):
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[PalletRecipe, PalletPlan]" = OrderedDict()
+
+    def plan(self, recipe: PalletRecipe) -> PalletPlan:
+        plan = self._plans.get(recipe)
+        if plan is None:
+            plan = self._plans[recipe] = build_plan(recipe)
+            if len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(recipe)
+            if plan.done:
+                plan.reset()
+        return plan
+
+    def forget(self, recipe: Optional[PalletRecipe] = None) -> None:
+        """Удалить план рецепта (None – все планы)."""
+        if recipe is None:
+            self._plans.clear()
+        else:
+            self._plans.pop(recipe, None)
+
+    def __contains__(self, recipe: PalletRecipe) -> bool:
+        return recipe in self._plans
+
+    def __len__(self) -> int:
+        return len(self._plans)
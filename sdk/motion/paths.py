@@ -0,0 +1,458 @@
+"""
+Построение траекторий на стороне SDK: отрезки, дуги и ломаные со скруглёнными
+углами, разметка по времени трапецеидальным профилем скорости. Плотные
+выборки (numpy, если установлен) отправляются в потоковое управление
+(stream_coordinates / stream_joint_positions) без обмена командами на каждый сегмент.
+"""
+import math
+from bisect import bisect_right
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sdk.utils.numeric import np
+
+Vector3 = Tuple[float, float, float]
+Quaternion = Tuple[float, float, float, float]
+
+_EPS = 1e-9
+
+
+def _sub(a: Sequence[float], b: Sequence[float]) -> Vector3:
+    return a[0] - b[0], a[1] - b[1], a[2] - b[2]
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a: Sequence[float], b: Sequence[float]) -> Vector3:
+    return a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]
+
+
+def _norm(a: Sequence[float]) -> float:
+    return math.sqrt(_dot(a, a))
+
+
+def _scale(a: Sequence[float], k: float) -> Vector3:
+    return a[0] * k, a[1] * k, a[2] * k
+
+
+def _add(a: Sequence[float], b: Sequence[float]) -> Vector3:
+    return a[0] + b[0], a[1] + b[1], a[2] + b[2]
+
+
+def _unit(a: Sequence[float]) -> Vector3:
+    return _scale(a, 1.0 / _norm(a))
+
+
+def _split_waypoint(waypoint: Any) -> Tuple[Vector3, Optional[Quaternion]]:
+    """Point3D/Pose, Position или (x, y, z) -> (положение, кватернион или None)."""
+    position = getattr(waypoint, "position", None)
+    if position is not None:
+        o = getattr(waypoint, "orientation", None)
+        quaternion = (float(o.x), float(o.y), float(o.z), float(o.w)) if o is not None else None
+        return (float(position.x), float(position.y), float(position.z)), quaternion
+    if hasattr(waypoint, "x"):
+        return (float(waypoint.x), float(waypoint.y), float(waypoint.z)), None
+    x, y, z = waypoint
+    return (float(x), float(y), float(z)), None
+
+
+def slerp(q0: Sequence[float], q1: Sequence[float], u: float) -> Quaternion:
+    """Сферическая интерполяция кватернионов (x, y, z, w) по кратчайшей дуге."""
+    d = sum(a * b for a, b in zip(q0, q1))
+    if d < 0:
+        q1, d = [-v for v in q1], -d
+    if d > 0.9995:
+        w0, w1 = 1 - u, u
+    else:
+        theta = math.acos(d)
+        w0, w1 = math.sin((1 - u) * theta) / math.sin(theta), math.sin(u * theta) / math.sin(theta)
+    q = [w0 * a + w1 * b for a, b in zip(q0, q1)]
+    n = math.sqrt(sum(v * v for v in q))
+    return q[0] / n, q[1] / n, q[2] / n, q[3] / n
+
+
+class TrapezoidProfile:
+    """Трапецеидальный профиль скорости по длине пути: разгон, движение
+    с постоянной скоростью, торможение. Если разогнаться до max_velocity
+    не успевает – профиль треугольный.
+    """
+    __slots__ = ("distance", "velocity", "acceleration", "t_accel", "t_cruise", "duration")
+
+    def __init__(self, distance: float, max_velocity: float, max_acceleration: float):
+        if max_velocity <= 0 or max_acceleration <= 0:
+            raise ValueError("max_velocity и max_acceleration должны быть положительными")
+        if distance < 0:
+            raise ValueError("distance не может быть отрицательным")
+        self.distance = float(distance)
+        self.acceleration = float(max_acceleration)
+        self.velocity = min(float(max_velocity), math.sqrt(distance * max_acceleration))
+        self.t_accel = self.velocity / self.acceleration if self.velocity > 0 else 0.0
+        self.t_cruise = (distance - self.velocity * self.t_accel) / self.velocity if self.velocity > 0 else 0.0
+        self.duration = 2 * self.t_accel + self.t_cruise
+
+    def at(self, t: float) -> Tuple[float, float]:
+        """(пройденный путь, скорость) в момент t."""
+        a, ta = self.acceleration, self.t_accel
+        if t <= 0:
+            return 0.0, 0.0
+        if t >= self.duration:
+            return self.distance, 0.0
+        if t < ta:
+            return 0.5 * a * t * t, a * t
+        if t < ta + self.t_cruise:
+            return 0.5 * self.velocity * ta + self.velocity * (t - ta), self.velocity
+        rest = self.duration - t
+        return self.distance - 0.5 * a * rest * rest, a * rest
+
+    def sample(self, times: Any) -> Tuple[Any, Any]:
+        """Векторный вариант at() для массива моментов (numpy), иначе списки."""
+        if np is None:
+            pairs = [self.at(t) for t in times]
+            return [p[0] for p in pairs], [p[1] for p in pairs]
+        t = np.clip(np.asarray(times, dtype=float), 0.0, self.duration)
+        a, ta, v = self.acceleration, self.t_accel, self.velocity
+        rest = self.duration - t
+        s = np.where(t < ta, 0.5 * a * t * t,
+                     np.where(t < ta + self.t_cruise, 0.5 * v * ta + v * (t - ta), self.distance - 0.5 * a * rest * rest))
+        speed = np.where(t < ta, a * t, np.where(t < ta + self.t_cruise, v, a * rest))
+        return s, speed
+
+    def __repr__(self) -> str:
+        return f"TrapezoidProfile(distance={self.distance:.4f}, velocity={self.velocity:.4f}, duration={self.duration:.4f})"
+
+
+class LineSegment:
+    """Прямолинейный отрезок."""
+    __slots__ = ("start", "end", "length", "_direction")
+
+    def __init__(self, start: Sequence[float], end: Sequence[float]):
+        self.start: Vector3 = tuple(map(float, start))
+        self.end: Vector3 = tuple(map(float, end))
+        delta = _sub(self.end, self.start)
+        self.length = _norm(delta)
+        self._direction = _scale(delta, 1.0 / self.length) if self.length > _EPS else (0.0, 0.0, 0.0)
+
+    def point(self, s: float) -> Vector3:
+        return _add(self.start, _scale(self._direction, s))
+
+    def points(self, s: "np.ndarray") -> "np.ndarray":
+        return np.asarray(self.start) + np.outer(s, self._direction)
+
+    def __repr__(self) -> str:
+        return f"LineSegment({self.start} -> {self.end})"
+
+
+class ArcSegment:
+    """Дуга окружности от start до end вокруг center (как у arc_motion).
+
+    Направление обхода задаёт нормаль плоскости дуги (правило правой руки);
+    без неё берётся кратчайшая дуга. Если расстояния start и end до центра
+    различаются, радиус меняется вдоль дуги линейно.
+    """
+    __slots__ = ("start", "end", "center", "normal", "angle", "radius", "length", "_r0", "_r1", "_u", "_v")
+
+    def __init__(self, start: Sequence[float], end: Sequence[float], center: Sequence[float],
+                 normal: Optional[Sequence[float]] = None):
+        self.start: Vector3 = tuple(map(float, start))
+        self.end: Vector3 = tuple(map(float, end))
+        self.center: Vector3 = tuple(map(float, center))
+        a, b = _sub(self.start, self.center), _sub(self.end, self.center)
+        self._r0, self._r1 = _norm(a), _norm(b)
+        if self._r0 < _EPS or self._r1 < _EPS:
+            raise ValueError("Начало и конец дуги не должны совпадать с центром")
+        if normal is None:
+            normal = _cross(a, b)
+            if _norm(normal) < _EPS * self._r0 * self._r1:
+                raise ValueError("Плоскость дуги не определена (точки на одной прямой): задайте normal")
+        self.normal = _unit(normal)
+        self._u = _scale(a, 1.0 / self._r0)
+        self._v = _cross(self.normal, self._u)
+        angle = math.atan2(_dot(b, self._v), _dot(b, self._u))
+        self.angle = angle if angle > _EPS else angle + 2 * math.pi
+        self.radius = min(self._r0, self._r1)
+        self.length = self.angle * (self._r0 + self._r1) / 2
+
+    @classmethod
+    def through(cls, start: Sequence[float], via: Sequence[float], end: Sequence[float]) -> "ArcSegment":
+        """Дуга через три точки (направление обхода – от start через via к end)."""
+        a, b = _sub(via, start), _sub(end, start)
+        n = _cross(a, b)
+        nn = _dot(n, n)
+        if nn < _EPS ** 2:
+            raise ValueError("Точки дуги лежат на одной прямой")
+        center = _add(start, _scale(_cross(_sub(_scale(b, _dot(a, a)), _scale(a, _dot(b, b))), n), 0.5 / nn))
+        return cls(start, end, center, _cross(_sub(via, start), _sub(end, via)))
+
+    def point(self, s: float) -> Vector3:
+        k = s / self.length if self.length > 0 else 0.0
+        phi, r = k * self.angle, self._r0 + (self._r1 - self._r0) * k
+        return _add(self.center, _add(_scale(self._u, r * math.cos(phi)), _scale(self._v, r * math.sin(phi))))
+
+    def points(self, s: "np.ndarray") -> "np.ndarray":
+        k = np.asarray(s, dtype=float) / self.length
+        phi, r = k * self.angle, self._r0 + (self._r1 - self._r0) * k
+        return (np.asarray(self.center) + np.outer(r * np.cos(phi), self._u) + np.outer(r * np.sin(phi), self._v))
+
+    def __repr__(self) -> str:
+        return f"ArcSegment({self.start} -> {self.end}, center={self.center}, angle={self.angle:.4f})"
+
+
+class PathSamples:
+    """Выборка траектории с равным шагом по времени.
+
+    times – моменты от начала, с; positions – (N, 3); orientations – (N, 4)
+    (x, y, z, w) или None; speeds – скорость вдоль пути, м/с. При наличии
+    numpy поля – массивы, иначе списки.
+    """
+    __slots__ = ("times", "positions", "orientations", "speeds")
+
+    def __init__(self, times: Any, positions: Any, orientations: Any, speeds: Any):
+        self.times = times
+        self.positions = positions
+        self.orientations = orientations
+        self.speeds = speeds
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __iter__(self) -> Iterator[Tuple[float, Vector3, Optional[Quaternion]]]:
+        """(t, (x, y, z), (qx, qy, qz, qw) или None) – обычные float, готовые к отправке."""
+        orientations = self.orientations
+        for i in range(len(self.times)):
+            position = tuple(float(v) for v in self.positions[i])
+            orientation = tuple(float(v) for v in orientations[i]) if orientations is not None else None
+            yield float(self.times[i]), position, orientation
+
+    def __repr__(self) -> str:
+        return f"PathSamples(points={len(self)}, duration={self.duration:.3f})"
+
+
+class Path:
+    """Путь из отрезков и дуг с ориентацией, интерполируемой по длине пути.
+
+    Пример:
+        path = Path.polyline([p0, p1, p2, p3], blend_radius=0.02)
+        samples = path.sample(max_velocity=0.2, max_acceleration=0.5, rate_hz=250)
+        robot.stream_path(samples)
+    """
+
+    def __init__(self, segments: Sequence[Any], orientations: Optional[Sequence[Tuple[float, Sequence[float]]]] = None):
+        """
+        :param segments: Сегменты LineSegment/ArcSegment, каждый начинается в конце предыдущего
+        :param orientations: Опорные ориентации [(путь от начала, (x, y, z, w)), ...] по возрастанию пути
+        """
+        self.segments = [segment for segment in segments if segment.length > _EPS]
+        if not self.segments:
+            raise ValueError("Путь нулевой длины")
+        self._offsets = [0.0]
+        for segment in self.segments:
+            self._offsets.append(self._offsets[-1] + segment.length)
+        self.orientations = None
+        if orientations:
+            self.orientations = [(float(s), tuple(float(v) for v in q)) for s, q in orientations]
+            if len(self.orientations) == 1:
+                self.orientations.append((self.length, self.orientations[0][1]))
+
+    @property
+    def length(self) -> float:
+        return self._offsets[-1]
+
+    # -------------------------------------------------
+    # Построение
+    # -------------------------------------------------
+    @staticmethod
+    def _endpoint_orientations(start: Optional[Quaternion], end: Optional[Quaternion], length: float) -> Optional[list]:
+        if start is None or end is None:
+            return None
+        return [(0.0, start), (length, end)]
+
+    @classmethod
+    def line(cls, start: Any, end: Any) -> "Path":
+        """Прямая между двумя позами или точками (x, y, z)."""
+        (p0, q0), (p1, q1) = _split_waypoint(start), _split_waypoint(end)
+        segment = LineSegment(p0, p1)
+        return cls([segment], cls._endpoint_orientations(q0, q1, segment.length))
+
+    @classmethod
+    def arc(cls, start: Any, end: Any, center: Any, normal: Optional[Sequence[float]] = None) -> "Path":
+        """Дуга от start до end вокруг center (параметры как у arc_motion)."""
+        (p0, q0), (p1, q1), (c, _) = _split_waypoint(start), _split_waypoint(end), _split_waypoint(center)
+        segment = ArcSegment(p0, p1, c, normal)
+        return cls([segment], cls._endpoint_orientations(q0, q1, segment.length))
+
+    @classmethod
+    def arc_through(cls, start: Any, via: Any, end: Any) -> "Path":
+        """Дуга через три позы."""
+        (p0, q0), (pv, _), (p1, q1) = _split_waypoint(start), _split_waypoint(via), _split_waypoint(end)
+        segment = ArcSegment.through(p0, pv, p1)
+        return cls([segment], cls._endpoint_orientations(q0, q1, segment.length))
+
+    @classmethod
+    def polyline(cls, waypoints: Sequence[Any], blend_radius: float = 0.0) -> "Path":
+        """
+        Ломаная через точки; углы скругляются дугами, касательными к соседним отрезкам,
+        так что скорость на стыках не падает до нуля.
+        :param waypoints: Позы или точки (x, y, z); ориентация интерполируется, если задана у всех
+        :param blend_radius: Расстояние от вершины, на котором путь сходит с прямой, м
+            (ограничивается половиной соседних отрезков)
+        """
+        if len(waypoints) < 2:
+            raise ValueError("Нужно хотя бы две точки")
+        split = [_split_waypoint(w) for w in waypoints]
+        points = [p for p, _ in split]
+        quaternions = [q for _, q in split]
+        segments: List[Any] = []
+        stations: List[float] = [0.0]
+        cursor, travelled = points[0], 0.0
+        for i in range(1, len(points) - 1):
+            corner, previous, following = points[i], points[i - 1], points[i + 1]
+            len_in, len_out = _norm(_sub(corner, previous)), _norm(_sub(following, corner))
+            trim = 0.0
+            if blend_radius > 0 and len_in > _EPS and len_out > _EPS:
+                d_in, d_out = _unit(_sub(corner, previous)), _unit(_sub(following, corner))
+                turn = math.acos(max(-1.0, min(1.0, _dot(d_in, d_out))))
+                if 1e-6 < turn < math.pi - 1e-6:
+                    trim = min(blend_radius, len_in / 2, len_out / 2)
+            if trim == 0.0:
+                line = LineSegment(cursor, corner)
+                segments.append(line)
+                travelled += line.length
+                stations.append(travelled)
+                cursor = corner
+                continue
+            arc_start, arc_end = _sub(corner, _scale(d_in, trim)), _add(corner, _scale(d_out, trim))
+            radius = trim / math.tan(turn / 2)
+            center = _add(corner, _scale(_unit(_sub(d_out, d_in)), math.hypot(trim, radius)))
+            line = LineSegment(cursor, arc_start)
+            arc = ArcSegment(arc_start, arc_end, center, _cross(d_in, d_out))
+            segments.extend((line, arc))
+            travelled += line.length
+            stations.append(travelled + arc.length / 2)
+            travelled += arc.length
+            cursor = arc_end
+        last = LineSegment(cursor, points[-1])
+        segments.append(last)
+        stations.append(travelled + last.length)
+        orientations = None
+        if all(q is not None for q in quaternions):
+            orientations = list(zip(stations, quaternions))
+        return cls(segments, orientations)
+
+    # -------------------------------------------------
+    # Интерполяция
+    # -------------------------------------------------
+    def position(self, s: float) -> Vector3:
+        """Точка на расстоянии s от начала пути."""
+        index = min(max(bisect_right(self._offsets, s) - 1, 0), len(self.segments) - 1)
+        segment = self.segments[index]
+        return segment.point(min(max(s - self._offsets[index], 0.0), segment.length))
+
+    def orientation(self, s: float) -> Optional[Quaternion]:
+        if self.orientations is None:
+            return None
+        stations = [k[0] for k in self.orientations]
+        index = min(max(bisect_right(stations, s) - 1, 0), len(stations) - 2)
+        (s0, q0), (s1, q1) = self.orientations[index], self.orientations[index + 1]
+        u = (s - s0) / (s1 - s0) if s1 > s0 else 1.0
+        return slerp(q0, q1, min(max(u, 0.0), 1.0))
+
+    def positions(self, s: Any) -> Any:
+        """Точки для массива расстояний: numpy (N, 3) или список кортежей."""
+        if np is None:
+            return [self.position(v) for v in s]
+        s = np.clip(np.asarray(s, dtype=float), 0.0, self.length)
+        index = np.clip(np.searchsorted(self._offsets, s, side="right") - 1, 0, len(self.segments) - 1)
+        result = np.empty((len(s), 3))
+        for i, segment in enumerate(self.segments):
+            mask = index == i
+            if mask.any():
+                result[mask] = segment.points(s[mask] - self._offsets[i])
+        return result
+
+    def orientations_at(self, s: Any) -> Any:
+        """Ориентации для массива расстояний: numpy (N, 4), список или None."""
+        if self.orientations is None:
+            return None
+        if np is None:
+            return [self.orientation(v) for v in s]
+        stations = np.array([k[0] for k in self.orientations])
+        q0 = np.array([k[1] for k in self.orientations[:-1]], dtype=float)
+        q1 = np.array([k[1] for k in self.orientations[1:]], dtype=float)
+        dots = np.sum(q0 * q1, axis=1)
+        q1[dots < 0] *= -1
+        theta = np.arccos(np.clip(np.abs(dots), -1.0, 1.0))
+        s = np.asarray(s, dtype=float)
+        index = np.clip(np.searchsorted(stations, s, side="right") - 1, 0, len(stations) - 2)
+        span = stations[index + 1] - stations[index]
+        u = np.clip(np.where(span > 0, (s - stations[index]) / np.where(span > 0, span, 1.0), 1.0), 0.0, 1.0)
+        th, sin_th = theta[index], np.sin(theta[index])
+        small = sin_th < 1e-6
+        safe = np.where(small, 1.0, sin_th)
+        w0 = np.where(small, 1 - u, np.sin((1 - u) * th) / safe)
+        w1 = np.where(small, u, np.sin(u * th) / safe)
+        q = w0[:, None] * q0[index] + w1[:, None] * q1[index]
+        return q / np.linalg.norm(q, axis=1)[:, None]
+
+    # -------------------------------------------------
+    # Разметка по времени
+    # -------------------------------------------------
+    def _tangential_acceleration(self, max_acceleration: float) -> float:
+        """На дугах разгон и центростремительное ускорение складываются: каждому – max / √2."""
+        if any(isinstance(segment, ArcSegment) for segment in self.segments):
+            return max_acceleration / math.sqrt(2)
+        return max_acceleration
+
+    def max_speed(self, max_acceleration: float, max_angular_velocity: Optional[float] = None) -> float:
+        """
+        Наибольшая скорость вдоль пути, при которой полное ускорение на дугах (касательное
+        max / √2 и центростремительное) не превышает max_acceleration, а скорость поворота
+        инструмента – max_angular_velocity (рад/с, None – не ограничена).
+        """
+        centripetal = self._tangential_acceleration(max_acceleration)
+        radii = [segment.radius for segment in self.segments if isinstance(segment, ArcSegment)]
+        speed = min((math.sqrt(centripetal * r) for r in radii), default=math.inf)
+        if max_angular_velocity is not None and self.orientations is not None:
+            if max_angular_velocity <= 0:
+                raise ValueError("max_angular_velocity должна быть положительной")
+            for (s0, q0), (s1, q1) in zip(self.orientations, self.orientations[1:]):
+                angle = 2 * math.acos(min(1.0, abs(sum(a * b for a, b in zip(q0, q1)))))
+                if angle < 1e-9:
+                    continue
+                if s1 - s0 < _EPS:
+                    raise ValueError(f"Поворот на {angle:.4g} рад на нулевом участке пути (s={s0:.4g})")
+                speed = min(speed, max_angular_velocity * (s1 - s0) / angle)
+        return speed
+
+    def profile(self, max_velocity: float, max_acceleration: float,
+                max_angular_velocity: Optional[float] = None) -> TrapezoidProfile:
+        return TrapezoidProfile(self.length, min(max_velocity, self.max_speed(max_acceleration, max_angular_velocity)),
+                                self._tangential_acceleration(max_acceleration))
+
+    def sample(self, max_velocity: float, max_acceleration: float, rate_hz: float = 100.0,
+               max_angular_velocity: Optional[float] = None) -> PathSamples:
+        """
+        Плотная выборка пути с шагом 1 / rate_hz по трапецеидальному профилю
+        :param max_velocity: Предел скорости вдоль пути, м/с
+        :param max_acceleration: Предел полного ускорения (на дугах – касательного и центростремительного вместе), м/с²
+        :param rate_hz: Частота выборки (частота стриминга), Гц
+        :param max_angular_velocity: Предел скорости поворота инструмента, рад/с (None – не ограничена);
+            профиль удлиняется так, чтобы ориентация не поворачивалась быстрее
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz должна быть положительной")
+        profile = self.profile(max_velocity, max_acceleration, max_angular_velocity)
+        count = int(math.ceil(profile.duration * rate_hz - 1e-9)) + 1
+        if np is not None:
+            times = np.minimum(np.arange(count) / rate_hz, profile.duration)
+        else:
+            times = [min(i / rate_hz, profile.duration) for i in range(count)]
+        s, speeds = profile.sample(times)
+        return PathSamples(times, self.positions(s), self.orientations_at(s), speeds)
+
+    def __repr__(self) -> str:
+        return f"Path(segments={len(self.segments)}, length={self.length:.4f})"
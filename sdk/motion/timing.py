@@ -0,0 +1,249 @@
+"""
+Разметка траектории суставов по времени с учётом пределов скоростей и
+ускорений (в духе TOPP): путь через точки move_group проходится с
+наибольшей допустимой скоростью на каждом участке, без остановок в
+промежуточных точках, где это позволяет ускорение. Результат – явная
+траектория для stream_joint_positions и масштабы скорости по участкам.
+"""
+import math
+from bisect import bisect_right
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from sdk.motion.limits import JointLimits
+from sdk.utils.numeric import np
+
+_EPS = 1e-12
+
+
+class TimedSegment(NamedTuple):
+    """Участок между точками index и index + 1.
+
+    Скорости entry/peak/exit – вдоль пути в пространстве суставов (норма
+    вектора скоростей, рад/с). velocity_scaling и acceleration_scaling –
+    доля предела самого нагруженного сустава, использованная на участке.
+    """
+    index: int
+    start_time: float
+    duration: float
+    length: float
+    entry_speed: float
+    peak_speed: float
+    exit_speed: float
+    acceleration: float
+    velocity_scaling: float
+    acceleration_scaling: float
+
+
+def joint_rows(positions: Sequence[Any], names: Optional[Sequence[str]] = None) -> Tuple[Tuple[str, ...], List[List[float]]]:
+    """
+    Точки move_group (JointPositions или словари {сустав: угол}) -> (имена, строки углов)
+    :param names: Порядок суставов (по умолчанию – из первой точки)
+    """
+    mappings: List[Mapping[str, float]] = []
+    for point in positions:
+        if isinstance(point, Mapping):
+            mappings.append(point)
+        else:
+            mappings.append({p.joint: p.position for p in point.positions})
+    if not mappings:
+        raise ValueError("Траектория не содержит точек")
+    names = tuple(names) if names is not None else tuple(mappings[0])
+    rows = []
+    for index, mapping in enumerate(mappings):
+        missing = [name for name in names if name not in mapping]
+        if missing:
+            raise ValueError(f"Точка {index}: нет суставов {missing}")
+        rows.append([float(mapping[name]) for name in names])
+    return names, rows
+
+
+def _limit_vector(names: Sequence[str], joint_limits: Optional[JointLimits], attribute: str,
+                  override: Optional[Sequence[float]]) -> List[float]:
+    if override is not None:
+        values = [float(v) for v in override]
+    else:
+        source = getattr(joint_limits, attribute, None) if joint_limits is not None else None
+        if source is None:
+            raise ValueError(f"Пределы {attribute} суставов неизвестны: передайте их явно")
+        index = {name: i for i, name in enumerate(joint_limits.names)}
+        values = [source[index[name]] if name in index else math.inf for name in names]
+    bad = [name for name, value in zip(names, values) if not (0 < value < math.inf)]
+    if bad:
+        raise ValueError(f"Нет конечного предела {attribute} для суставов {bad}")
+    return values
+
+
+class JointTrajectory:
+    """Траектория суставов, размеченная по времени.
+
+    Пример:
+        trajectory = JointTrajectory.plan(names, rows, joint_limits, velocity_scaling=0.8)
+        print(trajectory.duration, trajectory.segments[0].velocity_scaling)
+        times, positions, velocities = trajectory.sample(rate_hz=250)
+    """
+
+    def __init__(self, names: Sequence[str], waypoints: Sequence[Sequence[float]], segments: Sequence[TimedSegment],
+                 directions: Sequence[Sequence[float]], corner_period: float = 0.01):
+        self.names: Tuple[str, ...] = tuple(names)
+        # Период стриминга, под который размечены изломы (проигрывать с частотой 1 / corner_period)
+        self.corner_period = corner_period
+        self.waypoints: List[List[float]] = [list(row) for row in waypoints]
+        self.segments: List[TimedSegment] = list(segments)
+        self._directions = [list(d) for d in directions]
+        self._starts = [segment.start_time for segment in self.segments]
+
+    @property
+    def duration(self) -> float:
+        if not self.segments:
+            return 0.0
+        last = self.segments[-1]
+        return last.start_time + last.duration
+
+    @property
+    def waypoint_times(self) -> List[float]:
+        """Моменты прохождения точек траектории."""
+        return self._starts + [self.duration]
+
+    # -------------------------------------------------
+    # Планирование
+    # -------------------------------------------------
+    @classmethod
+    def plan(cls,
+             names: Sequence[str],
+             waypoints: Sequence[Sequence[float]],
+             joint_limits: Optional[JointLimits] = None,
+             max_velocity: Optional[Sequence[float]] = None,
+             max_acceleration: Optional[Sequence[float]] = None,
+             velocity_scaling: float = 1.0,
+             acceleration_scaling: float = 1.0,
+             corner_period: float = 0.01) -> "JointTrajectory":
+        """
+        Разметить кусочно-линейный путь в пространстве суставов по времени
+        :param names: Имена суставов (столбцы waypoints)
+        :param waypoints: Точки пути, рад
+        :param joint_limits: Пределы суставов (скорости и ускорения берутся отсюда)
+        :param max_velocity: Пределы скоростей по суставам, рад/с (вместо joint_limits)
+        :param max_acceleration: Пределы ускорений по суставам, рад/с² (вместо joint_limits)
+        :param velocity_scaling: Доля пределов скорости (0..1]
+        :param acceleration_scaling: Доля пределов ускорения (0..1]
+        :param corner_period: Период стриминга, с: скачок скорости в точке излома
+            ограничивается ускорением за один период; на прямых стыках скорость не снижается.
+            Сохраняется в траектории и задаёт частоту stream_joint_trajectory по умолчанию
+        """
+        if not 0 < velocity_scaling <= 1 or not 0 < acceleration_scaling <= 1:
+            raise ValueError("velocity_scaling и acceleration_scaling должны быть в (0, 1]")
+        velocity = [v * velocity_scaling for v in _limit_vector(names, joint_limits, "velocity", max_velocity)]
+        acceleration = [a * acceleration_scaling for a in _limit_vector(names, joint_limits, "acceleration", max_acceleration)]
+        rows = [[float(v) for v in row] for row in waypoints]
+        # Совпадающие подряд точки не образуют участка
+        points = [rows[0]]
+        for row in rows[1:]:
+            if max(abs(a - b) for a, b in zip(row, points[-1])) > _EPS:
+                points.append(row)
+        if len(points) < 2:
+            return cls(names, points, [], [], corner_period)
+
+        lengths, directions, speed_limits, accel_limits = [], [], [], []
+        for a, b in zip(points, points[1:]):
+            delta = [y - x for x, y in zip(a, b)]
+            length = math.sqrt(sum(d * d for d in delta))
+            direction = [d / length for d in delta]
+            lengths.append(length)
+            directions.append(direction)
+            speed_limits.append(min(v / abs(d) for v, d in zip(velocity, direction) if abs(d) > _EPS))
+            accel_limits.append(min(a_ / abs(d) for a_, d in zip(acceleration, direction) if abs(d) > _EPS))
+
+        # Допустимая скорость в точках: 0 на концах, на изломах – по скачку скорости суставов
+        count = len(lengths)
+        corner = [0.0] * (count + 1)
+        for k in range(1, count):
+            jumps = [abs(o - i) for i, o in zip(directions[k - 1], directions[k])]
+            limit = min((a * corner_period / j for a, j in zip(acceleration, jumps) if j > _EPS), default=math.inf)
+            corner[k] = min(limit, speed_limits[k - 1], speed_limits[k])
+        # Прямой и обратный проход: скорость в точке достижима разгоном и торможением
+        for k in range(count):
+            corner[k + 1] = min(corner[k + 1], math.sqrt(corner[k] ** 2 + 2 * accel_limits[k] * lengths[k]))
+        for k in range(count - 1, -1, -1):
+            corner[k] = min(corner[k], math.sqrt(corner[k + 1] ** 2 + 2 * accel_limits[k] * lengths[k]))
+
+        segments = []
+        start_time = 0.0
+        for k in range(count):
+            c0, c1, a, length = corner[k], corner[k + 1], accel_limits[k], lengths[k]
+            peak = min(speed_limits[k], math.sqrt(max((2 * a * length + c0 * c0 + c1 * c1) / 2, 0.0)))
+            peak = max(peak, c0, c1)
+            cruise = length - (peak * peak - c0 * c0) / (2 * a) - (peak * peak - c1 * c1) / (2 * a)
+            duration = (peak - c0) / a + (peak - c1) / a + max(cruise, 0.0) / peak
+            direction = directions[k]
+            segments.append(TimedSegment(
+                index=k, start_time=start_time, duration=duration, length=length,
+                entry_speed=c0, peak_speed=peak, exit_speed=c1, acceleration=a,
+                velocity_scaling=max(peak * abs(d) / v for d, v in zip(direction, velocity)) * velocity_scaling,
+                acceleration_scaling=max(a * abs(d) / a_ for d, a_ in zip(direction, acceleration)) * acceleration_scaling,
+            ))
+            start_time += duration
+        return cls(names, points, segments, directions, corner_period)
+
+    # -------------------------------------------------
+    # Выборка
+    # -------------------------------------------------
+    @staticmethod
+    def _progress(segment: TimedSegment, t: float) -> Tuple[float, float]:
+        """(путь от начала участка, скорость) через t секунд после его начала."""
+        c0, c1, peak, a = segment.entry_speed, segment.exit_speed, segment.peak_speed, segment.acceleration
+        t = min(max(t, 0.0), segment.duration)
+        t_acc, t_dec = (peak - c0) / a, (peak - c1) / a
+        t_cruise = segment.duration - t_acc - t_dec
+        if t < t_acc:
+            return c0 * t + 0.5 * a * t * t, c0 + a * t
+        s_acc = (peak * peak - c0 * c0) / (2 * a)
+        if t < t_acc + t_cruise:
+            return s_acc + peak * (t - t_acc), peak
+        rest = segment.duration - t
+        return segment.length - c1 * rest - 0.5 * a * rest * rest, c1 + a * rest
+
+    def state(self, t: float) -> Tuple[List[float], List[float]]:
+        """(углы, скорости суставов) в момент t."""
+        if not self.segments:
+            return list(self.waypoints[0]), [0.0] * len(self.names)
+        index = min(max(bisect_right(self._starts, t) - 1, 0), len(self.segments) - 1)
+        segment = self.segments[index]
+        s, speed = self._progress(segment, t - segment.start_time)
+        direction, origin = self._directions[index], self.waypoints[index]
+        return [q + s * d for q, d in zip(origin, direction)], [speed * d for d in direction]
+
+    def sample(self, rate_hz: float = 100.0) -> Tuple[Any, Any, Any]:
+        """
+        Выборка с шагом 1 / rate_hz (последняя точка – конец траектории)
+        :return: (моменты, углы (N, dof), скорости (N, dof)) – массивы numpy или списки
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz должна быть положительной")
+        duration = self.duration
+        count = int(math.ceil(duration * rate_hz - 1e-9)) + 1
+        if np is None:
+            times = [min(i / rate_hz, duration) for i in range(count)]
+            states = [self.state(t) for t in times]
+            return times, [p for p, _ in states], [v for _, v in states]
+        times = np.minimum(np.arange(count) / rate_hz, duration)
+        if not self.segments:
+            return times, np.tile(self.waypoints[0], (count, 1)), np.zeros((count, len(self.names)))
+        table = np.array([(s.start_time, s.duration, s.length, s.entry_speed, s.peak_speed, s.exit_speed, s.acceleration)
+                          for s in self.segments])
+        index = np.clip(np.searchsorted(table[:, 0], times, side="right") - 1, 0, len(self.segments) - 1)
+        start, length, c0, peak, c1, a = (table[index, i] for i in (0, 2, 3, 4, 5, 6))
+        duration_k = table[index, 1]
+        t = np.clip(times - start, 0.0, duration_k)
+        t_acc, t_dec = (peak - c0) / a, (peak - c1) / a
+        t_cruise = duration_k - t_acc - t_dec
+        rest = duration_k - t
+        s_acc = (peak * peak - c0 * c0) / (2 * a)
+        s = np.where(t < t_acc, c0 * t + 0.5 * a * t * t,
+                     np.where(t < t_acc + t_cruise, s_acc + peak * (t - t_acc), length - c1 * rest - 0.5 * a * rest * rest))
+        speed = np.where(t < t_acc, c0 + a * t, np.where(t < t_acc + t_cruise, peak, c1 + a * rest))
+        directions = np.asarray(self._directions)[index]
+        origins = np.asarray(self.waypoints)[index]
+        return times, origins + s[:, None] * directions, speed[:, None] * directions
+
+    def __repr__(self) -> str:
+        return f"JointTrajectory(joints={len(self.names)}, segments={len(self.segments)}, duration={self.duration:.3f})"
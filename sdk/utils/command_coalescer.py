@@ -0,0 +1,212 @@
+"""
+Слой отложенной записи (write-behind) для команд, записывающих состояние каналов
+(цифровые/аналоговые выходы, GPIO, скорость конвейера).
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Функция отправки пачки записей: принимает список (ключ канала, значение) и
+# возвращает словарь ключ -> исключение (None, если запись подтверждена)
+SendBatch = Callable[[List[Tuple[Hashable, Any]]], Dict[Hashable, Optional[Exception]]]
+
+# Маркер отсутствия подтверждённого значения (None – допустимое значение канала)
+_MISSING = object()
+
+
+class CommandCoalescer:
+    """Объединяет повторяющиеся записи в каналы.
+
+    * запись значения, совпадающего с последним подтверждённым, отбрасывается;
+    * серия записей в один канал в пределах окна ``window_seconds`` сливается
+      в последнее значение;
+    * отправка выполняется в фоновом потоке, вызывающий код не блокируется.
+    """
+
+    def __init__(self, send_batch: SendBatch, window_seconds: float = 0.05, tolerance: float = 0.0):
+        """
+        :param send_batch: Функция отправки пачки записей
+        :param window_seconds: Окно слияния записей в секундах
+        :param tolerance: Допуск сравнения числовых значений (для аналоговых выходов)
+        """
+        self._send_batch = send_batch
+        self.window_seconds = window_seconds
+        self.tolerance = tolerance
+
+        self._acknowledged: Dict[Hashable, Any] = {}
+        self._inflight: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, Any] = {}
+        self._deadlines: Dict[Hashable, float] = {}
+        self._errors: Dict[Hashable, Exception] = {}
+        # Каналы, записанные напрямую, пока их значение было в отправке: подтверждение устарело
+        self._superseded: set = set()
+
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.merged_count = 0
+
+    # -------------------------------------------------
+    # Публичный API
+    # -------------------------------------------------
+    def write(self, key: Hashable, value: Any) -> bool:
+        """
+        Поставить запись в очередь
+        :param key: Ключ канала, например ("write_digital_output", 3)
+        :param value: Записываемое значение
+        :return: False, если запись отброшена как не меняющая состояние
+        """
+        with self._condition:
+            baseline = self._inflight.get(key, self._acknowledged.get(key, _MISSING))
+            if key in self._pending:
+                self.merged_count += 1
+                if self._same(value, baseline):
+                    # Серия записей вернула канал к исходному значению – отправлять нечего
+                    del self._pending[key]
+                    del self._deadlines[key]
+                    return False
+                self._pending[key] = value
+                return True
+
+            if self._same(value, baseline):
+                self.dropped_count += 1
+                return False
+
+            self._pending[key] = value
+            self._deadlines[key] = time.monotonic() + self.window_seconds
+            self._closed = False
+            self._ensure_worker()
+            self._condition.notify_all()
+            return True
+
+    def flush(self, timeout_seconds: Optional[float] = None) -> bool:
+        """
+        Немедленно отправить все накопленные записи и дождаться подтверждения
+        :param timeout_seconds: Максимальное время ожидания
+        :return: True, если очередь опустела до истечения таймаута
+        """
+        deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+        with self._condition:
+            now = time.monotonic()
+            for key in self._deadlines:
+                self._deadlines[key] = now
+            self._condition.notify_all()
+            while self._pending or self._inflight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def acknowledged(self, key: Hashable, default: Any = None) -> Any:
+        """Последнее подтверждённое контроллером значение канала."""
+        with self._condition:
+            return self._acknowledged.get(key, default)
+
+    def last_error(self, key: Hashable) -> Optional[Exception]:
+        """Ошибка последней неудачной отправки в канал (если была)."""
+        with self._condition:
+            return self._errors.get(key)
+
+    def invalidate(self, key: Optional[Hashable] = None, discard_pending: bool = False) -> None:
+        """
+        Забыть подтверждённое значение канала (или всех каналов).
+        Вызывается, когда состояние могло измениться в обход слоя объединения.
+        :param discard_pending: Канал записан напрямую – отменить ещё не отправленную запись
+            и не считать подтверждением ответ на запись, которая уже в отправке
+        """
+        with self._condition:
+            keys = list(set(self._acknowledged) | set(self._pending) | set(self._inflight)) if key is None else [key]
+            for k in keys:
+                self._acknowledged.pop(k, None)
+                if discard_pending:
+                    if self._pending.pop(k, _MISSING) is not _MISSING:
+                        del self._deadlines[k]
+                    if k in self._inflight:
+                        self._superseded.add(k)
+            self._condition.notify_all()
+
+    @property
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def close(self, timeout_seconds: Optional[float] = 1.0) -> None:
+        """
+        Отправить накопленные записи и остановить фоновый поток.
+        Следующая запись снова запустит поток.
+        """
+        self.flush(timeout_seconds)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout_seconds)
+
+    # -------------------------------------------------
+    # Внутреннее
+    # -------------------------------------------------
+    def _same(self, value: Any, baseline: Any) -> bool:
+        if baseline is _MISSING:
+            return False
+        if self.tolerance and isinstance(value, (int, float)) and isinstance(baseline, (int, float)) \
+                and not isinstance(value, bool) and not isinstance(baseline, bool):
+            return abs(value - baseline) <= self.tolerance
+        return value == baseline
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="CommandCoalescer", daemon=True)
+            self._worker.start()
+
+    def _take_due(self) -> List[Tuple[Hashable, Any]]:
+        now = time.monotonic()
+        due = [key for key, deadline in self._deadlines.items() if deadline <= now]
+        batch = []
+        for key in due:
+            value = self._pending.pop(key)
+            del self._deadlines[key]
+            self._inflight[key] = value
+            batch.append((key, value))
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    batch = self._take_due()
+                    if batch:
+                        break
+                    timeout = None
+                    if self._deadlines:
+                        timeout = max(0.0, min(self._deadlines.values()) - time.monotonic())
+                    self._condition.wait(timeout)
+
+            try:
+                errors = self._send_batch(batch) or {}
+            except Exception as e:
+                errors = {key: e for key, _ in batch}
+
+            with self._condition:
+                for key, value in batch:
+                    self._inflight.pop(key, None)
+                    error = errors.get(key)
+                    if key in self._superseded:
+                        self._superseded.discard(key)
+                        if error is None:
+                            self.sent_count += 1
+                        continue
+                    if error is None:
+                        self._acknowledged[key] = value
+                        self._errors.pop(key, None)
+                        self.sent_count += 1
+                    else:
+                        self._errors[key] = error
+                        print(f"[CommandCoalescer] Ошибка записи в канал {key}: {error}")
+                self._condition.notify_all()
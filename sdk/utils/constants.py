@@ -19,6 +19,7 @@ JOINT_INFO_TOPIC = "/joint_states"
 COMMAND_FEEDBACK_TOPIC = '/feedback'
 MGBOT_TOPIC = '/mgbot_info'
 PIXY_CAM_COORDINATES_TOPIC = '/pixy_coordinates'
+ROBOT_DESCRIPTION_TOPIC = '/robot_description'
 
 # Маппинг типов сообщений на топики
 MESSAGE_TYPE_TO_TOPIC = {
@@ -0,0 +1,188 @@
+"""
+Политики доставки сообщений частых топиков в пользовательские обработчики:
+ограничение частоты, передача только последнего сообщения и прореживание.
+Проверка выполняется до разбора JSON, поэтому пропущенные сообщения не декодируются.
+"""
+import threading
+import time
+from typing import Any, Callable, Optional
+
+_MISSING = object()
+
+
+class DeliveryPolicy:
+    """Правила доставки сообщений в обработчик.
+
+    * every_nth – передавать каждое N-е сообщение (прореживание);
+    * max_rate – не чаще max_rate раз в секунду, лишние сообщения отбрасываются;
+    * latest_only – не копить сообщения: пока обработчик занят или действует
+      ограничение частоты, хранится только последнее сообщение, и оно будет
+      доставлено, как только это станет возможно.
+
+    Пример:
+        robot.set_joint_states_handler(update_dashboard, DeliveryPolicy(max_rate=10, latest_only=True))
+    """
+    __slots__ = ("max_rate", "every_nth", "latest_only")
+
+    def __init__(self, max_rate: Optional[float] = None, every_nth: int = 1, latest_only: bool = False):
+        """
+        :param max_rate: Максимальная частота доставки, Гц (None – без ограничения)
+        :param every_nth: Доставлять каждое N-е сообщение
+        :param latest_only: Доставлять только последнее из накопившихся сообщений
+        """
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError("Частота доставки должна быть больше нуля")
+        if every_nth < 1:
+            raise ValueError("every_nth должен быть не меньше 1")
+        self.max_rate = max_rate
+        self.every_nth = every_nth
+        self.latest_only = latest_only
+
+    @property
+    def interval(self) -> float:
+        """Минимальный интервал между доставками, с."""
+        return 1.0 / self.max_rate if self.max_rate else 0.0
+
+    def __repr__(self) -> str:
+        return (f"DeliveryPolicy(max_rate={self.max_rate!r}, every_nth={self.every_nth!r}, "
+                f"latest_only={self.latest_only!r})")
+
+
+class DeliveryGate:
+    """Состояние политики доставки для одного обработчика.
+
+    offer() вызывается в потоке MQTT с сырым payload. Принятое сообщение
+    передаётся в submit(call, payload), где call(payload) выполняет разбор
+    и вызов обработчика (на месте или через диспетчер). submit возвращает
+    False, если вызов отброшен.
+    """
+
+    def __init__(self,
+                 policy: DeliveryPolicy,
+                 call: Callable[[str], Any],
+                 submit: Optional[Callable[[Callable[[str], Any], str], Any]] = None):
+        """
+        :param policy: Политика доставки
+        :param call: Функция call(payload) – разбор сообщения и вызов обработчика
+        :param submit: Функция submit(call, payload) – где выполнить вызов (по умолчанию на месте)
+        """
+        self.policy = policy
+        self._call = call
+        self._submit = submit if submit is not None else self._submit_inline
+        self._lock = threading.Lock()
+        self._count = 0
+        self._next_at = 0.0
+        self._busy = False
+        self._pending: Any = _MISSING
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+        self.delivered = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _submit_inline(call: Callable[[str], Any], payload: str) -> bool:
+        call(payload)
+        return True
+
+    # -------------------------------------------------
+    # Поток MQTT
+    # -------------------------------------------------
+    def offer(self, payload: str) -> None:
+        """Предложить сообщение обработчику (решение принимается без разбора payload)."""
+        policy = self.policy
+        with self._lock:
+            if self._closed:
+                return
+            self._count += 1
+            if self._count % policy.every_nth:
+                self.skipped += 1
+                return
+            if not policy.max_rate and not policy.latest_only:
+                self.delivered += 1
+            elif policy.latest_only and (self._busy or self._timer is not None):
+                # Последнее сообщение заменяет ожидающее доставки
+                self._hold(payload)
+                return
+            else:
+                wait = self._next_at - time.monotonic()
+                if wait > 0:
+                    if policy.latest_only:
+                        self._hold(payload)
+                        self._start_timer(wait)
+                    else:
+                        self.skipped += 1
+                    return
+                self._mark_sent()
+        self._send(payload)
+
+    def _hold(self, payload: str) -> None:
+        if self._pending is not _MISSING:
+            self.skipped += 1
+        self._pending = payload
+
+    def _mark_sent(self) -> None:
+        self._next_at = time.monotonic() + self.policy.interval
+        self._busy = self.policy.latest_only
+        self.delivered += 1
+
+    def _send(self, payload: str) -> None:
+        try:
+            accepted = self._submit(self._execute, payload)
+        except Exception as e:
+            print(f"[DeliveryGate] Ошибка при передаче сообщения обработчику: {e}")
+            accepted = False
+        if accepted is False and self.policy.latest_only:
+            # Вызов отброшен диспетчером – _execute не выполнится
+            self._finish()
+
+    def _execute(self, payload: str) -> Any:
+        try:
+            return self._call(payload)
+        finally:
+            if self.policy.latest_only:
+                self._finish()
+
+    # -------------------------------------------------
+    # Отложенная доставка последнего сообщения
+    # -------------------------------------------------
+    def _finish(self) -> None:
+        with self._lock:
+            self._busy = False
+            payload = self._take_pending()
+        if payload is not _MISSING:
+            self._send(payload)
+
+    def _take_pending(self) -> Any:
+        """Забрать ожидающее сообщение, если его можно доставить сейчас (вызывается под блокировкой)."""
+        if self._closed or self._busy or self._timer is not None or self._pending is _MISSING:
+            return _MISSING
+        wait = self._next_at - time.monotonic()
+        if wait > 0:
+            self._start_timer(wait)
+            return _MISSING
+        payload, self._pending = self._pending, _MISSING
+        self._mark_sent()
+        return payload
+
+    def _start_timer(self, wait: float) -> None:
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(wait, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            payload = self._take_pending()
+        if payload is not _MISSING:
+            self._send(payload)
+
+    def close(self) -> None:
+        """Отменить отложенную доставку; новые сообщения игнорируются."""
+        with self._lock:
+            self._closed = True
+            self._pending = _MISSING
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
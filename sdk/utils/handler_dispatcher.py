@@ -0,0 +1,278 @@
+"""
+Выполнение пользовательских обработчиков сообщений вне сетевого потока MQTT:
+очереди по топикам с ограниченным размером, обслуживаемые пулом потоков или
+циклом asyncio.
+"""
+import asyncio
+import inspect
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Политики переполнения очереди топика
+DROP_OLDEST = "drop_oldest"   # вытеснить самый старый вызов (для телеметрии важнее свежие данные)
+DROP_NEWEST = "drop_newest"   # отбросить новый вызов
+BLOCK = "block"               # ждать освобождения места (обратное давление на сетевой поток)
+
+_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class _TopicQueue:
+    __slots__ = ("topic", "items", "maxsize", "policy", "scheduled", "dropped", "processed", "not_full")
+
+    def __init__(self, topic: str, maxsize: int, policy: str, lock: threading.Lock):
+        self.topic = topic
+        self.items: Deque[Tuple[Callable, tuple]] = deque()
+        self.maxsize = maxsize
+        self.policy = policy
+        self.scheduled = False
+        self.dropped = 0
+        self.processed = 0
+        self.not_full = threading.Condition(lock)
+
+
+class HandlerDispatcher:
+    """Очереди вызовов обработчиков по топикам.
+
+    Вызовы одного топика выполняются строго по очереди и в порядке поступления,
+    разные топики обслуживаются параллельно. Если задан loop, вызовы выполняются
+    в цикле asyncio (обработчик может быть корутиной), иначе – в пуле потоков.
+
+    Пример:
+        dispatcher = HandlerDispatcher(workers=2, maxsize=16)
+        dispatcher.configure_topic("/command", policy=BLOCK)
+        dispatcher.submit("/coordinates", handler, data)
+    """
+
+    def __init__(self,
+                 workers: int = 2,
+                 maxsize: int = 64,
+                 policy: str = DROP_OLDEST,
+                 block_timeout: Optional[float] = 1.0,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        :param workers: Число рабочих потоков (не используется при заданном loop)
+        :param maxsize: Размер очереди топика по умолчанию
+        :param policy: Политика переполнения по умолчанию: drop_oldest, drop_newest или block
+        :param block_timeout: Сколько ждать места в очереди при политике block (None – без ограничения);
+            по истечении новый вызов отбрасывается
+        :param loop: Цикл asyncio, в котором выполнять обработчики
+        """
+        self._check_queue_settings(maxsize, policy)
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._ready: Deque[_TopicQueue] = deque()
+        self._ready_cond = threading.Condition(self._lock)
+        self._queues: Dict[str, _TopicQueue] = {}
+        self._settings: Dict[str, Tuple[int, str]] = {}
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._started = False
+
+    @staticmethod
+    def _check_queue_settings(maxsize: int, policy: str) -> None:
+        if maxsize < 1:
+            raise ValueError("Размер очереди должен быть не меньше 1")
+        if policy not in _POLICIES:
+            raise ValueError(f"Неизвестная политика очереди: {policy}")
+
+    # -------------------------------------------------
+    # Управление
+    # -------------------------------------------------
+    def start(self) -> "HandlerDispatcher":
+        """Запустить рабочие потоки (при работе через loop потоки не нужны)."""
+        with self._lock:
+            if self._started:
+                return self
+            self._started = True
+            self._stopping = False
+        if self.loop is None:
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"HandlerDispatcher-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+        return self
+
+    def stop(self, drain: bool = True, timeout_seconds: Optional[float] = 5.0) -> None:
+        """
+        Остановить диспетчер
+        :param drain: Выполнить уже поставленные в очередь вызовы; False – отбросить их
+        """
+        with self._lock:
+            self._stopping = True
+            if not drain:
+                for queue in self._queues.values():
+                    queue.dropped += len(queue.items)
+                    queue.items.clear()
+                    queue.not_full.notify_all()
+            self._ready_cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout_seconds)
+        self._threads = []
+        with self._lock:
+            self._started = False
+
+    @property
+    def running(self) -> bool:
+        return self._started and not self._stopping
+
+    def configure_topic(self, topic: str, maxsize: Optional[int] = None, policy: Optional[str] = None) -> None:
+        """Задать размер очереди и политику переполнения для отдельного топика."""
+        current_size, current_policy = self._settings.get(topic, (self.maxsize, self.policy))
+        maxsize = current_size if maxsize is None else maxsize
+        policy = current_policy if policy is None else policy
+        self._check_queue_settings(maxsize, policy)
+        with self._lock:
+            self._settings[topic] = (maxsize, policy)
+            queue = self._queues.get(topic)
+            if queue is not None:
+                queue.maxsize, queue.policy = maxsize, policy
+                queue.not_full.notify_all()
+
+    # -------------------------------------------------
+    # Постановка вызовов
+    # -------------------------------------------------
+    def submit(self, topic: str, func: Callable, *args: Any) -> bool:
+        """
+        Поставить вызов func(*args) в очередь топика
+        :return: False, если вызов отброшен (очередь переполнена или диспетчер остановлен)
+        """
+        schedule = False
+        with self._lock:
+            if self._stopping or not self._started:
+                return False
+            queue = self._queues.get(topic)
+            if queue is None:
+                maxsize, policy = self._settings.get(topic, (self.maxsize, self.policy))
+                queue = self._queues[topic] = _TopicQueue(topic, maxsize, policy, self._lock)
+            if len(queue.items) >= queue.maxsize:
+                if queue.policy == DROP_OLDEST:
+                    queue.items.popleft()
+                    queue.dropped += 1
+                elif queue.policy == BLOCK and not self._in_loop_thread():
+                    queue.not_full.wait_for(lambda: len(queue.items) < queue.maxsize or self._stopping,
+                                            self.block_timeout)
+                    if self._stopping or len(queue.items) >= queue.maxsize:
+                        queue.dropped += 1
+                        return False
+                else:
+                    queue.dropped += 1
+                    return False
+            queue.items.append((func, args))
+            if not queue.scheduled:
+                queue.scheduled = True
+                if self.loop is None:
+                    self._ready.append(queue)
+                    self._ready_cond.notify()
+                else:
+                    schedule = True
+        if schedule:
+            self.loop.call_soon_threadsafe(self._run_on_loop, queue)
+        return True
+
+    # -------------------------------------------------
+    # Выполнение
+    # -------------------------------------------------
+    def _in_loop_thread(self) -> bool:
+        """Вызов из цикла asyncio, обслуживающего очереди: ждать места в нём нельзя."""
+        if self.loop is None:
+            return False
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _take(self, queue: _TopicQueue) -> Tuple[Callable, tuple]:
+        item = queue.items.popleft()
+        queue.not_full.notify()
+        return item
+
+    def _finish(self, queue: _TopicQueue) -> bool:
+        """Учесть выполненный вызов. Возвращает True, если в очереди топика есть ещё вызовы."""
+        queue.processed += 1
+        if queue.items:
+            return True
+        queue.scheduled = False
+        return False
+
+    def _invoke(self, queue: _TopicQueue, func: Callable, args: tuple) -> Any:
+        try:
+            return func(*args)
+        except Exception as e:
+            print(f"[HandlerDispatcher] Ошибка в обработчике топика {queue.topic}: {e}")
+            return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._lock:
+                while not self._ready and not self._stopping:
+                    self._ready_cond.wait()
+                if not self._ready:
+                    return
+                queue = self._ready.popleft()
+                func, args = self._take(queue)
+            result = self._invoke(queue, func, args)
+            if inspect.isawaitable(result):
+                # Корутина без цикла asyncio выполняется в отдельном цикле рабочего потока
+                try:
+                    asyncio.run(result)
+                except Exception as e:
+                    print(f"[HandlerDispatcher] Ошибка в обработчике топика {queue.topic}: {e}")
+            with self._lock:
+                if self._finish(queue):
+                    self._ready.append(queue)
+                    self._ready_cond.notify()
+
+    def _run_on_loop(self, queue: _TopicQueue) -> None:
+        with self._lock:
+            if not queue.items:
+                queue.scheduled = False
+                return
+            func, args = self._take(queue)
+        result = self._invoke(queue, func, args)
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            task.add_done_callback(lambda t: self._after_loop_task(queue, t))
+        else:
+            self._after_loop_call(queue)
+
+    def _after_loop_task(self, queue: _TopicQueue, task: "asyncio.Future") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[HandlerDispatcher] Ошибка в обработчике топика {queue.topic}: {task.exception()}")
+        self._after_loop_call(queue)
+
+    def _after_loop_call(self, queue: _TopicQueue) -> None:
+        with self._lock:
+            more = self._finish(queue)
+        if more:
+            self.loop.call_soon(self._run_on_loop, queue)
+
+    # -------------------------------------------------
+    # Статистика
+    # -------------------------------------------------
+    def _select(self, topic: Optional[str]) -> List[_TopicQueue]:
+        if topic is None:
+            return list(self._queues.values())
+        return [self._queues[topic]] if topic in self._queues else []
+
+    def pending(self, topic: Optional[str] = None) -> int:
+        """Число вызовов в очереди (топика или всех)."""
+        with self._lock:
+            return sum(len(queue.items) for queue in self._select(topic))
+
+    def dropped(self, topic: Optional[str] = None) -> int:
+        """Число отброшенных вызовов (топика или всех)."""
+        with self._lock:
+            return sum(queue.dropped for queue in self._select(topic))
+
+    def processed(self, topic: Optional[str] = None) -> int:
+        """Число выполненных вызовов (топика или всех)."""
+        with self._lock:
+            return sum(queue.processed for queue in self._select(topic))
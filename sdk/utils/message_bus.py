@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 
+from sdk.utils.topic_trie import TopicTrie, is_wildcard
+
 
 class MessageFormat(Enum):
     """Форматы сообщений"""
@@ -26,7 +28,10 @@ class MessageBus(ABC):
     """Абстрактный базовый класс для работы с шиной данных"""
 
     def __init__(self):
-        self._handlers: Dict[str, List[Callable]] = {}
+        # Обработчики по шаблонам топиков (поддерживаются "+" и "#")
+        self._handlers = TopicTrie()
+        # Диспетчер (HandlerDispatcher) для выполнения обработчиков вне потока приёма; None – вызов на месте
+        self.dispatcher = None
         self._message_specs: Dict[str, MessageSpec] = {}
         self._connected = False
         self.command_id = 0
@@ -76,34 +81,42 @@ class MessageBus(ABC):
         Регистрация обработчика сообщений для топика
         
         Args:
-            topic: Название топика
-            handler: Функция-обработчик вида handler(message)
+            topic: Название топика или шаблон с "+"/"#"
+            handler: Функция-обработчик вида handler(message);
+                для шаблонов с "+"/"#" – handler(topic, message)
         """
-        if topic not in self._handlers:
-            self._handlers[topic] = []
+        if self._handlers.add(topic, (handler, is_wildcard(topic))):
             self.subscribe(topic)
-            
-        self._handlers[topic].append(handler)
 
     def off_message(self, topic: str, handler: Callable) -> None:
         """Удаление обработчика сообщений"""
-        if topic in self._handlers and handler in self._handlers[topic]:
-            self._handlers[topic].remove(handler)
-            
+        if self._handlers.remove(topic, (handler, is_wildcard(topic))):
             # Если больше нет обработчиков, отписываемся от топика
-            if not self._handlers[topic]:
+            if not self._handlers.has(topic):
                 self.unsubscribe(topic)
-                del self._handlers[topic]
-                
+
+    @property
+    def has_handlers(self) -> bool:
+        """Зарегистрирован ли хотя бы один обработчик."""
+        return bool(self._handlers)
+
     def _process_message(self, topic: str, message: Any) -> None:
         """Обработка полученного сообщения"""
-        if topic in self._handlers:
-            for handler in self._handlers[topic]:
-                try:
-                    handler(message)
-                except Exception as e:
-                    self._handle_error(topic, handler, e)
-                    
+        dispatcher = self.dispatcher
+        for handler, wildcard in self._handlers.match(topic):
+            if dispatcher is not None:
+                dispatcher.submit(topic, self._call_handler, topic, handler, wildcard, message)
+            else:
+                self._call_handler(topic, handler, wildcard, message)
+
+    def _call_handler(self, topic: str, handler: Callable, wildcard: bool, message: Any) -> Any:
+        try:
+            if wildcard:
+                return handler(topic, message)
+            return handler(message)
+        except Exception as e:
+            self._handle_error(topic, handler, e)
+
     def _handle_error(self, topic: str, handler: Callable, error: Exception) -> None:
         """Обработка ошибок в обработчиках"""
         print(f"Ошибка в обработчике для топика {topic}: {error}") 
\ No newline at end of file
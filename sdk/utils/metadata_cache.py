@@ -0,0 +1,173 @@
+"""
+Кэш редко меняющихся данных контроллера (пределы суставов, список TCP,
+домашняя позиция, /manipulator_info) с временем жизни записей и
+необязательным сохранением на диск.
+"""
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Ключи кэша манипулятора
+JOINT_LIMITS = "joint_limits"
+TCP_LIST = "tcp_list"
+TCP_CURRENT = "tcp_current"
+HOME_POSITION = "home_position"
+MANIPULATOR_INFO = "manipulator_info"
+
+_MISSING = object()
+
+
+class MetadataCache:
+    """Кэш значений с временем жизни (TTL).
+
+    Записи хранятся вместе с моментом получения (time.time), поэтому записи,
+    загруженные с диска, устаревают так же, как полученные в этом сеансе.
+    Значения хранятся и выдаются копиями: изменение полученного словаря не
+    меняет кэш.
+    При заданном path кэш сохраняется в JSON-файл в разделе identity
+    (идентификатор контроллера) и при следующем запуске читается оттуда.
+
+    Пример:
+        cache = MetadataCache(ttl_seconds=300, ttls={"tcp_current": 30})
+        limits = cache.get_or_fetch("joint_limits", robot_fetch)
+        cache.invalidate("joint_limits")
+    """
+
+    def __init__(self,
+                 ttl_seconds: Optional[float] = 300.0,
+                 ttls: Optional[Dict[str, Optional[float]]] = None,
+                 path: Optional[str] = None,
+                 identity: str = "default"):
+        """
+        :param ttl_seconds: Время жизни записи по умолчанию, с (None – без ограничения)
+        :param ttls: Время жизни для отдельных ключей
+        :param path: Файл для сохранения кэша между запусками (None – только в памяти)
+        :param identity: Идентификатор контроллера – раздел файла кэша
+        """
+        self.ttl_seconds = ttl_seconds
+        self.ttls: Dict[str, Optional[float]] = dict(ttls or {})
+        self.path = path
+        self.identity = identity
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self._load()
+
+    # -------------------------------------------------
+    # Чтение и запись
+    # -------------------------------------------------
+    def _ttl(self, key: str) -> Optional[float]:
+        return self.ttls.get(key, self.ttl_seconds)
+
+    def _is_fresh(self, key: str, stored_at: float) -> bool:
+        ttl = self._ttl(key)
+        return ttl is None or time.time() - stored_at <= ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Значение ключа, если оно есть и не устарело, иначе default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(key, entry[1]):
+                self.hits += 1
+                return copy.deepcopy(entry[0])
+            self.misses += 1
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and self._is_fresh(key, entry[1])
+
+    def age(self, key: str) -> Optional[float]:
+        """Сколько секунд назад получено значение (None – значения нет)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, time.time())
+        self._save()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], refresh: bool = False) -> Any:
+        """
+        Значение из кэша или результат fetch() (он сохраняется в кэш)
+        :param refresh: Не читать кэш, а запросить значение заново
+        """
+        if not refresh:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        value = fetch()
+        # Ошибка при throw_error=False приходит значением (исключение или строка) – такое не кэшируем
+        if not isinstance(value, (Exception, str)):
+            self.set(key, value)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        """Удалить записи ключей (без аргументов – все записи)."""
+        with self._lock:
+            if keys:
+                changed = False
+                for key in keys:
+                    changed = self._entries.pop(key, None) is not None or changed
+            else:
+                changed = bool(self._entries)
+                self._entries.clear()
+        if changed:
+            self._save()
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def keys(self) -> Iterable[str]:
+        with self._lock:
+            return [key for key, (_, stored_at) in self._entries.items() if self._is_fresh(key, stored_at)]
+
+    # -------------------------------------------------
+    # Файл кэша
+    # -------------------------------------------------
+    def _read_file(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"[MetadataCache] Не удалось прочитать кэш {self.path}: {e}")
+            return {}
+
+    def _load(self) -> None:
+        section = self._read_file().get(self.identity, {})
+        with self._lock:
+            for key, entry in section.items():
+                try:
+                    self._entries[key] = (entry["value"], float(entry["stored_at"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            section = {key: {"value": value, "stored_at": stored_at}
+                       for key, (value, stored_at) in self._entries.items()}
+            # Разделы других контроллеров в том же файле сохраняем
+            data = self._read_file()
+            data[self.identity] = section
+            tmp_path = f"{self.path}.tmp"
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"[MetadataCache] Не удалось сохранить кэш {self.path}: {e}")
@@ -0,0 +1,41 @@
+"""
+Необязательная зависимость numpy (pip install pm_python_sdk[numpy]).
+
+Модули расчётов движения и калибровки импортируют np отсюда: с numpy пачки
+точек обрабатываются векторно, без него np is None и используется реализация
+на чистом Python с тем же результатом. Здесь же – общие вычислительные
+помощники на чистом Python.
+"""
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def solve_linear(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """
+    Решение квадратной системы методом Гаусса с выбором главного элемента
+    (небольшие системы: шаг обратной кинематики, калибровка камеры).
+    :raises ValueError: Матрица вырождена
+    """
+    n = len(vector)
+    a = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            raise ValueError("Система линейных уравнений вырождена")
+        a[col], a[pivot] = a[pivot], a[col]
+        top = a[col]
+        diagonal = top[col]
+        for r in range(col + 1, n):
+            factor = a[r][col] / diagonal
+            if factor:
+                row = a[r]
+                for c in range(col, n + 1):
+                    row[c] -= factor * top[c]
+    result = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        result[r] = (a[r][n] - sum(a[r][c] * result[c] for c in range(r + 1, n))) / a[r][r]
+    return result
@@ -0,0 +1,146 @@
+"""
+Реестр JSON-программ: программа регистрируется и компилируется один раз,
+готовое тело команды хранится в LRU по хэшу содержимого. Первый запуск
+загружает программу на контроллер, следующие идут по имени с хэшем
+содержимого – размер сообщения не зависит от размера программы.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CompiledProgram:
+    """Сериализованная программа.
+
+    stored_name – имя программы на контроллере (имя + начало хэша
+    содержимого), payload – готовое JSON-тело команды play_program_json,
+    uploaded – контроллер уже получил программу с этим именем,
+    version – версия, с которой программа зарегистрирована (см. register).
+    """
+    __slots__ = ("name", "digest", "stored_name", "payload", "uploaded", "version")
+
+    def __init__(self, name: str, digest: str, stored_name: str, payload: str):
+        self.name = name
+        self.digest = digest
+        self.stored_name = stored_name
+        self.payload = payload
+        self.uploaded = False
+        self.version: Any = None
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+    def __repr__(self) -> str:
+        return f"CompiledProgram({self.stored_name!r}, size={self.size}, uploaded={self.uploaded})"
+
+
+class ProgramRegistry:
+    """LRU скомпилированных программ.
+
+    register() компилирует программу один раз и возвращает дескриптор;
+    повторные вызовы с тем же именем и версией не сериализуют программу.
+    Изменённую программу регистрируют с новой версией или после forget().
+    compile() сериализует и хэширует программу при каждом вызове – для
+    разовых программ без имени-дескриптора.
+
+    Каждая версия содержимого сохраняется контроллером под своим именем
+    <имя>-<хэш>; SDK не удаляет их (команды удаления программ нет), forget()
+    очищает только реестр. Имена версий для очистки на контроллере –
+    stored_names().
+
+    Пример:
+        registry = ProgramRegistry()
+        pick = registry.register("pick", program_json)
+        pick.stored_name  # "pick-3f2a9c0d41b7"
+        robot.run_program_cached(pick)
+    """
+
+    def __init__(self, max_programs: int = 64, by_name: bool = True, digest_length: int = 12):
+        """
+        :param max_programs: Наибольшее число программ в кэше
+        :param by_name: Запускать загруженные программы по имени (play_program_name); False –
+            тело программы отправляется при каждом запуске (собирается один раз)
+        :param digest_length: Число символов хэша в имени программы на контроллере
+        """
+        self.max_programs = max_programs
+        self.by_name = by_name
+        self.digest_length = digest_length
+        self._compiled: "OrderedDict[Tuple[str, str], CompiledProgram]" = OrderedDict()
+        # Зарегистрированные программы: имя -> текущий дескриптор
+        self._handles: Dict[str, CompiledProgram] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, program_json: Dict[str, Any], version: Any = None) -> CompiledProgram:
+        """
+        Зарегистрировать программу и вернуть её дескриптор. Программа сериализуется только при
+        первой регистрации имени или смене version; изменения program_json на месте без новой
+        версии не учитываются.
+        :param version: Метка версии программы (любое сравнимое значение)
+        """
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is not None and handle.version == version:
+                self._compiled.move_to_end((name, handle.digest))
+                return handle
+        compiled = self.compile(name, program_json)
+        with self._lock:
+            compiled.version = version
+            self._handles[name] = compiled
+        return compiled
+
+    def get(self, name: str) -> Optional[CompiledProgram]:
+        """Дескриптор зарегистрированной программы (None – не зарегистрирована или вытеснена)."""
+        with self._lock:
+            return self._handles.get(name)
+
+    def compile(self, name: str, program_json: Dict[str, Any]) -> CompiledProgram:
+        """Сериализовать и хэшировать программу; тело команды собирается один раз на содержимое."""
+        text = json.dumps(program_json, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            compiled = self._compiled.get((name, digest))
+            if compiled is None:
+                stored_name = f"{name}-{digest[:self.digest_length]}"
+                payload = '{"name":' + json.dumps(stored_name, ensure_ascii=False) + ',"json":' + text + '}'
+                compiled = self._compiled[(name, digest)] = CompiledProgram(name, digest, stored_name, payload)
+            self._compiled.move_to_end((name, digest))
+            while len(self._compiled) > self.max_programs:
+                (evicted, _), old = self._compiled.popitem(last=False)
+                if self._handles.get(evicted) is old:
+                    del self._handles[evicted]
+        return compiled
+
+    def mark_uploaded(self, compiled: CompiledProgram, uploaded: bool = True) -> None:
+        compiled.uploaded = uploaded
+
+    def reset_uploads(self) -> None:
+        """Считать все программы незагруженными (например, после перезапуска контроллера)."""
+        with self._lock:
+            for compiled in self._compiled.values():
+                compiled.uploaded = False
+
+    def forget(self, name: Optional[str] = None) -> None:
+        """
+        Удалить из реестра программы с именем name (None – все); на контроллере они остаются.
+        Следующая регистрация имени скомпилирует программу заново.
+        """
+        with self._lock:
+            for key in [k for k in self._compiled if name is None or k[0] == name]:
+                del self._compiled[key]
+            for key in [k for k in self._handles if name is None or k == name]:
+                del self._handles[key]
+
+    def stored_names(self, name: Optional[str] = None, uploaded_only: bool = True) -> List[str]:
+        """Имена версий <имя>-<хэш> программы name (None – всех), отправленных на контроллер."""
+        with self._lock:
+            return [compiled.stored_name for key, compiled in self._compiled.items()
+                    if (name is None or key[0] == name) and (compiled.uploaded or not uploaded_only)]
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def __contains__(self, name: str) -> bool:
+        return any(key[0] == name for key in self._compiled)
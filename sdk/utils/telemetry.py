@@ -0,0 +1,31 @@
+"""
+Разбор сообщений телеметрии контроллера.
+"""
+from typing import Any, Dict
+
+
+def flatten_gpio_states(data: Any, prefix: str = "") -> Dict[str, Any]:
+    """
+    Привести сообщение /gpio_states к плоскому словарю пин -> значение.
+    Вложенные словари разворачиваются в имена вида "group/pin", списки записей
+    вида {"name": ..., "value": ...} – в имя записи. Так же разбираются данные
+    датчиков MGbot (/mgbot_info).
+    """
+    states: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, (dict, list)):
+                states.update(flatten_gpio_states(value, f"{name}/"))
+            else:
+                states[name] = value
+    elif isinstance(data, list):
+        for index, item in enumerate(data):
+            if isinstance(item, dict) and "name" in item and "value" in item:
+                states[f"{prefix}{item['name']}"] = item["value"]
+            elif isinstance(item, (dict, list)):
+                states.update(flatten_gpio_states(item, f"{prefix}{index}/"))
+            else:
+                states[f"{prefix}{index}"] = item
+    return states
+
@@ -0,0 +1,214 @@
+"""
+Дерево топиков MQTT: сопоставление топика с подписками, содержащими
+шаблоны "+" (один уровень) и "#" (все оставшиеся уровни).
+"""
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SINGLE_LEVEL = "+"
+MULTI_LEVEL = "#"
+
+# Сколько результатов сопоставления хранить до полной очистки кэша
+_CACHE_LIMIT = 1024
+
+
+def is_wildcard(pattern: str) -> bool:
+    """Содержит ли шаблон подписки "+" или "#"."""
+    return SINGLE_LEVEL in pattern or MULTI_LEVEL in pattern
+
+
+def validate_pattern(pattern: str) -> List[str]:
+    """
+    Проверить шаблон подписки и разбить его на уровни
+    :raises ValueError: "#" не последний уровень или "+"/"#" не занимают уровень целиком
+    """
+    if not isinstance(pattern, str) or pattern == "":
+        raise ValueError("Шаблон топика должен быть непустой строкой")
+    levels = pattern.split("/")
+    for index, level in enumerate(levels):
+        if MULTI_LEVEL in level and (level != MULTI_LEVEL or index != len(levels) - 1):
+            raise ValueError(f"'#' допускается только как последний уровень шаблона: {pattern}")
+        if SINGLE_LEVEL in level and level != SINGLE_LEVEL:
+            raise ValueError(f"'+' должен занимать уровень шаблона целиком: {pattern}")
+    return levels
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.values: Tuple[Any, ...] = ()
+
+
+class TopicTrie:
+    """Подписки по шаблонам топиков MQTT.
+
+    Сопоставление проходит дерево по уровням топика (время зависит от глубины
+    топика, а не от числа подписок) и кэшируется до следующего изменения
+    подписок. Значения (обработчики) на узле хранятся кортежем, поэтому
+    сопоставление не блокирует добавление и удаление подписок из других потоков.
+
+    Пример:
+        trie = TopicTrie()
+        trie.add("/pixy/+/blocks", handler)
+        trie.add("#", log_all)
+        trie.match("/pixy/uart/blocks")  # handler и log_all
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Any, ...]] = {}
+        self._version = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Число зарегистрированных значений."""
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    # -------------------------------------------------
+    # Изменение подписок
+    # -------------------------------------------------
+    def add(self, pattern: str, value: Any) -> bool:
+        """
+        Добавить значение для шаблона
+        :return: True, если это первое значение шаблона (нужно подписаться на топик)
+        """
+        levels = validate_pattern(pattern)
+        with self._lock:
+            node = self._root
+            for level in levels:
+                child = node.children.get(level)
+                if child is None:
+                    child = node.children[level] = _Node()
+                node = child
+            first = not node.values
+            node.values = node.values + (value,)
+            self._count += 1
+            self._invalidate()
+        return first
+
+    def remove(self, pattern: str, value: Any) -> bool:
+        """
+        Удалить значение шаблона (первое совпадающее)
+        :return: True, если значение было найдено
+        """
+        levels = validate_pattern(pattern)
+        with self._lock:
+            path = [self._root]
+            for level in levels:
+                child = path[-1].children.get(level)
+                if child is None:
+                    return False
+                path.append(child)
+            node = path[-1]
+            if value not in node.values:
+                return False
+            values = list(node.values)
+            values.remove(value)
+            node.values = tuple(values)
+            self._count -= 1
+            self._invalidate()
+            # Удаляем опустевшие ветви
+            for level, parent, child in zip(reversed(levels), reversed(path[:-1]), reversed(path[1:])):
+                if child.values or child.children:
+                    break
+                del parent.children[level]
+        return True
+
+    def discard_pattern(self, pattern: str) -> Tuple[Any, ...]:
+        """Удалить все значения шаблона. Возвращает удалённые значения."""
+        removed = self.values(pattern)
+        for value in removed:
+            self.remove(pattern, value)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = _Node()
+            self._count = 0
+            self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._version += 1
+        self._cache = {}
+
+    # -------------------------------------------------
+    # Поиск
+    # -------------------------------------------------
+    def _find(self, pattern: str) -> Optional[_Node]:
+        node = self._root
+        for level in pattern.split("/"):
+            node = node.children.get(level)
+            if node is None:
+                return None
+        return node
+
+    def values(self, pattern: str) -> Tuple[Any, ...]:
+        """Значения, зарегистрированные точно для этого шаблона."""
+        node = self._find(pattern)
+        return node.values if node is not None else ()
+
+    def has(self, pattern: str) -> bool:
+        """Есть ли значения, зарегистрированные для шаблона."""
+        return bool(self.values(pattern))
+
+    def patterns(self) -> Iterator[str]:
+        """Все шаблоны, для которых есть значения."""
+        stack: List[Tuple[_Node, List[str]]] = [(self._root, [])]
+        while stack:
+            node, levels = stack.pop()
+            if node.values:
+                yield "/".join(levels)
+            for level, child in node.children.items():
+                stack.append((child, levels + [level]))
+
+    def match(self, topic: str) -> Tuple[Any, ...]:
+        """
+        Все значения, шаблоны которых соответствуют топику.
+        Значения одного шаблона идут в порядке добавления.
+        Топики, начинающиеся с "$", не совпадают с шаблонами, начинающимися с "+" или "#".
+        """
+        found = self._cache.get(topic)
+        if found is not None:
+            return found
+        version = self._version
+        result: List[Any] = []
+        system = topic.startswith("$")
+        nodes = [self._root]
+        for index, level in enumerate(topic.split("/")):
+            wildcards = not (system and index == 0)
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if wildcards:
+                    multi = children.get(MULTI_LEVEL)
+                    if multi is not None:
+                        result.extend(multi.values)
+                    single = children.get(SINGLE_LEVEL)
+                    if single is not None:
+                        next_nodes.append(single)
+                child = children.get(level)
+                if child is not None:
+                    next_nodes.append(child)
+            nodes = next_nodes
+            if not nodes:
+                break
+        for node in nodes:
+            result.extend(node.values)
+            # "a/#" совпадает и с самим "a"
+            multi = node.children.get(MULTI_LEVEL)
+            if multi is not None:
+                result.extend(multi.values)
+        found = tuple(result)
+        with self._lock:
+            # Подписки могли измениться во время поиска – такой результат не кэшируем
+            if version == self._version:
+                if len(self._cache) >= _CACHE_LIMIT:
+                    self._cache = {}
+                self._cache[topic] = found
+        return found
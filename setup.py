@@ -5,6 +5,9 @@ with open('README.md', 'r') as fh:
 
 requirements = ['paho-mqtt>=2.1.0']
 
+# Необязательные зависимости: pip install pm_python_sdk[numpy]
+extras = {'numpy': ['numpy>=1.24']}
+
 setuptools.setup(
     # Имя дистрибутива пакета.
     name='pm_python_sdk',
@@ -26,6 +29,8 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     # requirements или dependencies, которые будут установлены вместе с пакетом, когда пользователь установит его через pip.
     # install_requires=requirements,
+    # Векторные расчёты траекторий, кинематики и калибровки (без numpy – реализация на чистом Python).
+    extras_require=extras,
     # Предоставляет pip некоторые метаданные о пакете. Также отображается на странице PyPi.
     classifiers=[
         'Programming Language :: Python :: 3.12',
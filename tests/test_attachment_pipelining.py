@@ -0,0 +1,136 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from sdk.commands.data import Orientation, Position
+from sdk.manipulators.attachments import VacuumAttachment
+from sdk.manipulators.medu import MEdu
+from sdk.utils.constants import COMMAND_RESULT_TOPIC, COMMAND_TOPIC
+
+
+class _Client:
+    """Клиент MQTT без сети: отвечает на команды с задержкой, как контроллер после выполнения."""
+
+    def __init__(self, robot, reply, delay=0.05):
+        self.robot = robot
+        self.reply = reply
+        self.delay = delay
+        self.commands = []
+        self.replied = 0
+        # Сколько ответов было получено к моменту отправки каждой команды
+        self.replied_before = []
+
+    def publish(self, topic, payload):
+        if topic == COMMAND_TOPIC:
+            command = json.loads(payload)
+            self.commands.append(command["command"])
+            self.replied_before.append(self.replied)
+            answer = {"id": command["id"], "result": True, **self.reply(command)}
+            threading.Timer(self.delay, self._answer, (answer,)).start()
+        return types.SimpleNamespace(rc=0)
+
+    def _answer(self, answer):
+        self.replied += 1
+        self.robot.process_message(COMMAND_RESULT_TOPIC, json.dumps(answer))
+
+    def subscribe(self, topic):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot(reply=lambda command: {}):
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = MEdu("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client(robot, reply)
+    return robot
+
+
+def _move(robot):
+    return robot.move_to_coordinates_async(Position(0.2, 0.0, 0.15), Orientation(), 0.5, 0.5)
+
+
+def test_deactivate_with_sends_motion_without_waiting_for_vacuum():
+    robot = _robot()
+    vacuum = VacuumAttachment(robot)
+    vacuum._update_status(True)
+
+    results = vacuum.deactivate_with(_move(robot), _move(robot))
+
+    client = robot.message_bus.mqtt_client
+    assert client.commands == ["vacuum_control", "set_coordinates", "set_coordinates"]
+    assert client.replied_before == [0, 0, 0]
+    assert len(results) == 3 and all(isinstance(result, dict) for result in results)
+    assert vacuum.get_status() == "idle"
+    assert robot.active_commands == {} and robot.move_coordinates_command is None
+
+
+def test_failed_attachment_command_keeps_status():
+    robot = _robot(lambda command: {"error": "нет давления"} if command["command"] == "vacuum_control" else {})
+    vacuum = VacuumAttachment(robot)
+
+    results = vacuum.activate_with(_move(robot), throw_error=False)
+    assert isinstance(results[0], (str, Exception)) and isinstance(results[1], dict)
+    assert vacuum.get_status() == "idle"
+    with pytest.raises(Exception):
+        vacuum.activate_with(_move(robot))
+    assert robot.active_commands == {}
+
+
+def test_no_wait_and_async_await_update_status_from_reply():
+    robot = _robot()
+    vacuum = VacuumAttachment(robot)
+
+    command = vacuum.activate_no_wait()
+    assert vacuum.get_status() == "idle"
+    command.result()
+    assert vacuum.get_status() == "active"
+
+    asyncio.run(vacuum.deactivate_async_await())
+    assert vacuum.get_status() == "idle"
+    assert robot.active_commands == {}
@@ -0,0 +1,107 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и классов манипуляторов (нужны при импорте пакетов sdk.commands
+# и sdk.manipulators, насадкам достаточно фиктивного хоста)
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+_map_cls = {
+    "sdk.manipulators.manipulator": "Manipulator",
+    "sdk.manipulators.base": "BaseManipulator",
+    "sdk.manipulators.medu": "MEdu",
+    "sdk.manipulators.m13": "M13",
+}
+for _name, _cls in _map_cls.items():
+    if _name not in sys.modules:
+        mod = types.ModuleType(_name)
+        setattr(mod, _cls, type(_cls, (), {"__init__": lambda self, *a, **k: None}))
+        sys.modules[_name] = mod
+
+# Другие тесты могут подменить пакет насадок заглушкой – здесь нужен настоящий
+if not hasattr(sys.modules.get("sdk.manipulators.attachments"), "__path__"):
+    sys.modules.pop("sdk.manipulators.attachments", None)
+
+import json
+import threading
+
+from sdk.manipulators.attachments.laser import LaserAttachment
+
+
+class _Host:
+    """Минимальный хост насадки: общая подписка и учёт отправленных команд."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.active_commands = {}
+        self.published = []
+        self.message_bus = types.SimpleNamespace(publish=lambda *a, **k: self.published.append(a))
+
+    def register_attachment(self, attachment):
+        attachment.attach(self)
+
+    def add_payload_listener(self, topic, listener):
+        self.listeners.setdefault(topic, []).append(listener)
+
+    def remove_payload_listener(self, topic, listener):
+        self.listeners[topic].remove(listener)
+
+    def emit(self, topic, data):
+        for listener in self.listeners.get(topic, []):
+            listener(topic, json.dumps(data))
+
+
+def test_laser_mirrors_gpio_states_and_skips_redundant_commands():
+    host = _Host()
+    laser = LaserAttachment(host, channel=3, state_key="outputs/DO3")
+    assert laser.is_active is None
+
+    host.emit("/gpio_states", {"outputs": {"DO3": 1, "DO4": 0}})
+    assert laser.is_active is True
+    assert laser.get_status() == "on"
+
+    laser.activate()
+    assert host.published == []
+
+    laser.detach()
+    assert host.listeners["/gpio_states"] == []
+    assert laser.is_active is None
+
+
+def test_without_state_key_commands_are_always_sent():
+    host = _Host()
+    laser = LaserAttachment(host, channel=3)
+    assert "/gpio_states" not in host.listeners
+
+    laser._on_state_message("/gpio_states", json.dumps({"outputs": {"DO3": 1}}))
+    assert laser.is_active is None
+    # Даже известное состояние не отменяет отправку команды без state_key
+    laser._update_status(True, mirrored=True)
+    assert not laser._is_redundant(True, False, {})
+
+
+def test_wait_for_status_resolves_on_transition():
+    host = _Host()
+    laser = LaserAttachment(host, channel=1, state_key="DO_1")
+    host.emit("/gpio_states", {"DO_1": True})
+
+    timer = threading.Timer(0.02, host.emit, ("/gpio_states", {"DO_1": False}))
+    timer.start()
+    assert laser.wait_for_status(False, timeout_seconds=2) == "off"
+    timer.join()
+    assert laser.wait_for_status(False, timeout_seconds=0.1) == "off"
@@ -0,0 +1,74 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и классов манипуляторов (нужны при импорте пакетов sdk.commands
+# и sdk.manipulators, трекеру они не нужны)
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+_map_cls = {
+    "sdk.manipulators.manipulator": "Manipulator",
+    "sdk.manipulators.base": "BaseManipulator",
+    "sdk.manipulators.medu": "MEdu",
+    "sdk.manipulators.m13": "M13",
+}
+for _name, _cls in _map_cls.items():
+    if _name not in sys.modules:
+        mod = types.ModuleType(_name)
+        setattr(mod, _cls, type(_cls, (), {"__init__": lambda self, *a, **k: None}))
+        sys.modules[_name] = mod
+
+if "sdk.manipulators.attachments" not in sys.modules:
+    att_stub = types.ModuleType("sdk.manipulators.attachments")
+    for cls in ["Attachment", "LaserAttachment", "GripperAttachment", "VacuumAttachment"]:
+        setattr(att_stub, cls, object)
+    sys.modules["sdk.manipulators.attachments"] = att_stub
+
+from sdk.manipulators.extern_devices.pixy_cam.block_tracker import Block, BlockTracker, parse_blocks
+
+
+def test_parse_blocks_tolerates_formats():
+    pixy2 = {"id": 1, "result": [{"m_signature": 1, "m_x": 10, "m_y": 20, "m_index": 4}]}
+    plain = {"id": 2, "data": {"blocks": '[{"signature": 2, "x": 5, "y": 6}, {"signature": 3}]'}}
+    assert parse_blocks(pixy2) == [Block(1, 10.0, 20.0, index=4)]
+    assert parse_blocks(plain) == [Block(2, 5.0, 6.0)]
+    assert parse_blocks({"result": True}) == []
+
+
+def test_tracker_keeps_ids_and_estimates_velocity():
+    tracker = BlockTracker(max_distance=20)
+    for frame in range(5):
+        tracker.update([Block(1, 100 + 10 * frame, 50), Block(1, 300 - 10 * frame, 80)], timestamp=frame * 0.1)
+    first, second = sorted(tracker.tracks, key=lambda t: t.track_id)
+    assert (first.track_id, second.track_id) == (1, 2)
+    assert abs(first.vx - 100.0) < 1e-6
+    assert abs(second.vx + 100.0) < 1e-6
+    x, y = first.predict(0.5)
+    assert abs(x - 150.0) < 1e-6 and y == 50
+
+
+def test_tracker_forgets_lost_objects():
+    tracker = BlockTracker(max_missed_seconds=0.2)
+    tracker.update([Block(1, 10, 10)], timestamp=0.0)
+    tracker.update([], timestamp=0.1)
+    assert len(tracker.tracks) == 1
+    tracker.update([], timestamp=0.5)
+    assert tracker.tracks == []
+    tracker.update([Block(1, 10, 10)], timestamp=0.6)
+    assert tracker.tracks[0].track_id == 2
+
@@ -0,0 +1,119 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+
+import pytest
+
+from sdk.manipulators.medu import MEdu
+from sdk.utils.constants import COMMAND_RESULT_TOPIC, COMMAND_TOPIC
+
+
+class _Client:
+    """Клиент MQTT без сети: отвечает на каждую команду через process_message робота."""
+
+    def __init__(self, robot, reply):
+        self.robot = robot
+        self.reply = reply
+        self.commands = []
+
+    def publish(self, topic, payload):
+        if topic == COMMAND_TOPIC:
+            command = json.loads(payload)
+            self.commands.append((command["command"], command["data"]))
+            answer = {"id": command["id"], "result": True, **self.reply(command)}
+            self.robot.process_message(COMMAND_RESULT_TOPIC, json.dumps(answer))
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot(reply=lambda command: {}):
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = MEdu("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client(robot, reply)
+    return robot
+
+
+def _value_of(command):
+    name = command["data"]["name"]
+    if name == "broken":
+        return {"error": "нет канала"}
+    return {"data": {"value": int(name[-1])}}
+
+
+def test_get_gpio_values_returns_every_channel():
+    robot = _robot(_value_of)
+    assert robot.get_gpio_values(["in1", "in2", "in3"]) == {"in1": 1, "in2": 2, "in3": 3}
+    assert [name for name, _ in robot.message_bus.mqtt_client.commands] == ["get_gpio"] * 3
+    assert robot.active_commands == {}
+
+
+def test_failed_channel_is_none_or_raises():
+    robot = _robot(_value_of)
+    assert robot.get_gpio_values(["in1", "broken"], throw_error=False) == {"in1": 1, "broken": None}
+    with pytest.raises(Exception):
+        robot.get_gpio_values(["in1", "broken"])
+
+
+def test_get_i2c_values_uses_i2c_command():
+    robot = _robot(_value_of)
+    assert robot.get_i2c_values(["sensor4"]) == {"sensor4": 4}
+    assert robot.message_bus.mqtt_client.commands == [("get_i2c", {"name": "sensor4"})]
+
+
+def test_write_values_send_all_commands_before_checking_errors():
+    robot = _robot(lambda command: {"error": "занято"} if command["data"]["name"] == "out1" else {})
+    with pytest.raises(Exception):
+        robot.write_gpio_values({"out1": 1, "out2": 0})
+    assert robot.message_bus.mqtt_client.commands == [("set_gpio", {"name": "out1", "value": 1}),
+                                                      ("set_gpio", {"name": "out2", "value": 0})]
+
+    robot.write_i2c_values({"out1": 5, "out2": 6}, throw_error=False)
+    assert robot.message_bus.mqtt_client.commands[2:] == [("set_i2c", {"name": "out1", "value": 5}),
+                                                          ("set_i2c", {"name": "out2", "value": 6})]
+    assert robot.active_commands == {}
@@ -0,0 +1,121 @@
+import sys
+import pathlib
+import threading
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sdk.utils.command_coalescer import CommandCoalescer
+
+
+class RecordingSender:
+    """Запоминает отправленные пачки и может имитировать ошибку канала"""
+
+    def __init__(self, fail_keys=()):
+        self.batches = []
+        self.fail_keys = set(fail_keys)
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+        return {key: (RuntimeError("fail") if key in self.fail_keys else None) for key, _ in items}
+
+    @property
+    def sent(self):
+        return [item for batch in self.batches for item in batch]
+
+
+def test_burst_is_merged_into_latest_value():
+    sender = RecordingSender()
+    coalescer = CommandCoalescer(sender, window_seconds=10.0)
+    for value in range(5):
+        coalescer.write(("gpio", "A"), value)
+    assert coalescer.flush(1.0)
+    assert sender.sent == [(("gpio", "A"), 4)]
+    assert coalescer.acknowledged(("gpio", "A")) == 4
+
+
+def test_noop_write_is_dropped():
+    sender = RecordingSender()
+    coalescer = CommandCoalescer(sender, window_seconds=0.0)
+    assert coalescer.write(("do", 1), True)
+    coalescer.flush(1.0)
+    assert not coalescer.write(("do", 1), True)
+    coalescer.flush(1.0)
+    assert len(sender.sent) == 1
+    assert coalescer.dropped_count == 1
+
+
+def test_burst_returning_to_acknowledged_value_sends_nothing():
+    sender = RecordingSender()
+    coalescer = CommandCoalescer(sender, window_seconds=10.0)
+    coalescer.write(("do", 1), False)
+    coalescer.flush(1.0)
+    coalescer.write(("do", 1), True)
+    assert not coalescer.write(("do", 1), False)
+    coalescer.flush(1.0)
+    assert sender.sent == [(("do", 1), False)]
+
+
+def test_tolerance_for_numeric_values():
+    sender = RecordingSender()
+    coalescer = CommandCoalescer(sender, window_seconds=0.0, tolerance=0.01)
+    coalescer.write(("ao", 0), 0.5)
+    coalescer.flush(1.0)
+    assert not coalescer.write(("ao", 0), 0.505)
+    assert coalescer.write(("ao", 0), 0.6)
+    coalescer.flush(1.0)
+    assert [value for _, value in sender.sent] == [0.5, 0.6]
+
+
+def test_failed_write_is_not_acknowledged():
+    sender = RecordingSender(fail_keys={("do", 2)})
+    coalescer = CommandCoalescer(sender, window_seconds=0.0)
+    coalescer.write(("do", 2), True)
+    coalescer.flush(1.0)
+    assert coalescer.acknowledged(("do", 2)) is None
+    assert isinstance(coalescer.last_error(("do", 2)), RuntimeError)
+    # Повтор того же значения должен быть отправлен снова
+    assert coalescer.write(("do", 2), True)
+
+
+def test_invalidate_forces_resend():
+    sender = RecordingSender()
+    coalescer = CommandCoalescer(sender, window_seconds=0.0)
+    coalescer.write(("do", 3), True)
+    coalescer.flush(1.0)
+    coalescer.invalidate(("do", 3))
+    assert coalescer.write(("do", 3), True)
+    coalescer.close()
+    assert len(sender.sent) == 2
+
+
+def test_direct_write_discards_pending_value():
+    sender = RecordingSender()
+    coalescer = CommandCoalescer(sender, window_seconds=10.0)
+    coalescer.write(("gpio", "A"), 1)
+    coalescer.write(("gpio", "B"), 1)
+    coalescer.invalidate(("gpio", "A"), discard_pending=True)
+    assert coalescer.pending_count == 1
+    assert coalescer.flush(1.0)
+    assert sender.sent == [(("gpio", "B"), 1)]
+
+
+def test_direct_write_during_send_ignores_stale_acknowledgement():
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_sender(items):
+        started.set()
+        release.wait(1.0)
+        return {key: None for key, _ in items}
+
+    coalescer = CommandCoalescer(slow_sender, window_seconds=0.0)
+    coalescer.write(("gpio", "A"), 1)
+    assert started.wait(1.0)
+    coalescer.invalidate(("gpio", "A"), discard_pending=True)
+    release.set()
+    assert coalescer.flush(1.0)
+    assert coalescer.acknowledged(("gpio", "A")) is None
@@ -0,0 +1,166 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и классов манипуляторов (нужны при импорте пакетов sdk.commands
+# и sdk.manipulators, конвейеру захвата достаточно фиктивного робота)
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+_map_cls = {
+    "sdk.manipulators.manipulator": "Manipulator",
+    "sdk.manipulators.base": "BaseManipulator",
+    "sdk.manipulators.medu": "MEdu",
+    "sdk.manipulators.m13": "M13",
+}
+for _name, _cls in _map_cls.items():
+    if _name not in sys.modules:
+        mod = types.ModuleType(_name)
+        setattr(mod, _cls, type(_cls, (), {"__init__": lambda self, *a, **k: None}))
+        sys.modules[_name] = mod
+
+if "sdk.manipulators.attachments" not in sys.modules:
+    att_stub = types.ModuleType("sdk.manipulators.attachments")
+    for cls in ["Attachment", "LaserAttachment", "GripperAttachment", "VacuumAttachment"]:
+        setattr(att_stub, cls, object)
+    sys.modules["sdk.manipulators.attachments"] = att_stub
+
+import time
+
+from sdk.manipulators.conveyor_pipeline import ConveyorPickPipeline, PickTarget, _put_latest
+from sdk.manipulators.extern_devices.pixy_cam.block_tracker import Block
+from sdk.manipulators.extern_devices.pixy_cam.calibration import PixyCalibration
+
+
+def _calibration():
+    """Пиксель -> метры: x = u / 1000, y = v / 1000."""
+    calibration = PixyCalibration("affine")
+    for u, v in ((0, 0), (100, 0), (0, 100), (100, 100)):
+        calibration.add_sample((u, v), (u / 1000, v / 1000))
+    calibration.fit()
+    return calibration
+
+
+class _Camera:
+    """Камера Pixy: отдаёт кадры по очереди, затем пустые кадры."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.requests = 0
+
+    def get_blocks(self, timeout_seconds=60.0):
+        self.requests += 1
+        time.sleep(0.005)
+        blocks = self.frames.pop(0) if self.frames else []
+        return {"result": [{"m_signature": s, "m_x": x, "m_y": y} for s, x, y in blocks]}
+
+
+class _SensorStream:
+    def __init__(self):
+        self.callbacks = []
+
+    def on_sample(self, callback):
+        self.callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, handle):
+        self.callbacks.remove(handle)
+
+    def emit(self, sample):
+        for callback in list(self.callbacks):
+            callback(sample)
+
+
+def _robot(conveyor_velocity=None):
+    robot = types.SimpleNamespace(conveyor_velocity=conveyor_velocity)
+    stream = _SensorStream()
+    robot.mgbot_conveyer = types.SimpleNamespace(sensor_stream=stream,
+                                                 start_sensor_stream=lambda timeout_seconds=None: stream)
+    return robot
+
+
+def _wait(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_each_tracked_object_is_picked_once_with_belt_lead():
+    picked = []
+    frames = [[(1, 100, 50), (2, 10, 10)], [(1, 102, 50)], [(1, 104, 50)]]
+    pipeline = ConveyorPickPipeline(_robot(conveyor_velocity=0.2), _calibration(),
+                                    lambda robot, target, xy: picked.append((target, xy)),
+                                    camera=_Camera(frames), signatures={1}, lead_time=0.1)
+    with pipeline:
+        assert _wait(lambda: pipeline.camera.requests > len(frames))
+    assert not pipeline.running
+
+    assert len(picked) == 1 and pipeline.picked_count == 1
+    target, (x, y) = picked[0]
+    assert target.block.signature == 1 and abs(target.x - 0.1) < 1e-9
+    # За время упреждения (не меньше lead_time) лента сдвигает деталь вдоль x со скоростью 0.2
+    assert x - target.x >= 0.2 * 0.1 - 1e-9 and abs(y - 0.05) < 1e-9
+
+
+def test_sensor_edge_triggers_one_frame():
+    robot = _robot()
+    camera = _Camera([[(1, 50, 50)]])
+    picked = []
+    pipeline = ConveyorPickPipeline(robot, _calibration(), lambda r, target, xy: picked.append(target),
+                                    camera=camera, sensor_trigger=lambda sample: sample["ir"] == 1)
+    pipeline.start()
+    try:
+        stream = robot.mgbot_conveyer.sensor_stream
+        time.sleep(0.05)
+        assert camera.requests == 0
+        for value in (0, 1, 1, 1):
+            stream.emit({"ir": value})
+        assert _wait(lambda: len(picked) == 1)
+        time.sleep(0.05)
+        assert camera.requests == 1
+    finally:
+        pipeline.stop()
+    assert robot.mgbot_conveyer.sensor_stream.callbacks == []
+
+
+def test_stale_targets_and_pick_errors_are_counted():
+    def pick(robot, target, xy):
+        raise RuntimeError("захват не удался")
+
+    pipeline = ConveyorPickPipeline(_robot(), _calibration(), pick, camera=_Camera([[(1, 10, 10)]]))
+    with pipeline:
+        assert _wait(lambda: pipeline.error_count == 1)
+
+    pipeline = ConveyorPickPipeline(_robot(), _calibration(), pick, camera=_Camera([[(1, 10, 10)]]),
+                                    lead_time=1.0, max_target_age=0.5)
+    with pipeline:
+        assert _wait(lambda: pipeline.stale_count == 1)
+    assert pipeline.error_count == 0 and pipeline.picked_count == 0
+
+
+def test_bounded_queue_keeps_latest_target():
+    import queue
+
+    q = queue.Queue(maxsize=2)
+    assert not _put_latest(q, 1)
+    assert not _put_latest(q, 2)
+    assert _put_latest(q, 3)
+    assert [q.get_nowait(), q.get_nowait()] == [2, 3]
+
+    target = PickTarget(1, Block(1, 0.0, 0.0), 0.1, 0.2, detected_at=10.0)
+    assert target.predict((0.5, -0.1), at=12.0) == (1.1, 0.0)
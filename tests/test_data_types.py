@@ -0,0 +1,98 @@
+import sys, types
+import pathlib
+import copy
+import pickle
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic (минимум) – нужен пакету sdk.commands для CommandParams
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    def _Field(*args, **kwargs):
+        return None
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = _Field
+    sys.modules["pydantic"] = pydantic_stub
+
+import pytest
+
+from sdk.commands import data
+from sdk.commands.data import Position, Orientation, Point3D, Pose, Joint, Point, JointPosition, JointPositions
+from sdk.commands.move_group import MoveGroup, MoveType
+from sdk.commands.move_coordinates_command import MoveCoordinatesParamsPosition
+
+
+def test_positional_and_keyword_init():
+    assert Position(1, 2, 3) == Position(x=1, y=2, z=3)
+    assert Orientation() == Orientation(0.0, 0.0, 0.0, 1.0)
+    assert MoveCoordinatesParamsPosition(0.3, 0, 0.2).to_dict() == {"x": 0.3, "y": 0, "z": 0.2}
+    with pytest.raises(TypeError):
+        Position(1, 2)
+    with pytest.raises(TypeError):
+        Position(1, 2, 3, x=1)
+
+
+def test_objects_are_immutable_and_hashable():
+    position = Position(1, 2, 3)
+    with pytest.raises(AttributeError):
+        position.x = 5
+    assert position._replace(x=5) == Position(5, 2, 3)
+    assert len({Position(1, 2, 3), Position(1, 2, 3)}) == 1
+
+
+def test_nested_values_are_coerced_and_serialized():
+    pose = Pose(position={"x": 1, "y": 2, "z": 3}, velocity_factor=0.5)
+    assert pose.to_dict() == {
+        "position": {"x": 1, "y": 2, "z": 3},
+        "orientation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0},
+        "velocity_factor": 0.5,
+        "acceleration_factor": 0.1,
+    }
+    point = Point([Joint("a", 1.0), ("b", 2.0)])
+    assert point.to_dict() == {"positions": {"a": 1.0, "b": 2.0}, "velocities": {"a": 0.0, "b": 0.0}}
+    assert JointPositions([JointPosition("a", 1.0)]).to_dict() == [{"joint": "a", "position": 1.0}]
+
+    group = MoveGroup(MoveType.LINE, [Point3D(Position(1, 2, 3))])
+    assert group.to_dict()["points"][0]["position"] == {"x": 1, "y": 2, "z": 3}
+
+
+def test_numbers_and_numeric_strings_are_coerced_to_float():
+    from fractions import Fraction
+
+    position = MoveCoordinatesParamsPosition("0.25", Fraction(1, 2), 1)
+    assert position == Position(0.25, 0.5, 1.0)
+    assert all(type(value) is float for value in position.to_dict().values())
+    assert Orientation(w="1").w == 1.0
+    assert Pose(position=(1, 2, 3), velocity_factor="0.3").velocity_factor == 0.3
+    np = pytest.importorskip("numpy")
+    assert type(Position(*np.array([1, 2, 3], dtype=np.float32)).x) is float
+    with pytest.raises(TypeError):
+        Orientation(w="один")
+
+
+def test_validation_can_be_disabled():
+    with pytest.raises(TypeError):
+        Position(1, "a", 3)
+    data.set_validation(False)
+    try:
+        assert Position(1, "a", 3).y == "a"
+    finally:
+        data.set_validation(True)
+
+
+def test_fast_make_and_pickle_roundtrip():
+    point = Point3D._make(Position._make(1.0, 2.0, 3.0), Orientation._make(0.0, 0.0, 0.0, 1.0))
+    assert point == Point3D(Position(1.0, 2.0, 3.0))
+    assert pickle.loads(pickle.dumps(point)) == point
+    assert copy.deepcopy(point) == point
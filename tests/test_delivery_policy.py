@@ -0,0 +1,100 @@
+import sys
+import pathlib
+import threading
+import time
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sdk.utils.delivery_policy import DeliveryGate, DeliveryPolicy
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_every_nth_samples_messages():
+    calls = []
+    gate = DeliveryGate(DeliveryPolicy(every_nth=3), calls.append)
+    for i in range(10):
+        gate.offer(str(i))
+    assert calls == ["2", "5", "8"]
+    assert gate.skipped == 7
+
+
+def test_max_rate_drops_messages_inside_interval():
+    calls = []
+    gate = DeliveryGate(DeliveryPolicy(max_rate=20), calls.append)
+    for i in range(50):
+        gate.offer(str(i))
+    assert calls == ["0"]
+    time.sleep(0.06)
+    gate.offer("late")
+    assert calls == ["0", "late"]
+
+
+def test_latest_only_delivers_last_message_after_interval():
+    calls = []
+    gate = DeliveryGate(DeliveryPolicy(max_rate=20, latest_only=True), calls.append)
+    for i in range(50):
+        gate.offer(str(i))
+    assert calls == ["0"]
+    assert _wait(lambda: len(calls) == 2)
+    assert calls == ["0", "49"]
+    gate.close()
+
+
+def test_latest_only_conflates_while_handler_is_busy():
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def handler(payload):
+        calls.append(payload)
+        if payload == "0":
+            started.set()
+            release.wait(2.0)
+
+    def submit(call, payload):
+        threading.Thread(target=call, args=(payload,), daemon=True).start()
+        return True
+
+    gate = DeliveryGate(DeliveryPolicy(latest_only=True), handler, submit)
+    gate.offer("0")
+    assert started.wait(2.0)
+    for i in range(1, 10):
+        gate.offer(str(i))
+    release.set()
+    assert _wait(lambda: len(calls) == 2)
+    time.sleep(0.05)
+    assert calls == ["0", "9"]
+
+
+def test_rejected_submit_does_not_block_latest_only():
+    calls = []
+    accept = [False]
+
+    def submit(call, payload):
+        if not accept[0]:
+            return False
+        call(payload)
+        return True
+
+    gate = DeliveryGate(DeliveryPolicy(latest_only=True), calls.append, submit)
+    gate.offer("dropped")
+    accept[0] = True
+    gate.offer("next")
+    assert calls == ["next"]
+
+
+def test_policy_validation():
+    with pytest.raises(ValueError):
+        DeliveryPolicy(max_rate=0)
+    with pytest.raises(ValueError):
+        DeliveryPolicy(every_nth=0)
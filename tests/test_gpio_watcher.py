@@ -0,0 +1,110 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub классов манипуляторов: пакет sdk.manipulators импортирует их при загрузке,
+# а им нужен paho-mqtt. Наблюдателю GPIO они не нужны.
+# -----------------------------------------------------------------------------
+_map_cls = {
+    "sdk.manipulators.manipulator": "Manipulator",
+    "sdk.manipulators.base": "BaseManipulator",
+    "sdk.manipulators.medu": "MEdu",
+    "sdk.manipulators.m13": "M13",
+}
+for _name, _cls in _map_cls.items():
+    if _name not in sys.modules:
+        mod = types.ModuleType(_name)
+        setattr(mod, _cls, type(_cls, (), {"__init__": lambda self, *a, **k: None}))
+        sys.modules[_name] = mod
+
+if "sdk.manipulators.attachments" not in sys.modules:
+    att_stub = types.ModuleType("sdk.manipulators.attachments")
+    for cls in ["Attachment", "LaserAttachment", "GripperAttachment", "VacuumAttachment"]:
+        setattr(att_stub, cls, object)
+    sys.modules["sdk.manipulators.attachments"] = att_stub
+
+import json
+import threading
+import time
+
+from sdk.manipulators.gpio_watcher import GpioWatcher
+from sdk.utils.telemetry import flatten_gpio_states
+
+
+def test_first_message_sets_state_without_callbacks():
+    watcher = GpioWatcher()
+    events = []
+    watcher.on_change(lambda pin, old, new: events.append(pin))
+    watcher.update({"DI1": 0, "DI2": 1})
+    assert events == []
+    assert watcher.state == {"DI1": 0, "DI2": 1}
+
+
+def test_rising_and_falling_edges():
+    watcher = GpioWatcher()
+    rising, falling, only_di2 = [], [], []
+    watcher.on_rising(lambda pin, old, new: rising.append(pin))
+    watcher.on_falling(lambda pin, old, new: falling.append(pin))
+    watcher.on_change(lambda pin, old, new: only_di2.append((old, new)), pin="DI2")
+
+    watcher.update({"DI1": 0, "DI2": 1})
+    watcher.update({"DI1": 1, "DI2": 1})
+    watcher.update({"DI1": 1, "DI2": 0})
+
+    assert rising == ["DI1"]
+    assert falling == ["DI2"]
+    assert only_di2 == [(1, 0)]
+
+
+def test_debounce_requires_stable_value():
+    watcher = GpioWatcher(debounce_seconds=0.05)
+    events = []
+    watcher.on_change(lambda pin, old, new: events.append(new))
+
+    watcher.update({"DI1": 0}, timestamp=0.0)
+    watcher.update({"DI1": 1}, timestamp=1.00)
+    watcher.update({"DI1": 0}, timestamp=1.01)  # дребезг – вернулись к исходному
+    watcher.update({"DI1": 1}, timestamp=1.02)
+    assert events == []
+    watcher.update({"DI1": 1}, timestamp=1.08)
+    assert events == [1]
+
+
+def test_debounced_edge_fires_without_further_messages():
+    # Контроллер публикует /gpio_states только при изменениях: подтверждает таймер
+    watcher = GpioWatcher(debounce_seconds=0.02)
+    fired = threading.Event()
+    events = []
+    watcher.on_rising(lambda pin, old, new: events.append((pin, old, new)) or fired.set())
+    watcher.process_message("/gpio_states", json.dumps({"DI1": 0}))
+    watcher.process_message("/gpio_states", json.dumps({"DI1": 1}))
+    assert events == []
+    assert fired.wait(1.0)
+    assert events == [("DI1", 0, 1)] and watcher.get("DI1") == 1
+
+    watcher.process_message("/gpio_states", json.dumps({"DI1": 0}))
+    watcher.close()
+    time.sleep(0.05)
+    assert watcher.get("DI1") == 1
+
+
+def test_identical_payload_is_not_decoded_again():
+    watcher = GpioWatcher()
+    calls = []
+    original_update = watcher.update
+    watcher.update = lambda states, timestamp=None: calls.append(states) or original_update(states, timestamp)
+
+    payload = json.dumps({"DI1": 1})
+    watcher.process_message("/gpio_states", payload)
+    watcher.process_message("/gpio_states", payload)
+    watcher.process_message("/gpio_states", json.dumps({"DI1": 0}))
+    assert len(calls) == 2
+
+
+def test_flatten_nested_payload():
+    data = {"inputs": {"DI1": 1}, "outputs": [{"name": "DO1", "value": 0}]}
+    assert flatten_gpio_states(data) == {"inputs/DI1": 1, "outputs/DO1": 0}
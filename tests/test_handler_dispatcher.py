@@ -0,0 +1,65 @@
+import sys
+import pathlib
+import threading
+import time
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sdk.utils.handler_dispatcher import BLOCK, DROP_OLDEST, HandlerDispatcher
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_calls_of_one_topic_run_in_order_off_caller_thread():
+    dispatcher = HandlerDispatcher(workers=3).start()
+    calls = []
+    caller = threading.get_ident()
+    try:
+        for i in range(20):
+            dispatcher.submit("/coordinates", lambda i=i: calls.append((i, threading.get_ident())))
+        assert _wait(lambda: len(calls) == 20)
+    finally:
+        dispatcher.stop()
+    assert [i for i, _ in calls] == list(range(20))
+    assert all(thread != caller for _, thread in calls)
+
+
+def test_drop_oldest_keeps_latest_calls():
+    gate = threading.Event()
+    calls = []
+    dispatcher = HandlerDispatcher(workers=1, maxsize=2, policy=DROP_OLDEST).start()
+    try:
+        dispatcher.submit("/t", gate.wait)
+        assert _wait(lambda: dispatcher.pending("/t") == 0)
+        for i in range(5):
+            dispatcher.submit("/t", calls.append, i)
+        gate.set()
+        assert _wait(lambda: len(calls) == 2)
+    finally:
+        dispatcher.stop()
+    assert calls == [3, 4]
+    assert dispatcher.dropped("/t") == 3
+
+
+def test_block_policy_waits_for_space():
+    gate = threading.Event()
+    calls = []
+    dispatcher = HandlerDispatcher(workers=1, maxsize=1, block_timeout=2.0).start()
+    dispatcher.configure_topic("/t", policy=BLOCK)
+    try:
+        dispatcher.submit("/t", gate.wait)
+        assert _wait(lambda: dispatcher.pending("/t") == 0)
+        dispatcher.submit("/t", calls.append, 1)
+        threading.Timer(0.05, gate.set).start()
+        assert dispatcher.submit("/t", calls.append, 2)
+        assert _wait(lambda: len(calls) == 2)
+    finally:
+        dispatcher.stop()
+    assert calls == [1, 2] and dispatcher.dropped() == 0
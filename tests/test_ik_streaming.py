@@ -0,0 +1,167 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+import math
+
+import pytest
+
+from sdk.commands.move_coordinates_command import MoveCoordinatesParamsPosition
+from sdk.errors import KinematicsError
+from sdk.manipulators.medu import MEdu
+from sdk.motion.kinematics import DHLink, KinematicChain
+from sdk.motion.limits import JointLimits
+from sdk.utils.constants import JOINT_INFO_TOPIC, ROBOT_DESCRIPTION_TOPIC
+
+NAMES = ("povorot_osnovaniya", "privod_plecha", "privod_strely")
+CHAIN = KinematicChain(NAMES, [DHLink(0.0, math.pi / 2, 0.15), DHLink(0.2, 0.0, 0.0), DHLink(0.15, 0.0, 0.0)])
+# То же описание в URDF, как его публикует контроллер
+URDF = f"""<robot name="medu">
+  <joint name="povorot_osnovaniya" type="revolute"><parent link="base_link"/><child link="osnovanie"/>
+    <axis xyz="0 0 1"/></joint>
+  <joint name="privod_plecha" type="revolute"><parent link="osnovanie"/><child link="plecho"/>
+    <origin xyz="0 0 0.15" rpy="{math.pi / 2} 0 0"/><axis xyz="0 0 1"/></joint>
+  <joint name="privod_strely" type="revolute"><parent link="plecho"/><child link="strela"/>
+    <origin xyz="0.2 0 0"/><axis xyz="0 0 1"/></joint>
+  <joint name="flanec" type="fixed"><parent link="strela"/><child link="tool0"/><origin xyz="0.15 0 0"/></joint>
+  <joint name="kamera" type="fixed"><parent link="base_link"/><child link="camera_link"/><origin xyz="0.3 0 0.5"/></joint>
+</robot>"""
+
+
+class _Client:
+    """Клиент MQTT без сети: при подписке на /joint_states отдаёт заданные углы, /stream запоминает."""
+
+    def __init__(self, robot, angles):
+        self.robot = robot
+        self.angles = angles
+        self.streamed = []
+
+    def publish(self, topic, payload):
+        if topic == "/stream":
+            self.streamed.append(json.loads(payload)["data"]["positions"])
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        if topic == ROBOT_DESCRIPTION_TOPIC:
+            self.robot.process_message(ROBOT_DESCRIPTION_TOPIC, json.dumps({"data": URDF}))
+        if topic == JOINT_INFO_TOPIC:
+            state = {"name": list(NAMES), "position": list(self.angles), "velocity": [0.0] * 3}
+            self.robot.process_message(JOINT_INFO_TOPIC, json.dumps(state))
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot(angles, kinematics=CHAIN):
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = MEdu("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client(robot, angles)
+    robot.kinematics = kinematics
+    return robot
+
+
+def _target(angles):
+    return MoveCoordinatesParamsPosition(*CHAIN.position(angles))
+
+
+def test_first_point_is_seeded_from_joint_states():
+    # Из /joint_states выбирается ветвь «локоть вверх», хотя та же точка достижима и «локтем вниз»
+    current = [0.3, 0.9, -1.2]
+    robot = _robot(current)
+    sent = robot.stream_coordinates_via_joints(_target([0.3, 0.92, -1.21]), dt=0.01)
+    assert sent == pytest.approx([0.3, 0.92, -1.21], abs=1e-6)
+    assert list(robot.message_bus.mqtt_client.streamed[0]) == list(NAMES)
+
+
+def test_jump_beyond_velocity_limit_is_not_streamed():
+    robot = _robot([0.3, 0.9, -1.2])
+    robot.enable_motion_validation(JointLimits(NAMES, (-3.0,) * 3, (3.0,) * 3, velocity=(1.0,) * 3), fetch=False)
+    robot.stream_coordinates_via_joints(_target([0.3, 0.9, -1.2]), dt=0.01)
+    with pytest.raises(KinematicsError):
+        robot.stream_coordinates_via_joints(_target([0.5, 0.9, -1.2]), dt=0.01)
+    assert len(robot.message_bus.mqtt_client.streamed) == 1
+    # После отказа поток продолжается от последней отправленной точки
+    sent = robot.stream_coordinates_via_joints(_target([0.305, 0.9, -1.2]), dt=0.01)
+    assert sent == pytest.approx([0.305, 0.9, -1.2], abs=1e-6)
+
+
+def test_stale_configuration_is_replaced_by_joint_states(monkeypatch):
+    import sdk.manipulators.manipulator as manipulator
+
+    robot = _robot([0.3, 0.9, -1.2])
+    robot.stream_coordinates_via_joints(_target([0.3, 0.9, -1.2]))
+    # Робот переехал другой командой; старая точка потока больше не годится как приближение
+    robot.message_bus.mqtt_client.angles = [-0.5, 0.6, -0.8]
+    monkeypatch.setattr(manipulator, "IK_STREAM_STALE_SECONDS", -1.0)
+    sent = robot.stream_coordinates_via_joints(_target([-0.5, 0.62, -0.8]))
+    assert sent == pytest.approx([-0.5, 0.62, -0.8], abs=1e-6)
+
+
+def test_numeric_solver_without_restarts_stays_near_seed():
+    from sdk.motion.inverse_kinematics import InverseKinematics
+
+    half_pi = math.pi / 2
+    chain = KinematicChain(["j%d" % i for i in range(6)],
+                           [DHLink(0.0, half_pi, 0.2), DHLink(-0.6, 0.0, 0.0), DHLink(-0.55, 0.0, 0.0),
+                            DHLink(0.0, half_pi, 0.17), DHLink(0.0, -half_pi, 0.12), DHLink(0.0, 0.0, 0.1)])
+    ik = InverseKinematics(chain)
+    # Цель вне досягаемости: без перезапусков – одна попытка от seed
+    ik.iterations = 0
+    with pytest.raises(KinematicsError):
+        ik.solve((3.0, 0.0, 0.0), seed=[0.0] * 6, restarts=0)
+    single = ik.iterations
+    ik.iterations = 0
+    with pytest.raises(KinematicsError):
+        ik.solve((3.0, 0.0, 0.0), seed=[0.0] * 6)
+    assert ik.iterations > single
+
+
+
+
+def test_kinematics_is_built_from_controller_urdf():
+    robot = _robot([0.3, 0.9, -1.2], kinematics=None)
+    q = [0.3, 0.9, -1.2]
+    pose = robot.forward_kinematics(q)
+    assert robot.kinematics.joint_names == NAMES
+    assert (pose.position.x, pose.position.y, pose.position.z) == pytest.approx(CHAIN.position(q))
+    assert robot.inverse_kinematics(CHAIN.position(q), seed=q) == pytest.approx(q, abs=1e-4)
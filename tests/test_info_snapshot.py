@@ -0,0 +1,137 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from sdk.manipulators.manipulator_info import ManipulatorInfo
+from sdk.promise import Promise
+
+
+class _Bus:
+    """Шина сообщений: учитывает подписки."""
+
+    def __init__(self):
+        self.subscribed = []
+        self.unsubscribed = []
+
+    def subscribe(self, topic):
+        self.subscribed.append(topic)
+
+    def unsubscribe(self, topic):
+        self.unsubscribed.append(topic)
+
+
+def _info():
+    info = ManipulatorInfo(_Bus())
+    info._manipulator_ref = types.SimpleNamespace(_topic_handlers={}, _payload_listeners=None)
+    return info
+
+
+def _emit_later(info, messages, delay):
+    def run():
+        time.sleep(delay)
+        for topic, data in messages:
+            info.process_message(topic, json.dumps(data))
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_topics_are_awaited_in_parallel():
+    info = _info()
+    topics = ["/manipulator_info", "/hardware_state", "/gpio_states"]
+    thread = _emit_later(info, [(topic, {"topic": topic}) for topic in reversed(topics)], 0.2)
+    started = time.monotonic()
+    state = info.snapshot(topics, timeout_seconds=0.5)
+    thread.join()
+    assert state == {topic: {"topic": topic} for topic in topics}
+    assert time.monotonic() - started < 0.5
+    assert sorted(info.message_bus.subscribed) == sorted(topics)
+    assert sorted(info.message_bus.unsubscribed) == sorted(topics)
+    assert info._snapshot_waiters == {}
+
+
+def test_missing_topics_share_one_timeout_and_become_error_dicts():
+    info = _info()
+    thread = _emit_later(info, [("/hardware_state", {"ok": 1})], 0.05)
+    started = time.monotonic()
+    state = info.snapshot(["/gpio_states", "/hardware_state", "/i2c_states"], timeout_seconds=0.3)
+    thread.join()
+    # Ожидания идут параллельно: два пропавших топика не удваивают таймаут
+    assert time.monotonic() - started < 0.55
+    assert state["/hardware_state"] == {"ok": 1}
+    assert state["/gpio_states"]["error"] == "topic_gpiostates_unavailable"
+    assert state["/i2c_states"]["error"] == "topic_i2cstates_unavailable"
+    assert "message" in state["/i2c_states"]
+
+
+def test_throw_error_raises_for_missing_topic():
+    info = _info()
+    with pytest.raises(Exception, match="/gamepad_info"):
+        info.snapshot(["/gamepad_info"], timeout_seconds=0.05, throw_error=True)
+    with pytest.raises(Exception, match="/gamepad_info"):
+        asyncio.run(info.snapshot_async(["/gamepad_info"], timeout_seconds=0.05, throw_error=True))
+
+
+def test_async_snapshot():
+    info = _info()
+    thread = _emit_later(info, [("/gpio_states", {"DI1": 1}), ("/i2c_states", {"a": 2})], 0.05)
+    state = asyncio.run(info.snapshot_async(["/gpio_states", "/i2c_states"], timeout_seconds=2))
+    thread.join()
+    assert state == {"/gpio_states": {"DI1": 1}, "/i2c_states": {"a": 2}}
+
+
+def test_topics_in_use_stay_subscribed():
+    info = _info()
+    info._gpio_states_promise = Promise(timeout_seconds=5)
+    info._manipulator_ref.cartesian_coordinates_promise = Promise(timeout_seconds=5)
+    info._manipulator_ref._topic_handlers["/i2c_states"] = print
+    topics = ["/gpio_states", "/coordinates", "/i2c_states", "/hardware_state"]
+    # /gpio_states не приходит: get_gpio_states всё ещё ждёт его после таймаута снимка
+    thread = _emit_later(info, [(topic, {}) for topic in topics[1:]], 0.02)
+    info.snapshot(topics, timeout_seconds=0.2)
+    thread.join()
+    assert info.message_bus.unsubscribed == ["/hardware_state"]
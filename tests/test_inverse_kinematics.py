@@ -0,0 +1,90 @@
+import sys
+import types
+import math
+import pathlib
+import random
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Stub pydantic (минимум) – нужен пакету sdk.commands, который импортирует sdk.motion
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+    pydantic_stub.BaseModel = type("BaseModel", (), {})
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+from sdk.errors import KinematicsError
+from sdk.motion.inverse_kinematics import InverseKinematics
+from sdk.motion.kinematics import DHLink, KinematicChain
+from sdk.motion.limits import JointLimits
+
+
+def _six_axis():
+    """Шестиосная цепь с запястьем UR-типа (условные размеры)."""
+    half_pi = math.pi / 2
+    links = [DHLink(0.0, half_pi, 0.2), DHLink(-0.6, 0.0, 0.0), DHLink(-0.55, 0.0, 0.0),
+             DHLink(0.0, half_pi, 0.17), DHLink(0.0, -half_pi, 0.12), DHLink(0.0, 0.0, 0.1)]
+    return KinematicChain(["j%d" % i for i in range(6)], links)
+
+
+def _three_axis(tool=(0.0, 0.0, 0.0)):
+    """Поворот основания и два параллельных звена (условные размеры)."""
+    return KinematicChain(("base", "shoulder", "elbow"),
+                          [DHLink(0.0, math.pi / 2, 0.15), DHLink(0.2, 0.0, 0.0), DHLink(0.15, 0.0, 0.0)], tool)
+
+
+def _distance(a, b):
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+def test_three_axis_analytic_round_trip_with_tool_offset():
+    chain = _three_axis(tool=(0.02, 0.01, 0.015))
+    ik = InverseKinematics(chain)
+    assert ik.analytic
+    rng = random.Random(3)
+    for _ in range(200):
+        q = [rng.uniform(-2.0, 2.0) for _ in range(3)]
+        target = chain.position(q)
+        assert _distance(chain.position(ik.solve(target)), target) < 1e-9
+
+
+def test_three_axis_unreachable_and_out_of_limits():
+    chain = _three_axis()
+    with pytest.raises(KinematicsError):
+        InverseKinematics(chain).solve((1.0, 0.0, 0.5))
+    limits = JointLimits(chain.joint_names, (-0.1, -0.1, -0.1), (0.1, 0.1, 0.1))
+    with pytest.raises(KinematicsError):
+        InverseKinematics(chain, limits).solve(chain.position([1.0, 0.5, -0.5]))
+
+
+def test_six_axis_pose_round_trip_and_warm_start_path():
+    chain = _six_axis()
+    ik = InverseKinematics(chain)
+    assert not ik.analytic
+    q0 = [0.1, -1.2, 1.5, -1.8, -1.57, 0.2]
+    pose = chain.forward(q0)
+    solution = ik.solve(pose, seed=[v + 0.2 for v in q0])
+    reached = chain.forward(solution)
+    assert _distance(chain.position(solution), chain.position(q0)) < 1e-5
+    a, b = reached.orientation, pose.orientation
+    assert abs(abs(a.x * b.x + a.y * b.y + a.z * b.z + a.w * b.w) - 1) < 1e-7
+
+    o = pose.orientation
+    path = [(pose.position.x + i * 0.002, pose.position.y, pose.position.z, o.x, o.y, o.z, o.w) for i in range(50)]
+    ik.iterations = 0
+    solutions = ik.solve_many(path, seed=q0)
+    assert ik.iterations < 4 * len(path)
+    for point, q in zip(path, solutions):
+        assert _distance(chain.position(q), point[:3]) < 1e-5
+    # Соседние точки пути дают непрерывные углы
+    assert max(abs(a - b) for p, n in zip(solutions, solutions[1:]) for a, b in zip(p, n)) < 0.05
+
+
+def test_solve_many_without_throw_returns_none_for_unreachable():
+    ik = InverseKinematics(_three_axis())
+    reachable = _three_axis().position([0.2, 0.3, -0.4])
+    assert ik.solve_many([reachable, (2.0, 0.0, 0.0)], throw_error=False)[1] is None
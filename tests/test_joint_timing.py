@@ -0,0 +1,64 @@
+import sys
+import types
+import pathlib
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Stub pydantic (минимум) – нужен пакету sdk.commands, который импортирует sdk.motion
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+    pydantic_stub.BaseModel = type("BaseModel", (), {})
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+from sdk.motion import timing
+from sdk.motion.limits import JointLimits
+from sdk.motion.timing import JointTrajectory, joint_rows
+
+NAMES = ("a", "b")
+LIMITS = JointLimits(NAMES, (-5, -5), (5, 5), velocity=(1.0, 2.0), acceleration=(2.0, 2.0))
+
+
+def test_collinear_waypoints_do_not_stop():
+    rows = [[0.0, 0.0], [0.5, 0.0], [1.0, 0.0], [1.5, 0.0]]
+    trajectory = JointTrajectory.plan(NAMES, rows, LIMITS)
+    single = JointTrajectory.plan(NAMES, [rows[0], rows[-1]], LIMITS)
+    assert trajectory.duration == pytest.approx(single.duration)
+    assert trajectory.segments[1].entry_speed == pytest.approx(1.0)
+    assert all(segment.velocity_scaling <= 1.0 + 1e-9 for segment in trajectory.segments)
+
+
+def test_sharp_corner_slows_down_and_limits_hold():
+    rows = [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]]
+    trajectory = JointTrajectory.plan(NAMES, rows, LIMITS, velocity_scaling=0.5)
+    assert trajectory.segments[1].entry_speed < 0.05
+    times, positions, velocities = trajectory.sample(rate_hz=200)
+    assert [float(v) for v in positions[-1]] == pytest.approx(rows[-1])
+    assert max(abs(float(v[0])) for v in velocities) <= 0.5 + 1e-9
+    assert trajectory.waypoint_times[0] == 0.0 and trajectory.waypoint_times[-1] == trajectory.duration
+
+
+def test_sample_fallback_matches_vectorized(monkeypatch):
+    rows = [[0.0, 0.0], [0.4, 0.3], [0.9, 0.2], [0.2, -0.4]]
+    trajectory = JointTrajectory.plan(NAMES, rows, LIMITS)
+    times, positions, velocities = trajectory.sample(100)
+    monkeypatch.setattr(timing, "np", None)
+    times2, positions2, velocities2 = trajectory.sample(100)
+    assert len(times) == len(times2)
+    for a, b in zip(positions, positions2):
+        assert [float(v) for v in a] == pytest.approx(b)
+    for a, b in zip(velocities, velocities2):
+        assert [float(v) for v in a] == pytest.approx(b)
+
+
+def test_joint_rows_and_missing_limits():
+    names, rows = joint_rows([{"a": 0.0, "b": 1.0}, {"b": 2.0, "a": 3.0}])
+    assert names == ("a", "b") and rows == [[0.0, 1.0], [3.0, 2.0]]
+    with pytest.raises(ValueError):
+        joint_rows([{"a": 0.0, "b": 1.0}, {"a": 1.0}])
+    with pytest.raises(ValueError):
+        JointTrajectory.plan(NAMES, rows, JointLimits(NAMES, (-5, -5), (5, 5)))
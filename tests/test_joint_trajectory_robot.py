@@ -0,0 +1,98 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+
+import pytest
+
+from sdk.errors import LimitError
+from sdk.manipulators.medu import MEdu
+from sdk.motion.limits import JointLimits
+
+NAMES = ("povorot_osnovaniya", "privod_plecha", "privod_strely")
+LIMITS = JointLimits(NAMES, (-1.0,) * 3, (1.0,) * 3, velocity=(2.0,) * 3, acceleration=(20.0,) * 3)
+
+
+class _Client:
+    """Клиент MQTT без сети: запоминает точки /stream."""
+
+    def __init__(self):
+        self.streamed = []
+
+    def publish(self, topic, payload):
+        if topic == "/stream":
+            self.streamed.append(json.loads(payload)["data"]["positions"])
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot():
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = MEdu("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client()
+    robot.enable_motion_validation(LIMITS, fetch=False)
+    return robot
+
+
+def test_dict_waypoints_are_validated():
+    robot = _robot()
+    waypoints = [dict(zip(NAMES, (0.0, 0.0, 0.0))), dict(zip(NAMES, (0.5, 1.5, 0.0)))]
+    with pytest.raises(LimitError) as error:
+        robot.plan_joint_trajectory(waypoints)
+    assert [(i, name) for i, name, _, _ in error.value.violations] == [(1, "privod_plecha")]
+
+
+def test_stream_rate_defaults_to_corner_period():
+    robot = _robot()
+    waypoints = [dict(zip(NAMES, (0.0, 0.0, 0.0))), dict(zip(NAMES, (0.02, 0.0, 0.0)))]
+    trajectory = robot.plan_joint_trajectory(waypoints, corner_period=0.02)
+    assert trajectory.corner_period == 0.02
+    sent = robot.stream_joint_trajectory(trajectory)
+    assert sent == len(trajectory.sample(50.0)[0]) == len(robot.message_bus.mqtt_client.streamed)
+
+
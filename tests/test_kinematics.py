@@ -0,0 +1,159 @@
+import sys
+import types
+import math
+import pathlib
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Stub pydantic (минимум) – нужен пакету sdk.commands, который импортирует sdk.motion
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+    pydantic_stub.BaseModel = type("BaseModel", (), {})
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+from sdk.motion.kinematics import DHLink, KinematicChain, rotation_to_quaternion
+
+
+def _urdf_of(chain):
+    """URDF, эквивалентный цепи DH без смещений углов: origin сустава – постоянная часть предыдущего звена."""
+    lines = ['<robot name="dh">', '<link name="base_link"/>']
+    parent, previous = "base_link", DHLink(0.0, 0.0, 0.0)
+    for name, link in zip(chain.joint_names, chain.links):
+        lines.append(f'<joint name="{name}" type="revolute"><parent link="{parent}"/><child link="{name}_link"/>'
+                     f'<origin xyz="{previous.a} 0 {previous.d}" rpy="{previous.alpha} 0 0"/>'
+                     f'<axis xyz="0 0 1"/></joint>')
+        parent, previous = f"{name}_link", link
+    lines.append(f'<joint name="flange" type="fixed"><parent link="{parent}"/><child link="tool0"/>'
+                 f'<origin xyz="{previous.a} 0 {previous.d}" rpy="{previous.alpha} 0 0"/></joint>')
+    lines.append("</robot>")
+    return "\n".join(lines)
+
+
+def _six_axis(tool=(0.0, 0.0, 0.0)):
+    """Шестиосная цепь с запястьем UR-типа (условные размеры)."""
+    half_pi = math.pi / 2
+    links = [DHLink(0.0, half_pi, 0.2), DHLink(-0.6, 0.0, 0.0), DHLink(-0.55, 0.0, 0.0),
+             DHLink(0.0, half_pi, 0.17), DHLink(0.0, -half_pi, 0.12), DHLink(0.0, 0.0, 0.1)]
+    return KinematicChain(["j%d" % i for i in range(6)], links, tool)
+
+
+def _three_axis(tool=(0.0, 0.0, 0.0)):
+    """Поворот основания и два параллельных звена (условные размеры)."""
+    return KinematicChain(("base", "shoulder", "elbow"),
+                          [DHLink(0.0, math.pi / 2, 0.15), DHLink(0.2, 0.0, 0.0), DHLink(0.15, 0.0, 0.0)], tool)
+
+
+def test_planar_chain_forward():
+    chain = KinematicChain(("a", "b"), [DHLink(1.0, 0.0, 0.0), DHLink(0.5, 0.0, 0.0)], tool=(0.1, 0.0, 0.0))
+    assert chain.position([0.0, 0.0]) == pytest.approx((1.6, 0.0, 0.0))
+    assert chain.position({"a": math.pi / 2, "b": -math.pi / 2}) == pytest.approx((0.6, 1.0, 0.0))
+    pose = chain.forward([math.pi / 2, 0.0])
+    assert (pose.orientation.z, pose.orientation.w) == pytest.approx((math.sqrt(0.5), math.sqrt(0.5)))
+
+
+def test_six_axis_zero_pose_matches_dh_offsets():
+    chain = _six_axis()
+    x, y, z = chain.position([0.0] * 6)
+    a2, a3 = chain.links[1].a, chain.links[2].a
+    d1, d4, d5, d6 = chain.links[0].d, chain.links[3].d, chain.links[4].d, chain.links[5].d
+    assert (x, y, z) == pytest.approx((a2 + a3, -(d4 + d6), d1 - d5))
+
+
+def test_jacobian_matches_finite_differences():
+    chain = _six_axis(tool=(0.0, 0.0, 0.05))
+    q = [0.3, -1.2, 1.0, 0.2, 0.5, -0.4]
+    jacobian = chain.jacobian(q)
+    base = chain.position(q)
+    eps = 1e-7
+    for i in range(chain.dof):
+        shifted = list(q)
+        shifted[i] += eps
+        moved = chain.position(shifted)
+        for k in range(3):
+            assert (moved[k] - base[k]) / eps == pytest.approx(jacobian[k][i], abs=1e-5)
+
+
+def test_jacobian_and_tip_from_precomputed_frames():
+    chain = _six_axis(tool=(0.0, 0.0, 0.05))
+    q = [0.3, -1.2, 1.0, 0.2, 0.5, -0.4]
+    frames = chain.frames(q)
+    assert chain.tip(frames) == chain.transform(q)
+    assert chain.jacobian_from_frames(frames, rows=3) == chain.jacobian(q)[:3]
+
+
+def test_batch_matches_single_configurations():
+    chain = _three_axis(tool=(0.05, 0.0, 0.0))
+    batch = [[0.1 * i, 0.4 - 0.05 * i, -0.3 + 0.02 * i] for i in range(20)]
+    positions, quaternions = chain.forward_many(batch)
+    for q, position, quaternion in zip(batch, positions, quaternions):
+        pose = chain.forward(q)
+        assert tuple(position) == pytest.approx((pose.position.x, pose.position.y, pose.position.z))
+        o = pose.orientation
+        assert tuple(quaternion) == pytest.approx((o.x, o.y, o.z, o.w))
+
+
+def test_urdf_chain_matches_dh_chain():
+    dh = _six_axis(tool=(0.0, 0.0, 0.05))
+    urdf = KinematicChain.from_urdf(_urdf_of(dh), dh.joint_names, tool=(0.0, 0.0, 0.05))
+    assert urdf.joint_names == dh.joint_names and urdf.name == "dh"
+    batch = [[0.3, -1.2, 1.0, 0.2, 0.5, -0.4], [0.0] * 6, [-2.0, 0.7, -0.3, 1.4, -2.5, 3.0]]
+    for q in batch:
+        expected, actual = dh.transform(q), urdf.transform(q)
+        for row in range(3):
+            assert actual[row] == pytest.approx(expected[row], abs=1e-12)
+        assert urdf.jacobian(q) == [pytest.approx(row, abs=1e-12) for row in dh.jacobian(q)]
+    positions, quaternions = urdf.forward_many(batch)
+    expected_positions, expected_quaternions = dh.forward_many(batch)
+    for a, b in zip(list(positions) + list(quaternions), list(expected_positions) + list(expected_quaternions)):
+        assert tuple(a) == pytest.approx(tuple(b), abs=1e-12)
+
+
+def test_urdf_axes_and_fixed_joints():
+    urdf = """<robot name="arm">
+      <link name="world"/><link name="base"/><link name="upper"/><link name="lower"/><link name="flange"/>
+      <joint name="mount" type="fixed"><parent link="world"/><child link="base"/><origin xyz="0 0 0.1"/></joint>
+      <joint name="pitch" type="revolute"><parent link="base"/><child link="upper"/><axis xyz="0 -1 0"/></joint>
+      <joint name="elbow" type="continuous"><parent link="upper"/><child link="lower"/>
+        <origin xyz="0.3 0 0" rpy="0 0 1.5707963267948966"/><axis xyz="1 0 0"/></joint>
+      <joint name="tip" type="fixed"><parent link="lower"/><child link="flange"/><origin xyz="0.2 0 0"/></joint>
+    </robot>"""
+    chain = KinematicChain.from_urdf(urdf)
+    assert chain.joint_names == ("pitch", "elbow")
+    # pitch поднимает плечо вверх (ось -y); последнее звено лежит на оси elbow и не смещается им
+    assert chain.position([0.0, 0.0]) == pytest.approx((0.3, 0.2, 0.1))
+    assert chain.position([math.pi / 2, 0.7]) == pytest.approx((0.0, 0.2, 0.4))
+    q = [0.4, -0.9]
+    jacobian = chain.jacobian(q)
+    base = chain.position(q)
+    eps = 1e-7
+    for i in range(2):
+        shifted = list(q)
+        shifted[i] += eps
+        moved = chain.position(shifted)
+        for k in range(3):
+            assert (moved[k] - base[k]) / eps == pytest.approx(jacobian[k][i], abs=1e-5)
+    with pytest.raises(ValueError):
+        KinematicChain.from_urdf(urdf, ("pitch", "wrist"))
+
+
+def test_batch_quaternions_of_half_turns():
+    np = pytest.importorskip("numpy")
+    from sdk.motion.kinematics import _quaternions_np
+
+    def rz(angle):
+        c, s = math.cos(angle), math.sin(angle)
+        return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+    rx_pi = np.diag([1.0, -1.0, -1.0])
+    ry_pi = np.diag([-1.0, 1.0, -1.0])
+    rotations = [rz(-0.5) @ rx_pi, rz(0.5) @ rx_pi, rz(1.2) @ ry_pi, rz(math.pi), rz(-0.5), rx_pi @ rz(2.0)]
+    quaternions = _quaternions_np(np.stack(rotations))
+    for rotation, quaternion in zip(rotations, quaternions):
+        assert tuple(quaternion) == pytest.approx(rotation_to_quaternion(rotation))
+    # Rz(-0.5)·Rx(π): вектор поворота лежит в плоскости xy, y < 0
+    assert tuple(quaternions[0]) == pytest.approx((math.cos(0.25), -math.sin(0.25), 0.0, 0.0))
@@ -0,0 +1,192 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from sdk.commands.data import Point3D, Position
+from sdk.commands.manipulator_commands import JointLimit
+from sdk.manipulators.m13 import M13
+from sdk.utils.constants import COMMAND_RESULT_TOPIC, COMMAND_TOPIC
+from sdk.utils.metadata_cache import MetadataCache
+
+
+def test_get_or_fetch_uses_cache_until_invalidated():
+    calls = []
+    cache = MetadataCache()
+
+    def fetch():
+        calls.append(1)
+        return {"limits": len(calls)}
+
+    assert cache.get_or_fetch("joint_limits", fetch) == {"limits": 1}
+    assert cache.get_or_fetch("joint_limits", fetch) == {"limits": 1}
+    cache.invalidate("joint_limits")
+    assert cache.get_or_fetch("joint_limits", fetch) == {"limits": 2}
+    assert cache.get_or_fetch("joint_limits", fetch, refresh=True) == {"limits": 3}
+
+
+def test_entries_expire_by_ttl():
+    cache = MetadataCache(ttl_seconds=60, ttls={"tcp_current": 0.01})
+    cache.set("tcp_current", "tool")
+    cache.set("tcp_list", ["tool"])
+    time.sleep(0.02)
+    assert cache.get("tcp_current") is None
+    assert cache.get("tcp_list") == ["tool"]
+
+
+def test_errors_are_not_cached():
+    cache = MetadataCache()
+    error = TimeoutError("no answer")
+    assert cache.get_or_fetch("home_position", lambda: error) is error
+    assert "home_position" not in cache
+
+
+def test_warm_cache_is_loaded_per_identity(tmp_path):
+    path = str(tmp_path / "metadata.json")
+    MetadataCache(path=path, identity="M13@a").set("joint_limits", {"j1": [-1, 1]})
+    MetadataCache(path=path, identity="M13@b").set("joint_limits", {"j1": [-2, 2]})
+
+    assert MetadataCache(path=path, identity="M13@a").get("joint_limits") == {"j1": [-1, 1]}
+    assert MetadataCache(path=path, identity="M13@b").get("joint_limits") == {"j1": [-2, 2]}
+    assert MetadataCache(path=path, identity="MEdu@a").get("joint_limits") is None
+
+
+def test_errors_returned_as_strings_are_not_cached():
+    cache = MetadataCache()
+    assert cache.get_or_fetch("joint_limits", lambda: "Команда завершилась с ошибкой") == "Команда завершилась с ошибкой"
+    assert "joint_limits" not in cache
+
+
+def test_cached_values_are_copies():
+    cache = MetadataCache()
+    limits = {"j1": [-1, 1]}
+    cache.set("joint_limits", limits)
+    limits["j1"][0] = -5
+    cached = cache.get("joint_limits")
+    cached["j1"][1] = 5
+    assert cache.get("joint_limits") == {"j1": [-1, 1]}
+
+
+class _Client:
+    """Клиент MQTT без сети: отвечает на команды и публикует /manipulator_info при подписке."""
+
+    def __init__(self, robot, info):
+        self.robot = robot
+        self.info = info
+        self.commands = []
+        self.failures = set()
+
+    def publish(self, topic, payload):
+        if topic == COMMAND_TOPIC:
+            command = json.loads(payload)
+            self.commands.append(command["command"])
+            answer = {"id": command["id"], "result": True, "data": {"calls": len(self.commands)}}
+            if command["command"] in self.failures:
+                self.failures.discard(command["command"])
+                answer = {"id": command["id"], "error": "контроллер занят"}
+            self.robot.process_message(COMMAND_RESULT_TOPIC, json.dumps(answer))
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        if topic == "/manipulator_info":
+            threading.Timer(0.01, self.robot.process_message, (topic, json.dumps(self.info))).start()
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot(info=None):
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = M13("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client(robot, info or {})
+    return robot
+
+
+def test_commands_invalidate_cached_metadata():
+    robot = _robot()
+    robot.enable_metadata_cache()
+    limits = robot.get_joint_limits()
+    assert robot.get_joint_limits() == limits
+    tcp_list = robot.tcp_get_list()
+    assert robot.message_bus.mqtt_client.commands == ["get_joint_limits", "tcp_get_list"]
+
+    robot.set_joint_limits([JointLimit("joint_1", 1.0, 2.0)])
+    assert robot.get_joint_limits() != limits
+    assert robot.tcp_get_list() == tcp_list
+
+    robot.tcp_add("tool", Point3D(Position(0, 0, 0.1)), True)
+    assert robot.tcp_get_list() != tcp_list
+    assert robot.message_bus.mqtt_client.commands == [
+        "get_joint_limits", "tcp_get_list", "set_joint_limits", "get_joint_limits", "tcp_add", "tcp_get_list"]
+
+
+def test_failed_home_position_is_not_cached():
+    robot = _robot()
+    robot.enable_metadata_cache()
+    robot.message_bus.mqtt_client.failures.add("get_home_position")
+    assert robot.get_home_position(throw_error=False) == {}
+    assert robot.get_home_position(throw_error=False) == {"calls": 2}
+    assert robot.get_home_position() == {"calls": 2}
+    assert robot.message_bus.mqtt_client.commands == ["get_home_position"] * 2
+
+
+def test_warm_cache_identity_is_controller_serial(tmp_path):
+    path = str(tmp_path / "metadata.json")
+    robot = _robot({"serial_number": "SN-1", "model": "M13"})
+    cache = robot.enable_metadata_cache(path=path)
+    assert cache.identity == "M13:SN-1"
+    assert robot.info.get_manipulator_info() == {"serial_number": "SN-1", "model": "M13"}
+    robot.get_joint_limits()
+
+    # Другой контроллер по тому же адресу не получает чужой кэш
+    other = _robot({"serial_number": "SN-2"})
+    assert other.enable_metadata_cache(path=path).get("joint_limits") is None
+    assert _robot({"serial_number": "SN-1"}).enable_metadata_cache(path=path).get("joint_limits") is not None
+
+    with pytest.raises(ValueError):
+        _robot({"model": "M13"}).enable_metadata_cache(path=path)
+    assert _robot().enable_metadata_cache(path=path, identity="cell-3").identity == "cell-3"
@@ -0,0 +1,89 @@
+import sys
+import types
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Stub pydantic (минимум) – нужен пакету sdk.commands, который импортирует sdk.motion
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+    pydantic_stub.BaseModel = type("BaseModel", (), {})
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+from sdk.errors import LimitError, SdkError
+from sdk.motion.limits import JointLimits, MotionValidator, WorkspaceLimits
+
+
+def _limits():
+    reply = {"id": 1, "result": True, "data": {
+        "shoulder_pan_joint": {"min_position": -3.0, "max_position": 3.0, "velocity": 2.0, "acceleration": 4.0},
+        "elbow_joint": {"min_position": -2.5, "max_position": 2.5},
+    }}
+    return JointLimits.from_controller(reply)
+
+
+def test_joint_limits_parse_controller_reply():
+    limits = _limits()
+    assert limits.names == ("shoulder_pan_joint", "elbow_joint")
+    assert limits.lower == (-3.0, -2.5)
+    assert limits.upper == (3.0, 2.5)
+    assert limits.velocity == (2.0, float("inf"))
+    assert limits.acceleration[0] == 4.0
+
+
+def test_joint_limits_without_position_limits_are_rejected():
+    # Другое написание полей не превращается молча в бесконечные пределы
+    with pytest.raises(ValueError):
+        JointLimits.from_controller({"shoulder_pan_joint": {"lower": -3.0, "upper": 3.0}})
+    with pytest.raises(ValueError):
+        JointLimits.from_controller([{"name": "shoulder_pan_joint", "min_position": -3.0}])
+    with pytest.raises(ValueError):
+        JointLimits.from_controller({"shoulder_pan_joint": {"min_position": "-3"}})
+
+
+def test_joint_check_reports_every_violation():
+    limits = _limits()
+    limits.check({"shoulder_pan_joint": 2.9, "elbow_joint": -2.5, "wrist_1_joint": 10.0})
+    rows = [[0.0, 0.0], [3.5, 0.0], [0.0, float("nan")]]
+    with pytest.raises(LimitError) as error:
+        limits.check_path(("shoulder_pan_joint", "elbow_joint"), rows)
+    assert isinstance(error.value, SdkError)
+    assert [(i, name) for i, name, _, _ in error.value.violations] == [(1, "shoulder_pan_joint"), (2, "elbow_joint")]
+
+
+def test_workspace_limits_from_message():
+    workspace = WorkspaceLimits.from_message({"x": {"min": -1, "max": 1}, "y": {"min": -2, "max": 2},
+                                              "z": {"min": 0, "max": 1}})
+    assert workspace.lower == (-1.0, -2.0, 0.0)
+    assert workspace.upper == (1.0, 2.0, 1.0)
+    workspace.check_point(0.5, 1.5, 0.5)
+    with pytest.raises(LimitError):
+        workspace.check_point(0.5, 1.5, -0.1)
+
+    partial = WorkspaceLimits.from_message({"z": {"min": 0}})
+    assert partial.lower == (-float("inf"), -float("inf"), 0.0)
+    for unknown in ({"x_min": -1, "x_max": 1}, {"x": [-1, 1]}, {}):
+        with pytest.raises(ValueError):
+            WorkspaceLimits.from_message(unknown)
+
+
+def test_validator_checks_move_group_points_with_global_indices():
+    def joints(**values):
+        return SimpleNamespace(positions=[SimpleNamespace(joint=k, position=v) for k, v in values.items()])
+
+    validator = MotionValidator(_limits(), WorkspaceLimits((-1, -1, 0), (1, 1, 1)))
+    positions = [joints(shoulder_pan_joint=0.0), joints(elbow_joint=0.0, shoulder_pan_joint=0.0),
+                 joints(shoulder_pan_joint=4.0)]
+    with pytest.raises(LimitError) as error:
+        validator.check_group(positions=positions)
+    assert error.value.violations[0][0] == 2
+
+    point = SimpleNamespace(position=SimpleNamespace(x=0.0, y=2.0, z=0.5))
+    with pytest.raises(LimitError):
+        validator.check_group(points=[point])
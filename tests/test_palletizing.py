@@ -0,0 +1,83 @@
+import sys
+import types
+import math
+import pathlib
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Stub pydantic (минимум) – нужен пакету sdk.commands, который импортирует sdk.motion
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+    pydantic_stub.BaseModel = type("BaseModel", (), {})
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+from sdk.motion import palletizing
+from sdk.motion.palletizing import APPROACH, PLACE, RETRACT, PalletPlanner, PalletRecipe, build_plan
+
+
+def test_snake_pattern_with_approach_and_retract():
+    recipe = PalletRecipe(origin=(0.4, 0.0, 0.1), rows=2, columns=3, layers=2, pitch=(0.1, 0.2),
+                          layer_height=0.05, pattern="snake", approach=0.03, retract=0.04)
+    plan = build_plan(recipe)
+    assert len(plan) == 2 * 3 * 2 * 3
+    assert list(plan.kinds[:3]) == [APPROACH, PLACE, RETRACT]
+    places = [plan.row(i)[:3] for i in range(len(plan)) if plan.kinds[i] == PLACE]
+    assert places[2] == pytest.approx((0.6, 0.0, 0.1))
+    assert places[3] == pytest.approx((0.6, 0.2, 0.1))  # второй ряд – в обратном порядке
+    assert places[6] == pytest.approx((0.4, 0.0, 0.15))
+    assert plan.row(0)[2] == pytest.approx(0.13) and plan.row(2)[2] == pytest.approx(0.14)
+    assert plan.slots[plan.index_of_slot(7)] == 7
+
+
+def test_yaw_and_interlock_rotate_positions_and_orientation():
+    recipe = PalletRecipe(origin=(0.0, 0.0, 0.0), rows=1, columns=2, layers=2, pitch=(0.1, 0.1),
+                          yaw=math.pi / 2, interlock=True)
+    plan = build_plan(recipe)
+    assert plan.row(3)[:2] == pytest.approx((0.0, 0.1))
+    half = math.sqrt(0.5)
+    assert plan.row(1)[3:] == pytest.approx((0.0, 0.0, half, half))
+    assert plan.row(7)[3:] == pytest.approx((0.0, 0.0, 1.0, 0.0), abs=1e-12)
+
+
+def test_planner_caches_plan_and_progress_per_recipe(monkeypatch):
+    planner = PalletPlanner(max_plans=1)
+    first = PalletRecipe(origin=(0.3, 0.0, 0.0), rows=2, columns=2)
+    plan = planner.plan(first)
+    plan.reset(5)
+    assert planner.plan(first) is plan and planner.plan(first).next_index == 5
+    assert [index for index, *_ in plan][:2] == [5, 6]
+
+    planner.plan(first._replace(rows=3))
+    assert first not in planner and len(planner) == 1
+
+    monkeypatch.setattr(palletizing, "np", None)
+    fallback = build_plan(first)
+    assert [fallback.row(i) for i in range(len(fallback))] == [pytest.approx(plan.row(i)) for i in range(len(plan))]
+    with pytest.raises(ValueError):
+        build_plan(first._replace(pattern="spiral"))
+
+
+def test_recipe_accepts_lists_and_stays_hashable():
+    recipe = PalletRecipe(origin=[0.3, 0.0, 0.0], rows=2, columns=2, pitch=[0.1, 0.2], orientation=[0, 0, 0, 1])
+    assert recipe == PalletRecipe(origin=(0.3, 0.0, 0.0), rows=2, columns=2, pitch=(0.1, 0.2))
+    assert hash(recipe) == hash(PalletRecipe((0.3, 0.0, 0.0), 2, 2, pitch=(0.1, 0.2)))
+    moved = recipe._replace(origin=[0.4, 0.0, 0.0])
+    assert moved.origin == (0.4, 0.0, 0.0) and isinstance(moved, PalletRecipe)
+    planner = PalletPlanner()
+    assert planner.plan(recipe) is planner.plan(PalletRecipe(origin=[0.3, 0, 0], rows=2, columns=2, pitch=[0.1, 0.2]))
+    with pytest.raises(ValueError):
+        PalletRecipe(origin=[0.3, 0.0], rows=2, columns=2)
+
+
+def test_finished_plan_restarts_when_recipe_is_planned_again():
+    planner = PalletPlanner()
+    recipe = PalletRecipe(origin=(0.3, 0.0, 0.0), rows=1, columns=2)
+    plan = planner.plan(recipe)
+    plan.reset(len(plan))
+    assert plan.done
+    assert planner.plan(recipe) is plan and plan.next_index == 0
@@ -0,0 +1,110 @@
+import sys
+import types
+import math
+import pathlib
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Stub pydantic (минимум) – нужен пакету sdk.commands, который импортирует sdk.motion
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+    pydantic_stub.BaseModel = type("BaseModel", (), {})
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+from sdk.commands.data import Orientation, Point3D, Position
+from sdk.motion import paths
+from sdk.motion.paths import ArcSegment, Path, TrapezoidProfile
+
+
+def _close(a, b, tolerance=1e-9):
+    return all(abs(x - y) <= tolerance for x, y in zip(a, b))
+
+
+def test_trapezoid_and_triangle_profiles():
+    profile = TrapezoidProfile(1.0, 0.5, 1.0)
+    assert profile.velocity == 0.5
+    assert profile.duration == pytest.approx(2.5)
+    assert profile.at(profile.duration) == (1.0, 0.0)
+    triangle = TrapezoidProfile(0.01, 0.5, 1.0)
+    assert triangle.velocity == pytest.approx(0.1)
+    assert triangle.at(triangle.duration / 2)[0] == pytest.approx(0.005)
+
+
+def test_arc_through_three_points_follows_via_direction():
+    half = ArcSegment.through((1, 0, 0), (0, 1, 0), (-1, 0, 0))
+    assert _close(half.center, (0, 0, 0))
+    assert _close(half.point(half.length / 2), (0, 1, 0))
+    major = ArcSegment.through((1, 0, 0), (0, -1, 0), (0, 1, 0))
+    assert major.angle == pytest.approx(1.5 * math.pi)
+    with pytest.raises(ValueError):
+        ArcSegment((1, 0, 0), (-1, 0, 0), (0, 0, 0))
+
+
+def _add(a, b):
+    return tuple(x + y for x, y in zip(a, b))
+
+
+def _scale2(a):
+    return tuple(2 * x for x in a)
+
+
+def test_blended_polyline_is_continuous_and_respects_limits():
+    path = Path.polyline([(0, 0, 0), (0.2, 0, 0), (0.2, 0.2, 0), (0.4, 0.2, 0.1)], blend_radius=0.03)
+    kinds = [type(segment).__name__ for segment in path.segments]
+    assert kinds == ["LineSegment", "ArcSegment", "LineSegment", "ArcSegment", "LineSegment"]
+    for previous, following in zip(path.segments, path.segments[1:]):
+        assert _close(previous.point(previous.length), following.start)
+
+    rate = 500.0
+    samples = path.sample(max_velocity=0.2, max_acceleration=0.5, rate_hz=rate)
+    points = [p for _, p, _ in samples]
+    assert _close(points[0], (0, 0, 0)) and _close(points[-1], (0.4, 0.2, 0.1))
+    speeds = [math.dist(a, b) * rate for a, b in zip(points, points[1:])]
+    assert max(speeds) <= 0.2 + 1e-6
+    assert max(abs(b - a) * rate for a, b in zip(speeds, speeds[1:])) <= 0.5 * 1.05
+
+
+def test_orientation_slerp_and_pure_python_fallback(monkeypatch):
+    start = Point3D(position=Position(x=0, y=0, z=0), orientation=Orientation(x=0, y=0, z=0, w=1))
+    end = Point3D(position=Position(x=1, y=0, z=0), orientation=Orientation(x=0, y=0, z=1, w=0))
+    path = Path.line(start, end)
+    middle = path.orientation(0.5)
+    assert _close(middle, (0, 0, math.sqrt(0.5), math.sqrt(0.5)))
+
+    vectorized = list(path.sample(0.5, 1.0, 50))
+    monkeypatch.setattr(paths, "np", None)
+    fallback = list(path.sample(0.5, 1.0, 50))
+    assert len(vectorized) == len(fallback)
+    for (t1, p1, q1), (t2, p2, q2) in zip(vectorized, fallback):
+        assert t1 == pytest.approx(t2)
+        assert _close(p1, p2) and _close(q1, q2)
+
+
+def test_arc_total_acceleration_is_bounded():
+    path = Path.arc((0.1, 0, 0), (0, 0.1, 0), (0, 0, 0))
+    rate = 2000.0
+    samples = path.sample(max_velocity=1.0, max_acceleration=0.5, rate_hz=rate)
+    points = [p for _, p, _ in samples]
+    # Вторая разность выборки – полное ускорение (касательное + центростремительное)
+    accelerations = [math.dist(_add(a, c), _scale2(b)) * rate * rate for a, b, c in zip(points, points[1:], points[2:])]
+    assert max(accelerations) <= 0.5 * 1.02
+
+
+def test_angular_velocity_limit_lengthens_profile():
+    start = Point3D(position=Position(x=0, y=0, z=0), orientation=Orientation(x=0, y=0, z=0, w=1))
+    end = Point3D(position=Position(x=0.1, y=0, z=0), orientation=Orientation(x=0, y=0, z=1, w=0))
+    path = Path.line(start, end)
+    free = path.profile(0.5, 1.0)
+    limited = path.profile(0.5, 1.0, max_angular_velocity=1.0)
+    assert limited.duration > free.duration
+    # Поворот на π за 0.1 м: не быстрее 1 рад/с -> скорость вдоль пути не выше 0.1 / π м/с
+    assert limited.velocity == pytest.approx(0.1 / math.pi)
+    samples = path.sample(0.5, 1.0, 100, max_angular_velocity=1.0)
+    quaternions = [q for _, _, q in samples]
+    steps = [2 * math.acos(min(1.0, abs(sum(a * b for a, b in zip(p, q))))) * 100 for p, q in zip(quaternions, quaternions[1:])]
+    assert max(steps) <= 1.0 + 1e-6
@@ -0,0 +1,135 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+
+import pytest
+
+from sdk.manipulators.m13 import M13
+from sdk.utils.constants import COMMAND_RESULT_TOPIC, COMMAND_TOPIC
+
+
+class _Client:
+    """Клиент MQTT без сети: отвечает на каждую команду камеры через process_message робота."""
+
+    def __init__(self, robot, reply):
+        self.robot = robot
+        self.reply = reply
+        self.commands = []
+
+    def publish(self, topic, payload):
+        if topic == COMMAND_TOPIC:
+            command = json.loads(payload)
+            self.commands.append(command["data"])
+            answer = {"id": command["id"], "result": True, **self.reply(command["data"])}
+            self.robot.process_message(COMMAND_RESULT_TOPIC, json.dumps(answer))
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot(reply):
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = M13("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client(robot, reply)
+    return robot
+
+
+def test_static_properties_are_cached_until_invalidated():
+    versions = iter(range(1, 10))
+    robot = _robot(lambda data: {"data": {"version": next(versions)}})
+    pixy = robot.pixy_cam_uart_control
+
+    assert pixy.get_version()["data"] == {"version": 1}
+    assert pixy.get_version()["data"] == {"version": 1}
+    assert pixy.get_version(use_cache=False)["data"] == {"version": 2}
+    assert pixy.get_version()["data"] == {"version": 2}
+    pixy.get_resolution_uart(type=0)
+    pixy.get_resolution_uart(type=1)
+    pixy.get_resolution_uart(type=0)
+    assert [data["cmd"] for data in robot.message_bus.mqtt_client.commands] == \
+        ["getVersion", "getVersion", "getResolution", "getResolution"]
+
+    pixy.invalidate_cache()
+    assert pixy.get_version()["data"] == {"version": 5}
+    assert robot.active_commands == {}
+
+
+def test_errors_are_not_cached():
+    replies = iter([{"error": "нет камеры"}, {"data": {"width": 316}}])
+    robot = _robot(lambda data: next(replies))
+    pixy = robot.pixy_cam_usb_control
+
+    assert isinstance(pixy.get_frame_size_usb(throw_error=False), str)
+    assert pixy.get_frame_size_usb()["data"] == {"width": 316}
+    assert pixy.get_frame_size_usb()["data"] == {"width": 316}
+    assert len(robot.message_bus.mqtt_client.commands) == 2
+
+
+def _color_of(data):
+    if data["x"] < 0:
+        return {"error": "точка вне кадра"}
+    return {"data": {"r": data["x"], "g": data["y"], "b": data["saturate"]}}
+
+
+def test_get_rgb_batch_keeps_order_across_windows():
+    robot = _robot(_color_of)
+    points = [(x, 2 * x) for x in range(7)]
+    results = robot.pixy_cam_uart_control.get_rgb_batch(points, saturate=True, max_in_flight=3)
+    assert [result["data"] for result in results] == [{"r": x, "g": 2 * x, "b": 1} for x in range(7)]
+    assert len(robot.message_bus.mqtt_client.commands) == 7
+    assert robot.active_commands == {}
+
+
+def test_get_rgb_batch_errors():
+    robot = _robot(_color_of)
+    pixy = robot.pixy_cam_uart_control
+    results = pixy.get_rgb_batch([(1, 1), (-1, 1), (2, 2)], throw_error=False)
+    assert results[0]["data"]["r"] == 1 and results[2]["data"]["r"] == 2
+    assert isinstance(results[1], str) and "точка вне кадра" in results[1]
+    with pytest.raises(Exception, match="точка вне кадра"):
+        pixy.get_rgb_batch([(1, 1), (-1, 1)])
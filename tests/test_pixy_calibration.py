@@ -0,0 +1,69 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и классов манипуляторов (нужны при импорте пакетов sdk.commands
+# и sdk.manipulators, калибровке они не нужны)
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+_map_cls = {
+    "sdk.manipulators.manipulator": "Manipulator",
+    "sdk.manipulators.base": "BaseManipulator",
+    "sdk.manipulators.medu": "MEdu",
+    "sdk.manipulators.m13": "M13",
+}
+for _name, _cls in _map_cls.items():
+    if _name not in sys.modules:
+        mod = types.ModuleType(_name)
+        setattr(mod, _cls, type(_cls, (), {"__init__": lambda self, *a, **k: None}))
+        sys.modules[_name] = mod
+
+if "sdk.manipulators.attachments" not in sys.modules:
+    att_stub = types.ModuleType("sdk.manipulators.attachments")
+    for cls in ["Attachment", "LaserAttachment", "GripperAttachment", "VacuumAttachment"]:
+        setattr(att_stub, cls, object)
+    sys.modules["sdk.manipulators.attachments"] = att_stub
+
+from sdk.manipulators.extern_devices.pixy_cam.block_tracker import Block
+from sdk.manipulators.extern_devices.pixy_cam.calibration import PixyCalibration
+
+
+def test_calibration_fits_affine_and_homography(tmp_path):
+    def true_affine(u, v):
+        return 0.3 + 0.001 * u - 0.0002 * v, -0.1 + 0.0003 * u + 0.0012 * v
+
+    def true_homography(u, v):
+        w = 1 + 0.0005 * u + 0.0002 * v
+        return (0.2 + 0.001 * u) / w, (0.1 + 0.001 * v) / w
+
+    pixels = [(10, 20), (300, 15), (150, 180), (290, 190), (40, 170)]
+    for model, func in (("affine", true_affine), ("homography", true_homography)):
+        calibration = PixyCalibration(model)
+        for u, v in pixels:
+            x, y = func(u, v)
+            calibration.add_sample((u, v), {"position": {"x": x, "y": y, "z": 0.1}})
+        assert calibration.fit() < 1e-9
+        x, y = calibration.transform(120, 60)
+        ex, ey = func(120, 60)
+        assert abs(x - ex) < 1e-9 and abs(y - ey) < 1e-9
+
+    path = tmp_path / "calibration.json"
+    calibration.save(str(path))
+    loaded = PixyCalibration.load(str(path))
+    targets = loaded.transform_blocks([Block(1, 120.0, 60.0)])
+    assert abs(targets[0][1] - true_homography(120, 60)[0]) < 1e-9
@@ -0,0 +1,198 @@
+import sys
+import types
+import json
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+
+import pytest
+
+from sdk.commands import RunCompiledProgramCommand
+from sdk.errors import CommandTimeout
+from sdk.manipulators.medu import MEdu
+from sdk.utils.constants import COMMAND_RESULT_TOPIC, COMMAND_TOPIC
+from sdk.utils.program_registry import ProgramRegistry
+
+
+def test_compile_once_per_content():
+    registry = ProgramRegistry()
+    assert registry.by_name
+    program = {"steps": [{"move": 1}, {"wait": 0.5}]}
+    compiled = registry.compile("pick", program)
+    assert compiled.stored_name.startswith("pick-") and len(compiled.stored_name) == len("pick-") + 12
+    assert registry.compile("pick", program) is compiled
+
+    same_content = {"steps": [{"move": 1}, {"wait": 0.5}]}
+    assert registry.compile("pick", same_content) is compiled
+    changed = registry.compile("pick", {"steps": []})
+    assert changed is not compiled and changed.stored_name != compiled.stored_name
+    assert len(registry) == 2
+
+
+def test_in_place_change_gives_new_payload():
+    registry = ProgramRegistry()
+    program = {"steps": [{"move": 1}]}
+    first = registry.compile("pick", program)
+    program["steps"].append({"move": 2})
+    second = registry.compile("pick", program)
+    assert second is not first
+    assert json.loads(second.payload)["json"] == {"steps": [{"move": 1}, {"move": 2}]}
+    registry.mark_uploaded(first)
+    assert registry.stored_names("pick") == [first.stored_name]
+    assert registry.stored_names(uploaded_only=False) == [first.stored_name, second.stored_name]
+
+
+def test_lru_eviction_and_upload_flags():
+    registry = ProgramRegistry(max_programs=2)
+    first = registry.compile("a", {"n": 1})
+    registry.compile("b", {"n": 2})
+    registry.mark_uploaded(first)
+    registry.compile("a", {"n": 1})
+    registry.compile("c", {"n": 3})
+    assert "a" in registry and "b" not in registry
+    registry.reset_uploads()
+    assert not first.uploaded
+    registry.forget("a")
+    assert "a" not in registry
+
+
+def test_compiled_command_sends_preserialized_payload():
+    program = {"steps": [{"move": "домой"}]}
+    compiled = ProgramRegistry().compile("home", program)
+    sent = []
+    command = RunCompiledProgramCommand(compiled, lambda topic, message: sent.append((topic, message)))
+    command.make_command_action()
+    topic, message = sent[0]
+    assert topic == "/command" and isinstance(message, str)
+    decoded = json.loads(message)
+    assert decoded["id"] == command.command_id
+    assert decoded["command"] == "play_program_json"
+    assert decoded["data"] == {"name": compiled.stored_name, "json": program}
+
+
+def test_register_compiles_once_per_version(monkeypatch):
+    registry = ProgramRegistry()
+    compiles = []
+    compile_content = registry.compile
+    monkeypatch.setattr(registry, "compile", lambda name, program: compiles.append(name) or compile_content(name, program))
+    program = {"steps": [{"move": 1}]}
+    handle = registry.register("pick", program)
+    program["steps"].append({"move": 2})
+    # Без новой версии изменения на месте не учитываются – программа не сериализуется повторно
+    assert registry.register("pick", program) is handle and registry.get("pick") is handle
+    assert compiles == ["pick"]
+    updated = registry.register("pick", program, version=2)
+    assert updated is not handle and json.loads(updated.payload)["json"] == program
+    assert registry.register("pick", program, version=2) is updated
+    registry.forget("pick")
+    assert registry.get("pick") is None
+    registry.register("pick", program, version=2)
+    assert compiles == ["pick"] * 3
+
+
+class _Client:
+    """Клиент MQTT без сети: отвечает на команды; failures – отказ, silent – ответа нет."""
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.commands = []
+        self.failures = set()
+        self.silent = set()
+
+    def publish(self, topic, payload):
+        if topic == COMMAND_TOPIC:
+            command = json.loads(payload)
+            self.commands.append(command["command"])
+            if command["command"] in self.silent:
+                self.silent.discard(command["command"])
+                return types.SimpleNamespace(rc=0)
+            answer = {"id": command["id"], "result": True}
+            if command["command"] in self.failures:
+                self.failures.discard(command["command"])
+                answer = {"id": command["id"], "error": "программа не найдена"}
+            self.robot.process_message(COMMAND_RESULT_TOPIC, json.dumps(answer))
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
+
+
+def _robot():
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = MEdu("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client(robot)
+    return robot
+
+
+def test_robot_uploads_once_then_runs_by_name():
+    robot = _robot()
+    client = robot.message_bus.mqtt_client
+    pick = robot.program_registry.register("pick", {"Root": []})
+    robot.run_program_cached(pick)
+    robot.run_program_cached("pick")
+    robot.run_program_cached("pick", {"Root": []})
+    assert client.commands == ["play_program_json", "play_program_name", "play_program_name"]
+    with pytest.raises(ValueError):
+        robot.run_program_cached("place")
+
+
+def test_rejection_or_timeout_of_run_by_name_uploads_again():
+    robot = _robot()
+    client = robot.message_bus.mqtt_client
+    pick = robot.program_registry.register("pick", {"Root": []})
+    robot.run_program_cached(pick)
+    # Контроллер забыл программу: отказ без исключения тоже сбрасывает признак загрузки
+    client.failures.add("play_program_name")
+    robot.run_program_cached(pick, throw_error=False)
+    assert not pick.uploaded
+    robot.run_program_cached(pick)
+    assert pick.uploaded
+    client.silent.add("play_program_name")
+    with pytest.raises(CommandTimeout):
+        robot.run_program_cached(pick, timeout_seconds=0.2)
+    assert not pick.uploaded
+    robot.run_program_cached(pick)
+    assert client.commands == ["play_program_json", "play_program_name", "play_program_json",
+                               "play_program_name", "play_program_json"]
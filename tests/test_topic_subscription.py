@@ -0,0 +1,86 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub классов манипуляторов: пакет sdk.manipulators импортирует их при загрузке,
+# а им нужен paho-mqtt. Подписке достаточно фиктивного источника сообщений.
+# -----------------------------------------------------------------------------
+_map_cls = {
+    "sdk.manipulators.manipulator": "Manipulator",
+    "sdk.manipulators.base": "BaseManipulator",
+    "sdk.manipulators.medu": "MEdu",
+    "sdk.manipulators.m13": "M13",
+}
+for _name, _cls in _map_cls.items():
+    if _name not in sys.modules:
+        mod = types.ModuleType(_name)
+        setattr(mod, _cls, type(_cls, (), {"__init__": lambda self, *a, **k: None}))
+        sys.modules[_name] = mod
+
+if "sdk.manipulators.attachments" not in sys.modules:
+    att_stub = types.ModuleType("sdk.manipulators.attachments")
+    for cls in ["Attachment", "LaserAttachment", "GripperAttachment", "VacuumAttachment"]:
+        setattr(att_stub, cls, object)
+    sys.modules["sdk.manipulators.attachments"] = att_stub
+
+import asyncio
+import json
+import threading
+
+from sdk.manipulators.topic_subscription import TopicSubscription
+from sdk.utils.topic_trie import TopicTrie
+
+
+class _Source:
+    """Источник сообщений с общими подписками, как у Manipulator"""
+
+    def __init__(self):
+        self.listeners = TopicTrie()
+
+    def add_payload_listener(self, topic, listener):
+        self.listeners.add(topic, listener)
+
+    def remove_payload_listener(self, topic, listener):
+        self.listeners.remove(topic, listener)
+
+    def emit(self, topic, data):
+        for listener in self.listeners.match(topic):
+            listener(topic, json.dumps(data))
+
+
+def test_messages_from_other_thread_are_iterated_in_order():
+    source = _Source()
+
+    async def main():
+        received = []
+        async with TopicSubscription(source, "/pixy/+/blocks") as subscription:
+            thread = threading.Thread(target=lambda: [source.emit("/pixy/uart/blocks", {"i": i}) for i in range(5)])
+            thread.start()
+            async for message in subscription:
+                received.append((message.topic, message.data["i"]))
+                if len(received) == 5:
+                    break
+            thread.join()
+        return received
+
+    assert asyncio.run(main()) == [("/pixy/uart/blocks", i) for i in range(5)]
+    assert len(source.listeners) == 0
+
+
+def test_conflate_keeps_latest_and_close_stops_iteration():
+    source = _Source()
+
+    async def main():
+        subscription = TopicSubscription(source, "/joint_states", conflate=True)
+        for i in range(10):
+            source.emit("/joint_states", {"i": i})
+        latest = await subscription.get(timeout=1.0)
+        subscription.close()
+        rest = [message async for message in subscription]
+        return latest.data["i"], subscription.dropped, rest
+
+    assert asyncio.run(main()) == (9, 9, [])
@@ -0,0 +1,81 @@
+import sys
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import pytest
+
+from sdk.utils.message_bus import MessageBus
+from sdk.utils.topic_trie import TopicTrie
+
+
+class RecordingBus(MessageBus):
+    """Шина без транспорта: запоминает подписки"""
+
+    def __init__(self):
+        super().__init__()
+        self.subscribed = []
+
+    def connect(self, **kwargs):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def publish(self, topic, message):
+        pass
+
+    def subscribe(self, topic):
+        self.subscribed.append(topic)
+
+    def unsubscribe(self, topic):
+        self.subscribed.remove(topic)
+
+
+def test_wildcards_match_mqtt_semantics():
+    trie = TopicTrie()
+    for pattern in ["/coordinates", "/pixy/+/blocks", "/pixy/#", "#", "+/coordinates"]:
+        trie.add(pattern, pattern)
+
+    assert set(trie.match("/coordinates")) == {"/coordinates", "#", "+/coordinates"}
+    assert set(trie.match("/pixy/uart/blocks")) == {"/pixy/+/blocks", "/pixy/#", "#"}
+    assert set(trie.match("/pixy")) == {"/pixy/#", "#"}
+    assert trie.match("$SYS/load") == ()
+    with pytest.raises(ValueError):
+        trie.add("/a/#/b", None)
+    with pytest.raises(ValueError):
+        trie.add("/a/b+", None)
+
+
+def test_remove_prunes_and_invalidates_cache():
+    trie = TopicTrie()
+    trie.add("/a/+", 1)
+    trie.add("/a/+", 2)
+    assert trie.match("/a/b") == (1, 2)
+    assert trie.remove("/a/+", 1)
+    assert trie.match("/a/b") == (2,)
+    assert trie.remove("/a/+", 2)
+    assert not trie.remove("/a/+", 2)
+    assert trie.match("/a/b") == () and len(trie) == 0 and list(trie.patterns()) == []
+
+
+def test_message_bus_dispatches_wildcard_and_exact_handlers():
+    bus = RecordingBus()
+    received = []
+    exact = lambda msg: received.append(("exact", msg))
+    wildcard = lambda topic, msg: received.append((topic, msg))
+    bus.on_message("/coordinates", exact)
+    bus.on_message("/coordinates", exact)
+    bus.on_message("#", wildcard)
+    assert bus.subscribed == ["/coordinates", "#"]
+
+    bus._process_message("/coordinates", "p")
+    assert received == [("/coordinates", "p"), ("exact", "p"), ("exact", "p")]
+
+    bus.off_message("/coordinates", exact)
+    assert bus.subscribed == ["/coordinates", "#"]
+    bus.off_message("/coordinates", exact)
+    bus.off_message("#", wildcard)
+    assert bus.subscribed == []
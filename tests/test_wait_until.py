@@ -0,0 +1,133 @@
+import sys, types
+import pathlib
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# -----------------------------------------------------------------------------
+# Stub pydantic и paho-mqtt: нужен настоящий манипулятор, сеть – нет
+# -----------------------------------------------------------------------------
+if "pydantic" not in sys.modules:
+    pydantic_stub = types.ModuleType("pydantic")
+
+    class _BaseModel:  # минимальная заглушка
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    pydantic_stub.BaseModel = _BaseModel
+    pydantic_stub.Field = lambda *args, **kwargs: None
+    sys.modules["pydantic"] = pydantic_stub
+
+if "paho" not in sys.modules:
+    paho_stub = types.ModuleType("paho")
+    mqtt_stub = types.ModuleType("paho.mqtt")
+    client_stub = types.ModuleType("paho.mqtt.client")
+    client_stub.Client = type("Client", (), {"__init__": lambda self, *a, **k: None})
+    mqtt_stub.client = client_stub
+    paho_stub.mqtt = mqtt_stub
+    sys.modules.update({"paho": paho_stub, "paho.mqtt": mqtt_stub, "paho.mqtt.client": client_stub})
+
+for _attr, _value in (("MQTTv311", 4), ("MQTT_ERR_SUCCESS", 0), ("MQTTMessage", object)):
+    if not hasattr(sys.modules["paho.mqtt.client"], _attr):
+        setattr(sys.modules["paho.mqtt.client"], _attr, _value)
+
+# Другие тесты подменяют модули манипуляторов заглушками – здесь нужны настоящие
+for _name in ("sdk.manipulators.manipulator", "sdk.manipulators.base", "sdk.manipulators.medu",
+              "sdk.manipulators.m13", "sdk.manipulators.attachments"):
+    if _name in sys.modules and not hasattr(sys.modules[_name], "__file__"):
+        del sys.modules[_name]
+
+import asyncio
+import json
+
+import threading
+import time
+
+import pytest
+
+from sdk.errors import CommandTimeout
+from sdk.manipulators.medu import MEdu
+
+
+class _Client:
+    """Клиент MQTT без сети: запоминает подписки."""
+
+    def __init__(self):
+        self.subscribed = set()
+
+    def publish(self, topic, payload):
+        return types.SimpleNamespace(rc=0)
+
+    def subscribe(self, topic):
+        self.subscribed.add(topic)
+
+    def unsubscribe(self, topic):
+        self.subscribed.discard(topic)
+
+
+def _robot():
+    # ManipulatorConnection берёт текущий цикл событий, а asyncio.run() в других тестах его сбрасывает
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    robot = MEdu("localhost", "test", "user", "password")
+    robot.message_bus.mqtt_client = _Client()
+    return robot
+
+
+def _emit_later(robot, topic, messages, delay=0.02):
+    def run():
+        for message in messages:
+            time.sleep(delay)
+            robot.process_message(topic, json.dumps(message))
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_wait_until_returns_first_matching_message_and_unsubscribes():
+    robot = _robot()
+    thread = _emit_later(robot, "/coordinates", [{"position": {"z": z}} for z in (0.3, 0.25, 0.2, 0.15)])
+    message = robot.wait_until(lambda msg: msg["position"]["z"] <= 0.2, timeout_seconds=5)
+    thread.join()
+    assert message == {"position": {"z": 0.2}}
+    assert "/coordinates" not in robot.message_bus.mqtt_client.subscribed
+    assert robot._telemetry_waiters == {}
+
+
+def test_waiters_share_subscription_and_see_last_value():
+    robot = _robot()
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault(
+        "first", robot.wait_until(lambda msg: msg["i"] == 2, "/joint_states", timeout_seconds=5)))
+    first.start()
+    while "/joint_states" not in robot._telemetry_waiters:
+        time.sleep(0.001)
+    robot.process_message("/joint_states", json.dumps({"i": 1}))
+    # Второе ожидание выполняется по уже полученному сообщению, без новой телеметрии
+    assert robot.wait_until(lambda msg: msg["i"] == 1, "/joint_states", timeout_seconds=5) == {"i": 1}
+    robot.process_message("/joint_states", json.dumps({"i": 2}))
+    first.join()
+    assert results["first"] == {"i": 2}
+    assert robot._telemetry_waiters == {}
+
+
+def test_wait_until_timeout_and_predicate_error():
+    robot = _robot()
+    with pytest.raises(CommandTimeout):
+        robot.wait_until(lambda msg: False, timeout_seconds=0.05)
+    assert isinstance(robot.wait_until(lambda msg: False, timeout_seconds=0.05, throw_error=False), CommandTimeout)
+
+    thread = _emit_later(robot, "/coordinates", [{}])
+    with pytest.raises(KeyError):
+        robot.wait_until(lambda msg: msg["position"], timeout_seconds=5)
+    thread.join()
+    assert robot._telemetry_waiters == {}
+
+
+def test_wait_for_gpio_async():
+    robot = _robot()
+    thread = _emit_later(robot, "/gpio_states", [{"gpio": {"in1": 0}}, {"gpio": {"in1": 1}}])
+    message = asyncio.run(robot.wait_for_gpio_async_await("gpio/in1", 1, timeout_seconds=5))
+    thread.join()
+    assert message == {"gpio": {"in1": 1}}